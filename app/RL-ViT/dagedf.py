@@ -104,10 +104,11 @@ class DAGEDFScheduler(object):
     """
 
     def __init__(self, seed: int = 143, uti: float = 2.0,
-                 verbose: bool = False):
+                 verbose: bool = False, pool = None):
         
         from dagenv import DAGEnv
-        self.env = DAGEnv(seed, uti)
+        # pool: SimulatorPool to take the client from, see DAGEnv
+        self.env = DAGEnv(seed, uti, pool=pool)
         self.state, self.dep = self.env.reset()
         time, proc_state, task_states, request = self.state
         min_period = 1000
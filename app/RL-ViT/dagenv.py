@@ -11,7 +11,9 @@ class DAGEnv:
 
     def __init__(self, seed: int, utilization: float = 2.0, 
                 phase_reward: bool = False,
-                edf_like: bool = False) -> None:
+                edf_like: bool = False,
+                state_mirror: bool = False,
+                pool = None) -> None:
         import sys
         import os
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +23,9 @@ class DAGEnv:
 
         self.seed = seed
         self.client = None
+        self.state_mirror = state_mirror
+        # SimulatorPool to take the clients from, a new backend per reset otherwise
+        self.pool = pool
 
         from rand import DAGViTGenerator
         self.task_generator = DAGViTGenerator(self.seed, uti=utilization) 
@@ -42,17 +47,20 @@ class DAGEnv:
         self.invalid_schedule_count = 0
 
     def __del__(self):
+        if self.pool is not None and self.client is not None:
+            self.pool.release(self.client)
+            self.client = None
         del self.client
 
     def reset(self, flash_client = True):
 
         if flash_client:
-            del self.client
-            from client import SimulatorClient
-            self.client = SimulatorClient("../../build/main")
+            self.client = self.new_client()
 
             self.client.create_processor(0, 2) # cpu
             self.client.create_processor(7, 2) # gpu
+            if self.state_mirror:
+                self.client.enable_state_mirror()
 
             self.tasks = self.task_generator.generate_tasksets()
             for task in self.tasks:
@@ -93,6 +101,15 @@ class DAGEnv:
             self.pre_ddl = constructor.pre_search_ddl()
         return self.query_state(), self.query_dependency()
     
+    def new_client(self):
+        """drop the current client, return an empty one"""
+        if self.pool is None:
+            del self.client
+            from client import SimulatorClient
+            return SimulatorClient("../../build/main")
+        if self.client is not None: self.pool.release(self.client)
+        return self.pool.acquire()
+
     def reset_client(self) -> bool:
         return self.client.reset_client()
 
@@ -157,11 +174,9 @@ class DAGEnv:
         """
         if (procAffinity!=self.task_state[taskId][segId][0]):
             return self.invalid_schedule_reward
-        for i in range(len(self.proc_states)):
-            if (self.proc_states[i][0]==procAffinity) and (self.proc_states[i][1]==0):
-                break
-        if (i >= len(self.proc_states)): return self.invalid_schedule_reward
-        return self.schedule(i, taskId, segId)
+        idle = self.client.query_idle_processors(procAffinity)
+        if (len(idle) == 0): return self.invalid_schedule_reward
+        return self.schedule(int(idle[0]), taskId, segId)
 
     def schedule(self, procId:int, taskId: int, segId: int) -> float:
         """Perform the schedule command.
@@ -249,17 +264,20 @@ class DAGEnv:
             s1 = affinity, currentProcessor, isSegmentReady, length, remainLength, period;
             request = [processorAffinity, index of current request, total num request of this affinity]
         """
-        self.current_time = self.client.get_current_time_stamp()
+        # one snapshot instead of querying the processors and each task
+        if self.state_mirror:
+            self.current_time, procs, segs = self.client.mirror.read()
+        else:
+            self.current_time, procs, segs = self.client.snapshot()
         # the proc states are tuple of tuple
-        self.proc_states: list = list(self.client.query_processor_states())
+        self.proc_states: list = procs.tolist()
         # the task state has repeat the "period" multiple times to 
         # keep the format same
+        result = [[] for _ in range(self.task_num)]
+        for seg in segs.tolist():
+            result[seg[0]].append(list(seg[2:]))
         for i in range(self.task_num):
-            tmp = self.client.query_task_state(i)
-            result = []
-            for j in range(len(tmp[1])):
-                result.append(list(tmp[1][j])+[tmp[0]])
-            self.task_state[i] = result
+            self.task_state[i] = result[i]
         
         if seek_request: self.query_request_space()
         return [self.current_time, self.proc_states, self.task_state, \
@@ -292,12 +310,21 @@ class DAGEnv:
 
         reward = 0
         if changenotice:
+            from client import EVENT_JOB_RELEASED, EVENT_SEGMENT_READY
             self.prev_proc_state = self.proc_states.copy()
-            self.prev_task_state = self.task_state.copy()
-        
-            self.execution_score += self.client.update_processor_and_task()
+
+            executed, events = self.client.update_processor_and_task(events=True)
+            self.execution_score += executed
             self.query_state(seek_request=False)
 
+            # the backend reports what changed during this tick, no need to
+            # diff the previous task states
+            released = events["index"][events["type"] == EVENT_JOB_RELEASED].tolist()
+            readied = {}
+            for kind, j, k in events.tolist():
+                if kind == EVENT_SEGMENT_READY and j not in released:
+                    readied.setdefault(j, []).append(k)
+
             unlock_flag = np.zeros(10, dtype=bool)
             # condition 1, there's more processor of this type
             considered_procs = [0,7]
@@ -309,22 +336,17 @@ class DAGEnv:
             length = 0
             for i in considered_procs:
                 for j in range(len(self.task_state)):
-                    for k in range(len(self.task_state[j])):
+                    for k in sorted(readied.get(j, ())):
                         if self.task_state[j][k][0] == i:
-                            # print(self.task_state[j][k][2], self.prev_task_state[j][k][2])
-                            if self.task_state[j][k][2] > self.prev_task_state[j][k][2]:
-                                length += self.task_state[j][k][3]
-                                # print("error")
-                                # print(f"proc {i} unlock task {j} seg {k} len {self.task_state[j][k][3]}")
-                                unlock_flag[i] = True; break
+                            length += self.task_state[j][k][3]
+                            unlock_flag[i] = True; break
                     if unlock_flag[i]: break
             # condition 3, there's task release (unlock all)
             for i in considered_procs:
                 if unlock_flag[i]: break
-                for j in range(len(self.task_state)):
-                    if self.current_time%self.task_state[j][0][5] ==0:
-                        unlock_flag[i] = True
-                        length += self.task_state[j][0][3]
+                for j in released:
+                    unlock_flag[i] = True
+                    length += self.task_state[j][0][3]
             for i in considered_procs:
                 self.proc_locks[i] &= (not unlock_flag[i])
 
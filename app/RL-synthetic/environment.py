@@ -19,7 +19,8 @@ class SimulationEnv:
     will reproduce **exact** same tasksets.
     """
 
-    def __init__(self, seed: int, utilization: float = 2.0) -> None:
+    def __init__(self, seed: int, utilization: float = 2.0,
+                 state_mirror: bool = False, pool = None) -> None:
         import sys
         import os
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -30,6 +31,9 @@ class SimulationEnv:
         self.seed = seed
         self.client = None
         self.utilization = utilization
+        self.state_mirror = state_mirror
+        # SimulatorPool to take the clients from, a new backend per reset otherwise
+        self.pool = pool
 
         from rand import TaskRandomGenerator
         self.task_generator = TaskRandomGenerator(self.seed)
@@ -47,17 +51,20 @@ class SimulationEnv:
 
     
     def __del__(self):
+        if self.pool is not None and self.client is not None:
+            self.pool.release(self.client)
+            self.client = None
         del self.client
 
     def reset(self, flash_client = True):
 
         if flash_client:
-            del self.client
-            from client import SimulatorClient
-            self.client = SimulatorClient("../../build/main")
+            self.client = self.new_client()
 
             self.client.create_processor(0, 2)
             self.client.create_processor(7, 2)
+            if self.state_mirror:
+                self.client.enable_state_mirror()
             self.client.set_simulation_timebound(200)
 
             tasks = self.task_generator.generate(self.utilization)
@@ -84,6 +91,15 @@ class SimulationEnv:
 
         return self.query_state()
     
+    def new_client(self):
+        """drop the current client, return an empty one"""
+        if self.pool is None:
+            del self.client
+            from client import SimulatorClient
+            return SimulatorClient("../../build/main")
+        if self.client is not None: self.pool.release(self.client)
+        return self.pool.acquire()
+
     def reset_client(self) -> bool:
         return self.client.reset_client()
 
@@ -209,15 +225,32 @@ class SimulationEnv:
         return tuple(result)
 
     def query_state(self) -> 'tuple':
-        self.current_time = self.client.get_current_time_stamp()
-        self.proc_states: 'tuple' = self.client.query_processor_states()
+        # one snapshot instead of querying the processors and each task
+        if self.state_mirror:
+            self.current_time, procs, segs = self.client.mirror.read()
+        else:
+            self.current_time, procs, segs = self.client.snapshot()
+        self.proc_states: 'tuple' = tuple(procs.tolist())
+        rows = [[] for _ in range(5)]
+        for seg in segs.tolist():
+            rows[seg[0]].append(seg)
         for i in range(5):
             if self.self_suspension:
-                self.task_state[i] = self.client.query_ss_task_state(i)
+                self.task_state[i] = self.ss_task_state(rows[i])
             else:
-                self.task_state[i] = self.client.query_task_state(i)
+                self.task_state[i] = (rows[i][0][7], tuple(tuple(seg[2:7]) for seg in rows[i]))
         
         return self.decode_state()
+
+    def ss_task_state(self, rows: list) -> 'tuple':
+        """same format as `SimulatorClient.query_ss_task_state`, built from snapshot rows"""
+        ready = (-1, -1, 0)
+        for seg in rows:
+            # first ready and unfinished segment
+            if seg[6] != 0 and seg[4] == 1:
+                ready = (seg[1], seg[3], seg[6])
+                break
+        return (rows[0][7],) + ready + (tuple((seg[2], seg[5]) for seg in rows),)
     
     def query_state_lazy(self) -> 'tuple':
         return self.decode_state()
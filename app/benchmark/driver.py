@@ -45,13 +45,23 @@ file.write(f"scheduling,CPU,DataCopy,GPU,Utilization,Count\n")
 
 count = 0
 
+import sys
+sys.path.append('../../src/python')
+from pool import SimulatorPool
+# one backend for all the runs, cleared between them instead of restarted
+pool = SimulatorPool("../../build/main")
+
 for run in tqdm(range(args.run), desc=f"c{args.c}e{args.e}g{args.g}u{args.u}"):
     real_seed = (run*324201 + args.u*402631 + 480881*args.c + 976369*args.e + 236513*args.g ) % 8175383
-    sche = RateMonotonicScheduler(real_seed, uti=uti,
-                                  cpuCount=args.c, datacopy=args.e, gpuCount=args.g)
-    success = sche.simulate()
+    with pool.client() as cli:
+        sche = RateMonotonicScheduler(real_seed, uti=uti,
+                                      cpuCount=args.c, datacopy=args.e, gpuCount=args.g,
+                                      client=cli)
+        success = sche.simulate()
     if success: count = count + 1
 
+pool.close()
+
 file.write(f"RM,{args.c},{args.e},{args.g},{args.u},{count}\n")
 file.close()
 
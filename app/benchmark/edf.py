@@ -7,14 +7,19 @@ class EDFScheduler:
     def __init__(self, seed: int, 
                  taskpattern: str = "dag", numTask: int = 5, uti: float = 3.0,
                  cpuCount: int = 2, datacopy: int = 2, gpuCount :int = 2,
-                 releaseLimit = 200) -> None:
+                 releaseLimit = 200, client = None) -> None:
+        """ `client`: an empty simulator client to configure, e.g. from
+        `SimulatorPool.acquire()`, a new backend is started by default
+        """
         import sys
         sim_path = '../../src/python'
         if sim_path not in sys.path:
             sys.path.append(sim_path)
         
-        from client import SimulatorClient
-        self.cli = SimulatorClient("../../build/main")
+        if client is None:
+            from client import SimulatorClient
+            client = SimulatorClient("../../build/main")
+        self.cli = client
         self.cli.create_processor(0, cpuCount)
         self.cli.create_processor(3, datacopy)
         self.cli.create_processor(7, gpuCount)
@@ -35,12 +40,19 @@ class EDFScheduler:
 
         self.cli.set_simulation_timebound(np.min(self.period)*releaseLimit)
         self.limit = np.min(self.period)*releaseLimit
+        # the policy is deterministic, a repeated state after a release ends the run
+        # early; the states repeat a hyperperiod apart at the earliest, far beyond
+        # the bound for most generated tasksets
+        hyperperiod = self.cli.query_hyperperiod()
+        if 0 < hyperperiod < self.limit: self.cli.set_steady_state_detection()
         self.cli.start_simulation()
 
 
-    def simulate(self) -> bool:
-        """ Return true if schedulable
+    def simulate(self, native: bool = False) -> bool:
+        """ Return true if schedulable, `native` runs the same policy inside
+        the backend in one command
         """
+        if native: return self.cli.run_policy("edf")[0]
     
         import tqdm
         bar = tqdm.tqdm(total=self.limit, desc="Simulating")
@@ -76,7 +88,8 @@ class EDFScheduler:
                         if scheduleFlag:
                             self.cli.schedule_segment_on_processor(i, j, k)
                             break
-            self.cli.update_processor_and_task()
+            # the deadline order only changes with a release, skip the ticks in between
+            self.cli.advance_until_event()
             bar.update(self.cli.get_current_time_stamp() - previousTime)
             previousTime = self.cli.get_current_time_stamp()
         return not self.cli.does_task_miss_deadline()
@@ -0,0 +1,76 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The sweep of generate_command.py as one spec of `main --batch`: the tasksets
+of driver.py are written as scenario files, the runs go to a thread pool inside
+the backend instead of one driver.py process per point.
+
+    python generate_batch.py -algo rm -run 1000 -d batch
+    ../../build/main --batch batch/sweep.spec
+    python generate_batch.py -algo rm -d batch -summarize
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+
+sys.path.append('../../src/python')
+
+def sweep_points():
+    """ (cpu, copy engine, gpu, utilization * 10) as in generate_command.py """
+    for cpu in range(1, 6):
+        for uti in range(15, 35): yield cpu, 2, 2, uti
+    for engine in range(1, 6):
+        if engine == 2: continue
+        for uti in range(15, 35): yield 2, engine, 2, uti
+    for gpu in range(1, 6):
+        if gpu == 2: continue
+        for uti in range(15, 35): yield 2, 2, gpu, uti
+
+def real_seed(run, c, e, g, u):
+    """ same as driver.py """
+    return (run*324201 + u*402631 + 480881*c + 976369*e + 236513*g) % 8175383
+
+def write_batch(directory, algo, runs, numTask=5, releaseLimit=200, points=None):
+    """ Write the tasksets without a platform and the spec, the platform of each
+    point is given by its run lines; `points` as sweep_points(), the whole sweep
+    by default
+    """
+    from rand import DAGTaskGenerator
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "sweep.spec"), "w") as spec:
+        spec.write(f"output {os.path.join(directory, algo + '_sweep.csv')}\n")
+        for c, e, g, u in (points or sweep_points()):
+            for run in range(runs):
+                seed = real_seed(run, c, e, g, u)
+                path = os.path.join(directory, f"n{numTask}u{u}s{seed}.scenario")
+                if not os.path.exists(path):
+                    DAGTaskGenerator(seed, numTask, u / 10.0).write_scenario(path, {})
+                spec.write(f"run c{c}e{e}g{g}u{u} {algo} {releaseLimit} {path} 0 {c} 3 {e} 7 {g}\n")
+
+def summarize(directory, algo):
+    """ Count the schedulable runs per point, in the csv format of driver.py """
+    import csv
+    counts = {}
+    with open(os.path.join(directory, algo + "_sweep.csv")) as rows:
+        for row in csv.DictReader(rows):
+            counts[row["label"]] = counts.get(row["label"], 0) + (row["schedulable"] == "1")
+    with open(os.path.join(directory, algo + "_result.csv"), "w") as file:
+        file.write("scheduling,CPU,DataCopy,GPU,Utilization,Count\n")
+        for c, e, g, u in sweep_points():
+            file.write(f"{algo.upper()},{c},{e},{g},{u},{counts.get(f'c{c}e{e}g{g}u{u}', 0)}\n")
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Batch sweep of the benchmark")
+    parser.add_argument("-algo", type=str, required=True,
+                        choices=("rm", "edf", "dm", "fifo", "dagedf"))
+    parser.add_argument("-run", type=int, default=1000,
+                        help="number of runs per point")
+    parser.add_argument("-d", type=str, default="batch",
+                        help="directory of the scenarios, the spec and the results")
+    parser.add_argument("-summarize", action="store_true",
+                        help="count the results of the batch instead")
+    args = parser.parse_args()
+    if args.summarize: summarize(args.d, args.algo)
+    else: write_batch(args.d, args.algo, args.run)
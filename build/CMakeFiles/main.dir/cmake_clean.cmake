@@ -0,0 +1,39 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/main.dir/src/cpp/batch.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/batch.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/calendar.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/calendar.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/capi.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/capi.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/interface.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/interface.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/policy.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/policy.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/processor.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/processor.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/protocol.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/protocol.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/scheduler.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/scheduler.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/segment.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/segment.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/server.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/server.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/simulator.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/simulator.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/statemirror.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/statemirror.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/task.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/task.cpp.o.d"
+  "CMakeFiles/main.dir/src/cpp/variation.cpp.o"
+  "CMakeFiles/main.dir/src/cpp/variation.cpp.o.d"
+  "CMakeFiles/main.dir/test/main.cpp.o"
+  "CMakeFiles/main.dir/test/main.cpp.o.d"
+  "main"
+  "main.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang CXX)
+  include(CMakeFiles/main.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -0,0 +1,32 @@
+
+# Consider dependencies only in project.
+set(CMAKE_DEPENDS_IN_PROJECT_ONLY OFF)
+
+# The set of languages for which implicit dependencies are needed:
+set(CMAKE_DEPENDS_LANGUAGES
+  )
+
+# The set of dependency files which are needed:
+set(CMAKE_DEPENDS_DEPENDENCY_FILES
+  "/root/package/src/cpp/batch.cpp" "CMakeFiles/rtheter.dir/src/cpp/batch.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/batch.cpp.o.d"
+  "/root/package/src/cpp/calendar.cpp" "CMakeFiles/rtheter.dir/src/cpp/calendar.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/calendar.cpp.o.d"
+  "/root/package/src/cpp/capi.cpp" "CMakeFiles/rtheter.dir/src/cpp/capi.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/capi.cpp.o.d"
+  "/root/package/src/cpp/interface.cpp" "CMakeFiles/rtheter.dir/src/cpp/interface.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/interface.cpp.o.d"
+  "/root/package/src/cpp/policy.cpp" "CMakeFiles/rtheter.dir/src/cpp/policy.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/policy.cpp.o.d"
+  "/root/package/src/cpp/processor.cpp" "CMakeFiles/rtheter.dir/src/cpp/processor.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/processor.cpp.o.d"
+  "/root/package/src/cpp/protocol.cpp" "CMakeFiles/rtheter.dir/src/cpp/protocol.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/protocol.cpp.o.d"
+  "/root/package/src/cpp/scheduler.cpp" "CMakeFiles/rtheter.dir/src/cpp/scheduler.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/scheduler.cpp.o.d"
+  "/root/package/src/cpp/segment.cpp" "CMakeFiles/rtheter.dir/src/cpp/segment.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/segment.cpp.o.d"
+  "/root/package/src/cpp/server.cpp" "CMakeFiles/rtheter.dir/src/cpp/server.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/server.cpp.o.d"
+  "/root/package/src/cpp/simulator.cpp" "CMakeFiles/rtheter.dir/src/cpp/simulator.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/simulator.cpp.o.d"
+  "/root/package/src/cpp/statemirror.cpp" "CMakeFiles/rtheter.dir/src/cpp/statemirror.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/statemirror.cpp.o.d"
+  "/root/package/src/cpp/task.cpp" "CMakeFiles/rtheter.dir/src/cpp/task.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/task.cpp.o.d"
+  "/root/package/src/cpp/variation.cpp" "CMakeFiles/rtheter.dir/src/cpp/variation.cpp.o" "gcc" "CMakeFiles/rtheter.dir/src/cpp/variation.cpp.o.d"
+  )
+
+# Targets to which this target links.
+set(CMAKE_TARGET_LINKED_INFO_FILES
+  )
+
+# Fortran module output directory.
+set(CMAKE_Fortran_TARGET_MODULE_DIR "")
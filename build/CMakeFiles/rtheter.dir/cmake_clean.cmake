@@ -0,0 +1,37 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/rtheter.dir/src/cpp/batch.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/batch.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/calendar.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/calendar.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/capi.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/capi.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/interface.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/interface.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/policy.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/policy.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/processor.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/processor.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/protocol.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/protocol.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/scheduler.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/scheduler.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/segment.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/segment.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/server.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/server.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/simulator.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/simulator.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/statemirror.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/statemirror.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/task.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/task.cpp.o.d"
+  "CMakeFiles/rtheter.dir/src/cpp/variation.cpp.o"
+  "CMakeFiles/rtheter.dir/src/cpp/variation.cpp.o.d"
+  "librtheter.pdb"
+  "librtheter.so"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang CXX)
+  include(CMakeFiles/rtheter.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -0,0 +1,40 @@
+# CMake generated Testfile for 
+# Source directory: /root/package
+# Build directory: /root/package/build
+# 
+# This file includes the relevant testing commands required for 
+# testing this directory and lists subdirectories to be tested as well.
+add_test(test_advance "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_advance")
+set_tests_properties(test_advance PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_async "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_async")
+set_tests_properties(test_async PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_batch "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_batch")
+set_tests_properties(test_batch PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_build_info "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_build_info")
+set_tests_properties(test_build_info PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_checkpoint "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_checkpoint")
+set_tests_properties(test_checkpoint PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_history "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_history")
+set_tests_properties(test_history PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_idle "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_idle")
+set_tests_properties(test_idle PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_inprocess "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_inprocess")
+set_tests_properties(test_inprocess PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_mirror "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_mirror")
+set_tests_properties(test_mirror PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_policy "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_policy")
+set_tests_properties(test_policy PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_pool "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_pool")
+set_tests_properties(test_pool PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_protocol "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_protocol")
+set_tests_properties(test_protocol PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_release "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_release")
+set_tests_properties(test_release PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_resolution "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_resolution")
+set_tests_properties(test_resolution PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_server "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_server")
+set_tests_properties(test_server PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_steady "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_steady")
+set_tests_properties(test_steady PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_variation "/root/.pyenv/shims/python3" "-m" "unittest" "-v" "test_variation")
+set_tests_properties(test_variation PROPERTIES  ENVIRONMENT "RTHETER_BUILD=/root/package/build" WORKING_DIRECTORY "/root/package/test" _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;32;add_test;/root/package/CMakeLists.txt;0;")
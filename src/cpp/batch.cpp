@@ -0,0 +1,132 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <algorithm>
+#include <iostream>
+#include <sstream>
+#include <thread>
+
+#include "batch.h"
+#include "interface.h"
+#include "policy.h"
+
+bool BatchRunner::loadSpec(const std::string & path) {
+    std::ifstream spec(path);
+    if (!spec.is_open()) {
+        std::cerr << "Cannot open " << path << std::endl;
+        return false;
+    }
+    std::string line;
+    for (unsigned int lineNum = 1; std::getline(spec, line); lineNum++) {
+        line = line.substr(0, line.find('#'));
+        std::istringstream ss(line);
+        std::string keyword;
+        if (!(ss >> keyword)) continue;
+
+        bool valid = false;
+        if (keyword == "output") {
+            valid = bool(ss >> outputPath);
+        } else if (keyword == "threads") {
+            valid = bool(ss >> threadCount);
+        } else if (keyword == "run") {
+            BatchRun run;
+            valid = bool(ss >> run.label >> run.policy >> run.releases >> run.scenario)
+                    && NativePolicy::parsePolicy(run.policy) != POLICY_UNKNOWN && run.releases > 0;
+            long long type, count;
+            while (valid && ss >> type) {
+                valid = (ss >> count) && type >= 0 && type < ProcessorAffinity_t::UNKNOWN && count >= 0;
+                if (valid) run.processors.emplace_back(ProcessorAffinity_t(type), count);
+            }
+            valid = valid && ss.eof();
+            if (valid) runs.push_back(run);
+        }
+        if (!valid) {
+            std::cerr << path << ":" << lineNum << ": invalid line" << std::endl;
+            return false;
+        }
+    }
+    if (outputPath.empty()) {
+        std::cerr << path << ": no output" << std::endl;
+        return false;
+    }
+    return true;
+}
+
+bool BatchRunner::takeRun(unsigned int worker, size_t & run) {
+    {
+        WorkQueue & own = *queues[worker];
+        std::lock_guard<std::mutex> guard(own.lock);
+        if (!own.runs.empty()) {
+            run = own.runs.back();
+            own.runs.pop_back();
+            return true;
+        }
+    }
+    // the runs are never added again, an empty round means the batch is done
+    for (unsigned int i = 1; i < queues.size(); i++) {
+        WorkQueue & victim = *queues[(worker + i) % queues.size()];
+        std::lock_guard<std::mutex> guard(victim.lock);
+        if (victim.runs.empty()) continue;
+        run = victim.runs.front();
+        victim.runs.pop_front();
+        return true;
+    }
+    return false;
+}
+
+std::string BatchRunner::simulate(const BatchRun & run) {
+    Interface interface;
+    Simulator & simulator = interface.getSimulator();
+    for (auto & [type, count]: run.processors) simulator.createNewProcessors(type, count);
+    std::string reply = interface.processCommand("loadScenario " + run.scenario);
+    if (reply != "Scenario loaded" || simulator.queryTaskCount() == 0) {
+        std::cerr << run.label << ": " << reply << std::endl;
+        return "error,,,,,";
+    }
+    interface.processCommand("sortProcessors");
+
+    TimeStamp_t period = simulator.getTask(0).queryTaskPeriod();
+    for (TaskIndex_t i = 1; i < simulator.queryTaskCount(); i++)
+        period = std::min(period, (TimeStamp_t)simulator.getTask(i).queryTaskPeriod());
+    simulator.setSimulationTimeBound(period * run.releases);
+    // the states repeat a hyperperiod apart at the earliest
+    TimeStamp_t hyperperiod = simulator.queryHyperperiod() * simulator.queryTimeScale();
+    simulator.setSteadyStateDetection(hyperperiod > 0 && hyperperiod < simulator.querySimulationTimeBound());
+    interface.processCommand("startSimulation");
+
+    reply = interface.processCommand("runPolicy " + run.policy);
+    std::replace(reply.begin(), reply.end(), ' ', ',');
+    return reply;
+}
+
+void BatchRunner::work(unsigned int worker) {
+    size_t index;
+    while (takeRun(worker, index)) {
+        const BatchRun & run = runs[index];
+        std::string row = run.label + "," + run.policy + "," + run.scenario + "," + simulate(run) + "\n";
+        std::lock_guard<std::mutex> guard(outputLock);
+        output << row << std::flush;
+    }
+}
+
+bool BatchRunner::run() {
+    output.open(outputPath, std::ios::trunc);
+    if (!output.is_open()) {
+        std::cerr << "Cannot open " << outputPath << std::endl;
+        return false;
+    }
+    output << "label,policy,scenario,schedulable,missTime,endTime,rounds,scheduled,preemptions\n" << std::flush;
+
+    unsigned int workerCount = threadCount ? threadCount : std::max(1u, std::thread::hardware_concurrency());
+    workerCount = std::max<size_t>(1, std::min<size_t>(workerCount, runs.size()));
+    queues.clear();
+    for (unsigned int i = 0; i < workerCount; i++) queues.push_back(std::make_unique<WorkQueue>());
+    for (size_t i = 0; i < runs.size(); i++) queues[i % workerCount]->runs.push_back(i);
+
+    std::vector<std::thread> workers;
+    for (unsigned int i = 0; i < workerCount; i++) workers.emplace_back(&BatchRunner::work, this, i);
+    for (std::thread & worker: workers) worker.join();
+    output.close();
+    return true;
+}
@@ -0,0 +1,95 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef BATCH_H
+#define BATCH_H
+
+#include <deque>
+#include <fstream>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+#include "affinity.h"
+
+namespace batch {
+
+/// @brief One line "run ..." of a batch spec.
+struct BatchRun {
+    std::string label;
+    std::string policy;
+    // The bound is releases times the shortest period.
+    unsigned long long releases = 200;
+    std::string scenario;
+    // Created before loading the scenario, in addition to its own processors.
+    std::vector<std::pair<ProcessorAffinity_t, unsigned int>> processors = {};
+};
+
+/// @brief Runs of one worker, the owner takes from the back, the thieves from the front.
+struct WorkQueue {
+    std::mutex lock;
+    std::deque<size_t> runs = {};
+};
+
+};
+
+using namespace batch;
+
+/**
+ * @brief Batch mode: run the independent simulations of a spec file on a pool of
+ * threads, one simulator per run, and stream a result row per finished run.
+ *
+ * Spec lines, '#' starts a comment:
+ *   output <path>          result rows, CSV with a header, required
+ *   threads <count>        0 (default) for std::thread::hardware_concurrency
+ *   run <label> <policy> <releases> <scenario> [<type> <count> ...]
+ *
+ * A run creates the listed processors, loads the scenario file (see
+ * Interface::loadScenario), sorts the processors, bounds the simulation to
+ * <releases> times the shortest period and runs the native policy (see
+ * NativePolicy), with the steady state detection if the hyperperiod is below the bound.
+ * The runs are dealt round-robin to the workers, an idle worker steals from the
+ * others, so the rows come in completion order.
+*/
+class BatchRunner {
+
+    std::string outputPath;
+
+    unsigned int threadCount = 0;
+
+    std::vector<BatchRun> runs = {};
+
+    std::vector<std::unique_ptr<WorkQueue>> queues = {};
+
+    std::ofstream output;
+
+    std::mutex outputLock;
+
+    /// @brief Next run of the worker, its own newest first, then the oldest of another.
+    bool takeRun(unsigned int worker, size_t & run);
+
+    void work(unsigned int worker);
+
+    /// @return The CSV fields after the label, policy and scenario.
+    std::string simulate(const BatchRun & run);
+
+public:
+
+    /**
+     * @brief Read the spec file.
+     * @return False, with the reason on stderr, if it cannot be read or is invalid.
+    */
+    bool loadSpec(const std::string & path);
+
+    /**
+     * @brief Run all the runs of the spec, blocking until the last one.
+     * @return False if the output cannot be opened.
+    */
+    bool run();
+
+    size_t queryRunCount() {return runs.size();};
+};
+
+#endif // batch.h
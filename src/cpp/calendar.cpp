@@ -0,0 +1,75 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <algorithm>
+
+#include "calendar.h"
+
+void TaskCalendar::place(size_t position, const std::pair<TimeStamp_t, TaskIndex_t> & entry) {
+    heap[position] = entry;
+    positions[entry.second] = position;
+}
+
+void TaskCalendar::siftUp(size_t position) {
+    std::pair<TimeStamp_t, TaskIndex_t> entry = heap[position];
+    while (position > 0) {
+        size_t parent = (position - 1) / 2;
+        if (!(entry < heap[parent])) break;
+        place(position, heap[parent]);
+        position = parent;
+    }
+    place(position, entry);
+}
+
+void TaskCalendar::siftDown(size_t position) {
+    std::pair<TimeStamp_t, TaskIndex_t> entry = heap[position];
+    while (true) {
+        size_t child = 2 * position + 1;
+        if (child >= heap.size()) break;
+        if (child + 1 < heap.size() && heap[child + 1] < heap[child]) child++;
+        if (!(heap[child] < entry)) break;
+        place(position, heap[child]);
+        position = child;
+    }
+    place(position, entry);
+}
+
+void TaskCalendar::schedule(TaskIndex_t task, TimeStamp_t time) {
+    if (task >= positions.size()) positions.resize(task + 1, NOT_SCHEDULED);
+    size_t position = positions[task];
+    if (position == NOT_SCHEDULED) {
+        heap.emplace_back(time, task);
+        siftUp(heap.size() - 1);
+        return;
+    }
+    TimeStamp_t former = heap[position].first;
+    heap[position].first = time;
+    if (time < former) siftUp(position);
+    else siftDown(position);
+}
+
+void TaskCalendar::cancel(TaskIndex_t task) {
+    if (task >= positions.size() || positions[task] == NOT_SCHEDULED) return;
+    size_t position = positions[task];
+    positions[task] = NOT_SCHEDULED;
+    std::pair<TimeStamp_t, TaskIndex_t> last = heap.back();
+    heap.pop_back();
+    if (position == heap.size()) return;
+    place(position, last);
+    siftUp(position);
+    siftDown(positions[last.second]);
+}
+
+void TaskCalendar::collectDue(size_t position, TimeStamp_t bound, std::vector<TaskIndex_t> & tasks) const {
+    if (position >= heap.size() || heap[position].first > bound) return;
+    tasks.push_back(heap[position].second);
+    collectDue(2 * position + 1, bound, tasks);
+    collectDue(2 * position + 2, bound, tasks);
+}
+
+void TaskCalendar::queryDue(TimeStamp_t bound, std::vector<TaskIndex_t> & tasks) const {
+    tasks.clear();
+    collectDue(0, bound, tasks);
+    std::sort(tasks.begin(), tasks.end());
+}
@@ -0,0 +1,65 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef CALENDAR_H
+#define CALENDAR_H
+
+#include <utility>
+#include <vector>
+
+#include "task.h"
+
+/**
+ * @brief Min-heap of at most one time stamp per task, e.g. the next release of
+ * every task, so the simulator only visits the tasks due at a time stamp instead
+ * of testing all of them. The position of every task is kept, an entry is moved
+ * or removed in O(log n). Ties go to the lower task index.
+*/
+class TaskCalendar {
+
+    std::vector<std::pair<TimeStamp_t, TaskIndex_t>> heap = {};
+
+    // Position of each task in the heap, NOT_SCHEDULED if it has no entry.
+    std::vector<size_t> positions = {};
+
+    /// @brief Put the entry at the position and record it.
+    void place(size_t position, const std::pair<TimeStamp_t, TaskIndex_t> & entry);
+
+    void siftUp(size_t position);
+
+    void siftDown(size_t position);
+
+    /// @brief Add the tasks of the subtree due by the bound, see queryDue.
+    void collectDue(size_t position, TimeStamp_t bound, std::vector<TaskIndex_t> & tasks) const;
+
+public:
+
+    static constexpr size_t NOT_SCHEDULED = ~size_t(0);
+
+    void clear() {heap.clear(); positions.clear();};
+
+    /// @brief Insert the entry of the task or move it to the time stamp.
+    void schedule(TaskIndex_t task, TimeStamp_t time);
+
+    /// @brief Remove the entry of the task, if any.
+    void cancel(TaskIndex_t task);
+
+    bool empty() const {return heap.empty();};
+
+    size_t size() const {return heap.size();};
+
+    /// @attention The calendar must not be empty.
+    TimeStamp_t nextTime() const {return heap.front().first;};
+
+    /// @attention The calendar must not be empty.
+    TaskIndex_t nextTask() const {return heap.front().second;};
+
+    /**
+     * @brief The tasks with a time stamp up to the bound, in ascending index order.
+     * Only the due entries and their children are visited.
+    */
+    void queryDue(TimeStamp_t bound, std::vector<TaskIndex_t> & tasks) const;
+};
+
+#endif // calendar.h
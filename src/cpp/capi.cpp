@@ -0,0 +1,193 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <cstring>
+
+#include "capi.h"
+#include "interface.h"
+
+using namespace protocol;
+
+struct RTHeterHandle {
+    Interface interface;
+    // Reused between calls, so the queries do not allocate in steady state.
+    std::vector<ReplyValue_t> scratch;
+    // Reply of the last text command, copied again by rtheter_copy_last_reply.
+    std::string lastReply;
+};
+
+static long long copyScratch(RTHeterHandle * handle, void * buffer, long long capacity) {
+    long long count = handle->scratch.size();
+    if (count <= capacity)
+        std::memcpy(buffer, handle->scratch.data(), count * sizeof(ReplyValue_t));
+    return count;
+}
+
+static std::vector<ReplyValue_t> & clearedScratch(RTHeterHandle * handle) {
+    handle->scratch.clear();
+    return handle->scratch;
+}
+
+RTHeterHandle * rtheter_create() {
+    return new RTHeterHandle();
+}
+
+void rtheter_destroy(RTHeterHandle * handle) {
+    delete handle;
+}
+
+int rtheter_value_is_float() {
+    return REPLY_NUMERIC == REPLY_FLOAT64;
+}
+
+unsigned long long rtheter_time_resolution(RTHeterHandle * handle) {
+    return handle->interface.getSimulator().queryTimeResolution();
+}
+
+int rtheter_create_processors(RTHeterHandle * handle, int processorType, int processorCount) {
+    return handle->interface.getSimulator().createNewProcessors(ProcessorType_t(processorType), processorCount);
+}
+
+int rtheter_sort_processors(RTHeterHandle * handle) {
+    return handle->interface.getSimulator().sortProcessorsByType();
+}
+
+int rtheter_create_dag_task(RTHeterHandle * handle, const long long * values, long long count) {
+    std::vector<long long> args(values, values + count);
+    return handle->interface.createDAGTaskFromValues(args) == "Created successfully";
+}
+
+int rtheter_load_scenario(RTHeterHandle * handle, const long long * values, long long count) {
+    std::vector<long long> args(values, values + count);
+    return handle->interface.loadScenarioFromValues(args) == "Scenario loaded";
+}
+
+int rtheter_set_simulation_time_bound(RTHeterHandle * handle, unsigned long long bound) {
+    handle->interface.getSimulator().setSimulationTimeBound(bound);
+    return 1;
+}
+
+int rtheter_start_simulation(RTHeterHandle * handle) {
+    handle->interface.startSimulation();
+    return 1;
+}
+
+int rtheter_reset_simulator(RTHeterHandle * handle) {
+    // as the resetSimulator command, which also publishes the reset state to the mirror
+    return handle->interface.resetSimulator() == "Success";
+}
+
+int rtheter_schedule_segment(RTHeterHandle * handle, int processorId, int taskId, int segmentId) {
+    return handle->interface.scheduleSegment(processorId, taskId, segmentId);
+}
+
+long long rtheter_update(RTHeterHandle * handle) {
+    Simulator & simulator = handle->interface.getSimulator();
+    return simulator.updateProcessorAndTask() * (long long)simulator.queryTimeScale();
+}
+
+long long rtheter_advance_until_decision(RTHeterHandle * handle) {
+    Simulator & simulator = handle->interface.getSimulator();
+    return simulator.advanceUntilDecision() * (long long)simulator.queryTimeScale();
+}
+
+long long rtheter_advance_until_event(RTHeterHandle * handle) {
+    Simulator & simulator = handle->interface.getSimulator();
+    return simulator.advanceUntilEvent() * (long long)simulator.queryTimeScale();
+}
+
+unsigned long long rtheter_current_time(RTHeterHandle * handle) {
+    return handle->interface.getSimulator().queryOriginalTimeStamp();
+}
+
+int rtheter_is_simulation_completed(RTHeterHandle * handle) {
+    return handle->interface.getSimulator().isSimulationCompleted();
+}
+
+int rtheter_does_task_miss_deadline(RTHeterHandle * handle) {
+    return handle->interface.getSimulator().doesTaskMissDeadline();
+}
+
+long long rtheter_query_processor_state(RTHeterHandle * handle, int processorId, void * buffer, long long capacity) {
+    if (!handle->interface.processorStateValues(processorId, clearedScratch(handle))) return 0;
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_processor_states(RTHeterHandle * handle, void * buffer, long long capacity) {
+    std::vector<ReplyValue_t> & values = clearedScratch(handle);
+    for (unsigned int i = 0; i < handle->interface.getSimulator().queryProcessorCount(); i++)
+        handle->interface.processorStateValues(i, values);
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_task_state(RTHeterHandle * handle, int taskId, void * buffer, long long capacity) {
+    if (!handle->interface.taskStateValues(taskId, clearedScratch(handle))) return 0;
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_ss_task_state(RTHeterHandle * handle, int taskId, void * buffer, long long capacity) {
+    if (!handle->interface.ssTaskStateValues(taskId, clearedScratch(handle))) return 0;
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_task_execution_states(RTHeterHandle * handle, void * buffer, long long capacity) {
+    std::vector<ReplyValue_t> & values = clearedScratch(handle);
+    Simulator & simulator = handle->interface.getSimulator();
+    for (unsigned int i = 0; i < simulator.queryTaskCount(); i++)
+        values.push_back(simulator.getTask(i).queryExecutedSegLength() * simulator.queryTimeScale());
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_snapshot(RTHeterHandle * handle, void * buffer, long long capacity) {
+    handle->interface.snapshotValues(clearedScratch(handle));
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_tick_events(RTHeterHandle * handle, void * buffer, long long capacity) {
+    handle->interface.tickEventValues(clearedScratch(handle));
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_task_versions(RTHeterHandle * handle, void * buffer, long long capacity) {
+    handle->interface.taskVersionValues(clearedScratch(handle));
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_idle_processors(RTHeterHandle * handle, int processorType, void * buffer, long long capacity) {
+    if (!handle->interface.idleProcessorValues(processorType, clearedScratch(handle))) return 0;
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_execution_history(RTHeterHandle * handle, int taskId, void * buffer, long long capacity) {
+    if (!handle->interface.executionHistoryValues(taskId, clearedScratch(handle))) return 0;
+    return copyScratch(handle, buffer, capacity);
+}
+
+long long rtheter_query_state_data(RTHeterHandle * handle, unsigned long long stateId, void * buffer, long long capacity) {
+    const std::string * data = handle->interface.getSimulator().queryStateData(stateId);
+    if (!data) return 0;
+    long long size = data->size();
+    if (size <= capacity) std::memcpy(buffer, data->data(), size);
+    return size;
+}
+
+int rtheter_restore_state_data(RTHeterHandle * handle, const void * data, long long size) {
+    if (size < 0) return 0;
+    return handle->interface.getSimulator().restoreSnapshot(std::string((const char *)data, size));
+}
+
+long long rtheter_process_command(RTHeterHandle * handle, const char * command, char * reply, long long capacity) {
+    handle->lastReply = handle->interface.processCommand(command);
+    return rtheter_copy_last_reply(handle, reply, capacity);
+}
+
+long long rtheter_copy_last_reply(RTHeterHandle * handle, char * reply, long long capacity) {
+    const std::string & result = handle->lastReply;
+    if (capacity > 0) {
+        long long length = std::min<long long>(result.size(), capacity - 1);
+        std::memcpy(reply, result.data(), length);
+        reply[length] = '\0';
+    }
+    return result.size();
+}
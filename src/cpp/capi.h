@@ -0,0 +1,99 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef CAPI_H
+#define CAPI_H
+
+/**
+ * @brief Flat C API of the simulator, built into the shared library so that
+ * clients (e.g. Python ctypes) can drive it in-process without a subprocess.
+ *
+ * The query functions fill caller-provided buffers of int64 values, the lengths
+ * in sub-ticks of rtheter_time_resolution(), in the same layout as the numeric
+ * replies of the binary protocol. They return the number of values of the
+ * full reply; nothing is written if it exceeds the capacity.
+*/
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+typedef struct RTHeterHandle RTHeterHandle;
+
+RTHeterHandle * rtheter_create();
+void rtheter_destroy(RTHeterHandle * handle);
+
+/// @brief 0, the values are int64 since the sub-tick units, kept for the former clients
+int rtheter_value_is_float();
+/// @brief Sub-ticks per time unit of the lengths, see setTimeResolution
+unsigned long long rtheter_time_resolution(RTHeterHandle * handle);
+
+int rtheter_create_processors(RTHeterHandle * handle, int processorType, int processorCount);
+int rtheter_sort_processors(RTHeterHandle * handle);
+/// @param values same layout as createDAGTask
+int rtheter_create_dag_task(RTHeterHandle * handle, const long long * values, long long count);
+/// @param values same layout as the OP_LOAD_SCENARIO payload, see protocol.h
+int rtheter_load_scenario(RTHeterHandle * handle, const long long * values, long long count);
+int rtheter_set_simulation_time_bound(RTHeterHandle * handle, unsigned long long bound);
+int rtheter_start_simulation(RTHeterHandle * handle);
+int rtheter_reset_simulator(RTHeterHandle * handle);
+
+/// @return 1 if scheduled, 0 on schedule error
+int rtheter_schedule_segment(RTHeterHandle * handle, int processorId, int taskId, int segmentId);
+/// @return total executed length of this tick
+long long rtheter_update(RTHeterHandle * handle);
+/// @return total executed length, see Simulator::advanceUntilDecision
+long long rtheter_advance_until_decision(RTHeterHandle * handle);
+/// @return total executed length, see Simulator::advanceUntilEvent
+long long rtheter_advance_until_event(RTHeterHandle * handle);
+
+unsigned long long rtheter_current_time(RTHeterHandle * handle);
+int rtheter_is_simulation_completed(RTHeterHandle * handle);
+int rtheter_does_task_miss_deadline(RTHeterHandle * handle);
+
+/// @brief 0 if there is no such processor
+long long rtheter_query_processor_state(RTHeterHandle * handle, int processorId, void * buffer, long long capacity);
+long long rtheter_query_processor_states(RTHeterHandle * handle, void * buffer, long long capacity);
+/// @brief 0 if there is no such task
+long long rtheter_query_task_state(RTHeterHandle * handle, int taskId, void * buffer, long long capacity);
+/// @brief 0 if there is no such task
+long long rtheter_query_ss_task_state(RTHeterHandle * handle, int taskId, void * buffer, long long capacity);
+long long rtheter_query_task_execution_states(RTHeterHandle * handle, void * buffer, long long capacity);
+long long rtheter_query_snapshot(RTHeterHandle * handle, void * buffer, long long capacity);
+/// @brief <type> <index> <segment> per event of the last update
+long long rtheter_query_tick_events(RTHeterHandle * handle, void * buffer, long long capacity);
+/// @brief <version> <t0.version> <t1.version> ...
+long long rtheter_query_task_versions(RTHeterHandle * handle, void * buffer, long long capacity);
+/// @brief same layout as queryIdleProcessors, a negative type for all the types; 0 if the type is invalid
+long long rtheter_query_idle_processors(RTHeterHandle * handle, int processorType, void * buffer, long long capacity);
+/// @brief <segment> <processor> <start> <end> per interval of the current job; 0 if there is no such task
+long long rtheter_query_execution_history(RTHeterHandle * handle, int taskId, void * buffer, long long capacity);
+
+/**
+ * @brief Copy the bytes of a pushState snapshot, e.g. into another simulator of the
+ * same processors, tasks and time base.
+ * @return Size in bytes, 0 if there is no such snapshot; nothing is written if it exceeds the capacity.
+*/
+long long rtheter_query_state_data(RTHeterHandle * handle, unsigned long long stateId, void * buffer, long long capacity);
+/// @return 1 if restored, 0 leaving the state as it was if the snapshot is incomplete or does not fit
+int rtheter_restore_state_data(RTHeterHandle * handle, const void * data, long long size);
+
+/**
+ * @brief Run a text command, same as one line of the stdin protocol.
+ * @return Length of the reply, truncated to capacity-1 and null terminated.
+*/
+long long rtheter_process_command(RTHeterHandle * handle, const char * command, char * reply, long long capacity);
+
+/**
+ * @brief Copy the reply of the last text command again, e.g. into a larger buffer
+ * after it was truncated, without running the command twice.
+ * @return Length of the reply, truncated to capacity-1 and null terminated.
+*/
+long long rtheter_copy_last_reply(RTHeterHandle * handle, char * reply, long long capacity);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // capi.h
@@ -0,0 +1,145 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef CHECKPOINT_H
+#define CHECKPOINT_H
+
+#include <cstdint>
+#include <cstring>
+#include <list>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+/**
+ * @brief Compact binary archives of the simulator state, see Simulator::saveCheckpoint.
+ *
+ * A class takes part by a template member
+ *     template <class Archive> void checkpointFields(Archive & archive) {archive(a, b, c);}
+ * used by both the Writer and the Reader. Trivially copyable values are stored
+ * as their raw (little-endian) bytes, vectors and lists as <uint64 count> <items>.
+*/
+namespace checkpoint {
+
+// The 8 bytes "RTHCkpt1" read as a little-endian int64.
+const long long CHECKPOINT_MAGIC = 0x3174706b43485452LL;
+// Incremented when a checkpointFields changes.
+const long long CHECKPOINT_VERSION = 12;
+
+template <class Archive, typename T>
+concept HasCheckpointFields = requires(T & value, Archive & archive) {value.checkpointFields(archive);};
+
+class Writer {
+
+    std::string buffer;
+
+public:
+
+    static const bool loading = false;
+
+    template <typename T>
+    void field(T & value) {
+        if constexpr (HasCheckpointFields<Writer, T>) {
+            value.checkpointFields(*this);
+        } else {
+            static_assert(std::is_trivially_copyable_v<T>, "no checkpointFields for this type");
+            buffer.append(reinterpret_cast<const char *>(&value), sizeof(T));
+        }
+    }
+
+    template <typename T>
+    void field(std::vector<T> & values) {
+        uint64_t count = values.size();
+        field(count);
+        for (auto & value: values) field(value);
+    }
+
+    template <typename T>
+    void field(std::list<T> & values) {
+        uint64_t count = values.size();
+        field(count);
+        for (auto & value: values) field(value);
+    }
+
+    template <typename... T>
+    void operator()(T & ... values) {(field(values), ...);}
+
+    const std::string & data() const {return buffer;};
+
+    std::string release() {return std::move(buffer);};
+
+};
+
+/**
+ * @brief Reads what a Writer wrote. Nothing is read past the end of the data:
+ * on a truncated or corrupted input failed() turns true and the remaining
+ * fields are left as they are.
+*/
+class Reader {
+
+    const char * position;
+
+    const char * end;
+
+    bool failure = false;
+
+    bool take(void * target, size_t bytes) {
+        if (failure || (size_t)(end - position) < bytes) {failure = true; return false;}
+        std::memcpy(target, position, bytes);
+        position += bytes;
+        return true;
+    }
+
+    // the items take at least one byte each, larger counts are corrupted
+    bool takeCount(uint64_t & count) {
+        if (!take(&count, sizeof(count))) return false;
+        if (count > (uint64_t)(end - position)) failure = true;
+        return !failure;
+    }
+
+public:
+
+    static const bool loading = true;
+
+    explicit Reader(const std::string & data): position(data.data()), end(data.data() + data.size()) {};
+
+    template <typename T>
+    void field(T & value) {
+        if constexpr (HasCheckpointFields<Reader, T>) {
+            value.checkpointFields(*this);
+        } else {
+            static_assert(std::is_trivially_copyable_v<T>, "no checkpointFields for this type");
+            take(&value, sizeof(T));
+        }
+    }
+
+    template <typename T>
+    void field(std::vector<T> & values) {
+        uint64_t count = 0;
+        if (!takeCount(count)) return;
+        values.resize(count);
+        for (auto & value: values) field(value);
+    }
+
+    template <typename T>
+    void field(std::list<T> & values) {
+        uint64_t count = 0;
+        if (!takeCount(count)) return;
+        values.resize(count);
+        for (auto & value: values) field(value);
+    }
+
+    template <typename... T>
+    void operator()(T & ... values) {(field(values), ...);}
+
+    bool failed() const {return failure;};
+
+    /// @brief True if every byte was read without failure.
+    bool finished() const {return !failure && position == end;};
+
+};
+
+};
+
+#endif // checkpoint.h
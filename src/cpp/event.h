@@ -0,0 +1,32 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef EVENT_H
+#define EVENT_H
+
+namespace event {
+
+/**
+ * @brief State changes reported by Simulator::updateProcessorAndTask,
+ * the numbers are part of the client protocol.
+*/
+enum SimulationEventType_t {
+    SEGMENT_COMPLETED = 0, // index: task, segment: segment
+    SEGMENT_READY = 1,     // index: task, segment: segment
+    JOB_RELEASED = 2,      // index: task
+    PROCESSOR_IDLE = 3,    // index: processor global index
+    DEADLINE_MISSED = 4,   // index: task
+};
+
+struct SimulationEvent {
+    SimulationEventType_t type;
+    unsigned int index;
+    unsigned int segment;
+};
+
+};
+
+using namespace event;
+
+#endif // event.h
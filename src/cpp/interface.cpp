@@ -2,27 +2,96 @@
 Copy Right. The EHPCL Authors.
 */
 
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
 #include <iostream>
 #include <sstream>
 #include "interface.h"
+#include "policy.h"
+
+using namespace protocol;
+
+namespace {
+
+bool readBinaryFile(const std::string & path, std::string & data) {
+    std::ifstream file(path, std::ios::binary | std::ios::ate);
+    if (!file) return false;
+    data.resize(file.tellg());
+    file.seekg(0);
+    return (bool)file.read(data.data(), data.size());
+}
+
+// Written to a temporary file first, so a crash never leaves a partial file at path.
+bool writeBinaryFile(const std::string & path, const std::string & data) {
+    std::string temporary = path + ".tmp";
+    {
+        std::ofstream file(temporary, std::ios::binary | std::ios::trunc);
+        if (!file || !file.write(data.data(), data.size()) || !file.flush()) return false;
+    }
+    return std::rename(temporary.c_str(), path.c_str()) == 0;
+}
+
+}
 
 Interface::Interface(int argc, char ** argv) {
     if (argc >= 2) this->interactive = true;
     initCommandMap();
+    initOpcodeMap();
+}
+
+bool Interface::readCommands(std::istream & input, std::ostream & output) {
+    this->input = &input;
+    this->output = &output;
+    // every connection starts in the text protocol
+    quitFlag = false;
+    binaryProtocol = false;
+    batchMode = false;
+    bool res = readCommands();
+    this->input = &std::cin;
+    this->output = &std::cout;
+    return res;
 }
 
 bool Interface::readCommands() {
     std::string line;
     if (interactive) std::cerr << ">>> ";
-    while (std::getline(std::cin, line)) {
-        std::cout << processCommand(line) << std::endl;
-        if (quitFlag) return true;
-        if (interactive) std::cerr << ">>> ";
+    while (!quitFlag) {
+        if (binaryProtocol) {
+            if (!readBinaryCommand()) break;
+            continue;
+        }
+        if (!std::getline(*input, line)) break;
+        *output << processCommand(line) << '\n';
+        if (!batchMode) output->flush();
+        if (interactive && !quitFlag && !binaryProtocol) std::cerr << ">>> ";
     }
 
     return true;
 }
 
+bool Interface::readBinaryCommand() {
+    uint32_t header[2];
+    if (!input->read(reinterpret_cast<char *>(header), sizeof(header))) return false;
+    std::string payload(header[1], '\0');
+    if (header[1] > 0 && !input->read(payload.data(), header[1])) return false;
+    std::string frame = processBinaryCommand(header[0], payload).encode();
+    output->write(frame.data(), frame.size());
+    if (!batchMode) output->flush();
+    return true;
+}
+
+BinaryReply Interface::processBinaryCommand(uint32_t opcode, const std::string & payload) {
+    if (opcode == OP_TEXT) return BinaryReply(processCommand(payload));
+    auto it = opcode_map.find(opcode);
+    if (it == opcode_map.end()) return BinaryReply("Unknown command");
+    std::vector<long long> args(payload.size() / sizeof(long long));
+    if (!args.empty()) std::memcpy(args.data(), payload.data(), args.size() * sizeof(long long));
+    return it->second(args);
+}
+
 std::string Interface::processCommand(const std::string & command) {
     if (command.empty()) return "Unknown command";
     std::istringstream ss(command);
@@ -41,13 +110,14 @@ std::string Interface::processCommand(const std::string & command) {
 
 Interface::Interface() {
     initCommandMap();
+    initOpcodeMap();
 };
 
 void Interface::initCommandMap() {
 
     command_map = {
         {"queryCurrentTimeStamp", [this](const std::string&)
-            {return std::to_string(getSimulator().queryCurrentTimeStamp());}},
+            {return std::to_string(getSimulator().queryOriginalTimeStamp());}},
         {"quit", [this](const std::string&)
             {quitFlag = true; return "Exiting...";}},
         {"printSimulatorState", [this](const std::string&)
@@ -58,8 +128,30 @@ void Interface::initCommandMap() {
             {return getSimulator().isSimulationCompleted()?"Yes":"";}},
         {"doesTaskMissDeadline", [this](const std::string &)
             {return getSimulator().doesTaskMissDeadline()?"Yes":"";}},
-        {"updateProcessorAndTask", [this](const std::string &)
-            {return updateProcessorAndTask();}},
+        {"updateProcessorAndTask", [this](const std::string & args)
+            {return updateProcessorAndTask(args);}},
+        {"advanceUntilDecision", [this](const std::string & args)
+            {return advanceReply(simulator.advanceUntilDecision(), args);}},
+        {"advanceUntilEvent", [this](const std::string & args)
+            {return advanceReply(simulator.advanceUntilEvent(), args);}},
+        {"queryTickEvents", [this](const std::string &)
+            {return queryTickEvents();}},
+        {"queryTaskVersions", [this](const std::string &)
+            {return queryTaskVersions();}},
+        {"queryIdleProcessors", [this](const std::string & args)
+            {return queryIdleProcessors(args);}},
+        {"queryExecutionHistory", [this](const std::string & args)
+            {return queryExecutionHistory(args);}},
+        {"queryHyperperiod", [this](const std::string &)
+            {return std::to_string(simulator.queryHyperperiod() * simulator.queryTimeScale());}},
+        {"querySteadyState", [this](const std::string &)
+            {return std::to_string(int(simulator.isSteadyStateReached())) + " "
+                    + std::to_string(simulator.querySteadyStateCycle() * simulator.queryTimeScale());}},
+        {"queryTimeResolution", [this](const std::string &)
+            {return std::to_string(simulator.queryTimeResolution());}},
+        {"compressTimeBase", [this](const std::string &)
+            {return simulator.queryCurrentTimeStamp() != 0 ? std::string("Invalid args!") :
+                    simulator.compressTimeBase() ? std::to_string(simulator.queryTimeScale()) : "Not compressed";}},
         {"queryProcessorStates", [this](const std::string &)
             {return queryProcessorStates();}},
         {"queryTaskExecutionStates", [this](const std::string &)
@@ -68,17 +160,55 @@ void Interface::initCommandMap() {
             {getSimulator().checkTaskRelease(); return "Initial Tasks Released";}},
         {"resetSimulator", [this](const std::string &)
             {return resetSimulator();}},
+        {"clearSimulator", [this](const std::string &)
+            {return clearSimulator();}},
+        {"queryBuildInfo", [this](const std::string &)
+            {return queryBuildInfo();}},
+        {"beginBatch", [this](const std::string &)
+            {batchMode = true; return "Batch started";}},
+        {"endBatch", [this](const std::string &)
+            {batchMode = false; return "Batch ended";}},
+        {"querySnapshot", [this](const std::string &)
+            {return querySnapshot();}},
+        {"pushState", [this](const std::string & args)
+            {return stateStackReply("pushState", args);}},
+        {"popState", [this](const std::string & args)
+            {return stateStackReply("popState", args);}},
+        {"restoreState", [this](const std::string & args)
+            {return stateStackReply("restoreState", args);}},
     };
+    command_map["enableStateMirror"] =
+        std::bind(&Interface::enableStateMirror, this, std::placeholders::_1);
     command_map["startSimulation"] =
         std::bind(&Interface::startSimulation, this);
     command_map["createProcessor"] = 
         std::bind(&Interface::createProcessor, this, std::placeholders::_1);
     command_map["createDAGTask"] =
         std::bind(&Interface::createDAGTask, this, std::placeholders::_1);
+    command_map["loadScenario"] =
+        std::bind(&Interface::loadScenario, this, std::placeholders::_1);
+    command_map["setStateStackLimit"] =
+        std::bind(&Interface::setStateStackLimit, this, std::placeholders::_1);
+    command_map["saveCheckpoint"] =
+        std::bind(&Interface::saveCheckpoint, this, std::placeholders::_1);
+    command_map["loadCheckpoint"] =
+        std::bind(&Interface::loadCheckpoint, this, std::placeholders::_1);
     command_map["createHeterSSTask"] =
         std::bind(&Interface::createNewHeterSSTask, this, std::placeholders::_1);
     command_map["setSimulationTimeBound"] =
         std::bind(&Interface::setSimulationTimeBound, this, std::placeholders::_1);
+    command_map["setHyperperiodTimeBound"] =
+        std::bind(&Interface::setHyperperiodTimeBound, this, std::placeholders::_1);
+    command_map["setSteadyStateDetection"] =
+        std::bind(&Interface::setSteadyStateDetection, this, std::placeholders::_1);
+    command_map["setTimeResolution"] =
+        std::bind(&Interface::setTimeResolution, this, std::placeholders::_1);
+    command_map["setTaskRelease"] =
+        std::bind(&Interface::setTaskRelease, this, std::placeholders::_1);
+    command_map["queryTaskRelease"] =
+        std::bind(&Interface::queryTaskRelease, this, std::placeholders::_1);
+    command_map["runPolicy"] =
+        std::bind(&Interface::runPolicy, this, std::placeholders::_1);
     command_map["queryTaskSegmentStates"] =
         std::bind(&Interface::queryTaskSegmentStates, this, std::placeholders::_1);
     command_map["queryTaskState"] = 
@@ -93,6 +223,110 @@ void Interface::initCommandMap() {
         std::bind(&Interface::setProcessorVariation, this, std::placeholders::_1);
     command_map["setProcessorParallelFactor"] =
         std::bind(&Interface::setProcessorParallelFactor, this, std::placeholders::_1);
+    command_map["setVariationSeed"] =
+        std::bind(&Interface::setVariationSeed, this, std::placeholders::_1);
+    command_map["setVariationDistribution"] =
+        std::bind(&Interface::setVariationDistribution, this, std::placeholders::_1);
+    command_map["setProtocol"] =
+        std::bind(&Interface::setProtocol, this, std::placeholders::_1);
+}
+
+void Interface::initOpcodeMap() {
+    auto flag = [](bool value) {BinaryReply reply; reply.push(value); return reply;};
+
+    opcode_map = {
+        {OP_QUERY_CURRENT_TIMESTAMP, [this](const std::vector<long long> &)
+            {BinaryReply reply; reply.push(simulator.queryOriginalTimeStamp()); return reply;}},
+        {OP_IS_SIMULATION_COMPLETED, [this, flag](const std::vector<long long> &)
+            {return flag(simulator.isSimulationCompleted());}},
+        {OP_DOES_TASK_MISS_DEADLINE, [this, flag](const std::vector<long long> &)
+            {return flag(simulator.doesTaskMissDeadline());}},
+        {OP_UPDATE_PROCESSOR_AND_TASK, [this](const std::vector<long long> & args)
+            {return advanceBinaryReply(simulator.updateProcessorAndTask(), args);}},
+        {OP_ADVANCE_UNTIL_DECISION, [this](const std::vector<long long> & args)
+            {return advanceBinaryReply(simulator.advanceUntilDecision(), args);}},
+        {OP_ADVANCE_UNTIL_EVENT, [this](const std::vector<long long> & args)
+            {return advanceBinaryReply(simulator.advanceUntilEvent(), args);}},
+        {OP_QUERY_PROCESSOR_STATE, [this](const std::vector<long long> & args)
+            {BinaryReply reply;
+             if (args.empty() || !processorStateValues(args[0], reply.values)) return BinaryReply("Invalid args!");
+             return reply;}},
+        {OP_QUERY_PROCESSOR_STATES, [this](const std::vector<long long> &)
+            {BinaryReply reply;
+             reply.values.reserve(4 * simulator.queryProcessorCount());
+             for (unsigned int i = 0; i < simulator.queryProcessorCount(); i++)
+                processorStateValues(i, reply.values);
+             return reply;}},
+        {OP_QUERY_TASK_STATE, [this](const std::vector<long long> & args)
+            {BinaryReply reply;
+             if (args.empty() || !taskStateValues(args[0], reply.values)) return BinaryReply("Invalid args!");
+             return reply;}},
+        {OP_QUERY_SS_TASK_STATES, [this](const std::vector<long long> & args)
+            {BinaryReply reply;
+             if (args.empty() || !ssTaskStateValues(args[0], reply.values)) return BinaryReply("Invalid args!");
+             return reply;}},
+        {OP_QUERY_TASK_EXECUTION_STATES, [this](const std::vector<long long> &)
+            {BinaryReply reply;
+             for (unsigned int i = 0; i < simulator.queryTaskCount(); i++)
+                reply.push(simulator.getTask(i).queryExecutedSegLength() * simulator.queryTimeScale());
+             return reply;}},
+        {OP_SCHEDULE_SEGMENT_ON_PROCESSOR, [this](const std::vector<long long> & args)
+            {if (args.size() < 3) return BinaryReply("Invalid args!");
+             return BinaryReply(scheduleSegment(args[0], args[1], args[2])?"Scheduled":"Schedule Error!");}},
+        {OP_CREATE_DAG_TASK, [this](const std::vector<long long> & args)
+            {return BinaryReply(createDAGTaskFromValues(args));}},
+        {OP_LOAD_SCENARIO, [this](const std::vector<long long> & args)
+            {return BinaryReply(loadScenarioFromValues(args));}},
+        {OP_PUSH_STATE, [this](const std::vector<long long> & args)
+            {return stateStackBinaryReply("pushState", args);}},
+        {OP_POP_STATE, [this](const std::vector<long long> & args)
+            {return stateStackBinaryReply("popState", args);}},
+        {OP_RESTORE_STATE, [this](const std::vector<long long> & args)
+            {return stateStackBinaryReply("restoreState", args);}},
+        {OP_SET_SIMULATION_TIME_BOUND, [this](const std::vector<long long> & args)
+            {if (args.empty()) return BinaryReply("Invalid args!");
+             simulator.setSimulationTimeBound(args[0]);
+             return BinaryReply("Set bound to " + std::to_string(args[0]));}},
+        {OP_START_SIMULATION, [this](const std::vector<long long> &)
+            {return BinaryReply(startSimulation());}},
+        {OP_RESET_SIMULATOR, [this](const std::vector<long long> &)
+            {return BinaryReply(resetSimulator());}},
+        {OP_QUERY_SNAPSHOT, [this](const std::vector<long long> &)
+            {BinaryReply reply; snapshotValues(reply.values); return reply;}},
+        {OP_QUERY_TICK_EVENTS, [this](const std::vector<long long> &)
+            {BinaryReply reply; tickEventValues(reply.values); return reply;}},
+        {OP_QUERY_TASK_VERSIONS, [this](const std::vector<long long> &)
+            {BinaryReply reply; taskVersionValues(reply.values); return reply;}},
+        {OP_QUERY_EXECUTION_HISTORY, [this](const std::vector<long long> & args)
+            {BinaryReply reply;
+             if (args.empty() || !executionHistoryValues(args[0], reply.values))
+                return BinaryReply("Invalid args!");
+             return reply;}},
+        {OP_QUERY_IDLE_PROCESSORS, [this](const std::vector<long long> & args)
+            {BinaryReply reply;
+             if (!idleProcessorValues(args.empty() ? -1 : args[0], reply.values))
+                return BinaryReply("Invalid args!");
+             return reply;}},
+    };
+}
+
+/**
+ * @param args "binary" or "text"
+ * @brief Switch the wire protocol, the reply is still sent in the old protocol.
+*/
+std::string Interface::setProtocol(const std::string & args) {
+    std::istringstream ss(args);
+    std::string mode;
+    ss >> mode;
+    if (mode == "binary") {
+        binaryProtocol = true;
+        return "Binary protocol enabled";
+    }
+    if (mode == "text") {
+        binaryProtocol = false;
+        return "Text protocol enabled";
+    }
+    return "Unknown protocol";
 }
 
 std::string Interface::startSimulation() {
@@ -100,6 +334,7 @@ std::string Interface::startSimulation() {
     int proc_count = getSimulator().queryProcessorCount();
     for (unsigned int i = 0; i < getSimulator().queryTaskCount(); i++)
         getSimulator().getTask(i).setMaxParallism(proc_count);
+    getSimulator().publishState();
     return "Initial Tasks Released";
 }
 
@@ -151,29 +386,123 @@ std::string Interface::createEmptyTasks(const std::string & args) {
  */
 std::string Interface::createDAGTask(const std::string & args) {
     std::istringstream ss(args);
-    std::string temp;
-    ss >> temp;
-    int period = std::stoi(temp);
-    ss >> temp;
-    int nodeNum = std::stoi(temp);
-    ss >> temp;
-    int edgeNum = std::stoi(temp);
+    std::vector<long long> values;
+    long long value;
+    while (ss >> value) values.push_back(value);
+    return createDAGTaskFromValues(values);
+}
+
+/**
+ * @param values <period> <node_num> <edge_num> <len0> <type0> ... <u1> <v1> ...
+ * @see createDAGTask
+ */
+std::string Interface::createDAGTaskFromValues(const std::vector<long long> & values) {
+    return createDAGTaskFromValues(values.data(), values.size());
+}
+
+/**
+ * @brief False unless the period and the node lengths of the createDAGTask values
+ * are multiples of the time scale, see Simulator::compressTimeBase
+*/
+bool Interface::fitsTimeScale(const long long * values, size_t size) {
+    long long scale = simulator.queryTimeScale();
+    if (scale == 1) return true;
+    if (size < 2 || values[0] % scale != 0) return false;
+    for (size_t index = 3; index < size && index < 3 + 2 * (size_t)std::max(values[1], 0LL); index += 2)
+        if (values[index] % scale != 0) return false;
+    return true;
+}
+
+std::string Interface::createDAGTaskFromValues(const long long * values, size_t size) {
+    if (size < 3 || !fitsTimeScale(values, size)) return "Invalid args!";
+    long long period = values[0];
+    long long nodeNum = values[1];
+    long long edgeNum = values[2];
+    // Missing trailing values read as 0, same as the former istringstream parser.
+    auto value = [values, size](size_t index) {return index < size ? values[index] : 0;};
 
     Task & task = simulator.createNewTask();
     task.setTaskPeriod(period);
     task.setTaskRelativeDeadline(period);
-    task.initStorage(nodeNum);
-    for (int i = 0; i < nodeNum; i++) {
-        int len, type;
-        ss >> len >> type;
-        task.createNewSegment(ProcessorAffinity_t(type), len);
+    task.initStorage(nodeNum > 0 ? nodeNum : 0);
+    size_t index = 3;
+    for (int i = 0; i < nodeNum; i++, index += 2)
+        task.createNewSegment(ProcessorAffinity_t(value(index+1)), value(index));
+    for (int i = 0; i < edgeNum; i++, index += 2)
+        task.setSegmentDependency(value(index), value(index+1));
+    if (simulator.queryTimeScale() > 1) task.compressTimeBase(simulator.queryTimeScale());
+    return "Created successfully";
+}
+
+/**
+ * @param args "<path> [compress]" of a scenario file, the raw int64 values of
+ * loadScenarioFromValues; "compress" divides the time base afterwards, see compressTimeBase
+ * @brief Load the processors and DAG tasks of a whole scenario at once.
+*/
+std::string Interface::loadScenario(const std::string & args) {
+    std::istringstream ss(args);
+    std::string path, option;
+    ss >> path >> option;
+    if (path.empty() || !(option.empty() || option == "compress")) return "Invalid args!";
+    std::string data;
+    if (!readBinaryFile(path, data)) return "Cannot open " + path;
+    if (data.size() % sizeof(long long) != 0) return "Invalid scenario!";
+    std::vector<long long> values(data.size() / sizeof(long long));
+    std::memcpy(values.data(), data.data(), data.size());
+    std::string result = loadScenarioFromValues(values);
+    if (result == "Scenario loaded" && !option.empty() && !simulator.compressTimeBase())
+        return "Scenario loaded, time base not compressed";
+    return result;
+}
+
+/**
+ * @param values <magic> <version> <type_num> <type0> <count0> ... <task_num> <task0> <task1> ...
+ * where every task is in the createDAGTask layout.
+ * @brief Same as the createProcessor / createDAGTask commands in this order.
+ * Nothing is created unless the whole scenario is valid.
+*/
+std::string Interface::loadScenarioFromValues(const std::vector<long long> & values) {
+    const std::string invalid = "Invalid scenario!";
+    size_t size = values.size();
+    if (size < 4 || values[0] != SCENARIO_MAGIC || values[1] != SCENARIO_VERSION)
+        return invalid;
+
+    size_t index = 2;
+    long long typeNum = values[index++];
+    if (typeNum < 0 || (unsigned long long)typeNum > (size - index) / 2) return invalid;
+    size_t processorBegin = index;
+    index += 2 * typeNum;
+    for (size_t i = processorBegin; i < index; i += 2)
+        if (values[i] < 0 || values[i] >= ProcessorAffinity_t::UNKNOWN || values[i+1] < 0)
+            return invalid;
+
+    if (index >= size) return invalid;
+    long long taskNum = values[index++];
+    if (taskNum < 0 || (unsigned long long)taskNum > (size - index) / 3) return invalid;
+    std::vector<size_t> taskBegin(taskNum);
+    for (long long i = 0; i < taskNum; i++) {
+        if (size - index < 3) return invalid;
+        long long nodeNum = values[index+1];
+        long long edgeNum = values[index+2];
+        size_t remaining = (size - index - 3) / 2;
+        if (nodeNum < 0 || edgeNum < 0 || (unsigned long long)nodeNum > remaining
+            || (unsigned long long)edgeNum > remaining - nodeNum) return invalid;
+        if (!fitsTimeScale(values.data() + index, 3 + 2 * nodeNum)) return invalid;
+        taskBegin[i] = index;
+        index += 3 + 2 * nodeNum;
+        for (long long j = 0; j < 2 * edgeNum; j++, index++)
+            if (values[index] < 0 || values[index] >= nodeNum) return invalid;
     }
-    for (int i = 0; i < edgeNum; i++) {
-        int u, v;
-        ss >> u >> v;
-        task.setSegmentDependency(u, v);
+    if (index != size) return invalid;
+
+    for (size_t i = processorBegin; i < processorBegin + 2 * typeNum; i += 2)
+        simulator.createNewProcessors(ProcessorAffinity_t(values[i]), values[i+1]);
+    simulator.reserveTasks(simulator.queryTaskCount() + taskNum);
+    for (long long i = 0; i < taskNum; i++) {
+        size_t end = (i + 1 < taskNum) ? taskBegin[i+1] : size;
+        createDAGTaskFromValues(values.data() + taskBegin[i], end - taskBegin[i]);
     }
-    return "Created successfully";
+    return "Scenario loaded";
 }
 
 std::string Interface::createNewHeterSSTask(const std::string & args) {
@@ -192,13 +521,18 @@ std::string Interface::createNewHeterSSTask(const std::string & args) {
         processorTypes.push_back(stringtoProcessorAffinity(temp));
     }
     std::vector<SegmentLength_t> segments = {};
+    TimeStamp_t scale = simulator.queryTimeScale();
+    bool fits = period % scale == 0;
     while (ss >> temp) {
         unsigned int segLength = std::stoi(temp);
+        fits = fits && segLength % scale == 0;
         segments.push_back(segLength);
     }
+    if (!fits) return "Invalid args!";
     Task & task = simulator.createNewHeterSSTaskWithVector(processorTypes, segments);
     task.setTaskPeriod(period);
     task.setTaskRelativeDeadline(period);
+    if (scale > 1) task.compressTimeBase(scale);
     return "Created successfully";
 }
 
@@ -208,6 +542,92 @@ std::string Interface::setSimulationTimeBound(const std::string & args) {
     return "Set bound to " + std::to_string(timeBound);
 }
 
+/**
+ * @param args "[count]" of hyperperiods, 1 by default
+ * @brief Bound the simulation to whole hyperperiods of the current tasks, after the largest release offset.
+*/
+std::string Interface::setHyperperiodTimeBound(const std::string & args) {
+    std::istringstream ss(args);
+    unsigned long long count = 1;
+    if (!(ss >> std::ws).eof() && !(ss >> count)) return "Invalid args!";
+    if (!simulator.setHyperperiodTimeBound(count)) return "Invalid args!";
+    return "Set bound to " + std::to_string(simulator.querySimulationTimeBound());
+}
+
+/**
+ * @param args "<0|1>"
+ * @brief Stop once the state after a release repeats, see Simulator::setSteadyStateDetection
+*/
+std::string Interface::setSteadyStateDetection(const std::string & args) {
+    std::istringstream ss(args);
+    int enabled = 0;
+    if (!(ss >> enabled) || (enabled != 0 && enabled != 1)) return "Invalid args!";
+    simulator.setSteadyStateDetection(enabled);
+    return "Set";
+}
+
+/**
+ * @param args "<resolution>", sub-ticks per time unit
+ * @brief Fixed-point segment lengths for fractional progress, see Simulator::setTimeResolution
+*/
+std::string Interface::setTimeResolution(const std::string & args) {
+    std::istringstream ss(args);
+    long long resolution = 0;
+    if (!(ss >> resolution) || resolution <= 0 || !simulator.setTimeResolution(resolution)) return "Invalid args!";
+    return "Set";
+}
+
+/**
+ * @param args "<task> <offset> [<jitter> [<slack>]]", in time units
+ * @brief First arrival, release jitter and sporadic slack of a task, see Simulator::setTaskRelease
+*/
+std::string Interface::setTaskRelease(const std::string & args) {
+    std::istringstream ss(args);
+    long long taskId = -1, offset = -1, jitter = 0, slack = 0;
+    if (!(ss >> taskId >> offset) || (!(ss >> std::ws).eof() && !(ss >> jitter))
+        || (!(ss >> std::ws).eof() && !(ss >> slack)) || !(ss >> std::ws).eof())
+        return "Invalid args!";
+    if (taskId < 0 || offset < 0 || jitter < 0 || slack < 0
+        || !simulator.setTaskRelease(taskId, offset, jitter, slack))
+        return "Invalid args!";
+    return "Set";
+}
+
+/**
+ * @param args "<task>"
+ * @return <offset> <jitter> <slack> <arrival> <next release>, the arrival of the
+ * current job and the next release in the calendar, in the original time units
+*/
+std::string Interface::queryTaskRelease(const std::string & args) {
+    int taskId = parseFirstInteger(args);
+    if (taskId < 0 || (unsigned int)taskId >= simulator.queryTaskCount()) return "Invalid args!";
+    Task & task = simulator.getTask(taskId);
+    TimeStamp_t scale = simulator.queryTimeScale();
+    return std::to_string(task.queryReleaseOffset() * scale) + " " + std::to_string(task.queryReleaseJitter())
+           + " " + std::to_string(task.querySporadicSlack()) + " " + std::to_string(task.queryJobArrival() * scale)
+           + " " + std::to_string(task.queryNextRelease() * scale);
+}
+
+/**
+ * @param args "<edf|rm|dm|fifo|dagedf>"
+ * @brief Schedule by a native policy until the bound or a missed deadline, see NativePolicy
+ * @return "<schedulable> <missTime> <time> <rounds> <scheduled> <preemptions>",
+ * missTime is -1 if schedulable
+*/
+std::string Interface::runPolicy(const std::string & args) {
+    std::istringstream ss(args);
+    std::string name;
+    ss >> name;
+    SchedulePolicy_t policy = NativePolicy::parsePolicy(name);
+    if (policy == POLICY_UNKNOWN) return "Invalid args!";
+    PolicyResult result = NativePolicy(simulator, policy).run();
+    TimeStamp_t scale = simulator.queryTimeScale();
+    return std::to_string(int(result.schedulable)) + " " +
+           (result.schedulable ? std::string("-1") : std::to_string(result.missTime * scale)) + " " +
+           std::to_string(result.endTime * scale) + " " + std::to_string(result.rounds) + " " +
+           std::to_string(result.scheduled) + " " + std::to_string(result.preemptions);
+}
+
 std::string Interface::queryProcessorStates() {
     std::string temp = "";
     for (unsigned int i = 0; i < simulator.queryProcessorCount(); i++) {
@@ -224,7 +644,9 @@ std::string Interface::queryProcessorStates() {
  * @return "<procType> <processorState>", 0-IDLE, 1-PREEMPTIVE, 2-NONPREEMPTIVE
 */
 std::string Interface::queryProcessorState(const std::string & args) {
-    unsigned int processorId = std::stoi(args);
+    int tmp = parseFirstInteger(args);
+    if (tmp < 0 || (unsigned int)tmp >= simulator.queryProcessorCount()) return "Invalid args!";
+    unsigned int processorId = (unsigned int)tmp;
     std::string res = "";
     res += std::to_string((int)simulator.getProcessor(processorId).queryProcessorType());
     res += " ";
@@ -245,16 +667,16 @@ std::string Interface::queryProcessorState(const std::string & args) {
  */
 std::string Interface::segmentStateHelperFunc(unsigned int taskId, unsigned int segmentId) {
     std::string result = "";
-    result += std::to_string(int(simulator.getTask(taskId).getSegment(segmentId).querySegmentProcessorAffinity()));
+    result += std::to_string(int(simulator.getTask(taskId).querySegmentProcessorAffinity(segmentId)));
     result += " ";
     int tmp = simulator.getTask(taskId).getSegment(segmentId).queryCurrentProcessorIndex();
     result += std::to_string(tmp>=999999?-1:tmp);
     result += " ";
     result += std::to_string(int(simulator.getTask(taskId).isSegmentReady(segmentId)));
     result += " ";
-    result += std::to_string(simulator.getTask(taskId).getSegment(segmentId).querySegmentLength());
+    result += std::to_string(simulator.getTask(taskId).querySegmentLength(segmentId) * simulator.queryTimeScale());
     result += " ";
-    result += std::to_string(simulator.getTask(taskId).getSegment(segmentId).querySegmentRemainLength());
+    result += std::to_string(simulator.getTask(taskId).getSegment(segmentId).querySegmentRemainLength() * simulator.queryTimeScale());
     result += " ";
     return result;
 }
@@ -305,24 +727,175 @@ std::string Interface::scheduleSegmentOnProcessor(const std::string & args) {
     ss >> temp;
     unsigned int segmentId = std::stoi(temp);
 
-    Task & task = simulator.getTask(taskId);
-    Segment * segment = &(simulator.getTask(taskId).getSegment(segmentId));
-    if (simulator.getTask(taskId).getSegment(segmentId).queryCurrentProcessorIndex()<999999)
-        return "Schedule Error!";
-    TimeStamp_t currentTime = simulator.queryCurrentTimeStamp();
-
-    if (simulator.getProcessor(procId).scheduleTaskSpecifiedSegment(task, segment, currentTime)) return "Scheduled";
+    if (scheduleSegment(procId, taskId, segmentId)) return "Scheduled";
     else return "Schedule Error!";
 
     return "Unknown Error";
 }
 
-std::string Interface::updateProcessorAndTask() {
-    int res = simulator.updateProcessorAndTask();
+bool Interface::scheduleSegment(unsigned int procId, unsigned int taskId, unsigned int segmentId) {
+    Task & task = simulator.getTask(taskId);
+    Segment * segment = &(task.getSegment(segmentId));
+    if (segment->queryCurrentProcessorIndex()<999999)
+        return false;
+    Task * preemptedTask = simulator.getProcessor(procId).getCurrentTask();
+    if (!simulator.scheduleSegmentOnProcessor(procId, task, segment))
+        return false;
+    if (preemptedTask && preemptedTask != &task) simulator.markTaskChanged(*preemptedTask);
+    simulator.markTaskChanged(task);
+    simulator.publishState();
+    return true;
+}
+
+/**
+ * @param args optional "1" to reply the events of this tick
+ * @return "<executed> executed. Updated to timestamp <time>", or
+ * "<executed> <time> <event0> <event1> ..." with the events
+ * @see queryTickEvents
+*/
+std::string Interface::updateProcessorAndTask(const std::string & args) {
+    return advanceReply(simulator.updateProcessorAndTask(), args);
+}
+
+/**
+ * @brief reply of the commands advancing the time, see updateProcessorAndTask
+ * @param args optional "1" to reply the events as well
+*/
+std::string Interface::advanceReply(long long executed, const std::string & args) {
     if (interactive && simulator.doesTaskMissDeadline())
         std::cerr << "Task miss deadline! Please Exit!\n";
-    return std::to_string(res) + " executed. Updated to timestamp " +
-           std::to_string(simulator.queryCurrentTimeStamp());
+    long long work = executed * (long long)simulator.queryTimeScale();
+    if (parseFirstInteger(args) > 0)
+        return std::to_string(work) + " " + std::to_string(simulator.queryOriginalTimeStamp()) +
+               " " + queryTickEvents();
+    return std::to_string(work) + " executed. Updated to timestamp " +
+           std::to_string(simulator.queryOriginalTimeStamp());
+}
+
+/**
+ * @brief binary counterpart of advanceReply
+ * @return <executed> <time>, followed by the events if args[0] is 1
+*/
+BinaryReply Interface::advanceBinaryReply(long long executed, const std::vector<long long> & args) {
+    BinaryReply reply;
+    reply.push(executed * (long long)simulator.queryTimeScale());
+    reply.push(simulator.queryOriginalTimeStamp());
+    if (!args.empty() && args[0]) tickEventValues(reply.values);
+    return reply;
+}
+
+/**
+ * @brief numeric counterpart of queryTickEvents
+ * @return <type> <index> <segment> per event
+*/
+void Interface::tickEventValues(std::vector<ReplyValue_t> & values) {
+    for (SimulationEvent & event: simulator.queryTickEvents()) {
+        values.push_back(event.type);
+        values.push_back(event.index);
+        values.push_back(event.segment);
+    }
+}
+
+/**
+ * @brief return the events of the last update
+ * @return <type> <index> <segment> ..., type 0-segment completed, 1-segment ready,
+ * 2-job released, 3-processor idle, 4-deadline missed
+ * @see SimulationEventType_t
+*/
+std::string Interface::queryTickEvents() {
+    std::string result = "";
+    for (SimulationEvent & event: simulator.queryTickEvents()) {
+        result += std::to_string(int(event.type)) + " " + std::to_string(event.index) + " " +
+                  std::to_string(event.segment) + " ";
+    }
+    return result;
+}
+
+/**
+ * @brief numeric counterpart of queryTaskVersions
+ * @return <version> <t0.version> <t1.version> ...
+*/
+void Interface::taskVersionValues(std::vector<ReplyValue_t> & values) {
+    values.push_back(simulator.queryStateVersion());
+    for (unsigned int i = 0; i < simulator.queryTaskCount(); i++)
+        values.push_back(simulator.getTask(i).queryStateVersion());
+}
+
+/**
+ * @brief return the current state version and the version of the last change of each task,
+ * the tasks newer than the version of a previous query have changed since then
+ * @return <version> <t0.version> <t1.version> ...
+*/
+std::string Interface::queryTaskVersions() {
+    std::string result = std::to_string(simulator.queryStateVersion()) + " ";
+    for (unsigned int i = 0; i < simulator.queryTaskCount(); i++)
+        result += std::to_string(simulator.getTask(i).queryStateVersion()) + " ";
+    return result;
+}
+
+/**
+ * @brief numeric counterpart of queryIdleProcessors
+*/
+bool Interface::idleProcessorValues(long long processorType, std::vector<ReplyValue_t> & values) {
+    if (processorType >= ProcessorAffinity_t::UNKNOWN) return false;
+    ProcessorType_t first = processorType < 0 ? CPU : (ProcessorType_t)processorType;
+    ProcessorType_t last = processorType < 0 ? (ProcessorType_t)(ProcessorAffinity_t::UNKNOWN - 1) : first;
+    for (unsigned int type = first; type <= last; type++) {
+        const std::vector<ProcessorIndex_t> & idle = simulator.queryIdleProcessors((ProcessorType_t)type);
+        if (processorType < 0) values.push_back(idle.size());
+        for (auto it = idle.rbegin(); it != idle.rend(); it++) values.push_back(*it);
+    }
+    return true;
+}
+
+/**
+ * @brief return the idle processors from the per-type idle lists, without scanning
+ * the processor states
+ * @param args optional processor type
+ * @return <proc0> <proc1> ... in ascending order for the given type; otherwise
+ * <count> <proc0> ... for every type from 0 (CPU) to 8 (FPGA)
+*/
+std::string Interface::queryIdleProcessors(const std::string & args) {
+    std::vector<ReplyValue_t> values;
+    std::istringstream ss(args);
+    long long processorType = -1;
+    if (!(ss >> processorType)) processorType = -1;
+    if (!idleProcessorValues(processorType, values)) return "Invalid args!";
+    std::string result = "";
+    for (ReplyValue_t value: values) result += std::to_string((long long)value) + " ";
+    return result;
+}
+
+/**
+ * @brief numeric counterpart of queryExecutionHistory
+*/
+bool Interface::executionHistoryValues(long long taskId, std::vector<ReplyValue_t> & values) {
+    if (taskId < 0 || taskId >= simulator.queryTaskCount()) return false;
+    Task & task = simulator.getTask(taskId);
+    for (SegmentIndex_t i = 0; i < task.querySegmentCount(); i++) {
+        for (const ExecutionInterval & interval: task.getSegment(i).queryExecutionHistory()) {
+            values.push_back(i);
+            values.push_back(interval.processor >= 999999 ? -1 : (ReplyValue_t)interval.processor);
+            values.push_back(interval.start * simulator.queryTimeScale());
+            values.push_back(interval.end * simulator.queryTimeScale());
+        }
+    }
+    return true;
+}
+
+/**
+ * @brief return the execution of the current job of a task as intervals, e.g. for
+ * response times and preemptions; the history is cleared at each release
+ * @param args the task index
+ * @return <segment> <processor> <start> <end> ..., the time units [start, end)
+ * executed on the processor without a break
+*/
+std::string Interface::queryExecutionHistory(const std::string & args) {
+    std::vector<ReplyValue_t> values;
+    if (!executionHistoryValues(parseFirstInteger(args), values)) return "Invalid args!";
+    std::string result = "";
+    for (ReplyValue_t value: values) result += std::to_string((long long)value) + " ";
+    return result;
 }
 
 /**
@@ -331,7 +904,7 @@ std::string Interface::updateProcessorAndTask() {
 std::string Interface::queryTaskExecutionStates() {
     std::string result = "";
     for (unsigned int i = 0; i < simulator.queryTaskCount(); i++)
-        result += (std::to_string(simulator.getTask(i).queryExecutedSegLength()) + " ");
+        result += (std::to_string(simulator.getTask(i).queryExecutedSegLength() * simulator.queryTimeScale()) + " ");
     return result;
 }
 
@@ -343,10 +916,10 @@ std::string Interface::queryTaskExecutionStates() {
  */
 std::string Interface::queryTaskState(const std::string & args) {
     int tmp = parseFirstInteger(args);
-    if (tmp < 0) return "Invalid args!";
+    if (tmp < 0 || (unsigned int)tmp >= simulator.queryTaskCount()) return "Invalid args!";
     unsigned int taskId = (unsigned int)tmp;
     std::string result = "";
-    result += std::to_string(simulator.getTask(taskId).queryTaskPeriod());
+    result += std::to_string(simulator.getTask(taskId).queryTaskPeriod() * simulator.queryTimeScale());
     result += " ";
     result += queryTaskSegmentStates(args);
     return result;
@@ -376,9 +949,9 @@ std::string Interface::querySSTaskSegmentStates(const std::string & args) {
 
     std::string result = "";
     for (unsigned int i = 0 ; i < simulator.getTask(taskId).querySegmentCount(); i++) {
-        result += std::to_string(int(simulator.getTask(taskId).getSegment(i).querySegmentProcessorAffinity()));
+        result += std::to_string(int(simulator.getTask(taskId).querySegmentProcessorAffinity(i)));
         result += " ";
-        result += std::to_string(simulator.getTask(taskId).getSegment(i).querySegmentLength());
+        result += std::to_string(simulator.getTask(taskId).querySegmentLength(i) * simulator.queryTimeScale());
         result += " ";
     }
     return result;
@@ -390,11 +963,11 @@ std::string Interface::querySSTaskSegmentStates(const std::string & args) {
 */
 std::string Interface::querySSTaskStates(const std::string & args) {
     int tmp = parseFirstInteger(args);
-    if (tmp < 0) return "Invalid args!";
+    if (tmp < 0 || (unsigned int)tmp >= simulator.queryTaskCount()) return "Invalid args!";
     unsigned int taskId = (unsigned int)tmp;
 
     std::string result = "";
-    result += std::to_string(simulator.getTask(taskId).queryTaskPeriod());
+    result += std::to_string(simulator.getTask(taskId).queryTaskPeriod() * simulator.queryTimeScale());
     result += " ";
     auto * segPtr = simulator.getTask(taskId).getFirstReadySegment();
     if (!segPtr) result +="-1 -1 0 ";
@@ -405,7 +978,7 @@ std::string Interface::querySSTaskStates(const std::string & args) {
         tmp = (tmp>=99999)?-1:tmp;
         result += std::to_string(tmp);
         result += " ";
-        result += std::to_string(segPtr->querySegmentRemainLength());
+        result += std::to_string(segPtr->querySegmentRemainLength() * simulator.queryTimeScale());
         result += " ";
     }
     return result + querySSTaskSegmentStates(args);
@@ -413,9 +986,119 @@ std::string Interface::querySSTaskStates(const std::string & args) {
 
 std::string Interface::resetSimulator() {
     bool res = simulator.resetSimulator();
+    simulator.publishState();
     return res?"Success":"Reset Error!";
 }
 
+/**
+ * @brief Drop the processors, tasks and state mirror, e.g. before the next run
+ * of a pooled backend.
+*/
+std::string Interface::clearSimulator() {
+    simulator.clearSimulator();
+    return "Cleared";
+}
+
+/**
+ * @brief Capabilities of this build, queried once by the clients.
+ * @return "<unit: int|float> <protocol version> <processor type count> <command> ..."
+*/
+std::string Interface::queryBuildInfo() {
+    std::vector<std::string> commands;
+    for (auto & command: command_map) commands.push_back(command.first);
+    std::sort(commands.begin(), commands.end());
+    // int64 values in every session, the sub-tick resolution is chosen per session
+    std::string res = (REPLY_NUMERIC == REPLY_FLOAT64) ? "float" : "int";
+    res += " " + std::to_string(PROTOCOL_VERSION) + " " + std::to_string(ProcessorAffinity_t::UNKNOWN);
+    for (std::string & command: commands) res += " " + command;
+    return res;
+}
+
+/**
+ * @param args "<path>", e.g. a file under /dev/shm
+ * @brief Mirror the simulator state into the memory-mapped file
+ * @see StateMirror for the layout
+*/
+std::string Interface::enableStateMirror(const std::string & args) {
+    std::istringstream ss(args);
+    std::string path;
+    ss >> path;
+    if (path.empty()) return "Invalid args!";
+    return simulator.enableStateMirror(path) ? "Mirror enabled" : "Mirror Error!";
+}
+
+std::vector<long long> Interface::stateStackValues(const std::string & command, long long id) {
+    auto begin = std::chrono::steady_clock::now();
+    unsigned long long stateId = id;
+    bool done = false;
+    if (command == "pushState") {
+        stateId = simulator.pushState();
+        done = true;
+    }
+    else if (command == "popState") done = simulator.popState(stateId);
+    else if (command == "restoreState") done = id >= 0 && simulator.restoreState(id);
+    long long elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - begin).count();
+    if (!done) return {};
+    if (command == "pushState") return {(long long)stateId, (long long)simulator.queryStateBytes(stateId), elapsed};
+    return {(long long)stateId, elapsed};
+}
+
+std::string Interface::stateStackReply(const std::string & command, const std::string & args) {
+    std::vector<long long> values = stateStackValues(command, parseFirstInteger(args));
+    if (values.empty()) return "No such state!";
+    std::string result = "";
+    for (long long value: values) result += std::to_string(value) + " ";
+    return result;
+}
+
+BinaryReply Interface::stateStackBinaryReply(const std::string & command, const std::vector<long long> & args) {
+    std::vector<long long> values = stateStackValues(command, args.empty() ? 0 : args[0]);
+    if (values.empty()) return BinaryReply("No such state!");
+    BinaryReply reply;
+    for (long long value: values) reply.push(value);
+    return reply;
+}
+
+/**
+ * @param args "<depth> <bytes>"
+ * @brief Bound the snapshots of pushState, the oldest are dropped beyond either limit
+*/
+std::string Interface::setStateStackLimit(const std::string & args) {
+    std::istringstream ss(args);
+    long long depth = 0, bytes = 0;
+    if (!(ss >> depth >> bytes) || depth <= 0 || bytes < 0) return "Invalid args!";
+    simulator.setStateStackLimit(depth, bytes);
+    return "Set state stack limit to " + std::to_string(depth) + " " + std::to_string(bytes);
+}
+
+/**
+ * @param args "<path>"
+ * @brief Write the complete simulator state to the file, see Simulator::saveCheckpoint
+*/
+std::string Interface::saveCheckpoint(const std::string & args) {
+    std::istringstream ss(args);
+    std::string path;
+    ss >> path;
+    if (path.empty()) return "Invalid args!";
+    if (!writeBinaryFile(path, simulator.saveCheckpoint())) return "Cannot write " + path;
+    return "Checkpoint saved";
+}
+
+/**
+ * @param args "<path>" of a saveCheckpoint file
+ * @brief Continue from the saved state, the current one is replaced
+*/
+std::string Interface::loadCheckpoint(const std::string & args) {
+    std::istringstream ss(args);
+    std::string path;
+    ss >> path;
+    if (path.empty()) return "Invalid args!";
+    std::string data;
+    if (!readBinaryFile(path, data)) return "Cannot open " + path;
+    return simulator.loadCheckpoint(data) ? "Checkpoint loaded" : "Invalid checkpoint!";
+}
+
 std::string Interface::setProcessorVariation(const std::string & args) {
     std::istringstream ss(args);
     std::string temp;
@@ -438,3 +1121,155 @@ std::string Interface::setProcessorParallelFactor(const std::string & args) {
     simulator.setProcessorParallelFactor(procType, factor);
     return "Set";
 }
+
+/**
+ * @param args "<seed>"
+ * @brief Seed the execution variation, the same seed gives the same runs
+*/
+std::string Interface::setVariationSeed(const std::string & args) {
+    std::istringstream ss(args);
+    unsigned long long seed = 0;
+    if (!(ss >> seed)) return "Invalid args!";
+    simulator.getExecutionVariation().setSeed(seed);
+    return "Set";
+}
+
+/**
+ * @param args "<segment|job> <distribution> <parameters>", distribution one of
+ * none, uniform <low> <high>, normal <mean> <stddev> <low> <high>,
+ * lognormal <mu> <sigma> <low> <high>, histogram <value0> <weight0> ...
+ * @brief Draw the factor of the execution time of each segment (or of all the
+ * segments of a job) at every release, see ExecutionVariation
+*/
+std::string Interface::setVariationDistribution(const std::string & args) {
+    std::istringstream ss(args);
+    std::string scopeName, distributionName;
+    ss >> scopeName >> distributionName;
+    if (scopeName != "segment" && scopeName != "job") return "Invalid args!";
+    auto name = std::find(std::begin(VariationDistributionNames), std::end(VariationDistributionNames),
+                          distributionName);
+    if (name == std::end(VariationDistributionNames)) return "Invalid args!";
+    std::vector<double> parameters;
+    double value;
+    while (ss >> value) parameters.push_back(value);
+    if (!ss.eof()) return "Invalid args!";
+    VariationScope_t scope = scopeName == "job" ? PER_JOB : PER_SEGMENT;
+    VariationDistribution_t distribution =
+        (VariationDistribution_t)(name - std::begin(VariationDistributionNames));
+    if (!simulator.getExecutionVariation().setDistribution(scope, distribution, parameters))
+        return "Invalid args!";
+    return "Set";
+}
+
+/**
+ * @brief numeric counterpart of queryProcessorState
+ * @return <procType> <processorState> <taskIndex> <segIndex>
+*/
+bool Interface::processorStateValues(long long procId, std::vector<ReplyValue_t> & values) {
+    if (procId < 0 || procId >= simulator.queryProcessorCount()) return false;
+    Processor & processor = simulator.getProcessor(procId);
+    values.push_back(processor.queryProcessorType());
+    values.push_back(processor.queryProcessorState());
+    if (processor.queryProcessorState() != IDLE) {
+        values.push_back(processor.getCurrentTask()->queryTaskIndex());
+        values.push_back(processor.getCurrentSegment()->querySegmentIndex());
+    } else {
+        values.push_back(0);
+        values.push_back(0);
+    }
+    return true;
+}
+
+/**
+ * @brief numeric counterpart of segmentStateHelperFunc
+ * @return <affinity> <currentProcessor> <isSegmentReady> <length> <remainLength>
+*/
+void Interface::segmentStateValues(unsigned int taskId, unsigned int segId, std::vector<ReplyValue_t> & values) {
+    Task & task = simulator.getTask(taskId);
+    Segment & segment = task.getSegment(segId);
+    values.push_back(task.querySegmentProcessorAffinity(segId));
+    int tmp = segment.queryCurrentProcessorIndex();
+    values.push_back(tmp>=999999?-1:tmp);
+    values.push_back(task.isSegmentReady(segId));
+    values.push_back(task.querySegmentLength(segId) * simulator.queryTimeScale());
+    values.push_back(segment.querySegmentRemainLength() * simulator.queryTimeScale());
+}
+
+/**
+ * @brief numeric counterpart of queryTaskState
+ * @return <period> <s0.affinity> <s0.currentProcessor> ... <s1.affinity> ...
+*/
+bool Interface::taskStateValues(long long taskId, std::vector<ReplyValue_t> & values) {
+    if (taskId < 0 || taskId >= simulator.queryTaskCount()) return false;
+    Task & task = simulator.getTask(taskId);
+    values.reserve(values.size() + 1 + 5 * task.querySegmentCount());
+    values.push_back(task.queryTaskPeriod() * simulator.queryTimeScale());
+    for (unsigned int i = 0; i < task.querySegmentCount(); i++)
+        segmentStateValues(taskId, i, values);
+    return true;
+}
+
+/**
+ * @brief numeric counterpart of querySSTaskStates
+ * @return <period> <readySegIndex> <currentProcessor> <remainLength> <s0> <s1> ...
+*/
+bool Interface::ssTaskStateValues(long long taskId, std::vector<ReplyValue_t> & values) {
+    if (taskId < 0 || taskId >= simulator.queryTaskCount()) return false;
+    Task & task = simulator.getTask(taskId);
+    values.push_back(task.queryTaskPeriod() * simulator.queryTimeScale());
+    auto * segPtr = task.getFirstReadySegment();
+    if (!segPtr) {
+        values.push_back(-1);
+        values.push_back(-1);
+        values.push_back(0);
+    } else {
+        values.push_back(segPtr->querySegmentIndex());
+        int tmp = segPtr->queryCurrentProcessorIndex();
+        values.push_back((tmp>=99999)?-1:tmp);
+        values.push_back(segPtr->querySegmentRemainLength() * simulator.queryTimeScale());
+    }
+    for (unsigned int i = 0 ; i < task.querySegmentCount(); i++) {
+        values.push_back(task.querySegmentProcessorAffinity(i));
+        values.push_back(task.querySegmentLength(i) * simulator.queryTimeScale());
+    }
+    return true;
+}
+
+/**
+ * @brief return the whole simulator state in one reply
+ * @return <timestamp> <procCount> <segCount> <p0> <p1> ... <s0> <s1> ...
+ * @note p: <procType> <processorState> <taskIndex> <segIndex>,
+ * s: <taskId> <segId> <affinity> <currentProcessor> <isSegmentReady> <length> <remainLength> <period>
+*/
+std::string Interface::querySnapshot() {
+    std::vector<ReplyValue_t> values;
+    snapshotValues(values);
+    std::string result = "";
+    for (ReplyValue_t & value : values) {
+        result += std::to_string(value);
+        result += " ";
+    }
+    return result;
+}
+
+void Interface::snapshotValues(std::vector<ReplyValue_t> & values) {
+    unsigned int segmentCount = 0;
+    for (unsigned int i = 0; i < simulator.queryTaskCount(); i++)
+        segmentCount += simulator.getTask(i).querySegmentCount();
+    values.reserve(3 + 4 * simulator.queryProcessorCount() + 8 * segmentCount);
+
+    values.push_back(simulator.queryOriginalTimeStamp());
+    values.push_back(simulator.queryProcessorCount());
+    values.push_back(segmentCount);
+    for (unsigned int i = 0; i < simulator.queryProcessorCount(); i++)
+        processorStateValues(i, values);
+    for (unsigned int i = 0; i < simulator.queryTaskCount(); i++) {
+        Task & task = simulator.getTask(i);
+        for (unsigned int j = 0; j < task.querySegmentCount(); j++) {
+            values.push_back(i);
+            values.push_back(j);
+            segmentStateValues(i, j, values);
+            values.push_back(task.queryTaskPeriod() * simulator.queryTimeScale());
+        }
+    }
+}
@@ -7,7 +7,9 @@ Copy Right. The EHPCL Authors.
 
 #include <unordered_map>
 #include <functional>
+#include <iostream>
 #include "simulator.h"
+#include "protocol.h"
 
 class Interface {
 
@@ -22,12 +24,42 @@ class Interface {
 
     bool interactive = false;
 
+    // Set after a successful "setProtocol binary" handshake.
+    bool binaryProtocol = false;
+
+    // Between "beginBatch" and "endBatch" the replies are not flushed one by one.
+    bool batchMode = false;
+
+    std::unordered_map<uint32_t, std::function<protocol::BinaryReply(const std::vector<long long>&)>>
+        opcode_map;
+
+    // stdin / stdout unless serving a connection, see readCommands(input, output)
+    std::istream * input = &std::cin;
+
+    std::ostream * output = &std::cout;
+
 public:
 
     bool readCommands();
 
+    /**
+     * @brief Serve the commands of one connection, e.g. a socket of the server mode.
+     * @return True when the connection quits or ends.
+    */
+    bool readCommands(std::istream & input, std::ostream & output);
+
+    bool hasQuit() {return quitFlag;};
+
     std::string processCommand(const std::string & command);
 
+    /**
+     * @brief Read one binary frame from stdin and write its reply frame.
+     * @return False on end of input.
+    */
+    bool readBinaryCommand();
+
+    protocol::BinaryReply processBinaryCommand(uint32_t opcode, const std::string & payload);
+
     Simulator & getSimulator() {return simulator;};
 
     Interface();
@@ -36,6 +68,10 @@ public:
 
     void initCommandMap();
 
+    void initOpcodeMap();
+
+    std::string setProtocol(const std::string & args);
+
     ProcessorAffinity_t stringtoProcessorAffinity(const std::string & processorAffinity);
 
     std::string startSimulation();
@@ -44,16 +80,41 @@ public:
 
     std::string createDAGTask(const std::string & args);
 
+    std::string createDAGTaskFromValues(const std::vector<long long> & values);
+
+    std::string createDAGTaskFromValues(const long long * values, size_t size);
+    bool fitsTimeScale(const long long * values, size_t size);
+
+    std::string loadScenario(const std::string & args);
+
+    std::string loadScenarioFromValues(const std::vector<long long> & values);
+
     std::string createNewHeterSSTask(const std::string & args);
 
     std::string createEmptyTasks(const std::string & args);
 
     std::string setSimulationTimeBound(const std::string & args);
 
+    std::string setHyperperiodTimeBound(const std::string & args);
+
+    std::string setSteadyStateDetection(const std::string & args);
+
+    std::string setTimeResolution(const std::string & args);
+
+    std::string setTaskRelease(const std::string & args);
+
+    std::string queryTaskRelease(const std::string & args);
+
+    std::string runPolicy(const std::string & args);
+
     std::string setProcessorVariation(const std::string & args);
 
     std::string setProcessorParallelFactor(const std::string & args);
 
+    std::string setVariationSeed(const std::string & args);
+
+    std::string setVariationDistribution(const std::string & args);
+
     std::string queryProcessorStates();
 
     std::string queryProcessorState(const std::string & args);
@@ -74,12 +135,85 @@ public:
 
     std::string scheduleSegmentOnProcessor(const std::string & args);
 
-    std::string updateProcessorAndTask();
+    bool scheduleSegment(unsigned int procId, unsigned int taskId, unsigned int segmentId);
+
+    /**
+     * @return False if there is no such processor
+    */
+    bool processorStateValues(long long procId, std::vector<protocol::ReplyValue_t> & values);
+
+    void segmentStateValues(unsigned int taskId, unsigned int segId, std::vector<protocol::ReplyValue_t> & values);
+
+    /**
+     * @return <period> and the segment states, false if there is no such task
+    */
+    bool taskStateValues(long long taskId, std::vector<protocol::ReplyValue_t> & values);
+
+    /**
+     * @return False if there is no such task
+    */
+    bool ssTaskStateValues(long long taskId, std::vector<protocol::ReplyValue_t> & values);
+
+    std::string querySnapshot();
+
+    void snapshotValues(std::vector<protocol::ReplyValue_t> & values);
+
+    std::string updateProcessorAndTask(const std::string & args);
+
+    std::string advanceReply(long long executed, const std::string & args);
+
+    protocol::BinaryReply advanceBinaryReply(long long executed, const std::vector<long long> & args);
+
+    void tickEventValues(std::vector<protocol::ReplyValue_t> & values);
+
+    std::string queryTickEvents();
+
+    void taskVersionValues(std::vector<protocol::ReplyValue_t> & values);
+
+    std::string queryTaskVersions();
+
+    /**
+     * @param processorType the type, or negative for all the types
+     * @return False if the type is invalid
+    */
+    bool idleProcessorValues(long long processorType, std::vector<protocol::ReplyValue_t> & values);
+
+    std::string queryIdleProcessors(const std::string & args);
+
+    /**
+     * @return <segment> <processor> <start> <end> per interval, false if there is no such task
+    */
+    bool executionHistoryValues(long long taskId, std::vector<protocol::ReplyValue_t> & values);
+
+    std::string queryExecutionHistory(const std::string & args);
 
     int parseFirstInteger(const std::string & args);
 
     std::string resetSimulator();
 
+    std::string clearSimulator();
+
+    std::string queryBuildInfo();
+
+    std::string enableStateMirror(const std::string & args);
+
+    /**
+     * @param command "pushState", "popState" or "restoreState <id>"
+     * @return pushState: <id> <bytes> <nanoseconds>, popState / restoreState:
+     * <id> <nanoseconds>; empty if there is no such state
+    */
+    std::vector<long long> stateStackValues(const std::string & command, long long id = 0);
+
+    std::string stateStackReply(const std::string & command, const std::string & args);
+
+    protocol::BinaryReply stateStackBinaryReply(const std::string & command, const std::vector<long long> & args);
+
+    std::string setStateStackLimit(const std::string & args);
+
+    std::string saveCheckpoint(const std::string & args);
+
+    std::string loadCheckpoint(const std::string & args);
+
 };
 
 #endif // interface.h
\ No newline at end of file
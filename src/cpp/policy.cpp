@@ -0,0 +1,184 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <algorithm>
+#include <cmath>
+#include <tuple>
+
+#include "policy.h"
+
+SchedulePolicy_t NativePolicy::parsePolicy(const std::string & name) {
+    for (unsigned int i = 0; i < POLICY_UNKNOWN; i++)
+        if (SchedulePolicyNames[i] == name) return SchedulePolicy_t(i);
+    return POLICY_UNKNOWN;
+}
+
+long long NativePolicy::queryUrgency(Task & task) {
+    switch (policy) {
+        case POLICY_EDF:
+            return task.queryTaskAbsoluteDeadline();
+        case POLICY_RM:
+            return task.queryTaskPeriod();
+        case POLICY_DM:
+            return task.queryTaskRelativeDeadline();
+        default:
+            return -(long long)task.queryTaskRTPriority();
+    }
+}
+
+bool NativePolicy::scheduleSegment(ProcessorIndex_t processorId, Task & task, SegmentIndex_t segmentId) {
+    Segment * segment = &(task.getSegment(segmentId));
+    if (segment->queryCurrentProcessorIndex() < 999999) return false;
+    Task * preemptedTask = simulator.getProcessor(processorId).getCurrentTask();
+    if (!simulator.scheduleSegmentOnProcessor(processorId, task, segment)) return false;
+    if (preemptedTask) {
+        result.preemptions++;
+        if (preemptedTask != &task) simulator.markTaskChanged(*preemptedTask);
+    }
+    simulator.markTaskChanged(task);
+    result.scheduled++;
+    return true;
+}
+
+bool NativePolicy::scheduleOnProcessor(ProcessorIndex_t processorId, const std::vector<TaskIndex_t> & order) {
+    Processor & processor = simulator.getProcessor(processorId);
+    Task * runningTask = processor.getCurrentTask();
+    for (TaskIndex_t i: order) {
+        Task & task = simulator.getTask(i);
+        // the order is by urgency, no later task preempts either
+        if (runningTask && queryUrgency(*runningTask) <= queryUrgency(task)) return false;
+        for (SegmentIndex_t k: task.getReadySegments()) {
+            Segment & segment = task.getSegment(k);
+            if (task.querySegmentProcessorAffinity(k) != processor.queryProcessorType()) continue;
+            if (segment.querySegmentRemainLength() <= 0 || segment.queryCurrentProcessorIndex() < 999999) continue;
+            return scheduleSegment(processorId, task, k);
+        }
+    }
+    return false;
+}
+
+void NativePolicy::makePriorityDecisions() {
+    std::vector<TaskIndex_t> order(simulator.queryTaskCount());
+    for (TaskIndex_t i = 0; i < order.size(); i++) order[i] = i;
+    std::stable_sort(order.begin(), order.end(), [this](TaskIndex_t a, TaskIndex_t b)
+        {return queryUrgency(simulator.getTask(a)) < queryUrgency(simulator.getTask(b));});
+
+    if (policy == POLICY_FIFO) {
+        // the idle processors first, then the preemptions
+        for (ProcessorIndex_t i = 0; i < simulator.queryProcessorCount(); i++)
+            if (simulator.queryProcessorState(i) == IDLE) scheduleOnProcessor(i, order);
+        for (ProcessorIndex_t i = 0; i < simulator.queryProcessorCount(); i++)
+            if (simulator.queryProcessorState(i) == BUSY_PREEMPTIVE) scheduleOnProcessor(i, order);
+        return;
+    }
+    for (ProcessorIndex_t i = 0; i < simulator.queryProcessorCount(); i++)
+        if (simulator.queryProcessorState(i) < BUSY_NONPREEMPTIVE) scheduleOnProcessor(i, order);
+}
+
+void NativePolicy::initializePreDeadlines() {
+    preDeadlines.assign(simulator.queryTaskCount(), {});
+    std::vector<unsigned int> preceding, following;
+    for (TaskIndex_t i = 0; i < simulator.queryTaskCount(); i++) {
+        Task & task = simulator.getTask(i);
+        task.queryPathSegmentCounts(preceding, following);
+        double period = task.queryTaskPeriod() * simulator.queryTimeScale();
+        for (SegmentIndex_t j = 0; j < task.querySegmentCount(); j++) {
+            // rounded to 3 decimals as in dagedf.py, the ties go to the lower index
+            double deadline = period / (preceding[j] + following[j] + 1) * (preceding[j] + 1);
+            preDeadlines[i].push_back(std::round(deadline * 1000) / 1000);
+        }
+    }
+}
+
+void NativePolicy::makeDAGDecisions() {
+    std::vector<std::tuple<double, TaskIndex_t, SegmentIndex_t>> queue;
+    for (unsigned int type = 0; type < ProcessorAffinity_t::UNKNOWN; type++) {
+        if (lockedTypes[type]) continue;
+        size_t idleCount = simulator.queryIdleProcessors(ProcessorType_t(type)).size();
+        if (idleCount == 0) continue;
+
+        // unstarted ready segments of the type by the pre-deadline of the current job
+        queue.clear();
+        for (TaskIndex_t i = 0; i < simulator.queryTaskCount(); i++) {
+            Task & task = simulator.getTask(i);
+            double release = task.queryJobArrival() * simulator.queryTimeScale();
+            for (SegmentIndex_t k: task.getReadySegments()) {
+                Segment & segment = task.getSegment(k);
+                if (task.querySegmentProcessorAffinity(k) != type) continue;
+                if (segment.querySegmentRemainLength() == 0) continue;
+                if (segment.querySegmentRemainLength() != task.querySegmentLength(k)) continue;
+                queue.emplace_back(preDeadlines[i][k] + release, i, k);
+            }
+        }
+        std::sort(queue.begin(), queue.end());
+
+        for (size_t c = 0; c < idleCount; c++) {
+            if (c >= queue.size()) {
+                lockedTypes[type] = true;
+                break;
+            }
+            scheduleSegment(simulator.queryIdleProcessor(ProcessorType_t(type)),
+                            simulator.getTask(std::get<1>(queue[c])), std::get<2>(queue[c]));
+        }
+    }
+}
+
+unsigned int NativePolicy::queryIdleProcessorCount() {
+    unsigned int count = 0;
+    for (unsigned int type = 0; type < ProcessorAffinity_t::UNKNOWN; type++)
+        count += simulator.queryIdleProcessors(ProcessorType_t(type)).size();
+    return count;
+}
+
+void NativePolicy::unlockTypes(unsigned int idleBefore) {
+    std::vector<bool> unlocked(ProcessorAffinity_t::UNKNOWN, queryIdleProcessorCount() > idleBefore);
+    std::vector<bool> released(simulator.queryTaskCount(), false);
+    bool anyReleased = false;
+    for (SimulationEvent & event: simulator.queryTickEvents())
+        if (event.type == JOB_RELEASED) released[event.index] = anyReleased = true;
+    for (SimulationEvent & event: simulator.queryTickEvents())
+        if (event.type == SEGMENT_READY && !released[event.index])
+            unlocked[simulator.getTask(event.index).querySegmentProcessorAffinity(event.segment)] = true;
+    // as dagenv.py, a release unlocks the types of the processors in order, up to the
+    // first type already unlocked
+    if (anyReleased) {
+        std::vector<bool> present(ProcessorAffinity_t::UNKNOWN, false);
+        for (ProcessorIndex_t i = 0; i < simulator.queryProcessorCount(); i++)
+            present[simulator.getProcessor(i).queryProcessorType()] = true;
+        for (unsigned int type = 0; type < ProcessorAffinity_t::UNKNOWN; type++) {
+            if (!present[type]) continue;
+            if (unlocked[type]) break;
+            unlocked[type] = true;
+        }
+    }
+    for (unsigned int type = 0; type < ProcessorAffinity_t::UNKNOWN; type++)
+        if (unlocked[type]) lockedTypes[type] = false;
+}
+
+PolicyResult NativePolicy::run() {
+    result = PolicyResult();
+    simulator.checkTaskRelease();
+    if (policy == POLICY_DAG_EDF) {
+        initializePreDeadlines();
+        lockedTypes.assign(ProcessorAffinity_t::UNKNOWN, false);
+    }
+    while (!simulator.isSimulationCompleted() && !simulator.doesTaskMissDeadline()) {
+        result.rounds++;
+        if (policy == POLICY_DAG_EDF) {
+            makeDAGDecisions();
+            // the locks decide the coming schedule as well
+            simulator.setPolicyState(std::vector<unsigned char>(lockedTypes.begin(), lockedTypes.end()));
+        } else makePriorityDecisions();
+        // the decisions only change with an event, skip the ticks in between
+        unsigned int idleBefore = queryIdleProcessorCount();
+        simulator.advanceUntilEvent();
+        if (policy == POLICY_DAG_EDF) unlockTypes(idleBefore);
+    }
+    simulator.setPolicyState({});
+    simulator.publishState();
+    result.schedulable = !simulator.doesTaskMissDeadline();
+    result.endTime = simulator.queryCurrentTimeStamp();
+    if (!result.schedulable) result.missTime = result.endTime;
+    return result;
+}
@@ -0,0 +1,115 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef POLICY_H
+#define POLICY_H
+
+#include <string>
+#include <vector>
+
+#include "simulator.h"
+
+namespace policy {
+
+enum SchedulePolicy_t {
+    POLICY_EDF,
+    POLICY_RM,
+    POLICY_DM,
+    POLICY_FIFO,
+    POLICY_DAG_EDF,
+    POLICY_UNKNOWN
+};
+
+const std::string SchedulePolicyNames[5] = {
+    "edf",
+    "rm",
+    "dm",
+    "fifo",
+    "dagedf",
+};
+
+/// @brief Outcome of NativePolicy::run, the times in the simulated time units.
+struct PolicyResult {
+    bool schedulable = true;
+    // Time stamp of the first missed deadline, only set if not schedulable.
+    TimeStamp_t missTime = 0;
+    TimeStamp_t endTime = 0;
+    // Decision rounds, scheduled segments and the preempted ones among them.
+    unsigned long long rounds = 0;
+    unsigned long long scheduled = 0;
+    unsigned long long preemptions = 0;
+};
+
+};
+
+using namespace policy;
+
+/**
+ * @brief Scheduling policies running inside the backend, with the same decisions as
+ * the Python schedulers driving a client.
+ *
+ * edf (global EDF by absolute deadline), rm (by period) and dm (by relative deadline)
+ * are the policies of app/benchmark: the processors are visited in index order, an
+ * idle one takes the first ready segment of the most urgent task, a preemptive busy
+ * one is preempted by a strictly more urgent task; ties go to the lower task index.
+ * fifo is Scheduler::makeScheduleDecisions: the idle processors first, then the
+ * preemptions by a strictly higher RT priority.
+ *
+ * dagedf is the non-preemptive DAG EDF of app/RL-ViT/dagedf.py: every segment gets
+ * the pre-deadline period / (p + f + 1) * (p + 1) after its job arrival, where p and
+ * f are the segments before and after it on its longest path. The idle processors of
+ * a type take the unstarted ready segments of that type by pre-deadline; a type with
+ * no such segment left is locked until a processor turns idle, a segment of the type
+ * turns ready or a job is released, as in app/RL-ViT/dagenv.py.
+*/
+class NativePolicy {
+
+    Simulator & simulator;
+
+    SchedulePolicy_t policy;
+
+    PolicyResult result;
+
+    // dagedf: pre-deadline of every segment relative to its job arrival, original units
+    std::vector<std::vector<double>> preDeadlines = {};
+    // dagedf: types skipped until unlocked by an event
+    std::vector<bool> lockedTypes = {};
+
+    /// @brief Smaller is more urgent, the task index breaks the ties.
+    long long queryUrgency(Task & task);
+
+    /// @brief Same as Interface::scheduleSegment, counting the preemptions.
+    bool scheduleSegment(ProcessorIndex_t processorId, Task & task, SegmentIndex_t segmentId);
+
+    /// @brief The policies of app/benchmark and fifo on the current state.
+    void makePriorityDecisions();
+
+    /// @brief The ready segment the processor takes from the tasks in urgency order, if any.
+    bool scheduleOnProcessor(ProcessorIndex_t processorId, const std::vector<TaskIndex_t> & order);
+
+    void initializePreDeadlines();
+
+    /// @brief dagedf on the current state.
+    void makeDAGDecisions();
+
+    /// @brief Unlock the dagedf types after the update, see app/RL-ViT/dagenv.py
+    void unlockTypes(unsigned int idleBefore);
+
+    unsigned int queryIdleProcessorCount();
+
+public:
+
+    NativePolicy(Simulator & simulator, SchedulePolicy_t policy): simulator(simulator), policy(policy) {};
+
+    /// @return POLICY_UNKNOWN if there is no policy of the name.
+    static SchedulePolicy_t parsePolicy(const std::string & name);
+
+    /**
+     * @brief Release the jobs due now, then decide and advance to the next event until
+     * the bound, the steady state or a missed deadline.
+    */
+    PolicyResult run();
+};
+
+#endif // policy.h
@@ -24,7 +24,8 @@ bool Processor::scheduleTask(Task & taskToSchedule, task::TimeStamp_t timeStamp)
 
 bool Processor::workProcessor(task::TimeStamp_t timeStamp) {
     if (processorState == IDLE) return true;
-    if (!currentSegment->executeSegment(timeStamp, executionVariation, (parallelBurdern-1)*speedupDeductFactor)) return false;
+    if (!currentTask->executeSegment(currentSegment->querySegmentIndex(), timeStamp, executionVariation,
+                                     (parallelBurdern-1)*speedupDeductFactor)) return false;
 
     // TODO: Add temporal records here
 
@@ -36,9 +37,23 @@ bool Processor::workProcessor(task::TimeStamp_t timeStamp) {
     return true;
 }
 
+task::TimeStamp_t Processor::queryTicksToCompletion(task::TimeStamp_t timeStamp) {
+    if (processorState == IDLE || !currentSegment->canExecuteAt(timeStamp)) return 0;
+    // only a whole time unit per tick, e.g. a discount rounding to the full resolution
+    TimeStamp_t resolution = currentTask->queryTimeResolution();
+    if (currentSegment->queryProgressPerTick(executionVariation, (parallelBurdern-1)*speedupDeductFactor,
+                                             resolution) != resolution) return 0;
+    return (currentSegment->querySegmentRemainLength() + resolution - 1) / resolution;
+}
+
+void Processor::workProcessorFor(task::TimeStamp_t timeStamp, task::TimeStamp_t ticks) {
+    if (processorState == IDLE) return;
+    currentTask->executeSegmentFor(currentSegment->querySegmentIndex(), timeStamp, ticks);
+}
+
 bool Processor::scheduleTaskSpecifiedSegment(Task & taskToschedule, Segment * segment,
                                             task::TimeStamp_t currentTime) {
-    if (segment->querySegmentProcessorAffinity() != this->queryProcessorType())
+    if (taskToschedule.querySegmentProcessorAffinity(segment->querySegmentIndex()) != this->queryProcessorType())
         return false;
     if (!segment->isSegmentMarkedReady()) return false;
     if (currentSegment == segment) return true;
@@ -65,7 +65,7 @@ protected:
     Task * currentTask = nullptr;
     Segment * currentSegment = nullptr;
 
-    SegmentLength_t executionVariation = 0;
+    unsigned int executionVariation = 0;
 
     task::TaskRTPriority_t currentTaskPriority = 99;
     // Number of parallel running processors of this type.
@@ -88,6 +88,8 @@ public:
 
     task::TaskRTPriority_t queryProcessorCurrentTaskPriority() {return currentTaskPriority;}
 
+    unsigned int queryExecutionVariation() const {return executionVariation;};
+
     void setProcessorInternalIndex(ProcessorIndex_t processorInternalIndex)
         {this->processorInternalIndex = processorInternalIndex;}
     void setProcessorGlobalIndex(ProcessorIndex_t processorGlobalIndex)
@@ -97,9 +99,10 @@ public:
         {processorState = processorNewState;};
 
     /**
-     * @param varation percentage (0-100) of the execution time variation
+     * @param varation percentage (0-100) of the execution time variation, a job
+     * progresses up to this much slower, by the draw of its release
      */
-    void setExecutionVariation(SegmentLength_t varation)
+    void setExecutionVariation(unsigned int varation)
         {executionVariation = varation;};
 
     void setParallelBurdern(unsigned int parallelBurdern)
@@ -130,8 +133,31 @@ public:
     // Update the processor state if necessary
     bool workProcessor(task::TimeStamp_t timeStamp);
 
+    /**
+     * @brief Number of workProcessor calls until the current segment completes,
+     * 0 if idle or if the progress of a call is not exactly one unit.
+    */
+    task::TimeStamp_t queryTicksToCompletion(task::TimeStamp_t timeStamp);
+
+    /// @brief Same as workProcessor on ticks consecutive time stamps, without completing the segment.
+    void workProcessorFor(task::TimeStamp_t timeStamp, task::TimeStamp_t ticks);
+
     bool resetProcessor();
 
+    /**
+     * @brief Every field but the current task and segment, which the simulator
+     * stores as indices and restores by bindCurrent, see checkpoint.h
+    */
+    template <class Archive>
+    void checkpointFields(Archive & archive) {
+        archive(processorType, processorPreemption, processorState, processorGlobalIndex,
+                processorInternalIndex, executionVariation, currentTaskPriority,
+                parallelBurdern, speedupDeductFactor);
+    }
+
+    void bindCurrent(Task * task, Segment * segment)
+        {currentTask = task; currentSegment = segment;};
+
 };
 
 #endif // processor.h
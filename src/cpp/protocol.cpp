@@ -0,0 +1,22 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <cstring>
+
+#include "protocol.h"
+
+// The frames are written in host order, which is little-endian on every
+// platform the simulator targets (x86-64, aarch64).
+std::string protocol::BinaryReply::encode() const {
+    size_t payloadBytes = (tag == REPLY_TEXT) ? text.size() : values.size() * sizeof(ReplyValue_t);
+    uint32_t frameLength = payloadBytes + 1;
+    std::string frame(sizeof(uint32_t) + frameLength, '\0');
+    std::memcpy(frame.data(), &frameLength, sizeof(uint32_t));
+    frame[sizeof(uint32_t)] = tag;
+    if (tag == REPLY_TEXT)
+        std::memcpy(frame.data() + sizeof(uint32_t) + 1, text.data(), payloadBytes);
+    else if (payloadBytes > 0)
+        std::memcpy(frame.data() + sizeof(uint32_t) + 1, values.data(), payloadBytes);
+    return frame;
+}
@@ -0,0 +1,96 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef PROTOCOL_H
+#define PROTOCOL_H
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "segment.h"
+
+/**
+ * @brief Binary framed protocol between the Python client and the Interface.
+ *
+ * Request frame: <uint32 opcode> <uint32 payloadBytes> <payload>, little-endian.
+ * The payload is a sequence of int64 arguments, except for OP_TEXT whose payload
+ * is a plain text command line handled by Interface::processCommand.
+ *
+ * Reply frame: <uint32 payloadBytes> <char tag> <payload>, where payloadBytes
+ * counts the tag. Tag 's' is a UTF-8 message, 'q' an int64 array and 'd' a
+ * float64 array.
+*/
+namespace protocol {
+
+enum CommandOpcode_t : uint32_t {
+    OP_TEXT = 0,
+    OP_QUERY_CURRENT_TIMESTAMP = 1,
+    OP_IS_SIMULATION_COMPLETED = 2,
+    OP_DOES_TASK_MISS_DEADLINE = 3,
+    OP_UPDATE_PROCESSOR_AND_TASK = 4,
+    OP_QUERY_PROCESSOR_STATE = 5,
+    OP_QUERY_PROCESSOR_STATES = 6,
+    OP_QUERY_TASK_STATE = 7,
+    OP_QUERY_SS_TASK_STATES = 8,
+    OP_QUERY_TASK_EXECUTION_STATES = 9,
+    OP_SCHEDULE_SEGMENT_ON_PROCESSOR = 10,
+    OP_CREATE_DAG_TASK = 11,
+    OP_SET_SIMULATION_TIME_BOUND = 12,
+    OP_START_SIMULATION = 13,
+    OP_RESET_SIMULATOR = 14,
+    OP_QUERY_SNAPSHOT = 15,
+    OP_QUERY_TICK_EVENTS = 16,
+    OP_QUERY_TASK_VERSIONS = 17,
+    OP_ADVANCE_UNTIL_DECISION = 18,
+    OP_ADVANCE_UNTIL_EVENT = 19,
+    OP_LOAD_SCENARIO = 20,
+    OP_PUSH_STATE = 21,
+    OP_POP_STATE = 22,
+    OP_RESTORE_STATE = 23,
+    OP_QUERY_IDLE_PROCESSORS = 24,
+    OP_QUERY_EXECUTION_HISTORY = 25,
+};
+
+// Reported by queryBuildInfo, incremented on incompatible changes of the frames.
+const unsigned int PROTOCOL_VERSION = 1;
+
+/**
+ * @brief A scenario (file or OP_LOAD_SCENARIO payload) is a sequence of int64:
+ * <magic> <version> <type_num> <type0> <count0> ... <task_num> <task0> <task1> ...
+ * where every task is in the createDAGTask layout.
+*/
+// The 8 bytes "RTHScene" read as a little-endian int64.
+const long long SCENARIO_MAGIC = 0x656e656353485452LL;
+const long long SCENARIO_VERSION = 1;
+
+const char REPLY_TEXT = 's';
+const char REPLY_INT64 = 'q';
+const char REPLY_FLOAT64 = 'd';
+
+// Numeric replies are int64, the lengths in sub-ticks, see Simulator::setTimeResolution.
+typedef long long ReplyValue_t;
+const char REPLY_NUMERIC = REPLY_INT64;
+
+/**
+ * @brief A reply frame under construction, either a text message or a
+ * numeric array.
+*/
+struct BinaryReply {
+    char tag = REPLY_NUMERIC;
+    std::string text = "";
+    std::vector<ReplyValue_t> values = {};
+
+    BinaryReply() {};
+    BinaryReply(const std::string & message): tag(REPLY_TEXT), text(message) {};
+
+    void push(ReplyValue_t value) {values.push_back(value);};
+
+    /// @brief Serialize into <uint32 length> <tag> <payload>.
+    std::string encode() const;
+};
+
+};
+
+#endif // protocol.h
@@ -72,7 +72,7 @@ bool Scheduler::makeScheduleDecisions() {
             Segment * readySegmet = simulator.getTask(i).
                                     getFirstReadySegment(proc.queryProcessorType());
             if (!readySegmet) continue;
-            proc.scheduleTaskSpecifiedSegment(simulator.getTask(i), readySegmet, simulator.queryCurrentTimeStamp());
+            simulator.scheduleSegmentOnProcessor(j, simulator.getTask(i), readySegmet);
             break;
         }
     }
@@ -86,7 +86,7 @@ bool Scheduler::makeScheduleDecisions() {
                 proc.getCurrentTask()->queryTaskRTPriority()) continue;
             Segment * readySegmet = task.getFirstReadySegment(proc.queryProcessorType());
             if (!readySegmet) continue;
-            proc.scheduleTaskSpecifiedSegment(simulator.getTask(i), readySegmet, simulator.queryCurrentTimeStamp());
+            simulator.scheduleSegmentOnProcessor(j, simulator.getTask(i), readySegmet);
             break;
         }
     }
@@ -2,14 +2,16 @@
 Copy Right. The EHPCL Authors.
 */
 
-#include <sys/time.h>
+#include <algorithm>
+#include <cmath>
 
 #include "segment.h"
 
 
-bool Segment::resetSegment(bool enforce) {
+bool Segment::resetSegment(SegmentLength_t segmentLength, bool enforce) {
     if (!enforce && segmentRemainLength !=0) return false;
-    executedAt.clear();
+    executionHistory.clear();
+    lastExecutedAt = NOT_EXECUTED;
     segmentRemainLength = segmentLength;
     currentProcessor = 999999;
     segmentCompleted = false;
@@ -17,14 +19,31 @@ bool Segment::resetSegment(bool enforce) {
     return true;
 }
 
-bool Segment::executeSegment(TimeStamp_t timeStamp, SegmentLength_t variation, unsigned int parallelDiscount) {
+void Segment::clearSegment() {
+    executionHistory.clear();
+    lastExecutedAt = NOT_EXECUTED;
+    segmentRemainLength = 0;
+    currentProcessor = 999999;
+    segmentCompleted = true;
+    segmentReady = false;
+}
+
+SegmentLength_t Segment::queryProgressPerTick(unsigned int variation, unsigned int parallelDiscount,
+                                              TimeStamp_t resolution) const {
+    if (parallelDiscount == 0 && variation == 0 && executionSpeed == 1.0) return resolution;
+    double progress = (1.0 - parallelDiscount / 100.0) * executionSpeed * (1.0 - variation / 100.0 * variationDraw);
+    if (!(progress > 0)) return 0;
+    return std::max<SegmentLength_t>(1, std::llround(progress * resolution));
+}
+
+bool Segment::executeSegment(TimeStamp_t timeStamp, unsigned int variation, unsigned int parallelDiscount,
+                             TimeStamp_t resolution) {
     if (segmentRemainLength<=0) return false;
     if (segmentPreemption==SegmentPreemption_t::NONPREEMPTIVE)
-    if (!executedAt.empty() && executedAt.back()+1!=timeStamp) return false;
-    struct timeval sys_time;
-    gettimeofday(&sys_time, nullptr);
-    segmentRemainLength -= (1.0 - parallelDiscount / 100.0) * (1.0 - variation / 100.0 * (sys_time.tv_usec%(int(variation+1))));
-    executedAt.push_back(timeStamp);
+    if (lastExecutedAt != NOT_EXECUTED && lastExecutedAt+1!=timeStamp) return false;
+    SegmentLength_t progress = queryProgressPerTick(variation, parallelDiscount, resolution);
+    segmentRemainLength -= std::min(progress, segmentRemainLength);
+    recordExecution(timeStamp, 1);
     if (segmentRemainLength <= 0) {
         segmentRemainLength = 0;
         segmentCompleted = true;
@@ -33,3 +52,17 @@ bool Segment::executeSegment(TimeStamp_t timeStamp, SegmentLength_t variation, u
     return true;
 }
 
+
+void Segment::executeSegmentFor(TimeStamp_t timeStamp, TimeStamp_t ticks, TimeStamp_t resolution) {
+    segmentRemainLength -= ticks * resolution;
+    recordExecution(timeStamp, ticks);
+}
+
+void Segment::recordExecution(TimeStamp_t timeStamp, TimeStamp_t ticks) {
+    if (!executionHistory.empty() && executionHistory.back().end == timeStamp
+        && executionHistory.back().processor == currentProcessor)
+        executionHistory.back().end += ticks;
+    else
+        executionHistory.push_back({timeStamp, timeStamp + ticks, currentProcessor});
+    lastExecutedAt = timeStamp + ticks - 1;
+}
@@ -11,11 +11,8 @@ Copy Right. The EHPCL Authors.
 
 namespace segment {
 
-#ifdef VARI_PROC
-typedef double SegmentLength_t;
-#else
-typedef unsigned int SegmentLength_t;
-#endif
+// In sub-ticks, resolution per time unit, see Simulator::setTimeResolution.
+typedef unsigned long long SegmentLength_t;
 typedef unsigned int SegmentIndex_t;
 
 enum SegmentState_t {
@@ -35,6 +32,13 @@ enum SegmentPreemption_t {
 typedef SegmentIndex_t ProcessorIndex_t;
 typedef unsigned long long TimeStamp_t;
 
+/// @brief The time units [start, end) executed on one processor without a break.
+struct ExecutionInterval {
+    TimeStamp_t start;
+    TimeStamp_t end;
+    ProcessorIndex_t processor;
+};
+
 };
 
 using namespace segment;
@@ -43,16 +47,28 @@ using namespace segment;
  * @brief Describe a segment (SS Task Model) or node (DAG Task Model). 
 */
 class Segment {
+public:
+    static const TimeStamp_t NOT_EXECUTED = ~0ULL;
+private:
     SegmentPreemption_t segmentPreemption = SegmentPreemption_t::PREEMPTIVE;
-    SegmentLength_t segmentLength = 0;
+    // The length and the affinity are kept by the task, see Task::querySegmentLength.
     SegmentLength_t segmentRemainLength = 0;
     // The segment index inside its task.
     SegmentIndex_t segmentIndex = 0;
 
-    ProcessorAffinity_t segmentAffinity;
     ProcessorIndex_t currentProcessor = 999999;
 
-    std::vector<TimeStamp_t> executedAt = {};
+    // Execution of the current job, one interval per run on a processor.
+    std::vector<ExecutionInterval> executionHistory = {};
+    // Last executed time unit of the current job, NOT_EXECUTED before the first one.
+    TimeStamp_t lastExecutedAt = NOT_EXECUTED;
+
+    /// @brief Add the time units [timeStamp, timeStamp+ticks) to the history.
+    void recordExecution(TimeStamp_t timeStamp, TimeStamp_t ticks);
+
+    // Drawn at each job release, see ExecutionVariation.
+    double executionSpeed = 1.0;
+    double variationDraw = 0.0;
 
     // Local storage to speed up the system.
     // Set to true if the corresponding methods return true.
@@ -63,34 +79,86 @@ public:
     void markSegmentReady() {segmentReady = true;};
     bool isSegmentMarkedReady() {return segmentReady;}
 
-    SegmentLength_t querySegmentLength() const {return segmentLength;};
-    SegmentLength_t querySegmentRemainLength() {return segmentRemainLength;};
-    ProcessorAffinity_t querySegmentProcessorAffinity() {return segmentAffinity;}
+    SegmentLength_t querySegmentRemainLength() const {return segmentRemainLength;};
     SegmentIndex_t querySegmentIndex() {return segmentIndex;}
     void setSegmentIndex(SegmentIndex_t index) {segmentIndex = index;}
     // may return false if the non-preemptive segment is not executed continuously
-    bool executeSegment(TimeStamp_t timeStamp, SegmentLength_t variation = 0,  unsigned int parallelDiscount = 0);
+    bool executeSegment(TimeStamp_t timeStamp, unsigned int variation = 0, unsigned int parallelDiscount = 0,
+                        TimeStamp_t resolution = 1);
+    /**
+     * @brief Sub-ticks executed in one time unit: the resolution times the nominal progress
+     * scaled by the discount, the speed and the variation, rounded to the nearest sub-tick
+     * and at least one unless the progress is not positive.
+    */
+    SegmentLength_t queryProgressPerTick(unsigned int variation, unsigned int parallelDiscount,
+                                         TimeStamp_t resolution) const;
+    /**
+     * @param speed progress per time unit of the job, 1/factor of its execution time
+     * @param draw uniform in [0, 1), share of the processor variation taken by the job
+    */
+    void setExecutionDraw(double speed, double draw) {executionSpeed = speed; variationDraw = draw;};
+    // true if the job progresses by the nominal unit per time unit
+    bool hasNominalSpeed() {return executionSpeed == 1.0;};
+    // false if executeSegment at this time stamp would break the non-preemptive execution
+    bool canExecuteAt(TimeStamp_t timeStamp) {
+        return segmentPreemption != NONPREEMPTIVE || lastExecutedAt == NOT_EXECUTED || lastExecutedAt+1 == timeStamp;
+    }
+    TimeStamp_t queryLastExecutedAt() {return lastExecutedAt;};
+    /// @brief Execution intervals of the current job in time order, cleared by resetSegment.
+    const std::vector<ExecutionInterval> & queryExecutionHistory() const {return executionHistory;};
+    /**
+     * @brief Execute the time units [timeStamp, timeStamp+ticks) at once, same as one
+     * executeSegment per time unit progressing by the resolution.
+     * @attention ticks times the resolution must be smaller than the remaining length.
+    */
+    void executeSegmentFor(TimeStamp_t timeStamp, TimeStamp_t ticks, TimeStamp_t resolution = 1);
 
     // Default constructor: create an empty segment
     Segment() {};
-    Segment(SegmentLength_t segmentLength, ProcessorAffinity_t processorAffinity):
-            segmentLength(segmentLength), segmentAffinity(processorAffinity)
-            {};
-    Segment(SegmentLength_t segmentLength, ProcessorAffinity_t processorAffinity, 
-            SegmentPreemption_t segmentPreemption):
-            segmentLength(segmentLength), segmentAffinity(processorAffinity),
-            segmentPreemption(segmentPreemption) {};
+    Segment(SegmentPreemption_t segmentPreemption): segmentPreemption(segmentPreemption) {};
     
     /**
      * @brief Task may be periodic, the segment is reinited and executed again.
+     * @param segmentLength the length of the segment in its task, remaining again
      * @return True if reseted successfully, False if the reset behavior is inproper,
      * e.g. reset before the segment has finished.
     */
-    bool resetSegment(bool enforce = false);
+    bool resetSegment(SegmentLength_t segmentLength, bool enforce = false);
+
+    /// @brief Complete the segment without executing it, e.g. before the first release.
+    void clearSegment();
+
+    /// @brief Divide the remaining length in sub-ticks, see Simulator::compressTimeBase
+    void compressTimeBase(TimeStamp_t divisor) {segmentRemainLength /= divisor;};
 
     void setCurrentProcessorIndex(ProcessorIndex_t processorInd) 
         {currentProcessor = processorInd;};
     ProcessorIndex_t queryCurrentProcessorIndex() { return currentProcessor;};
+
+    /// @brief Every field in order, see checkpoint.h
+    template <class Archive>
+    void checkpointFields(Archive & archive) {
+        archive(segmentPreemption, segmentRemainLength, segmentIndex, currentProcessor, executionHistory, lastExecutedAt, segmentCompleted, segmentReady, executionSpeed, variationDraw);
+    }
+
+    /// @brief The fields changed by the simulation, see Simulator::pushState
+    template <class Archive>
+    void stateFields(Archive & archive) {
+        archive(segmentRemainLength, currentProcessor, executionHistory, lastExecutedAt, segmentCompleted, segmentReady,
+                executionSpeed, variationDraw);
+    }
+
+    /**
+     * @brief The stateFields deciding the coming execution, relative to the time stamp,
+     * see Simulator::checkSteadyState. The history is left out and so are the draws,
+     * which take no effect without variation.
+    */
+    template <class Archive>
+    void steadyStateFields(Archive & archive, TimeStamp_t timeStamp) {
+        // not executed, executed in the last time unit, executed before
+        unsigned char execution = lastExecutedAt == NOT_EXECUTED ? 0 : (lastExecutedAt+1 == timeStamp ? 1 : 2);
+        archive(segmentRemainLength, currentProcessor, execution, segmentCompleted, segmentReady);
+    }
 };
 
 #endif // segment.h
\ No newline at end of file
@@ -0,0 +1,141 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <cstring>
+#include <iostream>
+#include <sstream>
+#include <thread>
+
+#include <sys/socket.h>
+#include <sys/un.h>
+#include <unistd.h>
+
+#include "server.h"
+
+SocketBuffer::SocketBuffer(int socketDescriptor) : socketDescriptor(socketDescriptor) {
+    setg(inputBuffer, inputBuffer, inputBuffer);
+    setp(outputBuffer, outputBuffer + sizeof(outputBuffer));
+}
+
+int SocketBuffer::underflow() {
+    if (gptr() < egptr()) return traits_type::to_int_type(*gptr());
+    ssize_t count = ::recv(socketDescriptor, inputBuffer, sizeof(inputBuffer), 0);
+    if (count <= 0) return traits_type::eof();
+    setg(inputBuffer, inputBuffer, inputBuffer + count);
+    return traits_type::to_int_type(*gptr());
+}
+
+bool SocketBuffer::flushOutput() {
+    const char * data = pbase();
+    while (data < pptr()) {
+        ssize_t count = ::send(socketDescriptor, data, pptr() - data, MSG_NOSIGNAL);
+        if (count <= 0) return false;
+        data += count;
+    }
+    setp(outputBuffer, outputBuffer + sizeof(outputBuffer));
+    return true;
+}
+
+int SocketBuffer::overflow(int c) {
+    if (!flushOutput()) return traits_type::eof();
+    if (c != traits_type::eof()) {
+        *pptr() = traits_type::to_char_type(c);
+        pbump(1);
+    }
+    return traits_type::not_eof(c);
+}
+
+int SocketBuffer::sync() {
+    return flushOutput() ? 0 : -1;
+}
+
+Server::~Server() {
+    if (listenDescriptor < 0) return;
+    ::close(listenDescriptor);
+    ::unlink(socketPath.c_str());
+}
+
+std::shared_ptr<Session> Server::attachSession(std::string & sessionId) {
+    std::lock_guard<std::mutex> guard(sessionsLock);
+    if (sessionId == "new") {
+        do sessionId = std::to_string(nextSessionId++);
+        while (sessions.count(sessionId));
+        return sessions[sessionId] = std::make_shared<Session>();
+    }
+    // a mistyped id must not silently give a fresh simulator
+    auto session = sessions.find(sessionId);
+    if (session == sessions.end()) return nullptr;
+    return session->second;
+}
+
+unsigned int Server::querySessionCount() {
+    std::lock_guard<std::mutex> guard(sessionsLock);
+    return sessions.size();
+}
+
+void Server::serveConnection(int connectionDescriptor) {
+    SocketBuffer buffer(connectionDescriptor);
+    std::istream input(&buffer);
+    std::ostream output(&buffer);
+
+    std::string line, cmd, sessionId;
+    std::getline(input, line);
+    std::istringstream ss(line);
+    if (!(ss >> cmd >> sessionId) || cmd != "attachSession") {
+        output << "Invalid args!\n" << std::flush;
+        ::close(connectionDescriptor);
+        return;
+    }
+    std::shared_ptr<Session> session = attachSession(sessionId);
+    if (!session) {
+        output << "No such session\n" << std::flush;
+        ::close(connectionDescriptor);
+        return;
+    }
+    std::unique_lock<std::mutex> busy(session->busy, std::try_to_lock);
+    if (!busy.owns_lock()) {
+        output << "Session busy\n" << std::flush;
+        ::close(connectionDescriptor);
+        return;
+    }
+    output << "Session " << sessionId << '\n' << std::flush;
+
+    session->interface.readCommands(input, output);
+    output.flush();
+    if (session->interface.hasQuit()) {
+        std::lock_guard<std::mutex> guard(sessionsLock);
+        sessions.erase(sessionId);
+    }
+    ::close(connectionDescriptor);
+}
+
+bool Server::run() {
+    sockaddr_un address = {};
+    address.sun_family = AF_UNIX;
+    if (socketPath.size() >= sizeof(address.sun_path)) {
+        std::cerr << "Socket path too long: " << socketPath << std::endl;
+        return false;
+    }
+    std::strncpy(address.sun_path, socketPath.c_str(), sizeof(address.sun_path) - 1);
+
+    listenDescriptor = ::socket(AF_UNIX, SOCK_STREAM, 0);
+    if (listenDescriptor < 0) return false;
+    ::unlink(socketPath.c_str());
+    if (::bind(listenDescriptor, reinterpret_cast<sockaddr *>(&address), sizeof(address)) < 0 ||
+        ::listen(listenDescriptor, SOMAXCONN) < 0) {
+        std::cerr << "Cannot listen on " << socketPath << ": " << std::strerror(errno) << std::endl;
+        return false;
+    }
+    std::cerr << "Listening on " << socketPath << std::endl;
+
+    while (true) {
+        int connectionDescriptor = ::accept(listenDescriptor, nullptr, nullptr);
+        if (connectionDescriptor < 0) {
+            if (errno == EINTR) continue;
+            return false;
+        }
+        std::thread(&Server::serveConnection, this, connectionDescriptor).detach();
+    }
+    return true;
+}
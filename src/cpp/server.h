@@ -0,0 +1,89 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef SERVER_H
+#define SERVER_H
+
+#include <map>
+#include <memory>
+#include <mutex>
+#include <streambuf>
+#include <string>
+
+#include "interface.h"
+
+/**
+ * @brief Buffered stream over a connected socket, so that Interface reads and
+ * writes a connection like stdin / stdout.
+*/
+class SocketBuffer : public std::streambuf {
+
+    int socketDescriptor;
+    char inputBuffer[65536];
+    char outputBuffer[65536];
+
+    bool flushOutput();
+
+protected:
+    int underflow() override;
+    int overflow(int c) override;
+    int sync() override;
+
+public:
+    explicit SocketBuffer(int socketDescriptor);
+};
+
+/**
+ * @brief One simulator of the server mode, kept between connections until
+ * "quit" so a client can attach to it again.
+*/
+struct Session {
+    Interface interface;
+    // Held by the thread serving the session, one connection at a time.
+    std::mutex busy;
+};
+
+/**
+ * @brief Server mode: listen on a Unix-domain socket and host many independent
+ * sessions, each served by its own thread.
+ *
+ * A connection starts with the text line "attachSession <id>" ("new" for a fresh
+ * numeric id), the reply is "Session <id>", "Session busy" or "No such session"
+ * (only "new" creates one). The connection then speaks the stdin protocol (text,
+ * or binary after "setProtocol binary") to the simulator of the session; "quit"
+ * ends the session, closing the connection keeps it.
+*/
+class Server {
+
+    std::string socketPath;
+
+    int listenDescriptor = -1;
+
+    std::mutex sessionsLock;
+
+    std::map<std::string, std::shared_ptr<Session>> sessions = {};
+
+    unsigned long long nextSessionId = 0;
+
+    /// @brief Find the session, "new" creates one with a fresh id; nullptr for an unknown id.
+    std::shared_ptr<Session> attachSession(std::string & sessionId);
+
+    void serveConnection(int connectionDescriptor);
+
+public:
+
+    explicit Server(const std::string & socketPath) : socketPath(socketPath) {};
+
+    ~Server();
+
+    /**
+     * @brief Bind the socket and serve the connections until the process ends.
+     * @return False if the socket cannot be created.
+    */
+    bool run();
+
+    unsigned int querySessionCount();
+};
+
+#endif // server.h
@@ -5,7 +5,9 @@ Copy Right. The EHPCL Authors.
 #include <algorithm>
 #include <iostream>
 #include <iomanip>
+#include <numeric>
 
+#include "checkpoint.h"
 #include "simulator.h"
 
 ProcessorPreemption_t Simulator::queryProcessorPreemptionBasedonType(ProcessorType_t processorType) {
@@ -19,6 +21,9 @@ bool Simulator::createNewProcessor(processor::ProcessorType_t processorType) {
     unsigned int currentProcessorNum = processors.size();
     ProcessorPreemption_t processorPreemption = queryProcessorPreemptionBasedonType(processorType);
     processors.push_back(Processor(processorType, processorPreemption, currentProcessorNum));
+    processorCountByType[processorType]++;
+    std::vector<ProcessorIndex_t> & idle = idleProcessorsByType[processorType];
+    idle.insert(idle.begin(), currentProcessorNum);
     return true;
 }
 
@@ -30,15 +35,48 @@ bool Simulator::createNewProcessors(processor::ProcessorType_t processorType,
 }
 
 bool Simulator::updateParallelBurdern() {
-    int lastIndex = 0;
-    for (auto & typeCount: processorCountByType) {
-        unsigned int burdern = 0;
-        for (unsigned int i = lastIndex; i < lastIndex + typeCount; i++)
-            if (processors[i].queryProcessorState() != ProcessorState_t::IDLE) burdern++;
-        for (unsigned int i = lastIndex; i < lastIndex + typeCount; i++)
-            processors[i].setParallelBurdern(burdern);
-        lastIndex += typeCount;
+    if (!busyCountChanged) return true;
+    for (Processor & processor: processors)
+        processor.setParallelBurdern(std::max(busyProcessorCountByType[processor.queryProcessorType()], 1u));
+    busyCountChanged = false;
+    return true;
+}
+
+void Simulator::updateIdleProcessor(ProcessorIndex_t processorGlobalIndex) {
+    Processor & processor = processors[processorGlobalIndex];
+    ProcessorType_t type = processor.queryProcessorType();
+    std::vector<ProcessorIndex_t> & idle = idleProcessorsByType[type];
+    auto it = std::lower_bound(idle.begin(), idle.end(), processorGlobalIndex, std::greater<ProcessorIndex_t>());
+    bool listed = it != idle.end() && *it == processorGlobalIndex;
+    bool isIdle = processor.queryProcessorState() == IDLE;
+    if (listed == isIdle) return;
+    if (isIdle) {
+        idle.insert(it, processorGlobalIndex);
+        busyProcessorCountByType[type]--;
+    } else {
+        idle.erase(it);
+        busyProcessorCountByType[type]++;
+    }
+    busyCountChanged = true;
+}
+
+void Simulator::rebuildIdleProcessors() {
+    processorCountByType.assign(ProcessorAffinity_t::UNKNOWN + 1, 0);
+    busyProcessorCountByType.assign(ProcessorAffinity_t::UNKNOWN + 1, 0);
+    idleProcessorsByType.assign(ProcessorAffinity_t::UNKNOWN + 1, {});
+    for (unsigned int i = processors.size(); i-- > 0;) {
+        ProcessorType_t type = processors[i].queryProcessorType();
+        processorCountByType[type]++;
+        if (processors[i].queryProcessorState() == IDLE) idleProcessorsByType[type].push_back(i);
+        else busyProcessorCountByType[type]++;
     }
+    busyCountChanged = true;
+}
+
+bool Simulator::scheduleSegmentOnProcessor(ProcessorIndex_t processorGlobalIndex, Task & task, Segment * segment) {
+    if (!processors[processorGlobalIndex].scheduleTaskSpecifiedSegment(task, segment, currentTimeStamp))
+        return false;
+    updateIdleProcessor(processorGlobalIndex);
     return true;
 }
 
@@ -59,13 +97,13 @@ bool Simulator::sortProcessorsByType() {
     unsigned int lastCount = 0;
     for (auto & processor : processors) {
         if (processor.queryProcessorType() != lastType) {
-            if (lastCount > 0) processorCountByType.push_back(lastCount);
             lastCount = 1;
             lastType = processor.queryProcessorType();
         }
         processor.setProcessorInternalIndex(lastCount-1);
         lastCount++;
     }
+    rebuildIdleProcessors();
     return true;
 }
 
@@ -79,8 +117,10 @@ TaskState_t Simulator::queryTaskState(TaskIndex_t taskIndex) {
 
 Task & Simulator::createNewTask() {
     taskset.push_back(Task());
+    taskset.back().setTimeResolution(timeResolution);
     taskset.back().initStorage();
     taskset.back().setTaskIndex(taskset.size()-1);
+    calendarsValid = false;
     return taskset.back();
 }
 
@@ -93,50 +133,379 @@ Task & Simulator::createNewHeterSSTaskWithVector(std::vector<ProcessorAffinity_t
 
 bool Simulator::checkTaskRelease() {
     if (taskReleaseCheckedThisRound) return true;
-    for (Task & task: taskset) {
-        if (currentTimeStamp%task.queryTaskPeriod()==0) {
-            if (!task.releaseTask(currentTimeStamp))
-                return false;
+    if (!calendarsValid) rebuildCalendars();
+    // the releases failed at a former time stamp are dropped, as the modulo rule did
+    while (!releaseCalendar.empty() && releaseCalendar.nextTime() < currentTimeStamp)
+        scheduleNextArrival(taskset[releaseCalendar.nextTask()]);
+    releaseCalendar.queryDue(currentTimeStamp, dueTasks);
+    for (TaskIndex_t i: dueTasks) {
+        Task & task = taskset[i];
+        // the jitter is drawn at the arrival, the job waits in the calendar until then
+        if (task.queryNextRelease() == task.queryNextArrival()) {
+            TimeStamp_t delay = drawReleaseDelay(task.queryReleaseJitter());
+            if (delay > 0) {
+                task.delayNextRelease(delay);
+                releaseCalendar.schedule(i, task.queryNextRelease());
+                continue;
+            }
         }
+        bool released = task.releaseTask(currentTimeStamp, task.queryNextArrival());
+        scheduleDeadlineCheck(task);
+        if (!released) {
+            // a failed release still resets segments, report them before the miss;
+            // the due tasks stay in the calendar and are tried again at this time stamp
+            collectReadyEvents();
+            return false;
+        }
+        executionVariation.drawJob(task);
+        tickEvents.push_back({JOB_RELEASED, task.queryTaskIndex(), 0});
+        markTaskChanged(task);
+        steadyStateCheckPending = true;
     }
+    for (TaskIndex_t i: dueTasks)
+        if (taskset[i].queryNextRelease() <= currentTimeStamp) scheduleNextArrival(taskset[i]);
+    // Called at the end of every update, after the task states are checked.
+    collectReadyEvents();
     return (taskReleaseCheckedThisRound = true);
 }
 
-int Simulator::updateProcessorAndTask() {
+void Simulator::rebuildCalendars() {
+    releaseCalendar.clear();
+    deadlineCalendar.clear();
+    for (Task & task: taskset) {
+        releaseCalendar.schedule(task.queryTaskIndex(), task.queryNextRelease());
+        scheduleDeadlineCheck(task);
+    }
+    calendarsValid = true;
+}
+
+void Simulator::scheduleDeadlineCheck(Task & task) {
+    TimeStamp_t time = task.queryDeadlineCheckTime();
+    if (time == Task::NO_DEADLINE_CHECK) deadlineCalendar.cancel(task.queryTaskIndex());
+    else deadlineCalendar.schedule(task.queryTaskIndex(), time);
+}
+
+void Simulator::scheduleNextArrival(Task & task) {
+    task.setNextArrival(task.queryNextArrival() + task.queryTaskPeriod() + drawReleaseDelay(task.querySporadicSlack()));
+    releaseCalendar.schedule(task.queryTaskIndex(), task.queryNextRelease());
+}
+
+TimeStamp_t Simulator::drawReleaseDelay(TimeStamp_t bound) {
+    if (bound == 0) return 0;
+    return std::min<TimeStamp_t>(bound, executionVariation.nextUniform() * (bound + 1));
+}
+
+void Simulator::checkDeadlines() {
+    if (!calendarsValid) rebuildCalendars();
+    deadlineCalendar.queryDue(currentTimeStamp, dueTasks);
+    for (TaskIndex_t i: dueTasks) {
+        Task & task = taskset[i];
+        // a compressed tick spans original time units checked without compression
+        SegmentLength_t before = timeScale > 1 ? executedBeforeTick[i] : task.queryExecutedSegLength();
+        if (task.checkWhetherMissDDL(currentTimeStamp, before)) {
+            taskMissDeadline = true;
+            tickEvents.push_back({DEADLINE_MISSED, task.queryTaskIndex(), 0});
+        }
+        scheduleDeadlineCheck(task);
+    }
+}
+
+bool Simulator::hasRandomReleases() {
+    for (Task & task: taskset)
+        if (task.hasRandomReleases()) return true;
+    return false;
+}
+
+bool Simulator::setTaskRelease(TaskIndex_t taskIndex, TimeStamp_t offset, TimeStamp_t jitter, TimeStamp_t slack) {
+    if (currentTimeStamp != 0 || taskIndex >= taskset.size()) return false;
+    Task & task = taskset[taskIndex];
+    if (jitter >= task.queryTaskPeriod() * timeScale) return false;
+    if (offset % timeScale != 0 || (timeScale > 1 && (jitter > 0 || slack > 0))) return false;
+    task.setReleaseModel(offset / timeScale, jitter, slack);
+    calendarsValid = false;
+    return true;
+}
+
+void Simulator::collectReadyEvents() {
+    for (Task & task: taskset) {
+        if (task.queryReadiedSegments().empty()) continue;
+        for (SegmentIndex_t segment: task.queryReadiedSegments())
+            tickEvents.push_back({SEGMENT_READY, task.queryTaskIndex(), segment});
+        task.clearReadiedSegments();
+        markTaskChanged(task);
+    }
+}
+
+long long Simulator::updateProcessorAndTask() {
+    tickEvents.clear();
     if (!taskReleaseCheckedThisRound) checkTaskRelease();
+    if (checkSteadyState()) {
+        publishState();
+        return 0;
+    }
 
     updateParallelBurdern();
 
+    if (timeScale > 1) {
+        executedBeforeTick.resize(taskset.size());
+        for (Task & task: taskset) executedBeforeTick[task.queryTaskIndex()] = task.queryProgressedLength();
+    }
+
     for (Processor & processor: processors) {
+        Task * task = processor.getCurrentTask();
+        Segment * segment = processor.getCurrentSegment();
         if (!processor.workProcessor(currentTimeStamp)) {
             std::cerr << "Processor " << processor.queryProcessorGlobalIndex() << " working error!\n";
         }
+        if (!task) continue;
+        markTaskChanged(*task);
+        if (processor.queryProcessorState() == IDLE) {
+            tickEvents.push_back({SEGMENT_COMPLETED, task->queryTaskIndex(), segment->querySegmentIndex()});
+            tickEvents.push_back({PROCESSOR_IDLE, processor.queryProcessorGlobalIndex(), 0});
+            updateIdleProcessor(processor.queryProcessorGlobalIndex());
+        }
     }
 
-    int temp = 0;
+    SegmentLength_t executedTotal = 0;
 
     currentTimeStamp++;
     
     for (Task & task: taskset) {
         task.checkTaskStates();
-        if (task.checkWhetherMissDDL(currentTimeStamp))
-            taskMissDeadline = true;
-        temp += task.queryExecutedSegLength();
+        executedTotal += task.queryExecutedSegLength();
     }
+    checkDeadlines();
 
-    temp = temp - taskExecutedTotal;
-    taskExecutedTotal += temp;
+    long long temp = (long long)executedTotal - (long long)taskExecutedTotal;
+    taskExecutedTotal = executedTotal;
     
     taskReleaseCheckedThisRound = false;
     checkTaskRelease();
+    publishState();
     if (taskExecutedTotal == 0 ) return 0;
     return temp;
 }
 
 
+bool Simulator::hasSchedulingDecision() {
+    bool anyIdle = false;
+    for (auto & idle: idleProcessorsByType) anyIdle = anyIdle || !idle.empty();
+    if (!anyIdle) return false;
+    // the ready list holds the segments marked ready and not completed
+    for (Task & task: taskset) {
+        for (SegmentIndex_t i: task.queryReadySegments()) {
+            Segment & segment = task.getSegment(i);
+            unsigned int type = task.querySegmentProcessorAffinity(i);
+            if (type >= idleProcessorsByType.size() || idleProcessorsByType[type].empty()) continue;
+            if (segment.queryCurrentProcessorIndex() >= 999999) return true;
+        }
+    }
+    return false;
+}
+
+TimeStamp_t Simulator::queryUneventfulTicks() {
+    if (!taskReleaseCheckedThisRound) return 0;
+    // the update reaching the bound completes the simulation
+    if (currentTimeStamp + 1 >= maximumSimulationTime) return 0;
+    TimeStamp_t ticks = maximumSimulationTime - currentTimeStamp - 1;
+
+    // the update after a release reports the reset executed lengths, keep it a single tick
+    SegmentLength_t executedTotal = 0;
+    for (Task & task: taskset) executedTotal += task.queryExecutedSegLength();
+    if (executedTotal != taskExecutedTotal) return 0;
+
+    updateParallelBurdern();
+    std::vector<unsigned int> runningSegments(taskset.size(), 0);
+    for (Processor & processor: processors) {
+        if (processor.queryProcessorState() == IDLE) continue;
+        TimeStamp_t remain = processor.queryTicksToCompletion(currentTimeStamp);
+        if (remain == 0) return 0;
+        ticks = std::min(ticks, remain - 1);
+        runningSegments[processor.getCurrentTask()->queryTaskIndex()]++;
+    }
+    if (!calendarsValid) rebuildCalendars();
+    if (!releaseCalendar.empty()) {
+        if (releaseCalendar.nextTime() <= currentTimeStamp) return 0;
+        ticks = std::min(ticks, releaseCalendar.nextTime() - currentTimeStamp - 1);
+    }
+    // the executed length of a task grows with its running segments, which only
+    // delays the misses, the other tasks cannot miss before their check time
+    deadlineCalendar.queryDue(currentTimeStamp + ticks, dueTasks);
+    for (TaskIndex_t i: dueTasks) {
+        Task & task = taskset[i];
+        if (task.isAllSegmentsCompleted()) continue;
+        SegmentLength_t executed = task.queryExecutedSegLength();
+        SegmentLength_t progress = runningSegments[task.queryTaskIndex()] * timeResolution;
+        for (TimeStamp_t i = 1; i <= ticks; i++) {
+            if (task.wouldMissDDL(currentTimeStamp + i, executed + progress*i)
+                || task.wouldMissDDLBetween(currentTimeStamp + i, executed + progress*(i-1), executed + progress*i)) {
+                ticks = i - 1;
+                break;
+            }
+        }
+    }
+    return ticks;
+}
+
+long long Simulator::skipUneventfulTicks(TimeStamp_t ticks) {
+    if (checkSteadyState()) return 0;
+    for (Processor & processor: processors)
+        processor.workProcessorFor(currentTimeStamp, ticks);
+    currentTimeStamp += ticks;
+
+    SegmentLength_t executedTotal = 0;
+    for (Task & task: taskset) {
+        task.checkTaskStates();
+        executedTotal += task.queryExecutedSegLength();
+    }
+    long long temp = (long long)executedTotal - (long long)taskExecutedTotal;
+    taskExecutedTotal = executedTotal;
+    return temp;
+}
+
+long long Simulator::advanceUntil(const std::function<bool()> & stop, bool skipWhenUneventful) {
+    std::vector<SimulationEvent> events = {};
+    long long executed = 0;
+    do {
+        if (skipWhenUneventful) {
+            TimeStamp_t ticks = queryUneventfulTicks();
+            if (ticks > 0) executed += skipUneventfulTicks(ticks);
+        }
+        // negative on release ticks, clamped as the clients do for single updates
+        executed += std::max(updateProcessorAndTask(), 0LL);
+        events.insert(events.end(), tickEvents.begin(), tickEvents.end());
+    } while (!isSimulationCompleted() && !taskMissDeadline && !stop());
+    tickEvents.swap(events);
+    return executed;
+}
+
+long long Simulator::advanceUntilDecision() {
+    // a decision left open stays open in the uneventful ticks, stop after one tick then
+    return advanceUntil([this]() {return hasSchedulingDecision();}, !hasSchedulingDecision());
+}
+
+long long Simulator::advanceUntilEvent() {
+    return advanceUntil([this]() {return !tickEvents.empty();}, true);
+}
+
+TimeStamp_t Simulator::queryHyperperiod() {
+    if (taskset.empty()) return 0;
+    TimeStamp_t hyperperiod = 1;
+    for (Task & task: taskset) {
+        TimeStamp_t period = task.queryTaskPeriod();
+        if (period == 0) return 0;
+        if (__builtin_mul_overflow(hyperperiod, period / std::gcd(hyperperiod, period), &hyperperiod))
+            return 0;
+    }
+    return hyperperiod;
+}
+
+bool Simulator::setHyperperiodTimeBound(TimeStamp_t hyperperiodCount) {
+    TimeStamp_t bound = 0;
+    TimeStamp_t hyperperiod = queryHyperperiod();
+    // the schedule only settles into the hyperperiods after the last first arrival
+    TimeStamp_t offset = 0;
+    for (Task & task: taskset) offset = std::max(offset, task.queryReleaseOffset());
+    if (hyperperiod == 0 || hyperperiodCount == 0
+        || __builtin_mul_overflow(hyperperiod, hyperperiodCount, &bound)
+        || __builtin_add_overflow(bound, offset, &bound))
+        return false;
+    maximumSimulationTime = bound;
+    return true;
+}
+
+bool Simulator::setTimeResolution(TimeStamp_t resolution) {
+    if (!taskset.empty() || resolution == 0 || resolution > MAX_TIME_RESOLUTION) return false;
+    timeResolution = resolution;
+    return true;
+}
+
+namespace {
+
+// gcd of the divisor and a length in sub-ticks, 1 unless the length is whole time units
+TimeStamp_t gcdWithLength(TimeStamp_t divisor, SegmentLength_t length, TimeStamp_t resolution) {
+    if (length % resolution != 0) return 1;
+    return std::gcd(divisor, length / resolution);
+}
+
+}
+
+bool Simulator::compressTimeBase() {
+    if (currentTimeStamp != 0) return false;
+    // drawn releases would only be drawn on the coarser grid
+    if (hasRandomReleases()) return false;
+    TimeStamp_t divisor = 0;
+    for (Task & task: taskset) {
+        divisor = std::gcd(divisor, task.queryReleaseOffset());
+        divisor = std::gcd(divisor, task.queryTaskPeriod());
+        divisor = std::gcd(divisor, task.queryTaskRelativeDeadline());
+        divisor = std::gcd(divisor, task.queryTaskAbsoluteDeadline());
+        for (SegmentIndex_t i = 0; i < task.querySegmentCount(); i++) {
+            divisor = gcdWithLength(divisor, task.querySegmentLength(i), timeResolution);
+            divisor = gcdWithLength(divisor, task.getSegment(i).querySegmentRemainLength(), timeResolution);
+        }
+    }
+    if (divisor <= 1) return false;
+
+    for (Task & task: taskset) {
+        task.compressTimeBase(divisor);
+        markTaskChanged(task);
+    }
+    maximumSimulationTime = maximumSimulationTime / divisor + (maximumSimulationTime % divisor != 0);
+    timeScale *= divisor;
+    calendarsValid = false;
+    // the snapshots and the recorded states hold the former lengths
+    stateStack.clear();
+    stateStackBytes = 0;
+    clearSteadyStates();
+    publishState();
+    return true;
+}
+
+void Simulator::setSteadyStateDetection(bool enabled) {
+    steadyStateDetection = enabled;
+    clearSteadyStates();
+}
+
+void Simulator::clearSteadyStates() {
+    steadyStates.clear();
+    steadyStateBytes = 0;
+}
+
+bool Simulator::isExecutionNominal() {
+    if (!executionVariation.isNominal()) return false;
+    for (Processor & processor: processors)
+        if (processor.queryExecutionVariation() != 0) return false;
+    return true;
+}
+
+bool Simulator::checkSteadyState() {
+    if (!steadyStateCheckPending || steadyStateReached) return steadyStateReached;
+    steadyStateCheckPending = false;
+    if (!steadyStateDetection || taskMissDeadline || !isExecutionNominal() || hasRandomReleases()) return false;
+    TimeStamp_t hyperperiod = queryHyperperiod();
+    if (hyperperiod == 0) return false;
+
+    // the burden is updated lazily, bring it up to date whatever the caller advanced with
+    updateParallelBurdern();
+    std::string data = steadyStateData(hyperperiod);
+    auto seen = steadyStates.find(data);
+    if (seen != steadyStates.end()) {
+        steadyStateCycle = currentTimeStamp - seen->second;
+        steadyStateReached = true;
+        return true;
+    }
+    if (steadyStateBytes + data.size() <= MAXIMUM_STEADY_STATE_BYTES) {
+        steadyStateBytes += data.size();
+        steadyStates.emplace(std::move(data), currentTimeStamp);
+    }
+    return false;
+}
+
 void Simulator::initializeStorages() {
     taskset.reserve(10);
     processors.reserve(10);
+    rebuildIdleProcessors();
 }
 
 Simulator::Simulator() {
@@ -163,8 +532,10 @@ static std::ostream & operator<<(std::ostream & os, const Processor & processor)
     os << std::string(", Segment");
     if (processor.getCurrentSegment())
     os << std::string("(") << std::to_string(processor.getCurrentSegment()->querySegmentIndex()) << std::string("): ")
-       << std::to_string(processor.getCurrentSegment()->querySegmentLength() - processor.getCurrentSegment()->querySegmentRemainLength())
-       << std::string("/") << std::to_string(processor.getCurrentSegment()->querySegmentLength());
+       << std::to_string(processor.getCurrentTask()->querySegmentLength(processor.getCurrentSegment()->querySegmentIndex())
+                         - processor.getCurrentSegment()->querySegmentRemainLength())
+       << std::string("/")
+       << std::to_string(processor.getCurrentTask()->querySegmentLength(processor.getCurrentSegment()->querySegmentIndex()));
     return os;
 }
 
@@ -186,10 +557,338 @@ void Simulator::printSimulatorStates() {
 bool Simulator::resetSimulator() {
     this->currentTimeStamp = 0;
     taskMissDeadline = 0;
-    for (Task & task: taskset)
+    // the reset stands for the release at 0
+    steadyStateCheckPending = true;
+    steadyStateReached = false;
+    steadyStateCycle = 0;
+    clearSteadyStates();
+    executionVariation.restart();
+    tickEvents.clear();
+    for (Task & task: taskset) {
         if (!task.resetTask(true)) return false;
+        task.restartReleases();
+        // no job until the first release
+        task.clearJob();
+        markTaskChanged(task);
+    }
+    calendarsValid = false;
     for (Processor & proc: processors)
         if (!proc.resetProcessor()) return false;
+    rebuildIdleProcessors();
+    // the releases at 0 as startSimulation does, with the same draws and events
+    taskReleaseCheckedThisRound = false;
+    return checkTaskRelease();
+}
+
+bool Simulator::clearSimulator() {
+    processors.clear();
+    taskset.clear();
+    rebuildIdleProcessors();
+    currentTimeStamp = 0;
+    maximumSimulationTime = 65536L;
+    timeScale = 1;
+    timeResolution = 1;
+    taskMissDeadline = false;
+    taskReleaseCheckedThisRound = false;
+    releaseCalendar.clear();
+    deadlineCalendar.clear();
+    calendarsValid = false;
+    taskExecutedTotal = 0;
+    tickEvents.clear();
+    executionVariation = ExecutionVariation();
+    stateStack.clear();
+    stateStackBytes = 0;
+    stateMirror.close();
+    steadyStateDetection = false;
+    steadyStateCheckPending = false;
+    steadyStateReached = false;
+    steadyStateCycle = 0;
+    clearSteadyStates();
     return true;
-    this->checkTaskRelease();
+}
+
+namespace {
+
+// Current task and segment of a processor, NOT_ASSIGNED if none.
+struct ProcessorBinding {
+    static const unsigned int NOT_ASSIGNED = 999999;
+    TaskIndex_t task = NOT_ASSIGNED;
+    SegmentIndex_t segment = NOT_ASSIGNED;
+};
+
+ProcessorBinding queryBinding(const Processor & processor) {
+    ProcessorBinding binding;
+    Task * task = processor.getCurrentTask();
+    Segment * segment = processor.getCurrentSegment();
+    if (task) binding.task = task->queryTaskIndex();
+    if (task && segment) binding.segment = segment->querySegmentIndex();
+    return binding;
+}
+
+bool isValidBinding(const ProcessorBinding & binding, std::vector<Task> & taskset) {
+    if (binding.task == ProcessorBinding::NOT_ASSIGNED) return true;
+    if (binding.task >= taskset.size()) return false;
+    return binding.segment == ProcessorBinding::NOT_ASSIGNED
+        || binding.segment < taskset[binding.task].querySegmentCount();
+}
+
+// the binding must be valid
+void bindProcessor(Processor & processor, const ProcessorBinding & binding, std::vector<Task> & taskset) {
+    Task * task = nullptr;
+    Segment * segment = nullptr;
+    if (binding.task != ProcessorBinding::NOT_ASSIGNED) {
+        task = &taskset[binding.task];
+        if (binding.segment != ProcessorBinding::NOT_ASSIGNED)
+            segment = &task->getSegment(binding.segment);
+    }
+    processor.bindCurrent(task, segment);
+}
+
+}
+
+std::string Simulator::saveCheckpoint() {
+    std::vector<ProcessorBinding> bindings;
+    bindings.reserve(processors.size());
+    for (Processor & processor: processors) bindings.push_back(queryBinding(processor));
+    long long magic = checkpoint::CHECKPOINT_MAGIC, version = checkpoint::CHECKPOINT_VERSION;
+    char unit = protocol::REPLY_NUMERIC;
+
+    checkpoint::Writer writer;
+    writer(magic, version, unit);
+    writer(processors, bindings, taskset, currentTimeStamp,
+           maximumSimulationTime, taskMissDeadline, taskReleaseCheckedThisRound,
+           taskExecutedTotal, tickEvents, stateVersion, executionVariation,
+           steadyStateDetection, steadyStateCheckPending, steadyStateReached, steadyStateCycle, timeScale,
+           timeResolution);
+    return writer.release();
+}
+
+bool Simulator::loadCheckpoint(const std::string & data) {
+    long long magic = 0, version = 0;
+    char unit = 0;
+    checkpoint::Reader reader(data);
+    reader(magic, version, unit);
+    if (reader.failed() || magic != checkpoint::CHECKPOINT_MAGIC
+        || version != checkpoint::CHECKPOINT_VERSION || unit != protocol::REPLY_NUMERIC)
+        return false;
+
+    // read into copies, the state is only replaced by a complete checkpoint
+    std::vector<Processor> newProcessors;
+    std::vector<ProcessorBinding> bindings;
+    std::vector<Task> newTaskset;
+    TimeStamp_t newTime = 0, newBound = 0;
+    bool newMissDeadline = false, newReleaseChecked = false;
+    SegmentLength_t newExecutedTotal = 0;
+    std::vector<SimulationEvent> newEvents;
+    unsigned long long newVersion = 0;
+    ExecutionVariation newVariation;
+    bool newDetection = false, newCheckPending = false, newReached = false;
+    TimeStamp_t newCycle = 0, newScale = 0, newResolution = 0;
+    reader(newProcessors, bindings, newTaskset, newTime,
+           newBound, newMissDeadline, newReleaseChecked,
+           newExecutedTotal, newEvents, newVersion, newVariation,
+           newDetection, newCheckPending, newReached, newCycle, newScale, newResolution);
+    if (!reader.finished() || bindings.size() != newProcessors.size() || !newVariation.isValid()
+        || newScale == 0 || newResolution == 0 || newResolution > MAX_TIME_RESOLUTION) return false;
+    for (Task & task: newTaskset)
+        if (task.queryTimeResolution() != newResolution) return false;
+    for (auto & binding: bindings)
+        if (!isValidBinding(binding, newTaskset)) return false;
+
+    processors = std::move(newProcessors);
+    taskset = std::move(newTaskset);
+    for (unsigned int i = 0; i < processors.size(); i++)
+        bindProcessor(processors[i], bindings[i], taskset);
+    rebuildIdleProcessors();
+    currentTimeStamp = newTime;
+    maximumSimulationTime = newBound;
+    taskMissDeadline = newMissDeadline;
+    taskReleaseCheckedThisRound = newReleaseChecked;
+    taskExecutedTotal = newExecutedTotal;
+    tickEvents = std::move(newEvents);
+    executionVariation = newVariation;
+    steadyStateDetection = newDetection;
+    steadyStateCheckPending = newCheckPending;
+    steadyStateReached = newReached;
+    steadyStateCycle = newCycle;
+    timeScale = newScale;
+    timeResolution = newResolution;
+    calendarsValid = false;
+    // the recorded states may come from another run
+    clearSteadyStates();
+    // every task changed for the clients, keep the versions increasing
+    stateVersion = std::max(stateVersion, newVersion);
+    for (Task & task: taskset) markTaskChanged(task);
+    // the snapshots belong to the former processors and tasks
+    stateStack.clear();
+    stateStackBytes = 0;
+    publishState();
+    return true;
+}
+
+template <class Archive>
+void Simulator::stateFields(Archive & archive) {
+    for (Processor & processor: processors) {
+        ProcessorBinding binding = queryBinding(processor);
+        processor.checkpointFields(archive);
+        archive(binding);
+    }
+    for (Task & task: taskset) task.stateFields(archive);
+    archive(currentTimeStamp, maximumSimulationTime, taskMissDeadline,
+            taskReleaseCheckedThisRound, taskExecutedTotal, tickEvents, executionVariation,
+            steadyStateCheckPending, steadyStateReached, steadyStateCycle);
+}
+
+std::string Simulator::steadyStateData(TimeStamp_t hyperperiod) {
+    checkpoint::Writer writer;
+    TimeStamp_t phase = currentTimeStamp % hyperperiod;
+    writer(phase, policyState);
+    for (Processor & processor: processors) {
+        ProcessorBinding binding = queryBinding(processor);
+        processor.checkpointFields(writer);
+        writer(binding);
+    }
+    for (Task & task: taskset) task.steadyStateFields(writer, currentTimeStamp);
+    return writer.release();
+}
+
+void Simulator::trimStateStack() {
+    while (stateStack.size() > 1 && (stateStack.size() > maximumStateStackDepth
+           || stateStackBytes > maximumStateStackBytes)) {
+        stateStackBytes -= stateStack.front().data.size();
+        stateStack.pop_front();
+    }
+}
+
+unsigned long long Simulator::pushState() {
+    checkpoint::Writer writer;
+    uint64_t processorCount = processors.size(), taskCount = taskset.size();
+    writer(processorCount, taskCount, timeScale, timeResolution);
+    stateFields(writer);
+
+    stateStack.push_back({nextStateId++, writer.release()});
+    stateStackBytes += stateStack.back().data.size();
+    trimStateStack();
+    return stateStack.back().id;
+}
+
+bool Simulator::restoreSnapshot(const std::string & data) {
+    checkpoint::Reader reader(data);
+    uint64_t processorCount = 0, taskCount = 0;
+    TimeStamp_t scale = 0, resolution = 0;
+    reader(processorCount, taskCount, scale, resolution);
+    if (reader.failed() || processorCount != processors.size() || taskCount != taskset.size()
+        || scale != timeScale || resolution != timeResolution) return false;
+
+    // read into copies in the order of stateFields, the state is only replaced by a complete snapshot
+    restoredProcessors = processors;
+    restoredTaskset = taskset;
+    std::vector<ProcessorBinding> bindings(processors.size());
+    for (unsigned int i = 0; i < restoredProcessors.size(); i++) {
+        restoredProcessors[i].checkpointFields(reader);
+        reader(bindings[i]);
+    }
+    for (Task & task: restoredTaskset) task.stateFields(reader);
+    TimeStamp_t newTime = 0, newBound = 0, newCycle = 0;
+    bool newMissDeadline = false, newReleaseChecked = false, newCheckPending = false, newReached = false;
+    SegmentLength_t newExecutedTotal = 0;
+    std::vector<SimulationEvent> newEvents;
+    ExecutionVariation newVariation;
+    reader(newTime, newBound, newMissDeadline, newReleaseChecked, newExecutedTotal, newEvents,
+           newVariation, newCheckPending, newReached, newCycle);
+    if (!reader.finished() || !newVariation.isValid()) return false;
+    for (auto & binding: bindings)
+        if (!isValidBinding(binding, restoredTaskset)) return false;
+
+    processors.swap(restoredProcessors);
+    taskset.swap(restoredTaskset);
+    for (unsigned int i = 0; i < processors.size(); i++)
+        bindProcessor(processors[i], bindings[i], taskset);
+    rebuildIdleProcessors();
+    currentTimeStamp = newTime;
+    maximumSimulationTime = newBound;
+    taskMissDeadline = newMissDeadline;
+    taskReleaseCheckedThisRound = newReleaseChecked;
+    taskExecutedTotal = newExecutedTotal;
+    tickEvents = std::move(newEvents);
+    executionVariation = newVariation;
+    steadyStateCheckPending = newCheckPending;
+    steadyStateReached = newReached;
+    steadyStateCycle = newCycle;
+    calendarsValid = false;
+    // the recorded states may be ahead of the restored time
+    clearSteadyStates();
+    for (Task & task: taskset) markTaskChanged(task);
+    publishState();
+    return true;
+}
+
+bool Simulator::popState(unsigned long long & id) {
+    if (stateStack.empty()) return false;
+    StateSnapshot snapshot = std::move(stateStack.back());
+    stateStack.pop_back();
+    stateStackBytes -= snapshot.data.size();
+    id = snapshot.id;
+    return restoreSnapshot(snapshot.data);
+}
+
+bool Simulator::restoreState(unsigned long long id) {
+    for (auto & snapshot: stateStack)
+        if (snapshot.id == id) return restoreSnapshot(snapshot.data);
+    return false;
+}
+
+const std::string * Simulator::queryStateData(unsigned long long id) {
+    for (auto & snapshot: stateStack)
+        if (snapshot.id == id) return &snapshot.data;
+    return nullptr;
+}
+
+size_t Simulator::queryStateBytes(unsigned long long id) {
+    for (auto & snapshot: stateStack)
+        if (snapshot.id == id) return snapshot.data.size();
+    return 0;
+}
+
+void Simulator::setStateStackLimit(unsigned int depth, size_t bytes) {
+    maximumStateStackDepth = depth > 0 ? depth : 1;
+    maximumStateStackBytes = bytes;
+    trimStateStack();
+}
+
+bool Simulator::enableStateMirror(const std::string & path) {
+    if (!stateMirror.open(path)) return false;
+    publishState();
+    return true;
+}
+
+void Simulator::publishState() {
+    if (!stateMirror.isEnabled()) return;
+    unsigned int segmentCount = 0;
+    for (Task & task: taskset) segmentCount += task.querySegmentCount();
+    protocol::ReplyValue_t * row = stateMirror.beginWrite(processors.size(), segmentCount);
+    if (!row) return;
+    for (Processor & processor: processors) {
+        bool busy = processor.queryProcessorState() != IDLE;
+        *row++ = processor.queryProcessorType();
+        *row++ = processor.queryProcessorState();
+        *row++ = busy ? processor.getCurrentTask()->queryTaskIndex() : 0;
+        *row++ = busy ? processor.getCurrentSegment()->querySegmentIndex() : 0;
+    }
+    for (Task & task: taskset) {
+        for (SegmentIndex_t i = 0; i < task.querySegmentCount(); i++) {
+            Segment & segment = task.getSegment(i);
+            ProcessorIndex_t processorIndex = segment.queryCurrentProcessorIndex();
+            *row++ = task.queryTaskIndex();
+            *row++ = i;
+            *row++ = task.querySegmentProcessorAffinity(i);
+            *row++ = processorIndex >= 999999 ? -1 : (protocol::ReplyValue_t)processorIndex;
+            *row++ = task.peekSegmentReady(i);
+            *row++ = task.querySegmentLength(i) * timeScale;
+            *row++ = segment.querySegmentRemainLength() * timeScale;
+            *row++ = task.queryTaskPeriod() * timeScale;
+        }
+    }
+    stateMirror.endWrite(queryOriginalTimeStamp(), (taskMissDeadline ? 1 : 0) | (isSimulationCompleted() ? 2 : 0),
+                         timeResolution);
 }
@@ -5,7 +5,15 @@ Copy Right. The EHPCL Authors.
 #ifndef SIMULATOR_H
 #define SIMULATOR_H
 
+#include <deque>
+#include <functional>
+#include <unordered_map>
+
+#include "calendar.h"
+#include "event.h"
 #include "processor.h"
+#include "statemirror.h"
+#include "variation.h"
 
 
 /**
@@ -20,19 +28,177 @@ class Simulator {
 
     std::vector<Processor> processors = {};
 
+    // Indexed by ProcessorType_t, rebuilt by rebuildIdleProcessors.
     std::vector<unsigned int> processorCountByType = {};
 
+    std::vector<unsigned int> busyProcessorCountByType = {};
+
+    // Idle processors of each type in descending index order, the lowest at the back.
+    std::vector<std::vector<ProcessorIndex_t>> idleProcessorsByType = {};
+
+    // The busy counts changed since the last updateParallelBurdern.
+    bool busyCountChanged = false;
+
     std::vector<Task> taskset = {};
 
     TimeStamp_t currentTimeStamp = 0;
 
     TimeStamp_t maximumSimulationTime = 65536L;
 
+    // Original time units per simulated time unit, see compressTimeBase.
+    TimeStamp_t timeScale = 1;
+
+    // Sub-ticks per time unit of the segment lengths, see setTimeResolution.
+    TimeStamp_t timeResolution = 1;
+
     bool taskMissDeadline = false;
 
     bool taskReleaseCheckedThisRound = false;
 
-    int taskExecutedTotal = 0;
+    // Next release of every task, see checkTaskRelease.
+    TaskCalendar releaseCalendar;
+
+    // Earliest time stamp every unfinished task may miss its deadline at, see
+    // Task::queryDeadlineCheckTime, only the due tasks are checked by an update.
+    TaskCalendar deadlineCalendar;
+
+    // The calendars are rebuilt from the tasks before their next use, e.g. after a restore.
+    bool calendarsValid = false;
+
+    // Due tasks of the last calendar lookup, kept to save the allocations.
+    std::vector<TaskIndex_t> dueTasks = {};
+
+    // Executed lengths at the start of the tick with a compressed time base, see checkDeadlines.
+    std::vector<SegmentLength_t> executedBeforeTick = {};
+
+    // sum of the executed lengths in sub-ticks, past 32 bits with a fine resolution
+    SegmentLength_t taskExecutedTotal = 0;
+
+    StateMirror stateMirror;
+
+    ExecutionVariation executionVariation;
+
+    // Events of the last update, including the releases at its end.
+    std::vector<SimulationEvent> tickEvents = {};
+
+    // Incremented on every task change, see Task::queryStateVersion.
+    unsigned long long stateVersion = 0;
+
+    struct StateSnapshot {
+        unsigned long long id;
+        std::string data;
+    };
+
+    // Snapshots of pushState, the newest at the back.
+    std::deque<StateSnapshot> stateStack = {};
+
+    unsigned long long nextStateId = 0;
+
+    size_t stateStackBytes = 0;
+
+    unsigned int maximumStateStackDepth = 1024;
+
+    size_t maximumStateStackBytes = 256UL << 20;
+
+    // Stop once the state repeats at a release, see setSteadyStateDetection.
+    bool steadyStateDetection = false;
+
+    // A job was released since the last checkSteadyState.
+    bool steadyStateCheckPending = false;
+
+    bool steadyStateReached = false;
+
+    // Time units between the two equal states.
+    TimeStamp_t steadyStateCycle = 0;
+
+    // The states seen after the releases, see steadyStateData, and their time stamps.
+    std::unordered_map<std::string, TimeStamp_t> steadyStates = {};
+
+    size_t steadyStateBytes = 0;
+
+    // State of the running native policy deciding the schedule beside the simulator state.
+    std::vector<unsigned char> policyState = {};
+
+    // The states beyond this size are not recorded, the recorded ones are still compared.
+    static const size_t MAXIMUM_STEADY_STATE_BYTES = 64UL << 20;
+
+    // Copies restoreSnapshot decodes into, swapped with the state and kept to save the allocations.
+    std::vector<Processor> restoredProcessors = {};
+    std::vector<Task> restoredTaskset = {};
+
+    /**
+     * @brief The fields changed by the simulation, unlike checkpointFields the tasks
+     * and segments must already exist, i.e. the same processors and tasks. Read
+     * back in the same order by restoreSnapshot.
+    */
+    template <class Archive>
+    void stateFields(Archive & archive);
+
+    /// @brief Drop the oldest snapshots beyond the limits, keeping the newest one.
+    void trimStateStack();
+
+    /// @brief Move the processor into or out of the idle list of its type after a state change.
+    void updateIdleProcessor(ProcessorIndex_t processorGlobalIndex);
+
+    /// @brief Recompute the idle lists and the counts from the processors.
+    void rebuildIdleProcessors();
+
+    /// @brief Move the segments readied by the tasks into the tick events.
+    void collectReadyEvents();
+
+    /// @brief Fill the calendars from the release and deadline state of the tasks.
+    void rebuildCalendars();
+
+    /// @brief Move the deadline check of the task after a release or a check.
+    void scheduleDeadlineCheck(Task & task);
+
+    /// @brief Schedule the arrival one period (plus the sporadic slack) after the last one.
+    void scheduleNextArrival(Task & task);
+
+    /// @return Uniform in [0, bound], 0 without a draw if the bound is 0.
+    TimeStamp_t drawReleaseDelay(TimeStamp_t bound);
+
+    /// @brief Check the deadlines of the due tasks at the current time stamp.
+    void checkDeadlines();
+
+    /// @brief True if a task has a release jitter or sporadic arrivals.
+    bool hasRandomReleases();
+
+    /**
+     * @brief Number of coming time units in which only the execution progresses:
+     * no segment completes, no job is released, no deadline is missed and the
+     * simulation does not end. 0 if unknown, e.g. with execution variation.
+    */
+    TimeStamp_t queryUneventfulTicks();
+
+    /**
+     * @brief Simulate the given uneventful time units at once.
+     * @return total executed length, same as the sum of the skipped updates
+    */
+    long long skipUneventfulTicks(TimeStamp_t ticks);
+
+    /// @brief Repeat updateProcessorAndTask until stop() or the end of the simulation.
+    long long advanceUntil(const std::function<bool()> & stop, bool skipWhenUneventful);
+
+    /// @brief True if no job runs slower or faster than its nominal execution time.
+    bool isExecutionNominal();
+
+    /**
+     * @brief The state deciding the coming schedule: the phase in the hyperperiod,
+     * the policy state, the processors and the tasks relative to the current time stamp.
+    */
+    std::string steadyStateData(TimeStamp_t hyperperiod);
+
+    /**
+     * @brief After a release, record the state or stop the simulation if it was
+     * seen before. Called before the tick of the release is simulated, i.e. on
+     * the state the scheduling decisions were made on.
+     * @return True if the steady state is reached.
+    */
+    bool checkSteadyState();
+
+    /// @brief Forget the recorded states, e.g. when the time goes back.
+    void clearSteadyStates();
 
     //TODO: support more task types by adding other attributes.
 public:
@@ -56,6 +222,9 @@ public:
     */
     Task & createNewTask();
     Task & createNewHeterSSTaskWithVector(std::vector<ProcessorAffinity_t> processorType, std::vector<SegmentLength_t> segments);
+
+    /// @brief Reserve room for taskCount tasks, e.g. before loading a scenario.
+    void reserveTasks(unsigned int taskCount) {taskset.reserve(taskCount);}
     
     unsigned int queryProcessorCount() {return processors.size();}
     unsigned int queryTaskCount() {return taskset.size();}
@@ -72,12 +241,54 @@ public:
 
     TimeStamp_t queryCurrentTimeStamp() {return currentTimeStamp;};
 
+    /// @brief The current time stamp in the original time units, see compressTimeBase.
+    TimeStamp_t queryOriginalTimeStamp() {return currentTimeStamp * timeScale;};
+
+    TimeStamp_t queryTimeScale() {return timeScale;};
+
+    static const TimeStamp_t MAX_TIME_RESOLUTION = 1 << 20;
+
+    /**
+     * @brief Keep the segment lengths in fixed-point sub-ticks, resolution per time unit,
+     * so that a variation or a parallel discount progresses by a fraction of a unit. The
+     * lengths are given in time units and replied in sub-ticks. 1 (the default) is the
+     * integer simulation, nominal progress is always a whole unit per tick.
+     * @return False if a task exists already or the resolution is 0 or above MAX_TIME_RESOLUTION.
+    */
+    bool setTimeResolution(TimeStamp_t resolution);
+
+    TimeStamp_t queryTimeResolution() {return timeResolution;};
+
     /**
-     * @brief Check and release the periodic tasks according to current timestamp.
+     * @brief Divide all the periods, deadlines and segment lengths by their greatest
+     * common divisor, so each update simulates that many original time units. The
+     * replies of the interface are scaled back and the verdicts stay the same for
+     * policies deciding on the events. Only possible at time 0.
+     * @return False if nothing was divided: past time 0, with drawn releases (a jitter
+     * or a sporadic slack) or without a common divisor above 1.
+    */
+    bool compressTimeBase();
+
+    /**
+     * @brief Release the tasks due at the current time stamp in index order and
+     * schedule their next arrivals. A release failing as the previous job still runs
+     * is tried again at the same time stamp, and dropped once the time has passed.
      * @attention This action should be called before making scheduling.
     */
     bool checkTaskRelease();
 
+    /**
+     * @brief Set the release model of a task, in the original time units: the first
+     * arrival at the offset, then one arrival per period, or with a sporadic slack
+     * a minimum inter-arrival of the period plus a uniform draw in [0, slack]. A job
+     * is released a uniform draw in [0, jitter] after its arrival, its deadline
+     * stays one period after the arrival. The draws come from the generator of the
+     * execution variation. Only at time 0, resetSimulator starts over from the offset.
+     * @return False if the task does not exist, the jitter is not shorter than the
+     * period, or the values do not fit the time scale (no draws with a time scale).
+    */
+    bool setTaskRelease(TaskIndex_t taskIndex, TimeStamp_t offset, TimeStamp_t jitter, TimeStamp_t slack);
+
     /**
      * @brief Update all the processors and tasks by calling highLevel APIs.
      * Count the simulator time stamp by one.
@@ -86,27 +297,183 @@ public:
      * Task release will be automatically checked.
      * @return total executed length, error if negative
     */
-    int updateProcessorAndTask();
+    long long updateProcessorAndTask();
 
-    /// @brief Update the parallel burden of each processor type.
+    /// @brief Set the parallel burden of the processors to the busy count of their type.
     bool updateParallelBurdern();
 
+    /**
+     * @brief Schedule the segment on the processor, see Processor::scheduleTaskSpecifiedSegment.
+     * Keeps the idle lists up to date, so the processors should be scheduled through here.
+    */
+    bool scheduleSegmentOnProcessor(ProcessorIndex_t processorGlobalIndex, Task & task, Segment * segment);
+
+    /// @brief The idle processor of the type with the lowest index, NO_PROCESSOR if none.
+    ProcessorIndex_t queryIdleProcessor(ProcessorType_t processorType) {
+        if (processorType >= idleProcessorsByType.size() || idleProcessorsByType[processorType].empty())
+            return NO_PROCESSOR;
+        return idleProcessorsByType[processorType].back();
+    };
+
+    /// @brief Idle processors of the type in descending index order.
+    const std::vector<ProcessorIndex_t> & queryIdleProcessors(ProcessorType_t processorType)
+        {return idleProcessorsByType[processorType];};
+
+    unsigned int queryBusyProcessorCount(ProcessorType_t processorType)
+        {return busyProcessorCountByType[processorType];};
+
+    static const ProcessorIndex_t NO_PROCESSOR = 999999;
+
+    /// @brief True if an idle processor can take a ready, unassigned segment of its type.
+    bool hasSchedulingDecision();
+
+    /**
+     * @brief Advance at least one time unit, until hasSchedulingDecision() or the end
+     * of the simulation. Tick-exact with repeated updateProcessorAndTask, the time
+     * units in which only the execution progresses are simulated at once.
+     * @return total executed length, the sum of the non-negative update results;
+     * queryTickEvents() holds the events of all the ticks
+    */
+    long long advanceUntilDecision();
+
+    /**
+     * @brief Advance at least one time unit, until a tick with any event or the end
+     * of the simulation. Suits schedulers that also preempt busy processors.
+     * @see advanceUntilDecision
+    */
+    long long advanceUntilEvent();
+
+    /// @brief The variation drawn at each job release, restarted by resetSimulator.
+    ExecutionVariation & getExecutionVariation() {return executionVariation;};
+
+    /// @brief The bound in the original time units, rounded up to the time scale.
     void setSimulationTimeBound(TimeStamp_t simulationBound) 
-        {maximumSimulationTime = simulationBound;};
+        {maximumSimulationTime = simulationBound / timeScale + (simulationBound % timeScale != 0);};
+
+    /// @brief The bound in the original time units.
+    TimeStamp_t querySimulationTimeBound() {return maximumSimulationTime * timeScale;};
+
+    /// @brief Least common multiple of the task periods, 0 if there is no task or it overflows.
+    TimeStamp_t queryHyperperiod();
+
+    /**
+     * @brief Bound the simulation to the largest release offset plus the given number of hyperperiods.
+     * @return False, keeping the bound, if the hyperperiod is 0 or the bound overflows.
+    */
+    bool setHyperperiodTimeBound(TimeStamp_t hyperperiodCount);
+
+    /**
+     * @brief Stop the simulation once the state after a release repeats at the same
+     * phase of the hyperperiod: with a deterministic policy, the nominal execution
+     * times and periodic releases the schedule repeats from then on, so no deadline
+     * is missed later either.
+     * The policy must only depend on the state, not on the time stamp or the history.
+    */
+    void setSteadyStateDetection(bool enabled);
+
+    /**
+     * @brief State of a policy taking part in the recorded steady states, e.g. the
+     * locked types of dagedf. Set before advancing, cleared when the policy returns.
+    */
+    void setPolicyState(const std::vector<unsigned char> & state) {policyState = state;};
+
+    bool isSteadyStateReached() {return steadyStateReached;};
+
+    /// @brief Time units between the two equal states, 0 if not reached.
+    TimeStamp_t querySteadyStateCycle() {return steadyStateCycle;};
     
     bool setProcessorParallelFactor(ProcessorAffinity_t processorType, unsigned int speedupDeductFactor);
 
-    bool isSimulationCompleted() {return currentTimeStamp>=maximumSimulationTime;};
+    bool isSimulationCompleted() {return currentTimeStamp>=maximumSimulationTime || steadyStateReached;};
     bool doesTaskMissDeadline() {return taskMissDeadline;};
 
     ProcessorPreemption_t queryProcessorPreemptionBasedonType(ProcessorType_t processorType);
 
     void printSimulatorStates();
 
+    /**
+     * @brief Events of the last updateProcessorAndTask: completed and readied
+     * segments, released jobs, processors gone idle and missed deadlines.
+    */
+    std::vector<SimulationEvent> & queryTickEvents() {return tickEvents;};
+
+    unsigned long long queryStateVersion() {return stateVersion;};
+
+    /// @brief Stamp the task with a new state version, clients re-query the tasks newer than their last version.
+    void markTaskChanged(Task & task) {task.setStateVersion(++stateVersion);};
+
+    /**
+     * @brief Map the state mirror file, it is rewritten by publishState().
+     * @return False if the file cannot be created or mapped.
+    */
+    bool enableStateMirror(const std::string & path);
+
+    /// @brief Rewrite the state mirror if enabled, called after every update and schedule.
+    void publishState();
+
     Simulator();
 
     bool resetSimulator();
 
+    /**
+     * @brief Remove all processors and tasks and restore the default time bound,
+     * so the same simulator can be configured for another run.
+    */
+    bool clearSimulator();
+
+    /**
+     * @brief Serialize the complete state: processors with their current task and
+     * segment, tasks, segments, ready flags, deadlines, time and the last tick events.
+     * @return Compact binary checkpoint, see checkpoint.h
+    */
+    std::string saveCheckpoint();
+
+    /**
+     * @brief Replace the whole state by a checkpoint of saveCheckpoint(), the
+     * state mirror (if enabled) is kept and rewritten. All tasks get a new state
+     * version, so the versions seen by clients keep increasing.
+     * @return False, leaving the state as it was, if the checkpoint is invalid or
+     * comes from a build with another unit type.
+    */
+    bool loadCheckpoint(const std::string & data);
+
+    /**
+     * @brief Copy the mutable state (not the processors and tasks themselves) onto
+     * the snapshot stack. The oldest snapshots are dropped beyond the depth or byte
+     * limit of setStateStackLimit, the new one is always kept.
+     * @return Id of the snapshot for restoreState.
+    */
+    unsigned long long pushState();
+
+    /**
+     * @brief Restore the newest snapshot and remove it from the stack.
+     * @return False if the stack is empty or the processors and tasks changed.
+    */
+    bool popState(unsigned long long & id);
+
+    /// @brief Restore the given snapshot, the stack is kept as it is.
+    bool restoreState(unsigned long long id);
+
+    /// @brief Bytes of the given snapshot, nullptr if there is no such snapshot.
+    const std::string * queryStateData(unsigned long long id);
+
+    /**
+     * @brief Restore the state of a snapshot, e.g. copied from another simulator of
+     * the same processors, tasks and time base, bumping the task versions.
+     * @return False, leaving the state as it was, if the snapshot is incomplete or
+     * belongs to other processors or tasks.
+    */
+    bool restoreSnapshot(const std::string & data);
+
+    void setStateStackLimit(unsigned int depth, size_t bytes);
+
+    unsigned int queryStateStackDepth() {return stateStack.size();};
+
+    size_t queryStateStackBytes() {return stateStackBytes;};
+
+    /// @brief Size of the snapshot with the given id, 0 if there is none.
+    size_t queryStateBytes(unsigned long long id);
+
 };
 
 
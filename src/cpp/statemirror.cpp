@@ -0,0 +1,65 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <cstring>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include "statemirror.h"
+
+using namespace protocol;
+
+bool StateMirror::open(const std::string & path) {
+    close();
+    fileDescriptor = ::open(path.c_str(), O_RDWR | O_CREAT, 0644);
+    if (fileDescriptor < 0) return false;
+    this->path = path;
+    return remap(0, 0);
+}
+
+void StateMirror::close() {
+    if (header) munmap(header, mappedBytes);
+    if (fileDescriptor >= 0) ::close(fileDescriptor);
+    header = nullptr;
+    mappedBytes = 0;
+    fileDescriptor = -1;
+}
+
+bool StateMirror::remap(uint32_t processorCount, uint32_t segmentCount) {
+    size_t bytes = sizeof(StateMirrorHeader) +
+        (processorCount * PROCESSOR_FIELDS + segmentCount * SEGMENT_FIELDS) * sizeof(ReplyValue_t);
+    uint64_t sequence = header ? header->sequence : 0;
+    if (header) munmap(header, mappedBytes);
+    header = nullptr;
+    if (ftruncate(fileDescriptor, bytes) != 0) return false;
+    void * memory = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, fileDescriptor, 0);
+    if (memory == MAP_FAILED) return false;
+    mappedBytes = bytes;
+    header = static_cast<StateMirrorHeader *>(memory);
+    std::memset(header, 0, sizeof(StateMirrorHeader));
+    std::memcpy(header->magic, "RTHMIRR1", 8);
+    header->sequence = sequence;
+    header->processorCount = processorCount;
+    header->segmentCount = segmentCount;
+    header->valueIsFloat = (REPLY_NUMERIC == REPLY_FLOAT64);
+    header->headerSize = sizeof(StateMirrorHeader);
+    return true;
+}
+
+ReplyValue_t * StateMirror::beginWrite(uint32_t processorCount, uint32_t segmentCount) {
+    if (!header) return nullptr;
+    if (header->processorCount != processorCount || header->segmentCount != segmentCount)
+        if (!remap(processorCount, segmentCount)) return nullptr;
+    __atomic_store_n(&header->sequence, header->sequence + 1, __ATOMIC_RELEASE);
+    return reinterpret_cast<ReplyValue_t *>(header + 1);
+}
+
+void StateMirror::endWrite(uint64_t timestamp, uint32_t flags, uint32_t timeResolution) {
+    header->timestamp = timestamp;
+    header->flags = flags;
+    header->timeResolution = timeResolution;
+    __atomic_store_n(&header->sequence, header->sequence + 1, __ATOMIC_RELEASE);
+}
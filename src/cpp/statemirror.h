@@ -0,0 +1,77 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef STATEMIRROR_H
+#define STATEMIRROR_H
+
+#include <cstdint>
+#include <string>
+
+#include "protocol.h"
+
+/**
+ * @brief Memory-mapped mirror of the simulator state, rewritten after every
+ * update and schedule so that clients can read it without any query command.
+ *
+ * Layout (little-endian, 64-byte header):
+ * 0  char[8] magic "RTHMIRR1"
+ * 8  uint64  sequence, odd while the backend is writing
+ * 16 uint64  timestamp
+ * 24 uint32  processorCount
+ * 28 uint32  segmentCount
+ * 32 uint32  flags, bit0 task missed deadline, bit1 simulation completed
+ * 36 uint32  valueIsFloat, element type of the rows (int64 or float64), 0 since the sub-tick units
+ * 40 uint32  header size (64)
+ * 44 uint32  timeResolution, sub-ticks per time unit of the lengths
+ * then processorCount rows <type> <state> <task> <segment>,
+ * then segmentCount rows <task> <segment> <affinity> <processor> <ready> <length> <remaining> <period>,
+ * i.e. the same rows as querySnapshot.
+*/
+struct StateMirrorHeader {
+    char magic[8];
+    uint64_t sequence;
+    uint64_t timestamp;
+    uint32_t processorCount;
+    uint32_t segmentCount;
+    uint32_t flags;
+    uint32_t valueIsFloat;
+    uint32_t headerSize;
+    uint32_t timeResolution;
+    uint32_t reserved[4];
+};
+
+static_assert(sizeof(StateMirrorHeader) == 64, "state mirror header must be 64 bytes");
+
+class StateMirror {
+
+    std::string path = "";
+    int fileDescriptor = -1;
+    size_t mappedBytes = 0;
+    StateMirrorHeader * header = nullptr;
+
+    bool remap(uint32_t processorCount, uint32_t segmentCount);
+
+public:
+    static const unsigned int PROCESSOR_FIELDS = 4;
+    static const unsigned int SEGMENT_FIELDS = 8;
+
+    bool isEnabled() const {return header != nullptr;};
+
+    bool open(const std::string & path);
+    void close();
+
+    /**
+     * @brief Start rewriting the mirror, resized if the counts changed.
+     * @return Pointer to the first processor row, nullptr on failure.
+    */
+    protocol::ReplyValue_t * beginWrite(uint32_t processorCount, uint32_t segmentCount);
+    void endWrite(uint64_t timestamp, uint32_t flags, uint32_t timeResolution);
+
+    StateMirror() {};
+    ~StateMirror() {close();};
+    StateMirror(const StateMirror &) = delete;
+    StateMirror & operator=(const StateMirror &) = delete;
+};
+
+#endif // statemirror.h
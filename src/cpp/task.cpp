@@ -2,59 +2,120 @@
 Copy Right. The EHPCL Authors.
 */
 
+#include <algorithm>
+
 #include "task.h"
 
 bool Task::isSegmentReady(SegmentIndex_t segment) {
     if (segments[segment].isSegmentMarkedReady()) return true;
-    for (SegmentIndex_t & segInd: precedingSegments[segment]) {
-        if (!segments[segInd].isSegmentCompleted()) return false;
-    }
-    segments[segment].markSegmentReady();
+    if (unfinishedPredecessors[segment] != 0) return false;
+    setSegmentReady(segment);
     return true;
 }
 
+void Task::setSegmentReady(SegmentIndex_t segment) {
+    segments[segment].markSegmentReady();
+    if (segments[segment].isSegmentCompleted()) return;
+    readiedSegments.push_back(segment);
+    readySegments.insert(std::lower_bound(readySegments.begin(), readySegments.end(), segment), segment);
+}
+
+void Task::setFirstSegmentReady() {
+    if (segments[0].isSegmentMarkedReady()) return;
+    setSegmentReady(0);
+    // reported even if completed, e.g. of zero length
+    if (segments[0].isSegmentCompleted()) readiedSegments.push_back(0);
+}
+
+bool Task::peekSegmentReady(SegmentIndex_t segment) {
+    return segments[segment].isSegmentMarkedReady() || unfinishedPredecessors[segment] == 0;
+}
+
+void Task::checkPendingSegments() {
+    if (pendingSegments.empty()) return;
+    std::sort(pendingSegments.begin(), pendingSegments.end());
+    pendingSegments.erase(std::unique(pendingSegments.begin(), pendingSegments.end()), pendingSegments.end());
+    for (SegmentIndex_t segment: pendingSegments)
+        if (!segments[segment].isSegmentCompleted()) isSegmentReady(segment);
+    pendingSegments.clear();
+}
+
+void Task::recordProgress(SegmentIndex_t segment, SegmentLength_t remainBefore) {
+    Segment & seg = segments[segment];
+    auto started = std::find(startedSegments.begin(), startedSegments.end(), segment);
+    if (seg.isSegmentCompleted()) {
+        if (started != startedSegments.end()) startedSegments.erase(started);
+        completedLength += segmentLengths[segment];
+        completedSegmentCount++;
+        auto ready = std::lower_bound(readySegments.begin(), readySegments.end(), segment);
+        if (ready != readySegments.end() && *ready == segment) readySegments.erase(ready);
+        buildDependencyGraph();
+        for (unsigned int i = successorOffsets[segment]; i < successorOffsets[segment+1]; i++)
+            if (--unfinishedPredecessors[successorIndices[i]] == 0) pendingSegments.push_back(successorIndices[i]);
+    } else if (started == startedSegments.end() && seg.querySegmentRemainLength() != remainBefore) {
+        startedSegments.push_back(segment);
+    }
+}
+
 /**
  * @brief check the task state and update internal storage.
- * @attention different from querying, will detail examine each segments
+ * @attention different from querying, marks the segments readied since the last check
 */
 TaskState_t Task::checkTaskStates() {
-    readySegments.clear();
-    readySegments.reserve(segments.size());
-    TaskState_t res = TASKS_UNKNOWN;
-    
-    executedLength = 0;
-    for (SegmentIndex_t i = 0; i < segments.size(); i++) {
-        executedLength += segments[i].querySegmentLength() - segments[i].querySegmentRemainLength();
-        if (!segments[i].isSegmentCompleted()) {
-            if (isSegmentReady(i)) {
-                res = TASKS_READY;
-                readySegments.push_back(i);
-            }
-        }
-    }
-    if (executedLength == querySegmentExecutionTime()) res = TASKS_FINISHED;
+    checkPendingSegments();
+    TaskState_t res = readySegments.empty() ? TASKS_UNKNOWN : TASKS_READY;
+
+    executedLength = queryProgressedLength();
+    if (executedLength == segmentExecutionTime) res = TASKS_FINISHED;
     taskState = res;
     return res;
 }
 
+SegmentLength_t Task::queryProgressedLength() const {
+    SegmentLength_t length = completedLength;
+    for (SegmentIndex_t i: startedSegments)
+        length += segmentLengths[i] - segments[i].querySegmentRemainLength();
+    return length;
+}
+
 void Task::setTaskIndex(TaskIndex_t index) {
     this->taskIndex = index;
 }
 
 Segment & Task::createNewSegment(ProcessorAffinity_t processorAffinity, SegmentLength_t segmentLength) {
+    segmentLength *= timeResolution;
     if (processorAffinity==CPU || processorAffinity==CPUBigCore || processorAffinity==CPULittleCore)
-        this->segments.push_back(Segment(segmentLength, processorAffinity, SegmentPreemption_t::PREEMPTIVE));
+        this->segments.push_back(Segment(SegmentPreemption_t::PREEMPTIVE));
     else
-        this->segments.push_back(Segment(segmentLength, processorAffinity, SegmentPreemption_t::NONPREEMPTIVE));
+        this->segments.push_back(Segment(SegmentPreemption_t::NONPREEMPTIVE));
     segments.back().setSegmentIndex(segments.size()-1);
+    segmentLengths.push_back(segmentLength);
+    segmentAffinities.push_back(processorAffinity);
+    predecessorOffsets.push_back(predecessorOffsets.back());
+    successorOffsets.push_back(successorOffsets.back());
+    successorCounts.push_back(0);
     this->segmentExecutionTime += segmentLength;
+    // a new segment has no remaining length, i.e. counts as completed until the release
+    unfinishedPredecessors.push_back(0);
+    completedLength += segmentLength;
+    completedSegmentCount++;
     return segments.back();
 }
 
 bool Task::initializeTaskByVector(std::vector<ProcessorAffinity_t> & processorType,
                                   std::vector<SegmentLength_t> & segments) {
     this->segments.clear();
-    this->segments.reserve(segments.size());
+    segmentLengths.clear();
+    segmentAffinities.clear();
+    unfinishedPredecessors.clear();
+    successorCounts.clear();
+    initStorage(segments.size());
+    segmentExecutionTime = 0;
+    pendingSegments.clear();
+    startedSegments.clear();
+    readySegments.clear();
+    completedLength = 0;
+    completedSegmentCount = 0;
 
     // Insert segments into the tasks
     // Configure the dependencies
@@ -67,84 +128,164 @@ bool Task::initializeTaskByVector(std::vector<ProcessorAffinity_t> & processorTy
     }
     // self-suspension model, parallism = 1
     maxParallism = 1;
-    segmentExecutionTime = querySegmentExecutionTime();
     return true;
 }
 
 
-SegmentLength_t Task::querySegmentExecutionTime() const {
-    SegmentLength_t totalSegmentLength = 0;
-    for (auto seg : segments)
-        totalSegmentLength += seg.querySegmentLength();
-    return totalSegmentLength;
-}
-
 double Task::queryTaskUtilization() {
-    return querySegmentExecutionTime() / double(taskPeriod);
+    return segmentExecutionTime / double(taskPeriod * timeResolution);
 }
 
 double Task::querySingleTaskUtilization(ProcessorAffinity_t processorAffinity) {
     SegmentLength_t totalSegmentLength = 0;
-    for (Segment & seg : segments)
-        if (seg.querySegmentProcessorAffinity()==processorAffinity)
-            totalSegmentLength += seg.querySegmentLength();
-    return totalSegmentLength / double(taskPeriod);
+    for (SegmentIndex_t i = 0; i < segmentLengths.size(); i++)
+        if (segmentAffinities[i]==processorAffinity)
+            totalSegmentLength += segmentLengths[i];
+    return totalSegmentLength / double(taskPeriod * timeResolution);
 }
 
 
-bool Task::releaseTask(TimeStamp_t currentTime) {
-    if (!resetTask()) return false;
+bool Task::releaseTask(TimeStamp_t currentTime, TimeStamp_t arrivalTime) {
+    if (!resetTask()) {
+        // the segments reset before the failing one can run again, mark the ready ones
+        // now, as the replies do, so the ready list and the events see them at once
+        checkPendingSegments();
+        return false;
+    }
     
     setFirstSegmentReady();
-    taskAbsoluteDeadline = taskPeriod + currentTime;
+    // The other source segments are ready at release as well.
+    for (SegmentIndex_t i = 1; i < segments.size(); i++)
+        if (predecessorOffsets[i] == predecessorOffsets[i+1]) isSegmentReady(i);
+    setJobArrival(arrivalTime);
     this->taskState = TaskState_t::TASKS_READY;
     return true;
 }
 
+void Task::clearJob() {
+    for (Segment & segment: segments) segment.clearSegment();
+    readySegments.clear();
+    readiedSegments.clear();
+    pendingSegments.clear();
+    startedSegments.clear();
+    unfinishedPredecessors.assign(segments.size(), 0);
+    completedLength = executedLength = segmentExecutionTime;
+    completedSegmentCount = segments.size();
+    taskState = TASKS_FINISHED;
+}
+
 
-bool Task::checkWhetherMissDDL(TimeStamp_t currentTime) {
+bool Task::checkWhetherMissDDL(TimeStamp_t currentTime, SegmentLength_t executedBefore) {
+    // a job finished by a compressed time unit still runs through the original ones before
+    if (executedBefore < segmentExecutionTime && wouldMissDDLBetween(currentTime, executedBefore, executedLength)) {
+        taskState = TASKS_MISSDDL;
+        return true;
+    }
     if (taskState == TASKS_FINISHED) return false;
     bool res = (currentTime > taskAbsoluteDeadline);
     if (res) taskState = TASKS_MISSDDL;
-    res = (currentTime + (segmentExecutionTime - executedLength)/maxParallism > taskAbsoluteDeadline);
+    res = wouldMissDDL(currentTime, executedLength);
     if (res) taskState = TASKS_MISSDDL;
     return res;
 }
 
 
-bool Task::isAllSegmentsCompleted() {
-    for (Segment & seg : segments)
-        if (!seg.isSegmentCompleted()) return false;
-    return true;
+bool Task::wouldMissDDL(TimeStamp_t currentTime, SegmentLength_t executedLength) const {
+    // in the original time units, the division rounds the same as without compression
+    return currentTime*timeScale + (segmentExecutionTime - executedLength)*timeScale/(maxParallism*timeResolution)
+           > taskAbsoluteDeadline*timeScale;
 }
 
-bool Task::executeSegment(SegmentIndex_t segmentIndex, TimeStamp_t timeStamp) {
-    bool res = segments[segmentIndex].executeSegment(timeStamp);
-    if (!res) return false;
-    if (segments[segmentIndex].isSegmentCompleted()) {
-        for (SegmentIndex_t & segInd: successiveSegments[segmentIndex]) {
-            isSegmentReady(segInd);
-        }
-        segments[segmentIndex].setCurrentProcessorIndex(999999);
+bool Task::wouldMissDDLBetween(TimeStamp_t currentTime, SegmentLength_t executedBefore,
+                               SegmentLength_t executedAfter) const {
+    if (timeScale <= 1 || currentTime == 0) return false;
+    executedAfter = std::max(executedAfter, executedBefore);
+    // the test grows by one per original time unit and drops by the progress divided
+    // down, it is monotonic between the time stamps: the first and the last unit suffice
+    for (TimeStamp_t unit: {TimeStamp_t(1), timeScale - 1}) {
+        SegmentLength_t executed = executedBefore*timeScale + unit*(executedAfter - executedBefore);
+        if ((currentTime - 1)*timeScale + unit
+            + (segmentExecutionTime*timeScale - executed)/(maxParallism*timeResolution)
+            > taskAbsoluteDeadline*timeScale) return true;
     }
-    return res;
+    return false;
+}
+
+TimeStamp_t Task::queryDeadlineCheckTime() const {
+    if (taskState == TASKS_FINISHED) return NO_DEADLINE_CHECK;
+    // the first time stamp with currentTime*timeScale + remaining > deadline*timeScale
+    TimeStamp_t remaining = (segmentExecutionTime - executedLength)*timeScale/(maxParallism*timeResolution);
+    TimeStamp_t deadline = taskAbsoluteDeadline*timeScale;
+    if (remaining > deadline) return 0;
+    return (deadline - remaining)/timeScale + 1;
+}
+
+bool Task::executeSegment(SegmentIndex_t segmentIndex, TimeStamp_t timeStamp,
+                          unsigned int variation, unsigned int parallelDiscount) {
+    SegmentLength_t remainBefore = segments[segmentIndex].querySegmentRemainLength();
+    if (!segments[segmentIndex].executeSegment(timeStamp, variation, parallelDiscount, timeResolution)) return false;
+    recordProgress(segmentIndex, remainBefore);
+    return true;
+}
+
+void Task::executeSegmentFor(SegmentIndex_t segmentIndex, TimeStamp_t timeStamp, TimeStamp_t ticks) {
+    SegmentLength_t remainBefore = segments[segmentIndex].querySegmentRemainLength();
+    segments[segmentIndex].executeSegmentFor(timeStamp, ticks, timeResolution);
+    recordProgress(segmentIndex, remainBefore);
 }
 
 bool Task::executeFirstReadySegment(TimeStamp_t timeStamp) {
     for (SegmentIndex_t i = 0; i < segments.size(); i++)
         if (isSegmentReady(i))
-            return segments[i].executeSegment(timeStamp);
+            return executeSegment(i, timeStamp);
     return false;
 }
 
 
 bool Task::resetTask(bool enforce) {
+    buildDependencyGraph();
     executedLength = 0;
-    for (Segment & seg : segments)
-       if (!seg.resetSegment(enforce)) return false;
+    readiedSegments.clear();
+    for (SegmentIndex_t i = 0; i < segments.size(); i++) {
+        Segment & seg = segments[i];
+        bool completed = seg.isSegmentCompleted();
+        bool ready = seg.isSegmentMarkedReady();
+        if (!seg.resetSegment(segmentLengths[i], enforce)) return false;
+        if (ready && !completed) {
+            auto position = std::lower_bound(readySegments.begin(), readySegments.end(), i);
+            if (position != readySegments.end() && *position == i) readySegments.erase(position);
+        }
+        if (!completed) {
+            auto started = std::find(startedSegments.begin(), startedSegments.end(), i);
+            if (started != startedSegments.end()) startedSegments.erase(started);
+        } else if (!seg.isSegmentCompleted()) {
+            completedLength -= segmentLengths[i];
+            completedSegmentCount--;
+            for (unsigned int j = successorOffsets[i]; j < successorOffsets[i+1]; j++)
+                unfinishedPredecessors[successorIndices[j]]++;
+        }
+        if (!seg.isSegmentCompleted()) pendingSegments.push_back(i);
+    }
     return true;
 }
 
+void Task::compressTimeBase(TimeStamp_t divisor) {
+    taskPeriod /= divisor;
+    taskRelativeDeadline /= divisor;
+    taskAbsoluteDeadline /= divisor;
+    taskExecutionTime /= divisor;
+    releaseOffset /= divisor;
+    jobArrival /= divisor;
+    nextArrival /= divisor;
+    nextRelease /= divisor;
+    segmentExecutionTime /= divisor;
+    executedLength /= divisor;
+    completedLength /= divisor;
+    for (SegmentLength_t & length: segmentLengths) length /= divisor;
+    for (Segment & segment: segments) segment.compressTimeBase(divisor);
+    timeScale *= divisor;
+}
+
 bool Task::isInsideProcessorMasks(processor::ProcessorIndex_t processorGlobalIndex) {
     for (ProcessorIndex_t index : processorMasks)
         if (processorGlobalIndex == index)
@@ -153,10 +294,72 @@ bool Task::isInsideProcessorMasks(processor::ProcessorIndex_t processorGlobalInd
 }
 
 void Task::setSegmentDependency(SegmentIndex_t segment1, SegmentIndex_t segment2) {
-    precedingSegments[segment2].push_front(segment1);
-    successiveSegments[segment1].push_front(segment2);
-    if (successiveSegments[segment1].size() > maxParallism)
-        maxParallism = successiveSegments[segment1].size();
+    pendingDependencies.push_back({segment1, segment2});
+    if (!segments[segment1].isSegmentCompleted()) unfinishedPredecessors[segment2]++;
+    if (++successorCounts[segment1] > maxParallism)
+        maxParallism = successorCounts[segment1];
+}
+
+void Task::buildDependencyGraph() {
+    if (pendingDependencies.empty()) return;
+    SegmentIndex_t segmentCount = segments.size();
+    // Count the row lengths, then place the old and the new entries of each row.
+    std::vector<unsigned int> predecessorCounts(segmentCount, 0);
+    for (SegmentIndex_t i = 0; i < segmentCount; i++)
+        predecessorCounts[i] = predecessorOffsets[i+1] - predecessorOffsets[i];
+    for (const SegmentDependency & dependency: pendingDependencies) predecessorCounts[dependency.to]++;
+
+    std::vector<unsigned int> newPredecessorOffsets(segmentCount+1, 0);
+    std::vector<unsigned int> newSuccessorOffsets(segmentCount+1, 0);
+    for (SegmentIndex_t i = 0; i < segmentCount; i++) {
+        newPredecessorOffsets[i+1] = newPredecessorOffsets[i] + predecessorCounts[i];
+        newSuccessorOffsets[i+1] = newSuccessorOffsets[i] + successorCounts[i];
+    }
+    std::vector<SegmentIndex_t> newPredecessorIndices(newPredecessorOffsets.back());
+    std::vector<SegmentIndex_t> newSuccessorIndices(newSuccessorOffsets.back());
+    std::vector<unsigned int> predecessorEnds(newPredecessorOffsets.begin(), newPredecessorOffsets.end()-1);
+    std::vector<unsigned int> successorEnds(newSuccessorOffsets.begin(), newSuccessorOffsets.end()-1);
+    for (SegmentIndex_t i = 0; i < segmentCount; i++) {
+        for (unsigned int j = predecessorOffsets[i]; j < predecessorOffsets[i+1]; j++)
+            newPredecessorIndices[predecessorEnds[i]++] = predecessorIndices[j];
+        for (unsigned int j = successorOffsets[i]; j < successorOffsets[i+1]; j++)
+            newSuccessorIndices[successorEnds[i]++] = successorIndices[j];
+    }
+    for (const SegmentDependency & dependency: pendingDependencies) {
+        newPredecessorIndices[predecessorEnds[dependency.to]++] = dependency.from;
+        newSuccessorIndices[successorEnds[dependency.from]++] = dependency.to;
+    }
+
+    predecessorOffsets.swap(newPredecessorOffsets);
+    predecessorIndices.swap(newPredecessorIndices);
+    successorOffsets.swap(newSuccessorOffsets);
+    successorIndices.swap(newSuccessorIndices);
+    pendingDependencies.clear();
+}
+
+void Task::queryPathSegmentCounts(std::vector<unsigned int> & preceding, std::vector<unsigned int> & following) {
+    buildDependencyGraph();
+    SegmentIndex_t segmentCount = segments.size();
+    // topological order by the remaining predecessor counts
+    std::vector<SegmentIndex_t> order;
+    order.reserve(segmentCount);
+    std::vector<unsigned int> remaining(segmentCount);
+    for (SegmentIndex_t i = 0; i < segmentCount; i++) {
+        remaining[i] = predecessorOffsets[i+1] - predecessorOffsets[i];
+        if (remaining[i] == 0) order.push_back(i);
+    }
+    for (size_t head = 0; head < order.size(); head++)
+        for (unsigned int j = successorOffsets[order[head]]; j < successorOffsets[order[head]+1]; j++)
+            if (--remaining[successorIndices[j]] == 0) order.push_back(successorIndices[j]);
+
+    preceding.assign(segmentCount, 0);
+    following.assign(segmentCount, 0);
+    for (SegmentIndex_t i: order)
+        for (unsigned int j = successorOffsets[i]; j < successorOffsets[i+1]; j++)
+            preceding[successorIndices[j]] = std::max(preceding[successorIndices[j]], preceding[i] + 1);
+    for (auto it = order.rbegin(); it != order.rend(); it++)
+        for (unsigned int j = predecessorOffsets[*it]; j < predecessorOffsets[*it+1]; j++)
+            following[predecessorIndices[j]] = std::max(following[predecessorIndices[j]], following[*it] + 1);
 }
 
 bool Task::setTaskScheduled() {
@@ -170,9 +373,7 @@ bool Task::setTaskPreempted() {
 }
 
 std::vector<SegmentIndex_t> & Task::getReadySegments() {
-    readySegments.clear();
-    for (SegmentIndex_t i = 0; i < segments.size(); i++)
-        if (segments[i].querySegmentRemainLength()!=0 && isSegmentReady(i)) readySegments.push_back(i);
+    checkPendingSegments();
     return readySegments;
 }
 
@@ -187,15 +388,26 @@ Segment * Task::getFirstReadySegment() {
 Segment * Task::getFirstReadySegment(ProcessorAffinity_t processorAffinity) {
     getReadySegments();
     for (SegmentIndex_t & i : readySegments)
-        if (segments[i].querySegmentProcessorAffinity()==processorAffinity)
+        if (segmentAffinities[i]==processorAffinity)
             if (segments[i].queryCurrentProcessorIndex() == 999999)
                 return &(segments[i]);
     return nullptr;
 }
 
-void Task::initStorage(int buffersize) {
-    precedingSegments.resize(buffersize);
-    successiveSegments.resize(buffersize);
-    for (auto & seg: precedingSegments) seg.clear();
-    for (auto & seg: successiveSegments) seg.clear();
+void Task::initStorage(unsigned int segmentCount) {
+    predecessorOffsets.assign(segments.size()+1, 0);
+    successorOffsets.assign(segments.size()+1, 0);
+    predecessorIndices.clear();
+    successorIndices.clear();
+    pendingDependencies.clear();
+    for (auto & count: successorCounts) count = 0;
+    for (auto & count: unfinishedPredecessors) count = 0;
+
+    segments.reserve(segmentCount);
+    segmentLengths.reserve(segmentCount);
+    segmentAffinities.reserve(segmentCount);
+    unfinishedPredecessors.reserve(segmentCount);
+    successorCounts.reserve(segmentCount);
+    predecessorOffsets.reserve(segmentCount+1);
+    successorOffsets.reserve(segmentCount+1);
 }
\ No newline at end of file
@@ -6,7 +6,6 @@ Copy Right. The EHPCL Authors.
 #define TASK_H
 
 #include <vector>
-#include <list>
 
 #include "segment.h"
 #include "affinity.h"
@@ -28,6 +27,12 @@ enum TaskRTProperty_t {
 
 typedef unsigned int TaskIndex_t;
 
+/// @brief Segment to depends on segment from.
+struct SegmentDependency {
+    SegmentIndex_t from;
+    SegmentIndex_t to;
+};
+
 enum SSTaskState_t {
     SS_EXECUTING,
     SS_SUSPENSION,
@@ -81,8 +86,25 @@ protected:
 
     // Internal storage, the instances of segments
     std::vector<Segment> segments = {};
-    std::vector<std::list<SegmentIndex_t>> precedingSegments = {};
-    std::vector<std::list<SegmentIndex_t>> successiveSegments = {};
+    // Fixed properties of the segments as flat arrays, indexed by the segment index;
+    // the only copy, the segments keep the state changed by the simulation.
+    std::vector<SegmentLength_t> segmentLengths = {};
+    std::vector<ProcessorAffinity_t> segmentAffinities = {};
+
+    // Dependencies in compressed sparse row form: the predecessors of segment i are
+    // predecessorIndices[predecessorOffsets[i]] ... predecessorIndices[predecessorOffsets[i+1]-1],
+    // the successors likewise. New segments get empty rows.
+    std::vector<unsigned int> predecessorOffsets = {0};
+    std::vector<SegmentIndex_t> predecessorIndices = {};
+    std::vector<unsigned int> successorOffsets = {0};
+    std::vector<SegmentIndex_t> successorIndices = {};
+    // Dependencies set since the rows were last built, see buildDependencyGraph.
+    std::vector<SegmentDependency> pendingDependencies = {};
+    // Number of successors of each segment, including the pending dependencies.
+    std::vector<unsigned int> successorCounts = {};
+
+    /// @brief Merge the pending dependencies into the rows, in O(segments + dependencies).
+    void buildDependencyGraph();
 
     // Internal fixed properties
     SegmentLength_t segmentExecutionTime = 0;
@@ -109,10 +131,55 @@ protected:
     bool taskCompleted = false;
 
     std::vector<SegmentState_t> segmentStates;
+    // Segments marked ready and not completed, in index order.
     std::vector<SegmentIndex_t> readySegments = {};
+    // Segments marked ready since the simulator last collected them.
+    std::vector<SegmentIndex_t> readiedSegments = {};
+
+    // Incremental bookkeeping, updated only when a segment executes, completes or is reset.
+    // Number of unfinished preceding segments of each segment.
+    std::vector<unsigned int> unfinishedPredecessors = {};
+    // Segments whose predecessors may have all finished since the last check.
+    std::vector<SegmentIndex_t> pendingSegments = {};
+    // Partially executed segments, their progress is summed by checkTaskStates.
+    std::vector<SegmentIndex_t> startedSegments = {};
+    SegmentLength_t completedLength = 0;
+    unsigned int completedSegmentCount = 0;
+
+    /// @brief Mark the segment ready, add it to the ready lists unless completed.
+    void setSegmentReady(SegmentIndex_t segmentIndex);
+
+    /// @brief isSegmentReady on the pending segments, in index order.
+    void checkPendingSegments();
+
+    /// @brief Update the bookkeeping after the segment progressed from remainBefore.
+    void recordProgress(SegmentIndex_t segmentIndex, SegmentLength_t remainBefore);
+
+    // Simulator-wide version of the last change on this task.
+    unsigned long long stateVersion = 0;
+
+    // Original time units per simulated time unit, see compressTimeBase.
+    TimeStamp_t timeScale = 1;
+
+    // Sub-ticks per time unit of the lengths, see Simulator::setTimeResolution.
+    TimeStamp_t timeResolution = 1;
+
+    // Release model, see Simulator::setTaskRelease: first arrival, largest delay of a
+    // release after its arrival, largest time added to the period between two arrivals.
+    TimeStamp_t releaseOffset = 0;
+    TimeStamp_t releaseJitter = 0;
+    TimeStamp_t sporadicSlack = 0;
+    // Arrival of the current job, its deadline is one period later.
+    TimeStamp_t jobArrival = 0;
+    // Arrival of the next job and its release, later than the arrival once a jitter is drawn.
+    TimeStamp_t nextArrival = 0;
+    TimeStamp_t nextRelease = 0;
 
 public:
 
+    static const TimeStamp_t NO_DEADLINE_CHECK = ~0ULL;
+
+    /// @param segmentLength in time units, stored in sub-ticks
     Segment & createNewSegment(ProcessorAffinity_t processorAffinity, SegmentLength_t segmentLength);
 
     /**
@@ -126,6 +193,7 @@ public:
 
     TimeStamp_t queryTaskPeriod() {return taskPeriod;}
     TimeStamp_t queryTaskRelativeDeadline() {return taskRelativeDeadline;}
+    TimeStamp_t queryTaskAbsoluteDeadline() {return taskAbsoluteDeadline;}
     TaskRTPriority_t queryTaskRTPriority() {return taskPriority;}
     void setTaskPeriod(TimeStamp_t taskPeriod) {this->taskPeriod = taskPeriod;};
     void setTaskRelativeDeadline(TimeStamp_t deadline) {this->taskRelativeDeadline = deadline;};
@@ -137,21 +205,74 @@ public:
     double queryTaskUtilization();
     double querySingleTaskUtilization(ProcessorAffinity_t processorAffinity);
 
-    bool releaseTask(TimeStamp_t currentTime);
+    /// @param arrivalTime arrival of the job, at or before the current time with a jitter
+    bool releaseTask(TimeStamp_t currentTime, TimeStamp_t arrivalTime);
+
+    /// @brief Take the arrival of the current job and its deadline one period later.
+    void setJobArrival(TimeStamp_t arrivalTime) {jobArrival = arrivalTime; taskAbsoluteDeadline = arrivalTime + taskPeriod;}
+    TimeStamp_t queryJobArrival() {return jobArrival;}
+
+    /**
+     * @brief Drop the current job without releasing another one, e.g. before the first
+     * arrival after a reset: all the segments count as completed.
+    */
+    void clearJob();
+
+    /// @brief Set the release model and start over from the first arrival, see Simulator::setTaskRelease.
+    void setReleaseModel(TimeStamp_t offset, TimeStamp_t jitter, TimeStamp_t slack) {
+        releaseOffset = offset;
+        releaseJitter = jitter;
+        sporadicSlack = slack;
+        restartReleases();
+    }
+    /// @brief Back to the first arrival, without a job before it.
+    void restartReleases() {nextArrival = nextRelease = releaseOffset; jobArrival = taskAbsoluteDeadline = 0;}
+    TimeStamp_t queryReleaseOffset() {return releaseOffset;}
+    TimeStamp_t queryReleaseJitter() {return releaseJitter;}
+    TimeStamp_t querySporadicSlack() {return sporadicSlack;}
+    /// @brief True if the releases are drawn, i.e. with a jitter or sporadic arrivals.
+    bool hasRandomReleases() {return releaseJitter > 0 || sporadicSlack > 0;}
+
+    TimeStamp_t queryNextArrival() {return nextArrival;}
+    TimeStamp_t queryNextRelease() {return nextRelease;}
+    void setNextArrival(TimeStamp_t arrivalTime) {nextArrival = nextRelease = arrivalTime;}
+    /// @brief Release the next job the given time after its arrival.
+    void delayNextRelease(TimeStamp_t delay) {nextRelease = nextArrival + delay;}
     
     TaskState_t checkTaskStates();
     TaskState_t queryTaskState() {return taskState;}
     SegmentLength_t queryExecutedSegLength() {return executedLength;}
+    // the executed length checkTaskStates would count now, without changing the state
+    SegmentLength_t queryProgressedLength() const;
     void setTaskState(TaskState_t state) {taskState = state;}
     
-    bool isAllSegmentsCompleted();
+    bool isAllSegmentsCompleted() {return completedSegmentCount == segments.size();}
     bool isTaskCompleted() {return isAllSegmentsCompleted();}
     
-    // true if miss
-    bool checkWhetherMissDDL(TimeStamp_t currentTime);
+    // true if miss, executedBefore is the executed length at the previous time stamp
+    bool checkWhetherMissDDL(TimeStamp_t currentTime, SegmentLength_t executedBefore);
+    // same test as checkWhetherMissDDL for a given executed length, without changing the state
+    bool wouldMissDDL(TimeStamp_t currentTime, SegmentLength_t executedLength) const;
+    /**
+     * @brief With a compressed time base, the same test at the original time units
+     * between the time stamps currentTime - 1 and currentTime, the executed length
+     * growing evenly from executedBefore to executedAfter. False without compression.
+    */
+    bool wouldMissDDLBetween(TimeStamp_t currentTime, SegmentLength_t executedBefore,
+                             SegmentLength_t executedAfter) const;
+    /**
+     * @brief Earliest time stamp checkWhetherMissDDL may report a miss at with the current
+     * executed length, NO_DEADLINE_CHECK if finished. The executed length only grows
+     * until the next release, so the miss cannot come earlier.
+    */
+    TimeStamp_t queryDeadlineCheckTime() const;
 
     unsigned int querySegmentCount() {return segments.size();};
-    SegmentLength_t querySegmentExecutionTime() const;
+    SegmentLength_t querySegmentLength(SegmentIndex_t segmentIndex) const {return segmentLengths[segmentIndex];}
+    ProcessorAffinity_t querySegmentProcessorAffinity(SegmentIndex_t segmentIndex) const
+        {return segmentAffinities[segmentIndex];}
+    unsigned int queryDependencyCount() {return successorIndices.size() + pendingDependencies.size();};
+    SegmentLength_t querySegmentExecutionTime() const {return segmentExecutionTime;}
 
     // TODO: improve task status printing
     friend std::ostream & operator<<(std::ostream & os, const Task & task) {
@@ -176,20 +297,37 @@ public:
     }
 
     bool isSegmentReady(SegmentIndex_t segmentIndex);
+    // Same result as isSegmentReady, without marking the segment ready.
+    bool peekSegmentReady(SegmentIndex_t segmentIndex);
     /**
      * @brief Execute the given segment by 1 unit, need to take the preemption into account.
+     * The successors of a completed segment are marked ready by the next checkTaskStates.
      * @return True if segment is succuessfully executed, otherwise false.
     */
-    bool executeSegment(SegmentIndex_t segmentIndex, TimeStamp_t timeStamp);
+    bool executeSegment(SegmentIndex_t segmentIndex, TimeStamp_t timeStamp,
+                        unsigned int variation = 0, unsigned int parallelDiscount = 0);
+    /// @brief Same as Segment::executeSegmentFor, keeping the bookkeeping of the task.
+    void executeSegmentFor(SegmentIndex_t segmentIndex, TimeStamp_t timeStamp, TimeStamp_t ticks);
     bool executeFirstReadySegment(TimeStamp_t timeStamp);
 
     bool resetTask(bool enforce = false);
 
+    /**
+     * @brief Divide the periods, deadlines and lengths by the divisor, which must divide
+     * them all. The deadline miss test is still made in the original time units.
+    */
+    void compressTimeBase(TimeStamp_t divisor);
+    TimeStamp_t queryTimeScale() {return timeScale;}
+
+    /// @brief Only before the first segment is created, see Simulator::setTimeResolution.
+    void setTimeResolution(TimeStamp_t resolution) {timeResolution = resolution;}
+    TimeStamp_t queryTimeResolution() const {return timeResolution;}
+
     // Default constructor: create an empty task
-    Task() {segments.reserve(10);};
+    Task() {};
     Task(TaskRTPriority_t taskPriority, TimeStamp_t taskPeriod):
     taskPriority(taskPriority), taskPeriod(taskPeriod), taskRealTimeProperty(HARDRT)
-    {segments.reserve(10);};
+    {};
 
     void setProcessorMasks(std::vector<unsigned int> & processorMasks)
         {this->processorMasks = processorMasks;};
@@ -201,7 +339,13 @@ public:
     bool setTaskScheduled();
     // consider changes on heter ss task
     bool setTaskPreempted();
-    void setFirstSegmentReady() {segments[0].markSegmentReady();}
+    void setFirstSegmentReady();
+
+    std::vector<SegmentIndex_t> & queryReadiedSegments() {return readiedSegments;}
+    void clearReadiedSegments() {readiedSegments.clear();}
+
+    unsigned long long queryStateVersion() {return stateVersion;}
+    void setStateVersion(unsigned long long version) {stateVersion = version;}
 
     /**
      * @brief Configure dependency: seg2 depends on seg1
@@ -213,13 +357,60 @@ public:
     Segment * getFirstReadySegment(ProcessorAffinity_t processorAffinity);
     Segment & getSegment(SegmentIndex_t segmentIndex) {return segments[segmentIndex];}
 
+    /**
+     * @brief Longest paths through the dependencies counted in segments, e.g. for the
+     * pre-deadlines of DAG EDF, see NativePolicy.
+     * @param preceding segments before each segment on its longest path from a source
+     * @param following segments after each segment on its longest path to a sink
+    */
+    void queryPathSegmentCounts(std::vector<unsigned int> & preceding, std::vector<unsigned int> & following);
+
     bool setMaxParallism(int parallism) {
         if (parallism> this->maxParallism) this->maxParallism = parallism;
         else return false;
         return true;
     }
 
-    void initStorage(int buffersize = 10);
+    /**
+     * @brief Drop the dependencies and reserve the storage of segmentCount segments.
+     * @param segmentCount expected number of segments, 0 if unknown
+    */
+    void initStorage(unsigned int segmentCount = 0);
+
+    /// @brief Every field in order, see checkpoint.h
+    template <class Archive>
+    void checkpointFields(Archive & archive) {
+        archive(segments, segmentLengths, segmentAffinities, predecessorOffsets, predecessorIndices,
+                successorOffsets, successorIndices, pendingDependencies, successorCounts, segmentExecutionTime,
+                taskRealTimeProperty, taskIndex, maxParallism, taskRelativeDeadline,
+                taskAbsoluteDeadline, taskExecutionTime, taskPeriod, taskPriority,
+                taskSchedulePolicy, taskState, executedLength, processorMaskEnabled,
+                processorMasks, taskCompleted, segmentStates, readySegments,
+                readiedSegments, stateVersion, unfinishedPredecessors, pendingSegments,
+                startedSegments, completedLength, completedSegmentCount, timeScale, timeResolution,
+                releaseOffset, releaseJitter, sporadicSlack, jobArrival, nextArrival, nextRelease);
+    }
+
+    /// @brief The fields changed by the simulation, see Simulator::pushState
+    template <class Archive>
+    void stateFields(Archive & archive) {
+        archive(maxParallism, taskAbsoluteDeadline, taskExecutionTime, taskPriority, taskState,
+                executedLength, taskCompleted, segmentStates, readySegments, readiedSegments,
+                unfinishedPredecessors, pendingSegments, startedSegments, completedLength,
+                completedSegmentCount, jobArrival, nextArrival, nextRelease);
+        for (auto & segment: segments) segment.stateFields(archive);
+    }
+
+    /// @brief The stateFields relative to the time stamp, see Simulator::checkSteadyState
+    template <class Archive>
+    void steadyStateFields(Archive & archive, TimeStamp_t timeStamp) {
+        TimeStamp_t deadline = taskAbsoluteDeadline - timeStamp;
+        TimeStamp_t arrival = nextArrival - timeStamp, release = nextRelease - timeStamp;
+        archive(deadline, arrival, release, maxParallism, taskPriority, taskState, executedLength, taskCompleted,
+                segmentStates, readySegments, readiedSegments, unfinishedPredecessors, pendingSegments,
+                startedSegments, completedLength, completedSegmentCount);
+        for (auto & segment: segments) segment.steadyStateFields(archive, timeStamp);
+    }
 };
 
 class SSTask : public Task {
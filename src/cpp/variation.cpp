@@ -0,0 +1,127 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#include <algorithm>
+#include <cmath>
+
+#include "task.h"
+#include "variation.h"
+
+namespace {
+
+uint64_t rotateLeft(uint64_t value, int bits) {
+    return (value << bits) | (value >> (64 - bits));
+}
+
+uint64_t splitMix64(uint64_t & value) {
+    uint64_t result = (value += 0x9e3779b97f4a7c15ULL);
+    result = (result ^ (result >> 30)) * 0xbf58476d1ce4e5b9ULL;
+    result = (result ^ (result >> 27)) * 0x94d049bb133111ebULL;
+    return result ^ (result >> 31);
+}
+
+}
+
+void ExecutionVariation::setSeed(uint64_t newSeed) {
+    seed = newSeed;
+    uint64_t value = newSeed;
+    for (uint64_t & word: state) word = splitMix64(value);
+}
+
+uint64_t ExecutionVariation::next() {
+    uint64_t result = rotateLeft(state[1] * 5, 7) * 9;
+    uint64_t shifted = state[1] << 17;
+    state[2] ^= state[0];
+    state[3] ^= state[1];
+    state[1] ^= state[2];
+    state[0] ^= state[3];
+    state[2] ^= shifted;
+    state[3] = rotateLeft(state[3], 45);
+    return result;
+}
+
+double ExecutionVariation::nextUniform() {
+    return (next() >> 11) * 0x1.0p-53;
+}
+
+double ExecutionVariation::nextNormal() {
+    // Box-Muller, 1 - u keeps the logarithm finite
+    double radius = std::sqrt(-2.0 * std::log(1.0 - nextUniform()));
+    return radius * std::cos(2.0 * M_PI * nextUniform());
+}
+
+bool ExecutionVariation::setDistribution(VariationScope_t newScope, VariationDistribution_t newDistribution,
+                                         const std::vector<double> & newParameters) {
+    std::vector<double> weights = {};
+    switch (newDistribution) {
+        case NONE:
+            if (!newParameters.empty()) return false;
+            break;
+        case UNIFORM:
+            if (newParameters.size() != 2) return false;
+            if (!(newParameters[0] > 0 && newParameters[0] <= newParameters[1])) return false;
+            break;
+        case NORMAL:
+        case LOGNORMAL:
+            if (newParameters.size() != 4 || !(newParameters[1] >= 0)) return false;
+            if (!(newParameters[2] > 0 && newParameters[2] <= newParameters[3])) return false;
+            break;
+        case HISTOGRAM: {
+            if (newParameters.empty() || newParameters.size() % 2 != 0) return false;
+            double total = 0;
+            for (size_t i = 0; i < newParameters.size(); i += 2) {
+                if (!(newParameters[i] > 0 && newParameters[i+1] >= 0)) return false;
+                weights.push_back(total += newParameters[i+1]);
+            }
+            if (!(total > 0)) return false;
+            break;
+        }
+        default:
+            return false;
+    }
+    scope = newScope;
+    distribution = newDistribution;
+    parameters = newParameters;
+    cumulativeWeights = weights;
+    return true;
+}
+
+bool ExecutionVariation::isValid() const {
+    ExecutionVariation copy;
+    return copy.setDistribution(scope, distribution, parameters) && copy.cumulativeWeights == cumulativeWeights;
+}
+
+double ExecutionVariation::drawFactor() {
+    switch (distribution) {
+        case UNIFORM:
+            return parameters[0] + (parameters[1] - parameters[0]) * nextUniform();
+        case NORMAL:
+        case LOGNORMAL: {
+            // rejection keeps the shape inside the bounds, give up on far bounds
+            for (int attempt = 0; attempt < 64; attempt++) {
+                double value = parameters[0] + parameters[1] * nextNormal();
+                if (distribution == LOGNORMAL) value = std::exp(value);
+                if (value >= parameters[2] && value <= parameters[3]) return value;
+            }
+            double center = distribution == LOGNORMAL ? std::exp(parameters[0]) : parameters[0];
+            return std::clamp(center, parameters[2], parameters[3]);
+        }
+        case HISTOGRAM: {
+            double position = cumulativeWeights.back() * nextUniform();
+            size_t bin = std::upper_bound(cumulativeWeights.begin(), cumulativeWeights.end(), position)
+                         - cumulativeWeights.begin();
+            return parameters[2 * std::min(bin, cumulativeWeights.size() - 1)];
+        }
+        default:
+            return 1.0;
+    }
+}
+
+void ExecutionVariation::drawJob(Task & task) {
+    double factor = drawFactor();
+    for (SegmentIndex_t i = 0; i < task.querySegmentCount(); i++) {
+        if (scope == PER_SEGMENT && i > 0) factor = drawFactor();
+        task.getSegment(i).setExecutionDraw(1.0 / factor, nextUniform());
+    }
+}
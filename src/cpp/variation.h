@@ -0,0 +1,110 @@
+/*
+Copy Right. The EHPCL Authors.
+*/
+
+#ifndef VARIATION_H
+#define VARIATION_H
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+class Task;
+
+namespace variation {
+
+enum VariationDistribution_t {
+    NONE,
+    UNIFORM,
+    NORMAL,
+    LOGNORMAL,
+    HISTOGRAM
+};
+
+const std::string VariationDistributionNames[5] = {
+    "none",
+    "uniform",
+    "normal",
+    "lognormal",
+    "histogram",
+};
+
+enum VariationScope_t {
+    PER_SEGMENT,
+    PER_JOB
+};
+
+};
+
+using namespace variation;
+
+/**
+ * @brief Seeded execution time variation, drawn once per job release.
+ *
+ * At every release each segment gets a factor of its execution time (1 is the
+ * nominal length, 2 takes twice as long) from the distribution, PER_JOB draws one
+ * factor for all the segments of the job. Each segment also gets a uniform value
+ * in [0, 1) scaling the variation of the processor running it, see
+ * Processor::setExecutionVariation.
+ *
+ * The generator is xoshiro256** and the distributions are computed here rather
+ * than by <random>, so a seed gives the same runs with any standard library.
+*/
+class ExecutionVariation {
+
+    uint64_t seed = 0;
+    uint64_t state[4] = {};
+
+    VariationDistribution_t distribution = NONE;
+    VariationScope_t scope = PER_SEGMENT;
+
+    // uniform: <low> <high>, normal and lognormal: <mean or mu> <stddev or sigma> <low> <high>,
+    // histogram: <value0> <weight0> <value1> <weight1> ...
+    std::vector<double> parameters = {};
+    // Running sums of the histogram weights.
+    std::vector<double> cumulativeWeights = {};
+
+    uint64_t next();
+
+    double nextNormal();
+
+    /// @brief A factor of the distribution, truncated to [low, high] if bounded.
+    double drawFactor();
+
+public:
+
+    ExecutionVariation() {setSeed(0);};
+
+    void setSeed(uint64_t newSeed);
+
+    /// @brief Start the sequence of the current seed again, e.g. on a simulator reset.
+    void restart() {setSeed(seed);};
+
+    /**
+     * @param newParameters see the member parameters, the factors must be positive
+     * @return False, keeping the current distribution, if the parameters are invalid.
+    */
+    bool setDistribution(VariationScope_t newScope, VariationDistribution_t newDistribution,
+                         const std::vector<double> & newParameters);
+
+    /// @brief False if the distribution is inconsistent, e.g. read from a corrupted checkpoint.
+    bool isValid() const;
+
+    /// @brief True if every job runs with the nominal execution time.
+    bool isNominal() const {return distribution == NONE;};
+
+    /// @return Uniform in [0, 1).
+    double nextUniform();
+
+    /// @brief Draw the execution of the job just released.
+    void drawJob(Task & task);
+
+    /// @brief Every field in order, see checkpoint.h
+    template <class Archive>
+    void checkpointFields(Archive & archive) {
+        archive(seed, state, distribution, scope, parameters, cumulativeWeights);
+    }
+
+};
+
+#endif // variation.h
@@ -0,0 +1,225 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+import asyncio
+from contextlib import asynccontextmanager
+from functools import wraps
+
+from client import (_REPLY_HEADER, OP_TEXT, BatchFuture, CommandBatch,
+                    SimulatorClient, cached_build_info, decode_reply, encode_frame,
+                    store_build_info)
+
+# Text replies (e.g. a snapshot) can be longer than the default line limit.
+_STREAM_LIMIT = 1 << 24
+
+
+class _SyncView:
+    """ The async client seen through the methods of `SimulatorClient`: the
+    commands are queued into `client._batch` instead of being sent.
+    """
+
+    def __init__(self, client: 'AsyncSimulatorClient') -> None:
+        object.__setattr__(self, "client", client)
+
+    def __getattr__(self, name: str):
+        attr = getattr(SimulatorClient, name, None)
+        if callable(attr): return attr.__get__(self)
+        return getattr(self.client, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self.client, name, value)
+
+
+def _awaitable(name: str):
+    method = getattr(SimulatorClient, name)
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        async with self.lock:
+            batch = self._batch = CommandBatch(self.view)
+            try:
+                result = method(self.view, *args, **kwargs)
+            finally:
+                self._batch = None
+            await self._flush(batch)
+        return result.result() if isinstance(result, BatchFuture) else result
+    return wrapper
+
+
+class AsyncSimulatorClient:
+    """ asyncio version of `SimulatorClient`, every method is a coroutine with
+    the same arguments and results.
+
+    Examples
+    --------
+    >>> sim = await AsyncSimulatorClient.create("path_to_C++_executable")
+    >>> await sim.start_simulation()
+
+    Notes
+    -----
+    The calls on one client are sent one after the other, use `gather_clients`
+    to run a call on many backends at once.
+    """
+
+    def __init__(self, executable_path, binary: bool = True):
+        # not started yet, see `create`
+        self.executable = executable_path
+        self.procMap = {0: "CPU", 3:"DataCopy", 7: "GPU"}
+        self.use_binary = binary
+        self.binary = False
+        self.alreadyQuit = False
+        self._batch = None
+        self.mirror = None
+        self.process = None
+        self.unit_type = int
+        self.resolution = 1
+        self.lock = asyncio.Lock()
+        self.view = _SyncView(self)
+
+    @classmethod
+    async def create(cls, executable_path, binary: bool = True) -> 'AsyncSimulatorClient':
+        """start the backend and negotiate the protocol"""
+        client = cls(executable_path, binary)
+        await client._spawn()
+        return client
+
+    async def _spawn(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            self.executable,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=None,
+            limit=_STREAM_LIMIT
+        )
+        self.binary = False
+        self.alreadyQuit = False
+        if self.use_binary: await self.negotiate_protocol()
+        await self.check_unit_type()
+
+    def __del__(self):
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.kill()
+            except (ProcessLookupError, RuntimeError):
+                # already gone, or the event loop is closed
+                pass
+
+    async def negotiate_protocol(self) -> bool:
+        self.binary = (await self.send_command("setProtocol binary") == "Binary protocol enabled")
+        return self.binary
+
+    async def check_unit_type(self) -> type:
+        self.build_info = await self.query_build_info()
+        # a fresh backend, one sub-tick per time unit
+        self.view._use_resolution(1)
+        return self.unit_type
+
+    async def query_build_info(self) -> dict:
+        """same as `SimulatorClient.query_build_info`, shares its cache"""
+        info = cached_build_info(self.executable)
+        if info is None:
+            info = store_build_info(self.executable, await self.send_command("queryBuildInfo"))
+        return info
+
+    async def restart(self) -> None:
+        if self.process.returncode is None:
+            self.process.kill()
+        await self.process.wait()
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        await self._spawn()
+
+    async def quit(self) -> str:
+        res = await self._quit()
+        await self.process.wait()
+        return res
+
+    _quit = _awaitable("quit")
+
+    async def write_request(self, data: bytes) -> None:
+        self.process.stdin.write(data)
+        await self.process.stdin.drain()
+
+    async def read_reply(self) -> 'str | np.ndarray':
+        stdout = self.process.stdout
+        (length,) = _REPLY_HEADER.unpack(await stdout.readexactly(_REPLY_HEADER.size))
+        body = await stdout.readexactly(length)
+        reply = decode_reply(body[:1], body[1:])
+        return reply.strip() if isinstance(reply, str) else reply
+
+    async def read_raw_reply(self) -> 'str | np.ndarray':
+        """read one reply in the current protocol"""
+        if self.binary: return await self.read_reply()
+        return (await self.process.stdout.readline()).decode().strip()
+
+    async def _flush(self, batch: CommandBatch, framed: bool = False) -> list:
+        """write the queued commands at once and resolve the futures, `framed`
+        wraps them into beginBatch / endBatch
+        """
+        if not batch.requests: return batch.results
+        data = b"".join(batch.requests)
+        if framed:
+            if self.binary:
+                data = (encode_frame(OP_TEXT, ("beginBatch",)) + data +
+                        encode_frame(OP_TEXT, ("endBatch",)))
+            else:
+                data = b"beginBatch\n" + data + b"endBatch\n"
+        await self.write_request(data)
+        if framed: await self.read_raw_reply()
+        for future in batch.futures:
+            future.set_result(await self.read_raw_reply())
+        if framed: await self.read_raw_reply()
+        batch.results.extend(future.result() for future in batch.futures)
+        batch.requests = []
+        batch.futures = []
+        return batch.results
+
+    @asynccontextmanager
+    async def batch(self):
+        """same as `SimulatorClient.batch`, the commands of the block are sent
+        when it is left
+
+        Examples:
+        >>> async with client.batch() as b:
+        ...     futures = [b.query_task_state(j) for j in range(5)]
+        >>> [f.result() for f in futures]
+        """
+        async with self.lock:
+            batch = self._batch = CommandBatch(self.view)
+            try:
+                yield batch
+            finally:
+                self._batch = None
+            await self._flush(batch, framed=True)
+
+    async def enable_state_mirror(self, path: str = None) -> 'StateMirror':
+        """same as `SimulatorClient.enable_state_mirror`"""
+        from mirror import StateMirror, default_mirror_path
+        owner = path is None
+        if owner: path = default_mirror_path()
+        res = await self.send_command(f"enableStateMirror {path}")
+        if res != "Mirror enabled":
+            raise RuntimeError(f"Cannot enable the state mirror: {res}")
+        self.mirror = StateMirror(path, owner)
+        return self.mirror
+
+
+_CUSTOM = {"command_decorator", "check_unit_type", "query_build_info", "negotiate_protocol",
+           "restart", "quit", "write_request", "read_reply", "read_raw_reply", "batch",
+           "enable_state_mirror"}
+
+for _name, _attr in vars(SimulatorClient).items():
+    if _name.startswith("_") or _name in _CUSTOM or not callable(_attr): continue
+    setattr(AsyncSimulatorClient, _name, _awaitable(_name))
+
+
+async def gather_clients(clients: 'list[AsyncSimulatorClient]', method: str,
+                         *args, **kwargs) -> list:
+    """call the same method on every client at once, return the results in order
+
+    Examples:
+    >>> clients = await asyncio.gather(*[AsyncSimulatorClient.create(path) for _ in range(32)])
+    >>> executed = await gather_clients(clients, "advance_until_event")
+    """
+    return await asyncio.gather(*[getattr(client, method)(*args, **kwargs) for client in clients])
@@ -2,7 +2,426 @@
 # Copy Right. The EHPCL Authors.
 #
 
+import os
+import socket
+import struct
 import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from scenario import encode_scenario
+
+# Opcodes of the binary protocol, keep in sync with src/cpp/protocol.h
+OP_TEXT = 0
+OP_QUERY_CURRENT_TIMESTAMP = 1
+OP_IS_SIMULATION_COMPLETED = 2
+OP_DOES_TASK_MISS_DEADLINE = 3
+OP_UPDATE_PROCESSOR_AND_TASK = 4
+OP_QUERY_PROCESSOR_STATE = 5
+OP_QUERY_PROCESSOR_STATES = 6
+OP_QUERY_TASK_STATE = 7
+OP_QUERY_SS_TASK_STATES = 8
+OP_QUERY_TASK_EXECUTION_STATES = 9
+OP_SCHEDULE_SEGMENT_ON_PROCESSOR = 10
+OP_CREATE_DAG_TASK = 11
+OP_SET_SIMULATION_TIME_BOUND = 12
+OP_START_SIMULATION = 13
+OP_RESET_SIMULATOR = 14
+OP_QUERY_SNAPSHOT = 15
+OP_QUERY_TICK_EVENTS = 16
+OP_QUERY_TASK_VERSIONS = 17
+OP_ADVANCE_UNTIL_DECISION = 18
+OP_ADVANCE_UNTIL_EVENT = 19
+OP_LOAD_SCENARIO = 20
+OP_PUSH_STATE = 21
+OP_POP_STATE = 22
+OP_RESTORE_STATE = 23
+OP_QUERY_IDLE_PROCESSORS = 24
+OP_QUERY_EXECUTION_HISTORY = 25
+
+# Event types of a tick, keep in sync with src/cpp/event.h
+EVENT_SEGMENT_COMPLETED = 0
+EVENT_SEGMENT_READY = 1
+EVENT_JOB_RELEASED = 2
+EVENT_PROCESSOR_IDLE = 3
+EVENT_DEADLINE_MISSED = 4
+
+_REQUEST_HEADER = struct.Struct("<II")
+_REPLY_HEADER = struct.Struct("<I")
+_REPLY_DTYPES = {b"q": np.dtype("<i8"), b"d": np.dtype("<f8")}
+# Requests larger than the pipe buffer are written from a helper thread,
+# otherwise the backend may block on a full stdout while we block on stdin.
+_PIPE_SAFE_BYTES = 65536
+
+
+def encode_frame(opcode: int, args: tuple = ()) -> bytes:
+    """encode a binary request frame: <opcode> <payload bytes> <payload>"""
+    if opcode == OP_TEXT:
+        payload = args[0].encode()
+        return _REQUEST_HEADER.pack(opcode, len(payload)) + payload
+    return struct.pack(f"<II{len(args)}q", opcode, 8*len(args), *args)
+
+
+def decode_reply(tag: bytes, payload: bytes) -> 'str | np.ndarray':
+    """decode a binary reply: 's' -> str, 'q' -> int64 array, 'd' -> float64 array"""
+    if tag == b"s":
+        return payload.decode()
+    return np.frombuffer(payload, dtype=_REPLY_DTYPES[tag])
+
+
+def to_values(res: 'str | np.ndarray', unit_type: type = int) -> list:
+    """convert a text or binary reply into a list of numbers"""
+    if isinstance(res, str):
+        return list(map(unit_type, res.split()))
+    if unit_type is int and res.dtype.kind == "i":
+        return res.tolist()
+    return list(map(unit_type, res.tolist()))
+
+
+def parse_flag(res: 'str | np.ndarray') -> bool:
+    if isinstance(res, str): return bool(res)
+    return bool(res[0])
+
+
+def parse_time_stamp(res: 'str | np.ndarray') -> int:
+    return to_values(res)[0]
+
+
+def parse_steady_state(res: 'str | np.ndarray') -> 'tuple[bool, int]':
+    reached, cycle = to_values(res)
+    return bool(reached), int(cycle)
+
+
+def parse_policy_result(res: str) -> 'tuple[bool, int, int, int, int, int] | None':
+    if res == "Invalid args!": return None
+    schedulable, miss_time, time, rounds, scheduled, preemptions = map(int, res.split())
+    return bool(schedulable), miss_time, time, rounds, scheduled, preemptions
+
+
+def executed_units(executed: int, resolution: int = 1) -> 'int | float':
+    """an executed length in sub-ticks in time units, floats above a resolution of 1"""
+    if executed < 0:
+        # print("Error occured during updating!")
+        executed = 0
+    return executed / resolution if resolution > 1 else executed
+
+
+def parse_update(res: 'str | np.ndarray', resolution: int = 1) -> 'int | float':
+    return executed_units(int(res.split()[0] if isinstance(res, str) else res[0]), resolution)
+
+
+def parse_processor_state(res: 'str | np.ndarray') -> tuple:
+    return tuple(to_values(res))
+
+
+def parse_processor_states(res: 'str | np.ndarray') -> tuple:
+    mapped = to_values(res)
+    return tuple(zip(*[iter(mapped)]*4))
+
+
+def parse_task_state(res: 'str | np.ndarray', unit_type: type = int, resolution: int = 1) -> tuple:
+    """`resolution`: sub-ticks per time unit of the replied lengths, converted to time units"""
+    mapped = to_values(res, unit_type)
+    if unit_type == float:
+        for i in range(3): mapped[i] = int(mapped[i])
+    segments = tuple(zip(*[iter(mapped[1:])]*5))
+    if resolution > 1:
+        segments = tuple(seg[:3] + (seg[3] / resolution, seg[4] / resolution) for seg in segments)
+    return (mapped[0], segments)
+
+
+def parse_ss_task_state(res: 'str | np.ndarray', unit_type: type = int, resolution: int = 1) -> tuple:
+    mapped = to_values(res, unit_type)
+    if unit_type == float:
+        for i in range(3): mapped[i] = int(mapped[i])
+        for i in range(2, len(mapped)//2): mapped[2*i] = int(mapped[2*i])
+    if resolution > 1:
+        for i in range(3, len(mapped), 2): mapped[i] = mapped[i] / resolution
+    result = []
+    for i in range(2, len(mapped)//2):
+        temp = (mapped[2*i], mapped[2*i+1])
+        result.append(temp)
+    return (mapped[0],  mapped[1], -1 if mapped[2]>=999999 else mapped[2], mapped[3], tuple(result))
+
+
+PROCESSOR_DTYPE = np.dtype([
+    ('type', np.int64),
+    ('state', np.int64),
+    ('task', np.int64),
+    ('segment', np.int64),
+])
+
+
+def segment_dtype(unit_type: type = int) -> np.dtype:
+    unit = np.float64 if unit_type == float else np.int64
+    return np.dtype([
+        ('task', np.int64),
+        ('segment', np.int64),
+        ('affinity', np.int64),
+        ('processor', np.int64),
+        ('ready', np.int64),
+        ('length', unit),
+        ('remaining', unit),
+        ('period', np.int64),
+    ])
+
+
+def _structured(flat: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    if flat.dtype == np.int64 and all(dtype[i] == np.int64 for i in range(len(dtype))):
+        return flat.view(dtype)
+    rows = flat.reshape(-1, len(dtype))
+    result = np.empty(len(rows), dtype=dtype)
+    for i, name in enumerate(dtype.names): result[name] = rows[:, i]
+    return result
+
+
+def parse_snapshot(res: 'str | np.ndarray', unit_type: type = int, resolution: int = 1) -> tuple:
+    if isinstance(res, str):
+        res = np.array(res.split(), dtype=np.float64 if unit_type == float else np.int64)
+    time, proc_count, seg_count = (int(x) for x in res[:3])
+    procs = np.ascontiguousarray(res[3:3+4*proc_count])
+    segs = np.ascontiguousarray(res[3+4*proc_count:3+4*proc_count+8*seg_count])
+    segs = _structured(segs, segment_dtype(float if resolution > 1 else unit_type))
+    if resolution > 1:
+        segs['length'] /= resolution
+        segs['remaining'] /= resolution
+    return (time, _structured(procs, PROCESSOR_DTYPE), segs)
+
+
+EVENT_DTYPE = np.dtype([
+    ('type', np.int64),
+    ('index', np.int64),
+    ('segment', np.int64),
+])
+
+
+def parse_events(res: 'str | np.ndarray') -> np.ndarray:
+    if isinstance(res, str):
+        res = np.array(res.split(), dtype=np.int64)
+    return _structured(np.ascontiguousarray(res), EVENT_DTYPE)
+
+
+HISTORY_DTYPE = np.dtype([
+    ('segment', np.int64),
+    ('processor', np.int64),
+    ('start', np.int64),
+    ('end', np.int64),
+])
+
+
+def parse_execution_history(res: 'str | np.ndarray') -> np.ndarray:
+    if isinstance(res, str):
+        res = np.array(res.split(), dtype=np.int64)
+    return _structured(np.ascontiguousarray(res, dtype=np.int64), HISTORY_DTYPE)
+
+
+def parse_update_events(res: 'str | np.ndarray', resolution: int = 1) -> tuple:
+    if isinstance(res, str):
+        res = np.array(res.split(), dtype=np.int64)
+    return (executed_units(int(res[0]), resolution), parse_events(res[2:]))
+
+
+def parse_execution_states(res: 'str | np.ndarray', resolution: int = 1) -> list:
+    return [executed_units(executed, resolution) for executed in to_values(res)]
+
+
+def parse_task_versions(res: 'str | np.ndarray') -> tuple:
+    values = np.array(res.split(), dtype=np.int64) if isinstance(res, str) else res.astype(np.int64)
+    return (int(values[0]), values[1:])
+
+
+def parse_idle_processors(res: 'str | np.ndarray', procType: int = -1) -> 'np.ndarray | dict':
+    """reply of queryIdleProcessors, {type: idle processors} if no type is given"""
+    values = np.array(res.split(), dtype=np.int64) if isinstance(res, str) else res.astype(np.int64)
+    if procType >= 0: return values
+    idle, index = {}, 0
+    while index < len(values):
+        count = int(values[index])
+        idle[len(idle)] = values[index+1:index+1+count]
+        index += 1 + count
+    return idle
+
+
+def parse_state_stack(res: 'str | np.ndarray') -> 'tuple | None':
+    """reply of pushState / popState / restoreState, None if there is no such state"""
+    if isinstance(res, str) and res.startswith("No such state"): return None
+    return tuple(int(x) for x in to_values(res, float))
+
+
+def parse_reset(res: str) -> bool:
+    return res.find("Error") == -1
+
+
+def parse_build_info(res: str) -> dict:
+    fields = res.split()
+    return {
+        "unit_type": float if fields[0] == "float" else int,
+        "protocol": int(fields[1]),
+        "processor_types": int(fields[2]),
+        "commands": frozenset(fields[3:]),
+    }
+
+
+def legacy_build_info(executable_path: str) -> dict:
+    """build info of a backend without queryBuildInfo, from the compile_commands.json
+    next to the executable
+    """
+    import json
+    compile_command_path = os.path.join(os.path.dirname(executable_path), 'compile_commands.json')
+    with open(compile_command_path, 'r') as file:
+        compile_commands = json.load(file)
+    unit_type = int
+    for entry in compile_commands:
+        unit_type = float if "-DVARI_PROC" in entry["command"] else int
+    return {"unit_type": unit_type, "protocol": 0, "processor_types": 0, "commands": frozenset()}
+
+
+# queryBuildInfo replies by (real path, mtime) of the executable
+_build_info_cache = {}
+
+
+def _build_info_key(executable_path: str) -> 'tuple | None':
+    try:
+        return (os.path.realpath(executable_path), os.stat(executable_path).st_mtime_ns)
+    except (OSError, TypeError):
+        # e.g. a server mode backend without a local executable
+        return None
+
+
+def cached_build_info(executable_path: str) -> 'dict | None':
+    key = _build_info_key(executable_path)
+    return _build_info_cache.get(key) if key is not None else None
+
+
+def store_build_info(executable_path: str, res: str) -> dict:
+    """parse a queryBuildInfo reply and cache it for the executable"""
+    if res == "Unknown command": info = legacy_build_info(executable_path)
+    else: info = parse_build_info(res)
+    key = _build_info_key(executable_path)
+    if key is not None: _build_info_cache[key] = info
+    return info
+
+
+class BatchFuture:
+    """ Placeholder for a reply of a command queued inside `SimulatorClient.batch()`,
+    resolved when the batch is flushed.
+    """
+
+    def __init__(self, parser = None) -> None:
+        self.parser = parser
+        self.children = []
+        self.done = False
+        self.value = None
+
+    def then(self, parser) -> 'BatchFuture':
+        if not self.done and self.parser is None and not self.children:
+            # a raw reply parsed once, no need for another future
+            self.parser = parser
+            return self
+        child = BatchFuture(parser)
+        if self.done: child.set_result(self.value)
+        else: self.children.append(child)
+        return child
+
+    def set_result(self, raw) -> None:
+        self.value = self.parser(raw) if self.parser else raw
+        self.done = True
+        for child in self.children: child.set_result(self.value)
+        self.children = []
+
+    def result(self):
+        if not self.done:
+            raise RuntimeError("Batch is not flushed yet, leave the `with` block or call flush()")
+        return self.value
+
+
+class CommandBatch:
+    """ Queue of commands written to the backend in one syscall.
+
+    Every client method called on the batch returns a `BatchFuture`, the replies
+    are available from `results` (in order) after `flush()` or leaving the
+    `with` block.
+
+    Examples
+    --------
+    >>> with client.batch() as b:
+    ...     states = [b.query_task_state(i) for i in range(5)]
+    >>> states[0].result()
+    """
+
+    def __init__(self, client: 'SimulatorClient') -> None:
+        self.client = client
+        self.requests = []
+        self.futures = []
+        self.results = []
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
+
+    def queue(self, request: bytes) -> BatchFuture:
+        future = BatchFuture()
+        self.requests.append(request)
+        self.futures.append(future)
+        return future
+
+    def flush(self) -> list:
+        """write all queued commands at once and resolve the futures"""
+        if not self.requests: return self.results
+        client = self.client
+        if client.binary:
+            begin = encode_frame(OP_TEXT, ("beginBatch",))
+            end = encode_frame(OP_TEXT, ("endBatch",))
+        else:
+            begin, end = b"beginBatch\n", b"endBatch\n"
+        client.write_request(begin + b"".join(self.requests) + end)
+        client.read_raw_reply()
+        for future in self.futures:
+            future.set_result(client.read_raw_reply())
+        client.read_raw_reply()
+        self.results.extend(future.result() for future in self.futures)
+        self.requests = []
+        self.futures = []
+        return self.results
+
+
+class SocketConnection:
+    """ Connection to a session of the server mode (`main --server <path>`), with
+    the stdin / stdout / poll / kill surface of the `subprocess.Popen` it replaces.
+
+    `session` is the id to attach to, None for a new session; the id given by
+    the server is kept in `session`.
+    """
+
+    def __init__(self, socket_path: str, session: str = None) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path)
+        self.stdin = self.socket.makefile("wb")
+        self.stdout = self.socket.makefile("rb")
+        self.returncode = None
+        self.stdin.write(f"attachSession {session or 'new'}\n".encode())
+        self.stdin.flush()
+        reply = self.stdout.readline().decode().strip()
+        if reply == "Session busy" or not reply.startswith("Session "):
+            self.kill()
+            raise RuntimeError(f"Cannot attach to session {session}: {reply}")
+        self.session = reply.split()[1]
+
+    def poll(self) -> 'int | None':
+        return self.returncode
+
+    def kill(self) -> None:
+        """close the connection, the session stays on the server"""
+        if self.returncode is not None: return
+        for stream in (self.stdin, self.stdout, self.socket):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.returncode = -1
+
 
 class SimulatorClient:
     """ Python client for interecting with C++ backend
@@ -11,53 +430,94 @@ class SimulatorClient:
     --------
     >>> sim = SimulatorClient("path_to_C++_executable")
     >>> sim.startSimulation()
+
+    Notes
+    -----
+    The client negotiates the binary framed protocol at startup and falls back
+    to the text protocol if the backend does not support it, or if
+    `binary=False` is given.
+
+    With `socket_path` the client attaches to a session of a backend started as
+    `main --server <socket_path>` instead of spawning one: `session` is the id
+    to attach to (None for a new one), `executable_path` is still the build of
+    that backend.
+    >>> sim = SimulatorClient("../../build/main", socket_path="/tmp/rtheter.sock")
+    >>> sim.session
     """
 
-    def __init__(self, executable_path):
+    def __init__(self, executable_path, binary: bool = True,
+                 socket_path: str = None, session: str = None):
         self.executable = executable_path
+        self.socket_path = socket_path
+        self.session = session
         self.procMap = {0: "CPU", 3:"DataCopy", 7: "GPU"}
-        self.process = subprocess.Popen(
-            [self.executable],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=None,
-            text=True
-        )
+        self.use_binary = binary
+        self.binary = False
         self.alreadyQuit = False
+        self._batch = None
+        self.mirror = None
+        self.resolution = 1
+        self.process = self._spawn()
         self.check_unit_type()
+
+    def _spawn(self) -> 'subprocess.Popen | SocketConnection':
+        if self.socket_path is not None:
+            process = SocketConnection(self.socket_path, self.session)
+            self.session = process.session
+        else:
+            process = subprocess.Popen(
+                [self.executable],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=None
+            )
+        self.binary = False
+        self.process = process
+        if self.use_binary: self.negotiate_protocol()
+        return process
+
+    def negotiate_protocol(self) -> bool:
+        """switch the backend to the binary protocol, return false if unsupported"""
+        self.binary = (self.send_command("setProtocol binary") == "Binary protocol enabled")
+        return self.binary
     
     def check_unit_type(self) -> type:
-        import os
-        directory = os.path.dirname(self.executable)
-        compile_command_path = os.path.join(directory, 'compile_commands.json')
-        
-        import json
-
-        with open(compile_command_path, 'r') as file:
-            compile_commands = json.load(file)
-        
-        for entry in compile_commands:
-            if "-DVARI_PROC" in entry["command"]:
-                self.unit_type = float
-            else:
-                self.unit_type = int
-                
+        self.build_info = self.query_build_info()
+        self._use_resolution(self.resolution)
         return self.unit_type
+
+    def _use_resolution(self, resolution: int) -> None:
+        # the lengths are converted to fractional time units above one sub-tick per unit
+        self.resolution = resolution
+        self.unit_type = float if resolution > 1 else self.build_info["unit_type"]
+
+    def query_build_info(self) -> dict:
+        """capabilities of the backend, queried once per executable path and mtime
+
+        Returns:
+            dict: unit_type (int, float for a former VARI_PROC build), protocol (version),
+            processor_types (count), commands (text command names)
+        """
+        info = cached_build_info(self.executable)
+        if info is None: info = store_build_info(self.executable, self.send_command("queryBuildInfo"))
+        return info
     
     def __del__(self):
-        if (not self.alreadyQuit):
+        # the constructor may have failed before the backend was attached
+        if not getattr(self, "alreadyQuit", True) and hasattr(self, "process"):
             self.quit()
         
     def restart(self):
         if self.process.poll() is None:
             self.process.kill()
-        self.process = subprocess.Popen(
-            [self.executable],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=None,
-            text=True
-        )
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        self.alreadyQuit = False
+        # in the server mode a fresh simulator is a new session
+        if self.socket_path is not None: self.session = None
+        self._spawn()
+        self._use_resolution(1)
 
     def send_command(self, command: str):
         """send command in str to the C++ process
@@ -65,60 +525,348 @@ class SimulatorClient:
         Returns:
             str: striped stdout from the C++ backend
         """
-        self.process.stdin.write(command + "\n")
-        self.process.stdin.flush()
-        return self.process.stdout.readline().strip()
+        if self.binary:
+            return self.send_binary(OP_TEXT, command)
+        if self._batch is not None:
+            return self._batch.queue((command + "\n").encode())
+        self.write_request((command + "\n").encode())
+        return self.read_raw_reply()
+
+    def send_binary(self, opcode: int, *args) -> 'str | np.ndarray':
+        """send one binary frame to the C++ process
+
+        Returns:
+            str | np.ndarray: message for text replies, array for numeric replies
+        """
+        return self.send_frame(encode_frame(opcode, args))
 
+    def send_frame(self, frame: bytes) -> 'str | np.ndarray':
+        """send one encoded binary frame, queued inside `batch()`"""
+        if self._batch is not None:
+            return self._batch.queue(frame)
+        self.write_request(frame)
+        return self.read_reply()
 
-    def command_decorator(command_template: str):
+    def write_request(self, data: bytes) -> None:
+        stdin = self.process.stdin
+        def write():
+            stdin.write(data)
+            stdin.flush()
+        if len(data) <= _PIPE_SAFE_BYTES: write()
+        else: threading.Thread(target=write, daemon=True).start()
+
+    def read_reply(self) -> 'str | np.ndarray':
+        stdout = self.process.stdout
+        (length,) = _REPLY_HEADER.unpack(stdout.read(_REPLY_HEADER.size))
+        body = stdout.read(length)
+        reply = decode_reply(body[:1], body[1:])
+        return reply.strip() if isinstance(reply, str) else reply
+
+    def read_raw_reply(self) -> 'str | np.ndarray':
+        """read one reply in the current protocol"""
+        if self.binary: return self.read_reply()
+        return self.process.stdout.readline().decode().strip()
+
+    @contextmanager
+    def batch(self):
+        """queue the commands issued inside the block and write them in one syscall
+
+        Examples:
+        >>> with client.batch() as b:
+        ...     futures = [b.query_task_state(j) for j in range(5)]
+        >>> [f.result() for f in futures]
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        self._batch = CommandBatch(self)
+        try:
+            yield self._batch
+        finally:
+            batch, self._batch = self._batch, None
+            batch.flush()
+
+    def _resolve(self, res, parser):
+        if isinstance(res, BatchFuture): return res.then(parser)
+        return parser(res)
+
+    def command_decorator(command_template: str, opcode: int = None):
         from functools import wraps
         def decorator(func):
             @wraps(func)
             def wrapper(self, *args, **kwargs) -> str:
+                if self.binary and opcode is not None:
+                    return self.send_binary(opcode, *args, *kwargs.values())
                 command = command_template.format(*args, **kwargs)
                 return self.send_command(command)
             return wrapper
         return decorator
 
+    @command_decorator("queryCurrentTimeStamp", OP_QUERY_CURRENT_TIMESTAMP)
+    def _get_current_time_stamp_helper(self) -> str:
+        pass
+
     def get_current_time_stamp(self) -> int:
-        return int(self.send_command("queryCurrentTimeStamp"))
+        return self._resolve(self._get_current_time_stamp_helper(), parse_time_stamp)
     
     @command_decorator("quit")
+    def _quit_helper(self) -> str:
+        pass
+
     def quit(self) -> str:
+        """end the backend, or the session in the server mode"""
         self.alreadyQuit = True
-        pass
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        return self._quit_helper()
+
+    def detach(self) -> None:
+        """close the connection and keep the session on the server, attach
+        again with `SimulatorClient(..., socket_path, session=client.session)`
+        """
+        if self.socket_path is None:
+            raise RuntimeError("Only a client of the server mode can detach")
+        self.alreadyQuit = True
+        self.process.kill()
     
-    @command_decorator("setSimulationTimeBound {}")
+    @command_decorator("setSimulationTimeBound {}", OP_SET_SIMULATION_TIME_BOUND)
     def set_simulation_timebound(self, bound: int) -> str:
         pass
 
+    @command_decorator("setHyperperiodTimeBound {}")
+    def _set_hyperperiod_timebound_helper(self, count: int) -> str:
+        pass
+
+    def set_hyperperiod_timebound(self, count: int = 1) -> bool:
+        """bound the simulation to `count` hyperperiods of the created tasks
+        after the largest release offset, false if the hyperperiod overflows
+        """
+        return self._resolve(self._set_hyperperiod_timebound_helper(count),
+                             lambda res: res.startswith("Set bound"))
+
+    @command_decorator("queryHyperperiod")
+    def _query_hyperperiod_helper(self) -> str:
+        pass
+
+    def query_hyperperiod(self) -> int:
+        """least common multiple of the task periods, 0 if it overflows"""
+        return self._resolve(self._query_hyperperiod_helper(), int)
+
+    @command_decorator("setSteadyStateDetection {}")
+    def _set_steady_state_detection_helper(self, enabled: int) -> str:
+        pass
+
+    def set_steady_state_detection(self, enabled: bool = True) -> bool:
+        """end the simulation once the state after a release repeats, only
+        sound for a deterministic policy of the current state, see
+        `query_steady_state`
+        """
+        return self._resolve(self._set_steady_state_detection_helper(int(enabled)),
+                             lambda res: res == "Set")
+
+    @command_decorator("querySteadyState")
+    def _query_steady_state_helper(self) -> str:
+        pass
+
+    def query_steady_state(self) -> 'tuple[bool, int]':
+        """(reached, cycle): whether the simulation ended on a repeated state,
+        i.e. schedulable if no deadline was missed, and the cycle length
+        """
+        return self._resolve(self._query_steady_state_helper(), parse_steady_state)
+
+    @command_decorator("setTaskRelease {}")
+    def _set_task_release_helper(self, args: str) -> str:
+        pass
+
+    def set_task_release(self, taskId: int, offset: int, jitter: int = 0, slack: int = 0) -> bool:
+        """release the task first at `offset`, each job up to `jitter` after
+        its arrival, and with a `slack` the arrivals are sporadic: at least a
+        period and up to `slack` more apart; the draws come from the seed of
+        `set_variation_seed`. Only at time 0, before `start_simulation`.
+
+        Returns:
+            bool: False if the jitter is not shorter than the period, or the
+            simulation is past time 0
+        """
+        return self._resolve(self._set_task_release_helper(f"{taskId} {offset} {jitter} {slack}"),
+                             lambda res: res == "Set")
+
+    @command_decorator("queryTaskRelease {}")
+    def _query_task_release_helper(self, taskId: int) -> str:
+        pass
+
+    def query_task_release(self, taskId: int) -> 'tuple[int, int, int, int, int]':
+        """(offset, jitter, slack, arrival, next release) of the task, the
+        arrival of its current job (its deadline is a period later) and the
+        time of its next release
+        """
+        return self._resolve(self._query_task_release_helper(taskId),
+                             lambda res: tuple(map(int, res.split())))
+
+    @command_decorator("runPolicy {}")
+    def _run_policy_helper(self, policy: str) -> str:
+        pass
+
+    def run_policy(self, policy: str) -> 'tuple[bool, int, int, int, int, int] | None':
+        """schedule by a policy of the backend until the bound or a missed
+        deadline, without a round-trip per decision
+
+        Args:
+            policy: edf, rm, dm, fifo or dagedf
+
+        Returns:
+            tuple: schedulable, time of the first missed deadline (-1 if
+            schedulable), end time, decision rounds, scheduled segments,
+            preemptions; None if there is no such policy
+        """
+        return self._resolve(self._run_policy_helper(policy), parse_policy_result)
+
+    @command_decorator("isSimulationCompleted", OP_IS_SIMULATION_COMPLETED)
+    def _is_simulation_completed_helper(self) -> str:
+        pass
+
     def is_simulation_completed(self) -> bool:
         """return true is the simulation have reached the limit"""
-        return bool(self.send_command("isSimulationCompleted"))
-    
+        return self._resolve(self._is_simulation_completed_helper(), parse_flag)
+
+    @command_decorator("doesTaskMissDeadline", OP_DOES_TASK_MISS_DEADLINE)
+    def _does_task_miss_deadline_helper(self) -> str:
+        pass
+
     def does_task_miss_deadline(self) -> bool:
         """return true if there's any task miss deadline,
         the agent should stop simulation
         """
-        return bool(self.send_command("doesTaskMissDeadline"))
+        return self._resolve(self._does_task_miss_deadline_helper(), parse_flag)
     
-    @command_decorator("updateProcessorAndTask")
+    @command_decorator("updateProcessorAndTask", OP_UPDATE_PROCESSOR_AND_TASK)
     def update_processor_and_task_helper(self) -> str:
         pass
 
-    def update_processor_and_task(self) -> int:
-        res = self.update_processor_and_task_helper().split()
-        executed = int(res[0])
-        if executed < 0: 
-            # print("Error occured during updating!")
-            executed = 0
-        return executed
+    @command_decorator("updateProcessorAndTask {}", OP_UPDATE_PROCESSOR_AND_TASK)
+    def _update_processor_and_task_events_helper(self, events: int) -> str:
+        pass
+
+    def update_processor_and_task(self, events: bool = False) -> 'int | tuple[int, np.ndarray]':
+        """advance the simulator by 1 time
+
+        Returns:
+            int: executed length of this tick in time units (a float above a
+            resolution of 1), or (executed, events) if `events`
+        Notes:
+            events: structured array, fields type, index, segment, see `query_tick_events`
+        """
+        resolution = self.resolution
+        if events:
+            return self._resolve(self._update_processor_and_task_events_helper(1),
+                                 lambda res: parse_update_events(res, resolution))
+        return self._resolve(self.update_processor_and_task_helper(), lambda res: parse_update(res, resolution))
+
+    @command_decorator("advanceUntilDecision {}", OP_ADVANCE_UNTIL_DECISION)
+    def _advance_until_decision_helper(self, events: int) -> str:
+        pass
+
+    def advance_until_decision(self, events: bool = False) -> 'int | tuple[int, np.ndarray]':
+        """advance at least 1 time, until an idle processor can take a ready and
+        unassigned segment of its type, or the simulation ends
+
+        Same results as calling `update_processor_and_task` in a loop, the time
+        stamps in which only the execution progresses are simulated at once.
+
+        Returns:
+            int: executed length, or (executed, events) of all the ticks if `events`
+        """
+        resolution, parser = self.resolution, parse_update_events if events else parse_update
+        return self._resolve(self._advance_until_decision_helper(int(events)), lambda res: parser(res, resolution))
+
+    @command_decorator("advanceUntilEvent {}", OP_ADVANCE_UNTIL_EVENT)
+    def _advance_until_event_helper(self, events: int) -> str:
+        pass
+
+    def advance_until_event(self, events: bool = False) -> 'int | tuple[int, np.ndarray]':
+        """advance at least 1 time, until a tick with any event (see `query_tick_events`)
+        or the end of the simulation, for schedulers that also preempt busy processors
+
+        Returns:
+            int: executed length, or (executed, events) of all the ticks if `events`
+        """
+        resolution, parser = self.resolution, parse_update_events if events else parse_update
+        return self._resolve(self._advance_until_event_helper(int(events)), lambda res: parser(res, resolution))
+
+    @command_decorator("queryTickEvents", OP_QUERY_TICK_EVENTS)
+    def _query_tick_events_helper(self) -> str:
+        pass
+
+    def query_tick_events(self) -> np.ndarray:
+        """return the events of the last update (including the releases at its end)
+
+        Notes:
+            structured array, fields type, index, segment, the type is one of
+            EVENT_SEGMENT_COMPLETED (index: task), EVENT_SEGMENT_READY (index: task),
+            EVENT_JOB_RELEASED (index: task), EVENT_PROCESSOR_IDLE (index: processor),
+            EVENT_DEADLINE_MISSED (index: task)
+        """
+        return self._resolve(self._query_tick_events_helper(), parse_events)
+
+    @command_decorator("queryTaskVersions", OP_QUERY_TASK_VERSIONS)
+    def _query_task_versions_helper(self) -> str:
+        pass
+
+    def query_task_versions(self) -> 'tuple[int, np.ndarray]':
+        """return the current state version and the version of the last change of
+        each task, re-query only the tasks newer than a previously seen version
+
+        Examples:
+            >>> version, versions = client.query_task_versions()
+            >>> dirty = np.flatnonzero(versions > last_version)
+        """
+        return self._resolve(self._query_task_versions_helper(), parse_task_versions)
+
+    @command_decorator("queryIdleProcessors {}", OP_QUERY_IDLE_PROCESSORS)
+    def _query_idle_processors_helper(self, procType: int) -> str:
+        pass
+
+    def query_idle_processors(self, procType: int = -1) -> 'np.ndarray | dict':
+        """return the idle processors in ascending order, kept per type by the
+        simulator instead of scanning `query_processor_states`
+
+        Args:
+            procType (int, optional): 0 -> CPU, 7 -> GPU, all the types if negative
+
+        Returns:
+            np.ndarray | dict: idle processors of the type, or {type: idle processors}
+
+        Examples:
+            >>> idle = client.query_idle_processors(7)
+            >>> if len(idle): client.schedule_segment_on_processor(idle[0], taskId, segId)
+        """
+        return self._resolve(self._query_idle_processors_helper(procType),
+                             lambda res: parse_idle_processors(res, procType))
+
+    @command_decorator("queryExecutionHistory {}", OP_QUERY_EXECUTION_HISTORY)
+    def _query_execution_history_helper(self, taskId: int) -> str:
+        pass
+
+    def query_execution_history(self, taskId: int) -> np.ndarray:
+        """return the execution of the current job of a task, cleared at each release
+
+        Notes:
+            structured array, fields segment, processor, start, end: the time
+            units [start, end) executed on the processor without a break, e.g.
+            len(history) - 1 preemptions or migrations of a single segment job
+
+        Examples:
+            >>> history = client.query_execution_history(0)
+            >>> finish = history["end"].max()
+        """
+        return self._resolve(self._query_execution_history_helper(taskId), parse_execution_history)
 
     @command_decorator("sortProcessors")
     def sort_processors(self) -> str:
         pass
 
-    @command_decorator("startSimulation")
+    @command_decorator("startSimulation", OP_START_SIMULATION)
     def start_simulation(self) -> str:
         pass
 
@@ -165,9 +913,178 @@ class SimulatorClient:
         pass
 
     def create_dag_task(self, args: list) -> str:
+        if self.binary:
+            return self.send_binary(OP_CREATE_DAG_TASK, *args)
         return self._create_dag_task_helper(" ".join(map(str, args)) + " ")
 
-    @command_decorator("queryProcessorState {}")
+    @command_decorator("loadScenario {}")
+    def _load_scenario_helper(self, path: str) -> str:
+        pass
+
+    def load_scenario(self, path: str, compress: bool = False) -> str:
+        """create the processors and DAG tasks of a scenario file at once, see
+        `scenario.write_scenario` and `DAGTaskGenerator.write_scenario`
+
+        Args:
+            compress: run on a compressed time base afterwards, see `compress_time_base`
+
+        Returns:
+            str: Scenario loaded, or Scenario loaded, time base not compressed
+        """
+        return self._load_scenario_helper(os.path.abspath(path) + (" compress" if compress else ""))
+
+    def load_scenario_values(self, processors: 'dict | list', tasksets: list, compress: bool = False) -> str:
+        """same as `load_scenario` without a file, e.g.
+        load_scenario_values({0: 2, 7: 2}, generator.generate_tasksets())
+
+        Returns:
+            str: Scenario loaded
+        """
+        values = encode_scenario(processors, tasksets)
+        if self.binary:
+            res = self.send_frame(_REQUEST_HEADER.pack(OP_LOAD_SCENARIO, values.nbytes) +
+                                  values.tobytes())
+            if compress and res == "Scenario loaded" and not self.compress_time_base():
+                return "Scenario loaded, time base not compressed"
+            return res
+        # the text protocol has no blob, go through a temporary file
+        with tempfile.NamedTemporaryFile(suffix=".scenario", delete=False) as file:
+            values.tofile(file)
+        def remove(res):
+            os.remove(file.name)
+            return res
+        return self._resolve(self._load_scenario_helper(file.name + (" compress" if compress else "")), remove)
+
+    @command_decorator("compressTimeBase")
+    def _compress_time_base_helper(self) -> str:
+        pass
+
+    def compress_time_base(self) -> int:
+        """divide all the periods, deadlines and segment lengths by their
+        greatest common divisor before the simulation starts; the replies stay
+        in the original time units, e.g. each update then advances the time
+        stamp by the scale. The verdicts stay the same, a deadline missed
+        between two time stamps is reported at the next one.
+
+        Returns:
+            int: the time scale, 0 if nothing was compressed: past time 0, with
+            a release jitter or sporadic slack, or without a common divisor
+            above 1 (the reply is then `Not compressed`)
+        """
+        return self._resolve(self._compress_time_base_helper(),
+                             lambda res: int(res) if res.isdigit() else 0)
+
+    @command_decorator("setTimeResolution {}")
+    def _set_time_resolution_helper(self, resolution: int) -> str:
+        pass
+
+    def set_time_resolution(self, resolution: int) -> bool:
+        """keep the segment lengths in fixed-point sub-ticks, `resolution` per
+        time unit, so that an execution variation or a parallel factor
+        progresses by a fraction of a unit; only before the first task is
+        created. The lengths of the task states and snapshots and the executed
+        lengths are then floats in time units.
+
+        Returns:
+            bool: False if a task exists already or the resolution is invalid
+        """
+        def parse(res: str) -> bool:
+            if res != "Set": return False
+            self._use_resolution(int(resolution))
+            return True
+        return self._resolve(self._set_time_resolution_helper(resolution), parse)
+
+    @command_decorator("queryTimeResolution")
+    def _query_time_resolution_helper(self) -> str:
+        pass
+
+    def query_time_resolution(self) -> int:
+        """sub-ticks per time unit of the backend, e.g. after `load_checkpoint`"""
+        def parse(res: str) -> int:
+            self._use_resolution(int(res))
+            return self.resolution
+        return self._resolve(self._query_time_resolution_helper(), parse)
+
+    @command_decorator("pushState", OP_PUSH_STATE)
+    def _push_state_helper(self) -> str:
+        pass
+
+    def push_state(self) -> 'tuple[int, int, int]':
+        """copy the current state onto the snapshot stack of the backend
+
+        Returns:
+            tuple: state id, snapshot bytes, elapsed nanoseconds
+
+        Examples:
+            >>> state_id, _, _ = client.push_state()
+            >>> client.schedule_segment_on_processor(0, 1, 0); client.advance_until_event()
+            >>> client.restore_state(state_id)   # try another decision
+        """
+        return self._resolve(self._push_state_helper(), parse_state_stack)
+
+    @command_decorator("popState", OP_POP_STATE)
+    def _pop_state_helper(self) -> str:
+        pass
+
+    def pop_state(self) -> 'tuple[int, int] | None':
+        """restore the newest snapshot and remove it from the stack
+
+        Returns:
+            tuple | None: state id, elapsed nanoseconds; None if the stack is empty
+        """
+        return self._resolve(self._pop_state_helper(), parse_state_stack)
+
+    @command_decorator("restoreState {}", OP_RESTORE_STATE)
+    def _restore_state_helper(self, state_id: int) -> str:
+        pass
+
+    def restore_state(self, state_id: int) -> 'tuple[int, int] | None':
+        """restore the snapshot of `push_state`, it stays on the stack
+
+        Returns:
+            tuple | None: state id, elapsed nanoseconds; None if it was dropped
+        """
+        return self._resolve(self._restore_state_helper(state_id), parse_state_stack)
+
+    @command_decorator("setStateStackLimit {} {}")
+    def set_state_stack_limit(self, depth: int, max_bytes: int) -> str:
+        """keep at most `depth` snapshots and `max_bytes` bytes, the oldest are
+        dropped first (defaults: 1024 snapshots, 256 MiB)
+        """
+        pass
+
+    @command_decorator("saveCheckpoint {}")
+    def _save_checkpoint_helper(self, path: str) -> str:
+        pass
+
+    def save_checkpoint(self, path: str) -> bool:
+        """write the complete simulator state to a binary file
+
+        Returns:
+            bool: True if saved
+        """
+        return self._resolve(self._save_checkpoint_helper(os.path.abspath(path)),
+                             lambda res: res == "Checkpoint saved")
+
+    @command_decorator("loadCheckpoint {}")
+    def _load_checkpoint_helper(self, path: str) -> str:
+        pass
+
+    def load_checkpoint(self, path: str) -> bool:
+        """replace the simulator state by a `save_checkpoint` file, the run
+        continues from the saved time
+
+        Returns:
+            bool: True if loaded, False (state unchanged) if the file is invalid
+        """
+        loaded = self._resolve(self._load_checkpoint_helper(os.path.abspath(path)),
+                               lambda res: res == "Checkpoint loaded")
+        # the checkpoint brings its resolution, its parser also runs when the
+        # query is queued behind the load inside `batch()` or an async call
+        self.query_time_resolution()
+        return loaded
+
+    @command_decorator("queryProcessorState {}", OP_QUERY_PROCESSOR_STATE)
     def _query_processor_state_helper(self, procId: int) -> str:
         pass
     
@@ -178,11 +1095,9 @@ class SimulatorClient:
             processorState: procType, processorState, taskIndex, segIndex \\
             The index of task / segment is only valid when state is busy
         """
-        res = self._query_processor_state_helper(procId)
-        mapped = tuple(map(int, res.split()))
-        return mapped
+        return self._resolve(self._query_processor_state_helper(procId), parse_processor_state)
 
-    @command_decorator("queryProcessorStates")
+    @command_decorator("queryProcessorStates", OP_QUERY_PROCESSOR_STATES)
     def _query_processor_states_helper(self) -> str:
         pass
 
@@ -195,15 +1110,9 @@ class SimulatorClient:
             processorState: procType, processorState, taskIndex, segIndex \\
             The index of task / segment is only valid when state is busy
         """
-        res = self._query_processor_states_helper()
-        mapped = list(map(int, res.split()))
-        result = []
-        for i in range(len(mapped)//4):
-            temp = (mapped[4*i], mapped[4*i+1], mapped[4*i+2], mapped[4*i+3])
-            result.append(temp)
-        return tuple(result)
+        return self._resolve(self._query_processor_states_helper(), parse_processor_states)
 
-    @command_decorator("queryTaskState {}")
+    @command_decorator("queryTaskState {}", OP_QUERY_TASK_STATE)
     def _query_task_state_helper(self, taskId: int) -> str:
         pass
 
@@ -215,15 +1124,13 @@ class SimulatorClient:
         Notes:
             segmentState: affinity, currentProcessor, isSegmentReady, length, remainLength
         """
-        res = self._query_task_state_helper(taskId)
-        mapped = list(map(self.unit_type, res.split()))
-        if self.unit_type == float:
-            for i in range(3): mapped[i] = int(mapped[i])
-        result = []
-        for i in range(len(mapped)//5):
-            temp = (mapped[5*i+1], mapped[5*i+2], mapped[5*i+3], mapped[5*i+4], mapped[5*i+5])
-            result.append(temp)
-        return (mapped[0], tuple(result))
+        unit_type, resolution = self.unit_type, self.resolution
+        return self._resolve(self._query_task_state_helper(taskId),
+                             lambda res: parse_task_state(res, unit_type, resolution))
+
+    @command_decorator("querySSTaskStates {}", OP_QUERY_SS_TASK_STATES)
+    def _query_ss_task_state_helper(self, taskId: int) -> str:
+        pass
     
     def query_ss_task_state(self, taskId: int) -> 'tuple':
         """query the self-suspension based task state by index
@@ -232,34 +1139,87 @@ class SimulatorClient:
             tuple: (period, readySegIndex, currentProcessor, remainLength, (SSSegStates))\\
             SSSegStates: affinity, segmentLength
         """
-        mapped = list(map(self.unit_type, self.send_command(f"querySSTaskStates {taskId}").split()))
-        if self.unit_type == float:
-            for i in range(3): mapped[i] = int(mapped[i])
-            for i in range(2, len(mapped)//2): mapped[2*i] = int(mapped[2*i])
-        result = []
-        for i in range(2, len(mapped)//2):
-            temp = (mapped[2*i], mapped[2*i+1])
-            result.append(temp)
-        return (mapped[0],  mapped[1], -1 if mapped[2]>=999999 else mapped[2], mapped[3], tuple(result))
+        unit_type, resolution = self.unit_type, self.resolution
+        return self._resolve(self._query_ss_task_state_helper(taskId),
+                             lambda res: parse_ss_task_state(res, unit_type, resolution))
+
+    @command_decorator("queryTaskExecutionStates", OP_QUERY_TASK_EXECUTION_STATES)
+    def _query_task_execution_states_helper(self) -> str:
+        pass
     
     def query_task_execution_states(self) -> 'list[int]':
-        result = list(map(int, self.send_command("queryTaskExecutionStates").split()))
-        return result
+        """executed length of the current job of each task, in time units"""
+        resolution = self.resolution
+        return self._resolve(self._query_task_execution_states_helper(),
+                             lambda res: parse_execution_states(res, resolution))
+
+    @command_decorator("querySnapshot", OP_QUERY_SNAPSHOT)
+    def _snapshot_helper(self) -> str:
+        pass
+
+    def snapshot(self) -> 'tuple[int, np.ndarray, np.ndarray]':
+        """query the timestamp, all processor states and all segment states in one reply
 
-    @command_decorator("scheduleSegmentOnProcessor {} {} {}")
+        Returns:
+            tuple: (time, processors, segments)
+        Notes:
+            processors: structured array, fields type, state, task, segment \\
+            segments: structured array, one row per segment (task by task), fields
+            task, segment, affinity, processor, ready, length, remaining, period
+        """
+        unit_type, resolution = self.unit_type, self.resolution
+        return self._resolve(self._snapshot_helper(), lambda res: parse_snapshot(res, unit_type, resolution))
+
+    @command_decorator("scheduleSegmentOnProcessor {} {} {}", OP_SCHEDULE_SEGMENT_ON_PROCESSOR)
     def schedule_segment_on_processor(self, procId: int, taskId:int, segId: int) -> str:
         pass
 
+    def enable_state_mirror(self, path: str = None) -> 'StateMirror':
+        """let the backend mirror its state into a memory-mapped file after every
+        update and schedule, a temporary file under /dev/shm is used by default
+
+        Returns:
+            StateMirror: zero-copy reader, `read()` has the format of `snapshot()`
+        """
+        from mirror import StateMirror, default_mirror_path
+        owner = path is None
+        if owner: path = default_mirror_path()
+        res = self.send_command(f"enableStateMirror {path}")
+        if res != "Mirror enabled":
+            raise RuntimeError(f"Cannot enable the state mirror: {res}")
+        self.mirror = StateMirror(path, owner)
+        return self.mirror
+
+    @command_decorator("resetSimulator", OP_RESET_SIMULATOR)
+    def _reset_client_helper(self) -> str:
+        pass
+
     def reset_client(self) -> bool:
-        result = self.send_command("resetSimulator")
-        if result.find("Error") != -1: return False
-        return True
+        return self._resolve(self._reset_client_helper(), parse_reset)
+
+    @command_decorator("clearSimulator")
+    def _clear_simulator_helper(self) -> str:
+        pass
+
+    def clear_simulator(self) -> bool:
+        """remove all processors and tasks (and the state mirror), the backend
+        can then be configured for another run, see `SimulatorPool`
+        """
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        def parse(res: str) -> bool:
+            if res != "Cleared": return False
+            self._use_resolution(1)
+            return True
+        return self._resolve(self._clear_simulator_helper(), parse)
 
     @command_decorator("setProcessorVariation {}")
     def _set_processor_variation_helper(self, args: str = {}) -> bool:
         pass
 
     def set_processor_variation(self, procId: int, var: int) -> bool:
+        # no effect with whole units per tick, see set_time_resolution
         if self.unit_type == int: return False
         self._set_processor_variation_helper(f" {procId} {var}")
         return True
@@ -268,6 +1228,41 @@ class SimulatorClient:
     def set_processor_parallel_factor(self, procId: int, factor: int) -> str:
         pass
 
+    @command_decorator("setVariationSeed {}")
+    def _set_variation_seed_helper(self, seed: int) -> str:
+        pass
+
+    def set_variation_seed(self, seed: int) -> bool:
+        """seed the execution variation drawn at each job release, the same seed
+        gives the same runs, also after `reset_client`
+        """
+        return self._resolve(self._set_variation_seed_helper(seed), lambda res: res == "Set")
+
+    @command_decorator("setVariationDistribution {}")
+    def _set_variation_distribution_helper(self, args: str) -> str:
+        pass
+
+    def set_variation_distribution(self, distribution: str, *params: float,
+                                   per_job: bool = False) -> bool:
+        """draw the factor of the execution time of every segment at each release
+
+        Args:
+            distribution (str): "none", "uniform" (low, high), "normal" (mean,
+                stddev, low, high), "lognormal" (mu, sigma, low, high) or
+                "histogram" (value0, weight0, value1, weight1, ...)
+            per_job (bool, optional): one factor for all the segments of a job.
+                Defaults to False.
+
+        Returns:
+            bool: False if the parameters are invalid, the factors must be positive
+
+        Examples:
+            >>> client.set_variation_distribution("uniform", 0.8, 1.0)
+            >>> client.set_variation_distribution("histogram", 1.0, 9, 1.5, 1, per_job=True)
+        """
+        args = " ".join(["job" if per_job else "segment", distribution, *map(str, map(float, params))])
+        return self._resolve(self._set_variation_distribution_helper(args), lambda res: res == "Set")
+
     def print(self):
         return self.send_command("printSimulatorState")
 
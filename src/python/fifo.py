@@ -47,10 +47,11 @@ if __name__ == "__main__":
                 procState = simulator.query_processor_states()
                 if procState[i][1] != 0: break
 
-        simulator.update_processor_and_task()
+        # jump to the next time an idle processor can take a segment
+        simulator.advance_until_decision()
         simulator.print()
 
-        timeStamp = timeStamp + 1
+        timeStamp = simulator.get_current_time_stamp()
         if simulator.does_task_miss_deadline():
             print("Task Missing Deadline!\n")
             break
@@ -0,0 +1,391 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+import ctypes
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+from scenario import encode_scenario
+
+from client import (BatchFuture, executed_units, parse_build_info, parse_events,
+                    parse_execution_history, parse_execution_states, parse_idle_processors,
+                    parse_processor_state, parse_processor_states, parse_policy_result,
+                    parse_snapshot, parse_ss_task_state, parse_state_stack, parse_steady_state,
+                    parse_task_state, parse_task_versions)
+
+_handle = ctypes.c_void_p
+_buffer = ctypes.c_void_p
+_int64 = ctypes.c_longlong
+
+_SIGNATURES = {
+    "rtheter_create": ([], _handle),
+    "rtheter_destroy": ([_handle], None),
+    "rtheter_value_is_float": ([], ctypes.c_int),
+    "rtheter_time_resolution": ([_handle], ctypes.c_ulonglong),
+    "rtheter_create_processors": ([_handle, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    "rtheter_sort_processors": ([_handle], ctypes.c_int),
+    "rtheter_create_dag_task": ([_handle, ctypes.POINTER(_int64), _int64], ctypes.c_int),
+    "rtheter_load_scenario": ([_handle, ctypes.POINTER(_int64), _int64], ctypes.c_int),
+    "rtheter_set_simulation_time_bound": ([_handle, ctypes.c_ulonglong], ctypes.c_int),
+    "rtheter_start_simulation": ([_handle], ctypes.c_int),
+    "rtheter_reset_simulator": ([_handle], ctypes.c_int),
+    "rtheter_schedule_segment": ([_handle, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    "rtheter_update": ([_handle], _int64),
+    "rtheter_advance_until_decision": ([_handle], _int64),
+    "rtheter_advance_until_event": ([_handle], _int64),
+    "rtheter_current_time": ([_handle], ctypes.c_ulonglong),
+    "rtheter_is_simulation_completed": ([_handle], ctypes.c_int),
+    "rtheter_does_task_miss_deadline": ([_handle], ctypes.c_int),
+    "rtheter_query_processor_state": ([_handle, ctypes.c_int, _buffer, _int64], _int64),
+    "rtheter_query_processor_states": ([_handle, _buffer, _int64], _int64),
+    "rtheter_query_task_state": ([_handle, ctypes.c_int, _buffer, _int64], _int64),
+    "rtheter_query_ss_task_state": ([_handle, ctypes.c_int, _buffer, _int64], _int64),
+    "rtheter_query_task_execution_states": ([_handle, _buffer, _int64], _int64),
+    "rtheter_query_snapshot": ([_handle, _buffer, _int64], _int64),
+    "rtheter_query_tick_events": ([_handle, _buffer, _int64], _int64),
+    "rtheter_query_task_versions": ([_handle, _buffer, _int64], _int64),
+    "rtheter_query_idle_processors": ([_handle, ctypes.c_int, _buffer, _int64], _int64),
+    "rtheter_query_execution_history": ([_handle, ctypes.c_int, _buffer, _int64], _int64),
+    "rtheter_query_state_data": ([_handle, ctypes.c_ulonglong, _buffer, _int64], _int64),
+    "rtheter_restore_state_data": ([_handle, ctypes.c_char_p, _int64], ctypes.c_int),
+    "rtheter_process_command": ([_handle, ctypes.c_char_p, ctypes.c_char_p, _int64], _int64),
+    "rtheter_copy_last_reply": ([_handle, ctypes.c_char_p, _int64], _int64),
+}
+
+_libraries = {}
+
+
+def load_library(library_path: str) -> ctypes.CDLL:
+    """load the shared library once per path and declare the C signatures"""
+    if library_path not in _libraries:
+        lib = ctypes.CDLL(library_path)
+        for name, (argtypes, restype) in _SIGNATURES.items():
+            func = getattr(lib, name)
+            func.argtypes = argtypes
+            func.restype = restype
+        _libraries[library_path] = lib
+    return _libraries[library_path]
+
+
+class _ImmediateBatch:
+    """ Same surface as `CommandBatch`, the calls are executed immediately
+    since there is no round-trip to save in-process.
+    """
+
+    def __init__(self, client: 'InProcessSimulatorClient') -> None:
+        self.client = client
+        self.results = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self.client, name)
+        if not callable(method): return method
+        def call(*args, **kwargs) -> BatchFuture:
+            future = BatchFuture()
+            future.set_result(method(*args, **kwargs))
+            self.results.append(future.value)
+            return future
+        return call
+
+    def flush(self) -> list:
+        return self.results
+
+
+class InProcessSimulatorClient:
+    """ Drive the simulator through the shared library (`librtheter.so`) with
+    ctypes, the method surface is the same as `SimulatorClient`.
+
+    Examples
+    --------
+    >>> sim = InProcessSimulatorClient("path_to_librtheter.so")
+    >>> sim.start_simulation()
+    """
+
+    def __init__(self, library_path: str):
+        self.library = library_path
+        self.lib = load_library(library_path)
+        self.procMap = {0: "CPU", 3:"DataCopy", 7: "GPU"}
+        self.value_type = float if self.lib.rtheter_value_is_float() else int
+        self.dtype = np.float64 if self.value_type == float else np.int64
+        self._use_resolution(1)
+        self.buffer = np.empty(4096, dtype=self.dtype)
+        self.text_buffer = ctypes.create_string_buffer(4096)
+        self.handle = self.lib.rtheter_create()
+        self.alreadyQuit = False
+        self.mirror = None
+
+    def __del__(self):
+        # the constructor may have failed before the backend was attached
+        if not getattr(self, "alreadyQuit", True) and hasattr(self, "handle"):
+            self.quit()
+
+    def _use_resolution(self, resolution: int) -> None:
+        self.resolution = resolution
+        self.unit_type = float if resolution > 1 else self.value_type
+
+    def restart(self):
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        if self.handle: self.lib.rtheter_destroy(self.handle)
+        self.handle = self.lib.rtheter_create()
+        self.alreadyQuit = False
+
+    def send_command(self, command: str) -> str:
+        """run a text command in-process, same as one line of the stdin protocol"""
+        size = self.lib.rtheter_process_command(self.handle, command.encode(),
+                                                self.text_buffer, len(self.text_buffer))
+        if size >= len(self.text_buffer):
+            # truncated, copy the kept reply instead of running the command again
+            self.text_buffer = ctypes.create_string_buffer(size + 1)
+            self.lib.rtheter_copy_last_reply(self.handle, self.text_buffer, len(self.text_buffer))
+        return self.text_buffer.value.decode().strip()
+
+    def _query(self, func, *args) -> np.ndarray:
+        count = func(self.handle, *args, self.buffer.ctypes.data, len(self.buffer))
+        if count > len(self.buffer):
+            self.buffer = np.empty(2*count, dtype=self.dtype)
+            count = func(self.handle, *args, self.buffer.ctypes.data, len(self.buffer))
+        return self.buffer[:count]
+
+    def _query_index(self, func, index: int, name: str) -> np.ndarray:
+        """query of a processor or task, the library replies nothing for an invalid index"""
+        values = self._query(func, index)
+        if len(values) == 0: raise IndexError(f"No {name} {index}")
+        return values
+
+    @contextmanager
+    def batch(self):
+        yield _ImmediateBatch(self)
+
+    def query_build_info(self) -> dict:
+        return parse_build_info(self.send_command("queryBuildInfo"))
+
+    def get_current_time_stamp(self) -> int:
+        return self.lib.rtheter_current_time(self.handle)
+
+    def quit(self) -> str:
+        self.alreadyQuit = True
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        if self.handle:
+            self.lib.rtheter_destroy(self.handle)
+            self.handle = None
+        return "Exiting..."
+
+    def set_simulation_timebound(self, bound: int) -> str:
+        self.lib.rtheter_set_simulation_time_bound(self.handle, int(bound))
+        return f"Set bound to {int(bound)}"
+
+    def set_hyperperiod_timebound(self, count: int = 1) -> bool:
+        return self.send_command(f"setHyperperiodTimeBound {int(count)}").startswith("Set bound")
+
+    def query_hyperperiod(self) -> int:
+        return int(self.send_command("queryHyperperiod"))
+
+    def set_steady_state_detection(self, enabled: bool = True) -> bool:
+        return self.send_command(f"setSteadyStateDetection {int(enabled)}") == "Set"
+
+    def query_steady_state(self) -> 'tuple[bool, int]':
+        return parse_steady_state(self.send_command("querySteadyState"))
+
+    def set_task_release(self, taskId: int, offset: int, jitter: int = 0, slack: int = 0) -> bool:
+        return self.send_command(f"setTaskRelease {taskId} {offset} {jitter} {slack}") == "Set"
+
+    def query_task_release(self, taskId: int) -> 'tuple[int, int, int, int, int]':
+        return tuple(map(int, self.send_command(f"queryTaskRelease {taskId}").split()))
+
+    def run_policy(self, policy: str) -> 'tuple[bool, int, int, int, int, int] | None':
+        return parse_policy_result(self.send_command(f"runPolicy {policy}"))
+
+    def is_simulation_completed(self) -> bool:
+        return bool(self.lib.rtheter_is_simulation_completed(self.handle))
+
+    def does_task_miss_deadline(self) -> bool:
+        return bool(self.lib.rtheter_does_task_miss_deadline(self.handle))
+
+    def update_processor_and_task(self, events: bool = False) -> 'int | tuple[int, np.ndarray]':
+        executed = executed_units(self.lib.rtheter_update(self.handle), self.resolution)
+        if events: return (executed, self.query_tick_events())
+        return executed
+
+    def advance_until_decision(self, events: bool = False) -> 'int | tuple[int, np.ndarray]':
+        executed = executed_units(self.lib.rtheter_advance_until_decision(self.handle), self.resolution)
+        if events: return (executed, self.query_tick_events())
+        return executed
+
+    def advance_until_event(self, events: bool = False) -> 'int | tuple[int, np.ndarray]':
+        executed = executed_units(self.lib.rtheter_advance_until_event(self.handle), self.resolution)
+        if events: return (executed, self.query_tick_events())
+        return executed
+
+    def query_tick_events(self) -> np.ndarray:
+        return parse_events(self._query(self.lib.rtheter_query_tick_events).copy())
+
+    def query_task_versions(self) -> 'tuple[int, np.ndarray]':
+        return parse_task_versions(self._query(self.lib.rtheter_query_task_versions).copy())
+
+    def query_idle_processors(self, procType: int = -1) -> 'np.ndarray | dict':
+        return parse_idle_processors(self._query(self.lib.rtheter_query_idle_processors, procType).copy(),
+                                     procType)
+
+    def query_execution_history(self, taskId: int) -> np.ndarray:
+        return parse_execution_history(self._query(self.lib.rtheter_query_execution_history, taskId).copy())
+
+    def sort_processors(self) -> str:
+        self.lib.rtheter_sort_processors(self.handle)
+        return "Sorted"
+
+    def start_simulation(self) -> str:
+        self.lib.rtheter_start_simulation(self.handle)
+        return "Initial Tasks Released"
+
+    def create_processor(self, procType: int, procNum: int = 1) -> str:
+        if self.lib.rtheter_create_processors(self.handle, procType, procNum):
+            return "Created successfully"
+        return "Error Occurred"
+
+    def create_heter_ss_task(self, period:int, procCount: int,
+                             proc: 'tuple[int]', segs: 'tuple[int]') -> str:
+        return self.send_command(f"createHeterSSTask {period} {procCount} " +
+                                 " ".join([self.procMap[x] for x in proc]) + " " +
+                                 " ".join(map(str, segs)))
+
+    def create_dag_task(self, args: list) -> str:
+        values = (_int64 * len(args))(*args)
+        if self.lib.rtheter_create_dag_task(self.handle, values, len(args)):
+            return "Created successfully"
+        return "Invalid args!"
+
+    def load_scenario(self, path: str, compress: bool = False) -> str:
+        return self.send_command(f"loadScenario {os.path.abspath(path)}" + (" compress" if compress else ""))
+
+    def load_scenario_values(self, processors: 'dict | list', tasksets: list, compress: bool = False) -> str:
+        values = encode_scenario(processors, tasksets)
+        if not self.lib.rtheter_load_scenario(self.handle, values.ctypes.data_as(ctypes.POINTER(_int64)),
+                                              len(values)):
+            return "Invalid scenario!"
+        if compress and not self.compress_time_base(): return "Scenario loaded, time base not compressed"
+        return "Scenario loaded"
+
+    def compress_time_base(self) -> int:
+        res = self.send_command("compressTimeBase")
+        return int(res) if res.isdigit() else 0
+
+    def set_time_resolution(self, resolution: int) -> bool:
+        if self.send_command(f"setTimeResolution {resolution}") != "Set": return False
+        self._use_resolution(int(resolution))
+        return True
+
+    def query_time_resolution(self) -> int:
+        self._use_resolution(int(self.lib.rtheter_time_resolution(self.handle)))
+        return self.resolution
+
+    def push_state(self) -> 'tuple[int, int, int]':
+        return parse_state_stack(self.send_command("pushState"))
+
+    def pop_state(self) -> 'tuple[int, int] | None':
+        return parse_state_stack(self.send_command("popState"))
+
+    def restore_state(self, state_id: int) -> 'tuple[int, int] | None':
+        return parse_state_stack(self.send_command(f"restoreState {state_id}"))
+
+    def set_state_stack_limit(self, depth: int, max_bytes: int) -> str:
+        return self.send_command(f"setStateStackLimit {depth} {max_bytes}")
+
+    def query_state_data(self, state_id: int) -> 'bytes | None':
+        """bytes of the `push_state` snapshot, for `restore_state_data` here or on
+        another in-process client with the same processors, tasks and time base
+
+        Returns:
+            bytes | None: None if it was dropped
+        """
+        size = self.lib.rtheter_query_state_data(self.handle, state_id, None, 0)
+        if size == 0: return None
+        data = ctypes.create_string_buffer(size)
+        self.lib.rtheter_query_state_data(self.handle, state_id, data, size)
+        return data.raw
+
+    def restore_state_data(self, data: bytes) -> bool:
+        """restore the snapshot of `query_state_data`; False, leaving the state as
+        it was, if it is incomplete or belongs to other processors or tasks"""
+        return bool(self.lib.rtheter_restore_state_data(self.handle, data, len(data)))
+
+    def save_checkpoint(self, path: str) -> bool:
+        return self.send_command(f"saveCheckpoint {os.path.abspath(path)}") == "Checkpoint saved"
+
+    def load_checkpoint(self, path: str) -> bool:
+        if self.send_command(f"loadCheckpoint {os.path.abspath(path)}") != "Checkpoint loaded": return False
+        self.query_time_resolution()
+        return True
+
+    def query_processor_state(self, procId: int) -> 'tuple':
+        return parse_processor_state(self._query_index(self.lib.rtheter_query_processor_state, procId, "processor"))
+
+    def query_processor_states(self) -> 'tuple':
+        return parse_processor_states(self._query(self.lib.rtheter_query_processor_states))
+
+    def query_task_state(self, taskId: int) -> 'tuple':
+        return parse_task_state(self._query_index(self.lib.rtheter_query_task_state, taskId, "task"),
+                                self.unit_type, self.resolution)
+
+    def query_ss_task_state(self, taskId: int) -> 'tuple':
+        return parse_ss_task_state(self._query_index(self.lib.rtheter_query_ss_task_state, taskId, "task"),
+                                   self.unit_type, self.resolution)
+
+    def query_task_execution_states(self) -> 'list[int]':
+        return parse_execution_states(self._query(self.lib.rtheter_query_task_execution_states),
+                                      self.resolution)
+
+    def snapshot(self) -> 'tuple[int, np.ndarray, np.ndarray]':
+        # copy, the buffer is reused by the next query
+        return parse_snapshot(self._query(self.lib.rtheter_query_snapshot).copy(), self.unit_type, self.resolution)
+
+    def schedule_segment_on_processor(self, procId: int, taskId:int, segId: int) -> str:
+        if self.lib.rtheter_schedule_segment(self.handle, procId, taskId, segId):
+            return "Scheduled"
+        return "Schedule Error!"
+
+    def enable_state_mirror(self, path: str = None) -> 'StateMirror':
+        """same as `SimulatorClient.enable_state_mirror`"""
+        from mirror import StateMirror, default_mirror_path
+        owner = path is None
+        if owner: path = default_mirror_path()
+        res = self.send_command(f"enableStateMirror {path}")
+        if res != "Mirror enabled":
+            raise RuntimeError(f"Cannot enable the state mirror: {res}")
+        self.mirror = StateMirror(path, owner)
+        return self.mirror
+
+    def reset_client(self) -> bool:
+        return bool(self.lib.rtheter_reset_simulator(self.handle))
+
+    def clear_simulator(self) -> bool:
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+        if self.send_command("clearSimulator") != "Cleared": return False
+        self._use_resolution(1)
+        return True
+
+    def set_processor_variation(self, procId: int, var: int) -> bool:
+        if self.unit_type == int: return False
+        self.send_command(f"setProcessorVariation {procId} {var}")
+        return True
+
+    def set_processor_parallel_factor(self, procId: int, factor: int) -> str:
+        return self.send_command(f"setProcessorParallelFactor {procId} {factor}")
+
+    def set_variation_seed(self, seed: int) -> bool:
+        return self.send_command(f"setVariationSeed {seed}") == "Set"
+
+    def set_variation_distribution(self, distribution: str, *params: float,
+                                   per_job: bool = False) -> bool:
+        args = " ".join(["job" if per_job else "segment", distribution, *map(str, map(float, params))])
+        return self.send_command(f"setVariationDistribution {args}") == "Set"
+
+    def print(self):
+        return self.send_command("printSimulatorState")
@@ -0,0 +1,101 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+import mmap
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from client import PROCESSOR_DTYPE, segment_dtype
+
+# Keep in sync with StateMirrorHeader in src/cpp/statemirror.h
+_HEADER = struct.Struct("<8sQQIIIIII16x")
+_MAGIC = b"RTHMIRR1"
+
+
+def default_mirror_path() -> str:
+    """a fresh file under /dev/shm if available, otherwise the temp directory"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    fd, path = tempfile.mkstemp(prefix="rtheter-", suffix=".mirror", dir=directory)
+    os.close(fd)
+    return path
+
+
+class StateMirror:
+    """ Zero-copy reader of the state mirror written by the backend after every
+    update and schedule (`enableStateMirror <path>`).
+
+    `read()` returns the same (time, processors, segments) tuple as
+    `SimulatorClient.snapshot()`, but the arrays are views into the mapped file:
+    they change with the backend and must be copied to be kept. The lengths
+    stay in sub-ticks, `resolution` per time unit (see
+    `SimulatorClient.set_time_resolution`).
+
+    Examples
+    --------
+    >>> mirror = client.enable_state_mirror()
+    >>> time, procs, segs = mirror.read()
+    """
+
+    def __init__(self, path: str, owner: bool = False) -> None:
+        self.path = path
+        self.owner = owner
+        self.file = open(path, "rb")
+        self.map = self._map()
+        self.counts = None
+        self.sequence = 0
+        self.flags = 0
+        self.resolution = 1
+
+    def close(self) -> None:
+        # the map itself is released with the last view handed out by read()
+        self.processors = self.segments = self.map = None
+        self.file.close()
+        if self.owner and os.path.exists(self.path): os.remove(self.path)
+
+    def _map(self) -> mmap.mmap:
+        size = os.fstat(self.file.fileno()).st_size
+        return mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _header(self) -> tuple:
+        magic, *fields = _HEADER.unpack_from(self.map, 0)
+        if magic != _MAGIC: raise RuntimeError(f"{self.path} is not a state mirror")
+        return tuple(fields)
+
+    def _remap(self, proc_count: int, seg_count: int, is_float: int, header_size: int) -> None:
+        # the backend resizes the file when processors or tasks are added
+        self.map = self._map()
+        if is_float:
+            proc_dtype = np.dtype([(name, np.float64) for name in PROCESSOR_DTYPE.names])
+            seg_dtype = np.dtype([(name, np.float64) for name in segment_dtype().names])
+        else:
+            proc_dtype, seg_dtype = PROCESSOR_DTYPE, segment_dtype(int)
+        self.processors = np.frombuffer(self.map, dtype=proc_dtype, count=proc_count,
+                                        offset=header_size)
+        self.segments = np.frombuffer(self.map, dtype=seg_dtype, count=seg_count,
+                                      offset=header_size + proc_count*proc_dtype.itemsize)
+        self.counts = (proc_count, seg_count)
+
+    def read(self) -> 'tuple[int, np.ndarray, np.ndarray]':
+        """return (time, processors, segments) of the latest published state"""
+        while True:
+            sequence, time, proc_count, seg_count, flags, is_float, header_size, resolution = self._header()
+            if sequence % 2 == 1: continue
+            if self.counts != (proc_count, seg_count):
+                self._remap(proc_count, seg_count, is_float, header_size)
+                continue
+            if _HEADER.unpack_from(self.map, 0)[1] == sequence: break
+        self.sequence = sequence
+        self.flags = flags
+        # 0 from a backend without sub-ticks
+        self.resolution = max(resolution, 1)
+        return (time, self.processors, self.segments)
+
+    def does_task_miss_deadline(self) -> bool:
+        return bool(self.flags & 1)
+
+    def is_simulation_completed(self) -> bool:
+        return bool(self.flags & 2)
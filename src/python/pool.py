@@ -0,0 +1,95 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+import struct
+import threading
+from contextlib import contextmanager
+
+from client import SimulatorClient
+
+
+class SimulatorPool:
+    """ Already-started simulator backends handed out for one run each.
+
+    A released client is cleared (`clear_simulator`) before it is handed out
+    again, so the next run configures its processors, tasks and time bound on a
+    backend without a new fork/exec. A backend that died is restarted.
+
+    Examples
+    --------
+    >>> pool = SimulatorPool("../../build/main")
+    >>> with pool.client() as cli:
+    ...     cli.create_processor(0, 2)
+    >>> pool.close()
+
+    Notes
+    -----
+    `factory` creates a new client when no idle one is left, e.g.
+    `lambda: InProcessSimulatorClient(path)`; at most `size` clients are kept
+    idle, `acquire` never blocks.
+    """
+
+    def __init__(self, executable_path: str = None, size: int = 1,
+                 binary: bool = True, factory = None) -> None:
+        if factory is None:
+            factory = lambda: SimulatorClient(executable_path, binary=binary)
+        self.factory = factory
+        self.size = size
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self) -> 'SimulatorPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def is_alive(client) -> bool:
+        process = getattr(client, "process", None)
+        if process is not None: return process.poll() is None
+        return not client.alreadyQuit
+
+    def _recycle(self, client):
+        """clear a released client, restart its backend if it died"""
+        if self.is_alive(client):
+            try:
+                if client.clear_simulator(): return client
+            except (OSError, ValueError, struct.error):
+                # broken pipe or a truncated reply, the backend is gone
+                pass
+        client.restart()
+        return client
+
+    def acquire(self):
+        """return a client with an empty simulator, started if none is idle"""
+        with self.lock:
+            client = self.idle.pop() if self.idle else None
+        if client is None: return self.factory()
+        return self._recycle(client)
+
+    def release(self, client) -> None:
+        """give the client back, quit it if the pool is full"""
+        with self.lock:
+            if len(self.idle) < self.size:
+                self.idle.append(client)
+                return
+        client.quit()
+
+    @contextmanager
+    def client(self):
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for client in idle:
+            if not client.alreadyQuit: client.quit()
@@ -678,6 +678,19 @@ class DAGTaskGenerator:
         self.task_sets = res
         return res
 
+    def write_scenario(self, path: str, processors: 'dict | list') -> str:
+        """ Write the platform and the generated taskset as a scenario file,
+        loaded at once by `SimulatorClient.load_scenario`
+
+        Args:
+        ---
+            path (str): scenario file
+            processors (dict | list): {type: count}, e.g. {0: 2, 3: 1, 7: 2}
+        """
+        from scenario import write_scenario
+        if not hasattr(self, "task_sets"): self.generate_tasksets()
+        return write_scenario(path, processors, self.task_sets)
+
 class DAGViTGenerator:
     """Randomly generate several DAG ViT tasks by uunifast algorithm.
 
@@ -745,7 +758,7 @@ class DAGViTGenerator:
         res = []
         dependency = [ 0,1, 1,2, 2,3, 2,4, 2,5, 3,6, 4,6, 5,7, 6,7,
                        7,8, 8,9, 9,10, 10,11, 11,12]
-        num_nodes = 13; num_edges = len(dependency)
+        num_nodes = 13; num_edges = len(dependency) // 2
         tasks = np.zeros((5,13), dtype=list)
         tasks[0] = np.array([6,2,1,1,1,1,1,3,1,1,4,1,2]) #25
         tasks[1] = np.array([19,5,2,1,1,1,4,8,3,2,9,1,2]) #58
@@ -0,0 +1,69 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+import struct
+
+import numpy as np
+
+# Keep in sync with src/cpp/protocol.h
+SCENARIO_MAGIC = struct.unpack("<q", b"RTHScene")[0]
+SCENARIO_VERSION = 1
+
+
+def _processor_pairs(processors: 'dict | list') -> list:
+    if isinstance(processors, dict): processors = processors.items()
+    return [(int(proc_type), int(count)) for proc_type, count in processors]
+
+
+def encode_scenario(processors: 'dict | list', tasksets: list) -> np.ndarray:
+    """encode a platform and its DAG tasks as the int64 values of `loadScenario`
+
+    Args:
+        processors (dict | list): {type: count} or [(type, count), ...],
+            created in this order, e.g. {0: 2, 3: 1, 7: 2}
+        tasksets (list): tasks in the `create_dag_task` layout, e.g. the output
+            of `DAGTaskGenerator.generate_tasksets`
+
+    Returns:
+        np.ndarray: <magic> <version> <type_num> <type0> <count0> ... <task_num> <task0> ...
+    """
+    pairs = _processor_pairs(processors)
+    values = [SCENARIO_MAGIC, SCENARIO_VERSION, len(pairs)]
+    for pair in pairs: values += pair
+    values.append(len(tasksets))
+    for task in tasksets: values += task
+    return np.array(values, dtype="<i8")
+
+
+def write_scenario(path: str, processors: 'dict | list', tasksets: list) -> str:
+    """write a scenario file for `SimulatorClient.load_scenario`, returns the path"""
+    encode_scenario(processors, tasksets).tofile(path)
+    return path
+
+
+def decode_scenario(values: np.ndarray) -> 'tuple[list, list]':
+    """inverse of `encode_scenario`
+
+    Returns:
+        tuple: [(type, count), ...], [task0, task1, ...]
+    """
+    values = [int(x) for x in values]
+    if values[:2] != [SCENARIO_MAGIC, SCENARIO_VERSION]:
+        raise ValueError("Not a scenario of this version")
+    type_num = values[2]
+    processors = [tuple(values[3+2*i:5+2*i]) for i in range(type_num)]
+    index = 3 + 2*type_num
+    task_num = values[index]; index += 1
+    tasksets = []
+    for _ in range(task_num):
+        node_num, edge_num = values[index+1], values[index+2]
+        end = index + 3 + 2*(node_num + edge_num)
+        tasksets.append(values[index:end])
+        index = end
+    return processors, tasksets
+
+
+def read_scenario(path: str) -> 'tuple[list, list]':
+    """read a scenario file, see `decode_scenario`"""
+    return decode_scenario(np.fromfile(path, dtype="<i8"))
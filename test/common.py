@@ -0,0 +1,47 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" Paths shared by the regression tests: the build directory (RTHETER_BUILD,
+./build by default) and the Python clients of src/python.
+
+    ctest --test-dir build
+    python -m unittest discover -s test
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD = os.environ.get("RTHETER_BUILD", os.path.join(ROOT, "build"))
+MAIN = os.path.join(BUILD, "main")
+LIBRARY = os.path.join(BUILD, "librtheter.so")
+
+sys.path.insert(0, os.path.join(ROOT, "src", "python"))
+
+
+def greedy_decisions(cli, task_count: int) -> list:
+    """ (processor, task, segment) pairs of the idle processors and the ready,
+    unassigned segments of their type, as seen in the replies
+    """
+    decisions = []
+    for i, (affinity, state, *_) in enumerate(cli.query_processor_states()):
+        if state != 0: continue
+        for j in range(task_count):
+            _, segments = cli.query_task_state(j)
+            decisions += [(i, j, k) for k, seg in enumerate(segments)
+                          if seg[0] == affinity and seg[2] == 1 and seg[1] == -1 and seg[4] > 0]
+    return decisions
+
+
+def schedule_greedy(cli, task_count: int) -> list:
+    """ Schedule the first ready segment of each idle processor, return the
+    scheduled (processor, task, segment)
+    """
+    used, scheduled = set(), []
+    for i, j, k in greedy_decisions(cli, task_count):
+        if i in used or any((j, k) == (b, c) for _, b, c in scheduled): continue
+        cli.schedule_segment_on_processor(i, j, k)
+        used.add(i)
+        scheduled.append((i, j, k))
+    return scheduled
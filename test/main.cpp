@@ -4,8 +4,10 @@
 
 #include <unistd.h>
 
+#include "batch.h"
 #include "interface.h"
 #include "scheduler.h"
+#include "server.h"
 
 #define TASK_NUM 5
 #define SEGMENT_NUM 5
@@ -23,6 +25,19 @@ int main (int argc, char ** argv) {
     // 
     // std::cout << "Schedule result: " << res << std::endl;
 
+    // SERVER MODE: ./main --server <socket path>, one simulator per session
+    if (argc >= 3 && std::string(argv[1]) == "--server") {
+        Server server(argv[2]);
+        return server.run() ? 0 : 1;
+    }
+
+    // BATCH MODE: ./main --batch <spec>, the runs of the spec on a thread pool
+    if (argc >= 3 && std::string(argv[1]) == "--batch") {
+        BatchRunner runner;
+        if (!runner.loadSpec(argv[2])) return 1;
+        return runner.run() ? 0 : 1;
+    }
+
     // default CLIENT MODE
     Interface interface(argc, argv);
     interface.readCommands();
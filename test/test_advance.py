@@ -0,0 +1,91 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" advanceUntilDecision / advanceUntilEvent give the same schedules and
+events as updating tick by tick, and skip no scheduling decision.
+"""
+
+import unittest
+
+from common import LIBRARY, greedy_decisions, schedule_greedy
+
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+# 2 CPUs, a copy engine and a GPU; the sets include failed releases that reset
+# segments of a running job without a deadline miss
+PROCESSORS = ((0, 2), (3, 1), (7, 1))
+TASKSETS = ((1, 4, 1.5), (7, 3, 1.0), (13, 4, 1.5), (92, 3, 1.0), (5, 5, 2.0))
+
+
+def create(seed: int, count: int, utilization: float, bound: int = 400):
+    cli = InProcessSimulatorClient(LIBRARY)
+    for affinity, processors in PROCESSORS: cli.create_processor(affinity, processors)
+    for task in DAGTaskGenerator(seed, count, utilization).generate_tasksets():
+        cli.create_dag_task(task)
+    cli.set_simulation_timebound(bound)
+    cli.start_simulation()
+    return cli
+
+
+def run_greedy(seed: int, count: int, utilization: float, advance) -> list:
+    """ (time stamp, scheduled) of every scheduling and the end state """
+    cli = create(seed, count, utilization)
+    trace = []
+    while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+        scheduled = schedule_greedy(cli, count)
+        if scheduled: trace.append((cli.get_current_time_stamp(), scheduled))
+        advance(cli)
+    trace.append((cli.get_current_time_stamp(), cli.does_task_miss_deadline(),
+                  cli.query_task_execution_states()))
+    cli.quit()
+    return trace
+
+
+class AdvanceTest(unittest.TestCase):
+
+    def test_decision_is_not_skipped(self):
+        for seed, count, utilization in TASKSETS:
+            cli = create(seed, count, utilization)
+            stop = None
+            while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+                now = cli.get_current_time_stamp()
+                if stop is not None and now < stop:
+                    self.assertFalse(greedy_decisions(cli, count),
+                                     f"set {seed}: decision at {now} skipped to {stop}")
+                schedule_greedy(cli, count)
+                if stop is None or now >= stop:
+                    cli.push_state()
+                    cli.advance_until_decision()
+                    stop = cli.get_current_time_stamp()
+                    cli.pop_state()
+                cli.update_processor_and_task()
+            cli.quit()
+
+    def test_same_schedule_as_stepping(self):
+        for seed, count, utilization in TASKSETS:
+            stepped = run_greedy(seed, count, utilization, lambda cli: cli.update_processor_and_task())
+            self.assertEqual(stepped, run_greedy(seed, count, utilization,
+                                                 lambda cli: cli.advance_until_decision()), seed)
+
+    def test_same_events_as_stepping(self):
+        for seed, count, utilization in TASKSETS:
+            stepped, advanced = create(seed, count, utilization), create(seed, count, utilization)
+            events = []
+            while not advanced.is_simulation_completed() and not advanced.does_task_miss_deadline():
+                scheduled = schedule_greedy(advanced, count)
+                for i, j, k in scheduled: stepped.schedule_segment_on_processor(i, j, k)
+                _, advance_events = advanced.advance_until_event(events=True)
+                events.clear()
+                while stepped.get_current_time_stamp() < advanced.get_current_time_stamp():
+                    _, tick_events = stepped.update_processor_and_task(events=True)
+                    events += tick_events.tolist()
+                self.assertEqual(events, advance_events.tolist(), seed)
+                self.assertEqual(stepped.snapshot()[2].tolist(), advanced.snapshot()[2].tolist())
+            stepped.quit()
+            advanced.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
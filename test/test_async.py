@@ -0,0 +1,154 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The async client gives the same replies as the sync one, one call at a
+time, in a batch, and gathered over several backends.
+"""
+
+import asyncio
+import unittest
+
+from common import MAIN
+
+from asyncclient import AsyncSimulatorClient, gather_clients
+from client import SimulatorClient
+from rand import DAGTaskGenerator
+
+PROCESSORS = ((0, 2), (3, 1), (7, 1))
+TASKS = 4
+SEEDS = (2, 6, 11)
+TICKS = 60
+
+
+def decide(processors: tuple, tasks: list) -> list:
+    """ the first ready, unassigned segment of its type for each idle processor """
+    decisions = []
+    for i, (affinity, state, *_) in enumerate(processors):
+        if state != 0: continue
+        for j, (_, segments) in enumerate(tasks):
+            for k, seg in enumerate(segments):
+                if seg[0] == affinity and seg[2] == 1 and seg[1] == -1 and seg[4] > 0 \
+                   and all((j, k) != (b, c) for _, b, c in decisions):
+                    decisions.append((i, j, k))
+                    break
+            else: continue
+            break
+    return decisions
+
+
+def tasksets(seed: int) -> list:
+    return DAGTaskGenerator(seed, TASKS, 1.5).generate_tasksets()
+
+
+def run_sync(seed: int, binary: bool = True) -> list:
+    cli = SimulatorClient(MAIN, binary=binary)
+    for affinity, count in PROCESSORS: cli.create_processor(affinity, count)
+    for task in tasksets(seed): cli.create_dag_task(task)
+    cli.set_simulation_timebound(300)
+    cli.start_simulation()
+    trace = []
+    for _ in range(TICKS):
+        with cli.batch() as b:
+            processors = b.query_processor_states()
+            tasks = [b.query_task_state(j) for j in range(TASKS)]
+        trace.append((processors.result(), [task.result() for task in tasks]))
+        for decision in decide(*trace[-1]): trace.append(cli.schedule_segment_on_processor(*decision))
+        trace.append(cli.update_processor_and_task())
+    trace.append(cli.query_task_state(0))
+    trace.append(cli.advance_until_event())
+    trace.append((cli.get_current_time_stamp(), cli.does_task_miss_deadline()))
+    cli.quit()
+    return trace
+
+
+async def run_async(seed: int, binary: bool = True) -> list:
+    cli = await AsyncSimulatorClient.create(MAIN, binary=binary)
+    for affinity, count in PROCESSORS: await cli.create_processor(affinity, count)
+    for task in tasksets(seed): await cli.create_dag_task(task)
+    await cli.set_simulation_timebound(300)
+    await cli.start_simulation()
+    trace = []
+    for _ in range(TICKS):
+        async with cli.batch() as b:
+            processors = b.query_processor_states()
+            tasks = [b.query_task_state(j) for j in range(TASKS)]
+        trace.append((processors.result(), [task.result() for task in tasks]))
+        for decision in decide(*trace[-1]): trace.append(await cli.schedule_segment_on_processor(*decision))
+        trace.append(await cli.update_processor_and_task())
+    trace.append(await cli.query_task_state(0))
+    trace.append(await cli.advance_until_event())
+    trace.append((await cli.get_current_time_stamp(), await cli.does_task_miss_deadline()))
+    await cli.quit()
+    return trace
+
+
+class AsyncTest(unittest.TestCase):
+
+    def test_same_as_sync(self):
+        for binary in (True, False):
+            for seed in SEEDS:
+                self.assertEqual(asyncio.run(run_async(seed, binary)), run_sync(seed, binary), (binary, seed))
+
+    def test_gather_clients(self):
+        async def gather() -> list:
+            clients = await asyncio.gather(*[AsyncSimulatorClient.create(MAIN) for _ in SEEDS])
+            await gather_clients(clients, "create_processor", 0, 2)
+            for cli, seed in zip(clients, SEEDS):
+                for task in tasksets(seed): await cli.create_dag_task(task)
+            await gather_clients(clients, "set_simulation_timebound", 300)
+            await gather_clients(clients, "start_simulation")
+            states = await gather_clients(clients, "query_task_state", 1)
+            executed = await gather_clients(clients, "advance_until_event")
+            times = await gather_clients(clients, "get_current_time_stamp")
+            await gather_clients(clients, "quit")
+            return list(zip(states, executed, times))
+
+        expected = []
+        for seed in SEEDS:
+            cli = SimulatorClient(MAIN)
+            cli.create_processor(0, 2)
+            for task in tasksets(seed): cli.create_dag_task(task)
+            cli.set_simulation_timebound(300)
+            cli.start_simulation()
+            expected.append((cli.query_task_state(1), cli.advance_until_event(), cli.get_current_time_stamp()))
+            cli.quit()
+        self.assertEqual(asyncio.run(gather()), expected)
+
+    def test_same_policy_result(self):
+        def create(cli) -> list:
+            return [cli.create_processor(affinity, count) for affinity, count in PROCESSORS] + \
+                   [cli.create_dag_task(task) for task in tasksets(SEEDS[0])]
+
+        cli = SimulatorClient(MAIN)
+        create(cli)
+        cli.set_simulation_timebound(300)
+        cli.start_simulation()
+        expected = (cli.run_policy("edf"), cli.query_task_state(0))
+        cli.quit()
+
+        async def run() -> tuple:
+            cli = await AsyncSimulatorClient.create(MAIN)
+            async with cli.batch() as b:
+                create(b)
+                b.set_simulation_timebound(300)
+                b.start_simulation()
+            result = (await cli.run_policy("edf"), await cli.query_task_state(0))
+            await cli.quit()
+            return result
+        self.assertEqual(asyncio.run(run()), expected)
+
+        async def gather() -> list:
+            clients = await asyncio.gather(*[AsyncSimulatorClient.create(MAIN) for _ in range(3)])
+            for cli in clients:
+                async with cli.batch() as b: create(b)
+            await gather_clients(clients, "set_simulation_timebound", 300)
+            await gather_clients(clients, "start_simulation")
+            results = await gather_clients(clients, "run_policy", "edf")
+            await gather_clients(clients, "quit")
+            return results
+        self.assertEqual(asyncio.run(gather()), [expected[0]] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
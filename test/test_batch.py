@@ -0,0 +1,108 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" main --batch gives a row per run of a spec, the same as run_policy on the
+same scenario and platform, and rejects invalid specs.
+"""
+
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from common import LIBRARY, MAIN, ROOT
+
+from inprocess import InProcessSimulatorClient
+from scenario import read_scenario
+
+sys.path.insert(0, os.path.join(ROOT, "app", "benchmark"))
+from generate_batch import write_batch
+
+HEADER = ["label", "policy", "scenario", "schedulable", "missTime", "endTime", "rounds", "scheduled", "preemptions"]
+# (cpu, copy engine, gpu, utilization * 10)
+POINTS = ((1, 2, 2, 15), (2, 1, 2, 30), (2, 2, 1, 25))
+RUNS = 3
+RELEASES = 200
+
+
+def run_policy(policy: str, path: str, platform: tuple) -> list:
+    """ the result fields of a row, by the in-process client """
+    cli = InProcessSimulatorClient(LIBRARY)
+    for affinity, count in platform: cli.create_processor(affinity, count)
+    assert cli.load_scenario(path) == "Scenario loaded"
+    cli.sort_processors()
+    bound = min(task[0] for task in read_scenario(path)[1]) * RELEASES
+    cli.set_simulation_timebound(bound)
+    cli.set_steady_state_detection(0 < cli.query_hyperperiod() < bound)
+    cli.start_simulation()
+    result = cli.run_policy(policy)
+    cli.quit()
+    return [str(int(value)) for value in result]
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.spec = os.path.join(self.directory.name, "sweep.spec")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def batch(self, lines: list, mode: str = "w") -> subprocess.CompletedProcess:
+        """ run main --batch on the lines, appended to the spec with mode "a" """
+        with open(self.spec, mode) as spec: spec.writelines(line + "\n" for line in lines)
+        return subprocess.run([MAIN, "--batch", self.spec], capture_output=True, text=True)
+
+    def test_same_as_run_policy(self):
+        for policy in ("edf", "dagedf"):
+            write_batch(self.directory.name, policy, RUNS, releaseLimit=RELEASES, points=POINTS)
+            missing = os.path.join(self.directory.name, "missing.scenario")
+            # more runs than threads, and uneven, so that the workers steal
+            result = self.batch(["threads 4", f"run missing {policy} {RELEASES} {missing} 0 1"], "a")
+            self.assertEqual(result.returncode, 0)
+
+            with open(os.path.join(self.directory.name, policy + "_sweep.csv")) as output:
+                rows = list(csv.reader(output))
+            self.assertEqual(rows[0], HEADER)
+            rows = rows[1:]
+            self.assertEqual(len(rows), len(POINTS) * RUNS + 1)
+            with open(self.spec) as spec:
+                runs = [line.split() for line in spec if line.startswith("run ")]
+            # every run once, in completion order
+            self.assertEqual(sorted(row[:3] for row in rows), sorted(run[1:3] + run[4:5] for run in runs))
+
+            verdicts = set()
+            for label, row_policy, path, *fields in rows:
+                self.assertEqual(row_policy, policy)
+                if label == "missing":
+                    self.assertEqual(fields, ["error", "", "", "", "", ""])
+                    continue
+                run = next(run for run in runs if run[1] == label and run[4] == path)
+                platform = [(int(a), int(b)) for a, b in zip(run[5::2], run[6::2])]
+                self.assertEqual(fields, run_policy(policy, path, platform), (label, path))
+                verdicts.add(fields[0])
+            self.assertEqual(verdicts, {"0", "1"}, policy)
+
+    def test_invalid_spec(self):
+        output = os.path.join(self.directory.name, "out.csv")
+        scenario = os.path.join(self.directory.name, "a.scenario")
+        for line in (f"run a lifo {RELEASES} {scenario}", f"run a edf 0 {scenario}",
+                     f"run a edf {RELEASES} {scenario} 9 1", f"run a edf {RELEASES} {scenario} 0",
+                     "threads many", "rerun"):
+            result = self.batch(["# a comment", f"output {output}", line])
+            self.assertEqual(result.returncode, 1, line)
+            self.assertIn(f"{self.spec}:3: invalid line", result.stderr, line)
+            self.assertFalse(os.path.exists(output), line)
+
+        result = self.batch([f"run a edf {RELEASES} {scenario}"])
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("no output", result.stderr)
+        self.assertEqual(subprocess.run([MAIN, "--batch", scenario], capture_output=True).returncode, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The build info handshake of the clients, cached per executable, and the
+compile_commands.json fallback for a backend without queryBuildInfo.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from common import LIBRARY, MAIN
+
+import client
+from asyncclient import AsyncSimulatorClient
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+
+
+class RecordingClient(SimulatorClient):
+    """ keeps the text commands it sends """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.sent = []
+        super().__init__(*args, **kwargs)
+
+    def send_command(self, command: str):
+        self.sent.append(command)
+        return super().send_command(command)
+
+
+class BuildInfoTest(unittest.TestCase):
+
+    def setUp(self):
+        client._build_info_cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        client._build_info_cache.clear()
+        self.directory.cleanup()
+
+    def test_reply(self):
+        cli = SimulatorClient(MAIN)
+        info = cli.query_build_info()
+        cli.quit()
+        self.assertEqual((info["unit_type"], info["protocol"], info["processor_types"]), (int, 1, 9))
+        for command in ("queryBuildInfo", "runPolicy", "querySnapshot", "updateProcessorAndTask"):
+            self.assertIn(command, info["commands"])
+        self.assertIs(cli.unit_type, int)
+
+        cli = InProcessSimulatorClient(LIBRARY)
+        self.assertEqual(cli.query_build_info(), info)
+        cli.quit()
+
+    def test_cached_per_executable(self):
+        first = RecordingClient(MAIN)
+        self.assertIn("queryBuildInfo", first.sent)
+        second = RecordingClient(MAIN)
+        self.assertNotIn("queryBuildInfo", second.sent)
+        self.assertEqual(second.build_info, first.build_info)
+
+        async def start() -> dict:
+            cli = await AsyncSimulatorClient.create(MAIN)
+            info = cli.build_info
+            await cli.quit()
+            return info
+        self.assertEqual(asyncio.run(start()), first.build_info)
+        first.quit(); second.quit()
+
+        # another path, or the same one rebuilt, asks again
+        copy = shutil.copy(MAIN, os.path.join(self.directory.name, "main"))
+        third = RecordingClient(copy)
+        self.assertIn("queryBuildInfo", third.sent)
+        os.utime(copy, ns=(0, os.stat(copy).st_mtime_ns + 10**9))
+        third.sent.clear()
+        third.query_build_info()
+        self.assertEqual(third.sent, ["queryBuildInfo"])
+        third.quit()
+
+    def test_compile_commands_fallback(self):
+        executable = os.path.join(self.directory.name, "main")
+        open(executable, "w").close()
+        commands = os.path.join(self.directory.name, "compile_commands.json")
+        for flags, unit_type in (("-O2", int), ("-O2 -DVARI_PROC", float)):
+            client._build_info_cache.clear()
+            with open(commands, "w") as file:
+                json.dump([{"command": f"c++ {flags} -c src/cpp/task.cpp"}], file)
+            info = client.store_build_info(executable, "Unknown command")
+            self.assertEqual(info, {"unit_type": unit_type, "protocol": 0, "processor_types": 0,
+                                    "commands": frozenset()})
+            self.assertEqual(client.cached_build_info(executable), info)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" A checkpoint brings back the state and the sub-tick resolution of the run
+that saved it, in every client, and a snapshot of the state stack is restored
+whole or not at all.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from asyncclient import AsyncSimulatorClient
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+RESOLUTION = 4
+TASKS = 3
+
+
+def configure(cli) -> None:
+    """ a run with a fractional execution variation, 20 ticks in """
+    cli.set_time_resolution(RESOLUTION)
+    cli.set_variation_seed(11)
+    cli.load_scenario_values({0: 2, 3: 1, 7: 1}, DAGTaskGenerator(3, TASKS, 1.2).generate_tasksets())
+    cli.set_processor_variation(0, 30)
+    cli.set_simulation_timebound(400)
+    cli.start_simulation()
+    continued(cli, 20)
+
+
+def states(cli) -> list:
+    return [cli.get_current_time_stamp()] + [cli.query_task_state(i) for i in range(TASKS)]
+
+
+def continued(cli, ticks: int = 30) -> list:
+    for _ in range(ticks):
+        schedule_greedy(cli, TASKS)
+        cli.update_processor_and_task()
+    return states(cli) + [cli.query_task_execution_states()]
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.ckpt")
+        saved = InProcessSimulatorClient(LIBRARY)
+        configure(saved)
+        self.assertTrue(saved.save_checkpoint(self.path))
+        self.expected = (states(saved), continued(saved))
+        saved.quit()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_loaded(self, cli) -> None:
+        self.assertEqual(cli.resolution, RESOLUTION)
+        self.assertEqual((states(cli), continued(cli)), self.expected)
+
+    def test_round_trip(self):
+        for cli in (InProcessSimulatorClient(LIBRARY), SimulatorClient(MAIN),
+                    SimulatorClient(MAIN, binary=False)):
+            self.assertTrue(cli.load_checkpoint(self.path))
+            self.check_loaded(cli)
+            cli.quit()
+
+    def test_load_in_batch(self):
+        for binary in (True, False):
+            cli = SimulatorClient(MAIN, binary=binary)
+            with cli.batch() as batch:
+                loaded = batch.load_checkpoint(self.path)
+            self.assertTrue(loaded.result())
+            self.check_loaded(cli)
+            cli.quit()
+
+    def test_load_async(self):
+        async def load():
+            cli = await AsyncSimulatorClient.create(MAIN)
+            self.assertTrue(await cli.load_checkpoint(self.path))
+            self.assertEqual(cli.resolution, RESOLUTION)
+            loaded = [await cli.query_task_state(i) for i in range(TASKS)]
+            await cli.quit()
+            return loaded
+        self.assertEqual(asyncio.run(load()), self.expected[0][1:])
+
+    def test_invalid_checkpoint(self):
+        cli = SimulatorClient(MAIN)
+        with open(self.path, "r+b") as file: file.write(b"garbage!")
+        self.assertFalse(cli.load_checkpoint(self.path))
+        self.assertEqual(cli.resolution, 1)
+        cli.quit()
+
+    def test_snapshot_data(self):
+        cli = InProcessSimulatorClient(LIBRARY)
+        configure(cli)
+        state_id, size, _ = cli.push_state()
+        data = cli.query_state_data(state_id)
+        self.assertEqual(len(data), size)
+        pushed = states(cli)
+        continued(cli, 10)
+        advanced = states(cli) + [cli.snapshot()[0], cli.query_task_versions()[0]]
+        for truncated in (data[:-1], data[:size // 2], b""):
+            self.assertFalse(cli.restore_state_data(truncated))
+            self.assertEqual(states(cli) + [cli.snapshot()[0], cli.query_task_versions()[0]], advanced)
+        self.assertTrue(cli.restore_state_data(data))
+        self.assertEqual(states(cli), pushed)
+
+        # on another client of the same tasks, not on other ones
+        other = InProcessSimulatorClient(LIBRARY)
+        configure(other)
+        continued(other, 5)
+        self.assertTrue(other.restore_state_data(data))
+        self.assertEqual((states(other), continued(other)), (pushed, continued(cli)))
+        other.clear_simulator()
+        other.set_time_resolution(RESOLUTION)
+        other.load_scenario_values({0: 2, 3: 1, 7: 1}, DAGTaskGenerator(4, TASKS, 1.2).generate_tasksets())
+        self.assertFalse(other.restore_state_data(data))
+        other.quit()
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
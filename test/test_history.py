@@ -0,0 +1,105 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The execution history merges the consecutive time units of a segment on a
+processor into one interval, is cleared at each release, and comes out the
+same when uneventful ticks are skipped.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from client import EVENT_JOB_RELEASED, SimulatorClient
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+PROCESSORS = ((0, 2), (3, 1), (7, 1))
+# (seed, task count, utilization); TASKSETS include failed releases, which reset
+# the segments of a running job and their history, RELEASED_TASKSETS do not
+TASKSETS = ((1, 4, 1.5), (13, 4, 1.5), (5, 5, 2.0))
+RELEASED_TASKSETS = ((0, 4, 1.5), (4, 5, 2.0), (18, 5, 2.0))
+
+
+def create(seed: int, count: int, utilization: float):
+    cli = InProcessSimulatorClient(LIBRARY)
+    for affinity, processors in PROCESSORS: cli.create_processor(affinity, processors)
+    for task in DAGTaskGenerator(seed, count, utilization).generate_tasksets():
+        cli.create_dag_task(task)
+    cli.set_simulation_timebound(400)
+    cli.start_simulation()
+    return cli
+
+
+def histories(cli, count: int) -> list:
+    return [cli.query_execution_history(i).tolist() for i in range(count)]
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test_intervals(self):
+        cli = SimulatorClient(MAIN)
+        cli.create_processor(0, 2)
+        cli.create_heter_ss_task(20, 1, (0,), (6,))
+        cli.create_heter_ss_task(20, 1, (0,), (2,))
+        cli.set_simulation_timebound(100)
+        cli.start_simulation()
+        cli.schedule_segment_on_processor(0, 0, 0)
+        cli.update_processor_and_task(); cli.update_processor_and_task()
+        # preempted by task 1 at 2, resumed on the other processor at 3
+        cli.schedule_segment_on_processor(0, 1, 0)
+        cli.update_processor_and_task()
+        cli.schedule_segment_on_processor(1, 0, 0)
+        self.assertEqual(histories(cli, 2), [[(0, 0, 0, 2)], [(0, 0, 2, 3)]])
+        cli.advance_until_event()
+        self.assertEqual(histories(cli, 2), [[(0, 0, 0, 2), (0, 1, 3, 4)], [(0, 0, 2, 4)]])
+        cli.advance_until_event()
+        self.assertEqual(cli.get_current_time_stamp(), 7)
+        self.assertEqual(histories(cli, 2), [[(0, 0, 0, 2), (0, 1, 3, 7)], [(0, 0, 2, 4)]])
+        # cleared by the releases at 20
+        cli.advance_until_event()
+        self.assertEqual(cli.get_current_time_stamp(), 20)
+        self.assertEqual(histories(cli, 2), [[], []])
+        cli.quit()
+
+    def test_same_as_processor_states(self):
+        for seed, count, utilization in RELEASED_TASKSETS:
+            cli = create(seed, count, utilization)
+            # (task, segment) -> [[processor, start, end], ...] from the processor states
+            expected = {}
+            while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+                schedule_greedy(cli, count)
+                time, processors, _ = cli.snapshot()
+                for processor, (_, state, task, segment) in enumerate(processors.tolist()):
+                    if state == 0: continue
+                    intervals = expected.setdefault((task, segment), [])
+                    if intervals and intervals[-1][0] == processor and intervals[-1][2] == time:
+                        intervals[-1][2] += 1
+                    else:
+                        intervals.append([processor, time, time + 1])
+                _, events = cli.update_processor_and_task(events=True)
+                for task in events[events["type"] == EVENT_JOB_RELEASED]["index"].tolist():
+                    expected = {key: value for key, value in expected.items() if key[0] != task}
+                self.assertEqual(histories(cli, count),
+                                 [[(segment, *interval) for (task, segment), intervals in sorted(expected.items())
+                                   if task == i for interval in intervals] for i in range(count)],
+                                 (seed, cli.get_current_time_stamp()))
+            cli.quit()
+
+    def test_same_when_advancing(self):
+        for seed, count, utilization in TASKSETS:
+            stepped, advanced = create(seed, count, utilization), create(seed, count, utilization)
+            while not advanced.is_simulation_completed() and not advanced.does_task_miss_deadline():
+                for i, j, k in schedule_greedy(advanced, count): stepped.schedule_segment_on_processor(i, j, k)
+                advanced.advance_until_event()
+                while stepped.get_current_time_stamp() < advanced.get_current_time_stamp():
+                    stepped.update_processor_and_task()
+                self.assertEqual(histories(advanced, count), histories(stepped, count),
+                                 (seed, advanced.get_current_time_stamp()))
+            stepped.quit()
+            advanced.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
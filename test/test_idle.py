@@ -0,0 +1,84 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The idle processors kept per type match the processor states after every
+schedule, completion, sort, reset and restore, and the parallel burden is the
+busy count of the type.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+# created out of type order
+PROCESSORS = ((7, 1), (0, 1), (3, 1), (0, 2), (7, 1))
+TASKS = 4
+
+
+def clients() -> list:
+    return [SimulatorClient(MAIN), InProcessSimulatorClient(LIBRARY)]
+
+
+class IdleProcessorTest(unittest.TestCase):
+
+    def assertIdle(self, cli, message = None):
+        expected = {processor_type: [] for processor_type in range(9)}
+        for i, (processor_type, state, *_) in enumerate(cli.query_processor_states()):
+            if state == 0: expected[processor_type].append(i)
+        idle = cli.query_idle_processors()
+        self.assertEqual({key: value.tolist() for key, value in idle.items()}, expected, message)
+        for processor_type in (0, 3, 7):
+            self.assertEqual(cli.query_idle_processors(processor_type).tolist(), expected[processor_type], message)
+
+    def test_same_as_processor_states(self):
+        for cli in clients():
+            for processor_type, count in PROCESSORS: cli.create_processor(processor_type, count)
+            self.assertIdle(cli, "created")
+            cli.sort_processors()
+            self.assertIdle(cli, "sorted")
+            for task in DAGTaskGenerator(8, TASKS, 1.8).generate_tasksets(): cli.create_dag_task(task)
+            cli.set_simulation_timebound(400)
+            cli.start_simulation()
+            state_id = None
+            while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+                if schedule_greedy(cli, TASKS): self.assertIdle(cli, ("scheduled", cli.get_current_time_stamp()))
+                if cli.get_current_time_stamp() >= 30 and state_id is None:
+                    state_id, _, _ = cli.push_state()
+                    pushed = cli.query_processor_states()
+                cli.update_processor_and_task()
+                self.assertIdle(cli, ("updated", cli.get_current_time_stamp()))
+            self.assertIsNotNone(cli.restore_state(state_id))
+            self.assertEqual(cli.query_processor_states(), pushed)
+            self.assertIdle(cli, "restored")
+            self.assertTrue(cli.reset_client())
+            self.assertIdle(cli, "reset")
+            self.assertEqual(cli.query_idle_processors(0).tolist(), [0, 1, 2])
+            cli.quit()
+
+    def test_burden_is_busy_count(self):
+        for cli in clients():
+            cli.set_time_resolution(100)
+            # not sorted, a type spreads over other types
+            for processor_type in (0, 7, 0, 0): cli.create_processor(processor_type, 1)
+            for processor_type in (0, 0, 7, 0): cli.create_heter_ss_task(100, 1, (processor_type,), (10,))
+            cli.set_processor_parallel_factor("CPU", 10)
+            cli.set_processor_parallel_factor("GPU", 10)
+            cli.set_simulation_timebound(100)
+            cli.start_simulation()
+            for processor, task in ((0, 0), (2, 1), (1, 2)): cli.schedule_segment_on_processor(processor, task, 0)
+            # 2 busy CPUs at 90 %, the only busy GPU at full speed
+            cli.update_processor_and_task()
+            self.assertEqual(cli.query_task_execution_states(), [0.9, 0.9, 1.0, 0.0])
+            cli.schedule_segment_on_processor(3, 3, 0)
+            cli.update_processor_and_task()
+            self.assertEqual(cli.query_task_execution_states(), [1.7, 1.7, 2.0, 0.8])
+            cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The in-process client (librtheter.so) behaves as the client of the main
+process, copies a long reply without running the command again, and rejects
+an invalid processor or task index instead of crashing the host process.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+
+def run(cli) -> list:
+    cli.create_processor(0, 2); cli.create_processor(3, 1); cli.create_processor(7, 1)
+    for task in DAGTaskGenerator(21, 4, 1.5).generate_tasksets(): cli.create_dag_task(task)
+    cli.set_simulation_timebound(300)
+    cli.start_simulation()
+    trace = []
+    while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+        trace.append(schedule_greedy(cli, 4))
+        trace.append(cli.update_processor_and_task())
+        trace.append(cli.query_processor_states())
+        trace.append(cli.query_task_execution_states())
+    trace.append((cli.get_current_time_stamp(), cli.does_task_miss_deadline()))
+    cli.quit()
+    return trace
+
+
+class InProcessTest(unittest.TestCase):
+
+    def test_same_as_main(self):
+        self.assertEqual(run(InProcessSimulatorClient(LIBRARY)), run(SimulatorClient(MAIN)))
+
+    def test_long_reply_runs_once(self):
+        cli = InProcessSimulatorClient(LIBRARY)
+        cli.create_processor(0, 1)
+        for _ in range(1000): cli.create_heter_ss_task(10, 1, (0,), (1, 1))
+        cli.set_simulation_timebound(100)
+        cli.start_simulation()
+        # the events of 1000 deadline misses do not fit the first reply buffer
+        replies = [cli.send_command("updateProcessorAndTask 1") for _ in range(10)]
+        self.assertGreater(max(len(reply) for reply in replies), 4096)
+        self.assertEqual([int(reply.split()[1]) for reply in replies], list(range(1, 11)))
+        cli.quit()
+
+    def test_invalid_index(self):
+        cli = InProcessSimulatorClient(LIBRARY)
+        cli.create_processor(0, 1)
+        cli.create_heter_ss_task(10, 1, (0,), (2,))
+        cli.start_simulation()
+        for query, index in ((cli.query_task_state, 1), (cli.query_task_state, 100000),
+                             (cli.query_ss_task_state, 100000), (cli.query_task_state, -1),
+                             (cli.query_processor_state, 1), (cli.query_processor_state, 100000)):
+            with self.assertRaises(IndexError):
+                query(index)
+        # the simulator is left as it was
+        self.assertEqual(cli.query_task_state(0), (10, ((0, -1, 1, 2, 2),)))
+        self.assertEqual(cli.query_processor_state(0), (0, 0, 0, 0))
+        cli.quit()
+
+        cli = SimulatorClient(MAIN)
+        cli.create_processor(0, 1)
+        cli.create_heter_ss_task(10, 1, (0,), (2,))
+        self.assertEqual(cli.send_command("queryTaskState 100000"), "Invalid args!")
+        self.assertEqual(cli.send_command("querySSTaskStates 100000"), "Invalid args!")
+        self.assertEqual(cli.send_command("queryProcessorState 100000"), "Invalid args!")
+        self.assertEqual(cli.query_task_state(0)[0], 10)
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
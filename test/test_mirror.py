@@ -0,0 +1,76 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The state mirror reads the same state as snapshot() after every update,
+schedule, start, restore and reset, also once processors and tasks are added.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+TASKS = 3
+
+
+def clients() -> list:
+    """ (client, time resolution) """
+    return [(SimulatorClient(MAIN), 1), (SimulatorClient(MAIN, binary=False), 1),
+            (InProcessSimulatorClient(LIBRARY), 4)]
+
+
+class MirrorTest(unittest.TestCase):
+
+    def assertMirrored(self, cli, mirror, message = None):
+        time, processors, segments = cli.snapshot()
+        mirror_time, mirror_processors, mirror_segments = mirror.read()
+        self.assertEqual(mirror_time, time, message)
+        self.assertEqual(mirror_processors.tolist(), processors.tolist(), message)
+        # the mirror keeps the lengths in sub-ticks
+        for name in segments.dtype.names:
+            scale = mirror.resolution if name in ("length", "remaining") else 1
+            self.assertEqual((mirror_segments[name] / scale).tolist(), segments[name].tolist(), (message, name))
+        self.assertEqual(mirror.does_task_miss_deadline(), cli.does_task_miss_deadline(), message)
+        self.assertEqual(mirror.is_simulation_completed(), cli.is_simulation_completed(), message)
+
+    def test_same_as_snapshot(self):
+        for cli, resolution in clients():
+            mirror = cli.enable_state_mirror()
+            self.assertTrue(cli.set_time_resolution(resolution))
+            cli.create_processor(0, 2); cli.create_processor(7, 1)
+            for task in DAGTaskGenerator(4, TASKS, 1.2).generate_tasksets(): cli.create_dag_task(task)
+            cli.set_simulation_timebound(300)
+            cli.start_simulation()
+            self.assertMirrored(cli, mirror, "start")
+
+            for _ in range(40):
+                for decision in schedule_greedy(cli, TASKS): self.assertMirrored(cli, mirror, decision)
+                cli.update_processor_and_task()
+                self.assertMirrored(cli, mirror, cli.get_current_time_stamp())
+            cli.push_state()
+            cli.advance_until_event()
+            self.assertTrue(cli.pop_state() is not None)
+            self.assertMirrored(cli, mirror, "pop")
+            self.assertTrue(cli.reset_client())
+            self.assertMirrored(cli, mirror, "reset")
+
+            # a larger state moves the rows, the reader maps them again
+            counts = mirror.counts
+            cli.create_processor(3, 1)
+            cli.create_dag_task([40, 2, 1, 3, 3, 2, 0, 0, 1])
+            self.assertTrue(cli.reset_client())
+            self.assertMirrored(cli, mirror, "added")
+            self.assertNotEqual(mirror.counts, counts)
+            while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+                schedule_greedy(cli, TASKS + 1)
+                cli.advance_until_event()
+                self.assertMirrored(cli, mirror, cli.get_current_time_stamp())
+            cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The native policies of runPolicy schedule as the Python schedulers of
+app/benchmark and app/RL-ViT, with and without a compressed time base, count
+the same after resetSimulator, and keep their verdicts when compressed.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+from common import LIBRARY, MAIN, ROOT
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+from pool import SimulatorPool
+from rand import DAGTaskGenerator, DAGViTGenerator
+
+sys.path.insert(0, os.path.join(ROOT, "app", "RL-ViT"))
+from dagedf import DAGEDFScheduler
+
+PROCESSORS = ((0, 2), (3, 2), (7, 2))
+POLICIES = ("edf", "rm", "dm", "fifo", "dagedf")
+# the job of task 2 misses at time 11, between two compressed time stamps
+COMPRESSIBLE = ({0: 2, 7: 1}, [[8, 1, 0, 2, 7], [36, 2, 0, 4, 7, 4, 0], [10, 1, 0, 6, 7], [20, 1, 0, 6, 0]])
+# the processors of DAGEnv, and a bound in time units of the unscaled tasks
+VIT_PROCESSORS = ((0, 2), (7, 2))
+VIT_BOUND = 3000
+
+
+def scaled(task: list, scale: int) -> list:
+    """ the createDAGTask values with the period and the node lengths times scale """
+    task = list(task)
+    task[0] *= scale
+    for k in range(task[1]): task[3 + 2 * k] *= scale
+    return task
+
+
+def create(seed: int, utilization: float, release_limit: int = 100, scale: int = 1):
+    """ with scale > 1, on the compressed time base of the scaled tasks """
+    cli = InProcessSimulatorClient(LIBRARY)
+    for affinity, count in PROCESSORS: cli.create_processor(affinity, count)
+    cli.sort_processors()
+    taskset = [scaled(task, scale) for task in DAGTaskGenerator(seed, 5, utilization).generate_tasksets()]
+    for task in taskset: cli.create_dag_task(task)
+    if scale > 1: cli.compress_time_base()
+    period = np.array([task[0] for task in taskset], dtype=int)
+    cli.set_simulation_timebound(int(np.min(period)) * release_limit)
+    cli.start_simulation()
+    return cli, period
+
+
+def python_policy(cli, period, policy: str) -> tuple:
+    """ EDFScheduler / RateMonotonicScheduler.simulate of app/benchmark, with
+    the ties in index order; the relative deadlines are the periods for dm,
+    fifo takes the tasks in index order without preempting
+
+    Returns:
+        tuple: schedulable, end time, rounds
+    """
+    processor_count = sum(count for _, count in PROCESSORS)
+    rounds = 0
+    while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+        rounds += 1
+        time = cli.get_current_time_stamp()
+        if policy == "edf": key = np.array([p - (time % p) for p in period])
+        elif policy == "fifo": key = np.zeros(len(period), dtype=int)
+        else: key = period
+        order = np.argsort(key, kind="stable")
+        for i in range(processor_count):
+            processor = cli.query_processor_state(i)
+            if processor[1] >= 2: continue
+            scheduled = False
+            for j in order:
+                if scheduled: break
+                for k, seg in enumerate(cli.query_task_state(j)[1]):
+                    if seg[0] != processor[0] or seg[-1] <= 0 or seg[2] != 1: continue
+                    if 0 <= seg[1] <= 99999: continue
+                    scheduled = processor[1] == 0 or key[processor[2]] > key[j]
+                    if scheduled:
+                        cli.schedule_segment_on_processor(i, j, k)
+                        break
+        cli.advance_until_event()
+    return (not cli.does_task_miss_deadline(), cli.get_current_time_stamp(), rounds)
+
+
+class ScaledClient(SimulatorClient):
+    """ creates the tasks of DAGEnv scaled and compresses them back at the start,
+    and keeps the time the simulation first ends (DAGEnv may step on past it) """
+
+    def __init__(self, scale: int) -> None:
+        super().__init__(MAIN)
+        self.scale = scale
+        self.end = None
+
+    def create_dag_task(self, args: list) -> str:
+        return super().create_dag_task(scaled(args, self.scale))
+
+    def start_simulation(self) -> str:
+        if self.scale > 1: self.compress_time_base()
+        return super().start_simulation()
+
+    def update_processor_and_task(self, *args, **kwargs):
+        res = super().update_processor_and_task(*args, **kwargs)
+        if self.end is None and (self.does_task_miss_deadline() or self.is_simulation_completed()):
+            self.end = (not self.does_task_miss_deadline(), self.get_current_time_stamp())
+        return res
+
+
+def python_dagedf(seed: int, utilization: float, scale: int) -> tuple:
+    """ DAGEDFScheduler of app/RL-ViT
+
+    Returns:
+        tuple: schedulable, end time
+    """
+    pool = SimulatorPool(factory=lambda: ScaledClient(scale))
+    scheduler = DAGEDFScheduler(seed, utilization, pool=pool)
+    scheduler.env.client.set_simulation_timebound(VIT_BOUND * scale)
+    scheduler.schedule()
+    end = scheduler.env.client.end
+    del scheduler
+    pool.close()
+    return end
+
+
+def native_dagedf(seed: int, utilization: float, scale: int) -> tuple:
+    cli = InProcessSimulatorClient(LIBRARY)
+    for affinity, count in VIT_PROCESSORS: cli.create_processor(affinity, count)
+    for task in DAGViTGenerator(seed, uti=utilization).generate_tasksets(): cli.create_dag_task(scaled(task, scale))
+    if scale > 1: cli.compress_time_base()
+    cli.set_simulation_timebound(VIT_BOUND * scale)
+    cli.start_simulation()
+    schedulable, _, end_time, *_ = cli.run_policy("dagedf")
+    cli.quit()
+    return schedulable, end_time
+
+
+class PolicyTest(unittest.TestCase):
+
+    def test_same_as_python(self):
+        for seed in range(4):
+            for utilization in (2.0, 3.0, 3.6, 4.2):
+                for policy in ("edf", "rm", "dm", "fifo"):
+                    for scale in (1, 3):
+                        cli, period = create(seed, utilization, scale=scale)
+                        expected = python_policy(cli, period, policy)
+                        cli.quit()
+                        cli, _ = create(seed, utilization, scale=scale)
+                        schedulable, miss_time, end_time, rounds, _, _ = cli.run_policy(policy)
+                        cli.quit()
+                        self.assertEqual((schedulable, end_time, rounds), expected,
+                                         (seed, utilization, policy, scale))
+                        self.assertEqual(miss_time == -1, schedulable)
+
+    def test_dagedf_same_as_python(self):
+        results = set()
+        for seed, utilization in ((0, 0.8), (1, 1.0), (2, 0.8), (0, 2.5)):
+            for scale in (1, 3):
+                expected = python_dagedf(seed, utilization, scale)
+                self.assertEqual(native_dagedf(seed, utilization, scale), expected, (seed, utilization, scale))
+                results.add(expected[0])
+        # both verdicts are covered
+        self.assertEqual(results, {False, True})
+
+    def test_same_after_reset(self):
+        for seed in range(3):
+            for policy in POLICIES:
+                cli, _ = create(seed, 1.5)
+                fresh = cli.run_policy(policy)
+                self.assertTrue(cli.reset_client())
+                self.assertEqual(cli.run_policy(policy), fresh, (seed, policy))
+                self.assertTrue(cli.reset_client())
+                cli.start_simulation()
+                self.assertEqual(cli.run_policy(policy), fresh, (seed, policy))
+                cli.quit()
+
+    def test_same_when_compressed(self):
+        def run(policy: str, compress: bool) -> tuple:
+            cli = InProcessSimulatorClient(LIBRARY)
+            cli.load_scenario_values(*COMPRESSIBLE)
+            if compress: self.assertEqual(cli.compress_time_base(), 2)
+            cli.set_simulation_timebound(400)
+            cli.start_simulation()
+            result = cli.run_policy(policy)
+            cli.quit()
+            return result
+
+        self.assertEqual(run("fifo", False)[:2], (False, 11))
+        for policy in POLICIES:
+            schedulable, miss_time, end_time, *_ = run(policy, False)
+            compressed = run(policy, True)
+            self.assertEqual(compressed[0], schedulable, policy)
+            if schedulable:
+                self.assertEqual(compressed[2], end_time, policy)
+            else:
+                # reported at the next compressed time stamp
+                self.assertEqual(compressed[1], miss_time + miss_time % 2, policy)
+
+    def test_not_compressed(self):
+        for make in (lambda: SimulatorClient(MAIN), lambda: SimulatorClient(MAIN, binary=False),
+                     lambda: InProcessSimulatorClient(LIBRARY)):
+            cli = make()
+            processors, tasksets = COMPRESSIBLE
+            self.assertEqual(cli.load_scenario_values(processors, tasksets[:2] + [[9, 1, 0, 2, 0]], compress=True),
+                             "Scenario loaded, time base not compressed")
+            self.assertEqual(cli.compress_time_base(), 0)
+            cli.clear_simulator()
+            cli.load_scenario_values(*COMPRESSIBLE)
+            self.assertTrue(cli.set_task_release(0, 0, 3))
+            self.assertEqual(cli.compress_time_base(), 0)
+            self.assertTrue(cli.set_task_release(0, 0, 0))
+            self.assertEqual(cli.compress_time_base(), 2)
+            # nothing left to divide
+            self.assertEqual(cli.compress_time_base(), 0)
+            cli.start_simulation()
+            cli.update_processor_and_task()
+            self.assertEqual(cli.compress_time_base(), 0)
+            self.assertEqual(cli.get_current_time_stamp(), 2)
+            cli.quit()
+
+    def test_unknown_policy(self):
+        cli, _ = create(0, 2.0)
+        self.assertIsNone(cli.run_policy("lottery"))
+        self.assertEqual(cli.get_current_time_stamp(), 0)
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
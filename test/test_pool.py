@@ -0,0 +1,98 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The simulator pool hands a released backend out again, cleared, restarts
+one that died, and quits the clients beyond its size.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN
+
+from inprocess import InProcessSimulatorClient
+from pool import SimulatorPool
+
+
+def configure(cli) -> None:
+    cli.create_processor(0, 2)
+    cli.create_heter_ss_task(10, 1, (0,), (2,))
+    cli.set_simulation_timebound(50)
+    cli.start_simulation()
+    cli.update_processor_and_task()
+
+
+class PoolTest(unittest.TestCase):
+
+    def assertEmpty(self, cli):
+        self.assertEqual(cli.query_processor_states(), ())
+        self.assertEqual(cli.query_task_execution_states(), [])
+        self.assertEqual(cli.get_current_time_stamp(), 0)
+
+    def test_reused_and_cleared(self):
+        with SimulatorPool(MAIN) as pool:
+            with pool.client() as cli:
+                pid = cli.process.pid
+                configure(cli)
+                self.assertEqual(cli.get_current_time_stamp(), 1)
+            with pool.client() as again:
+                self.assertIs(again, cli)
+                self.assertEqual(again.process.pid, pid)
+                self.assertEmpty(again)
+                configure(again)
+                self.assertEqual(again.query_processor_states(), ((0, 0, 0, 0), (0, 0, 0, 0)))
+        self.assertTrue(cli.alreadyQuit)
+
+    def test_dead_backend_restarted(self):
+        with SimulatorPool(MAIN) as pool:
+            with pool.client() as cli:
+                pid = cli.process.pid
+                configure(cli)
+            cli.process.kill()
+            cli.process.wait()
+            self.assertFalse(pool.is_alive(cli))
+            with pool.client() as again:
+                self.assertIs(again, cli)
+                self.assertNotEqual(again.process.pid, pid)
+                self.assertTrue(pool.is_alive(again))
+                self.assertEmpty(again)
+                configure(again)
+                self.assertEqual(again.get_current_time_stamp(), 1)
+
+    def test_size(self):
+        with SimulatorPool(MAIN, size=1) as pool:
+            first, second = pool.acquire(), pool.acquire()
+            self.assertIsNot(first, second)
+            pool.release(first)
+            pool.release(second)
+            # the pool holds one idle client, the other one is quit
+            self.assertEqual(pool.idle, [first])
+            self.assertFalse(first.alreadyQuit)
+            self.assertTrue(second.alreadyQuit)
+            self.assertEqual(second.process.wait(timeout=10), 0)
+            self.assertIs(pool.acquire(), first)
+            third = pool.acquire()
+            self.assertIsNot(third, first)
+            third.quit(); first.quit()
+
+    def test_factory(self):
+        pool = SimulatorPool(factory=lambda: InProcessSimulatorClient(LIBRARY), size=2)
+        with pool.client() as cli:
+            self.assertIsInstance(cli, InProcessSimulatorClient)
+            configure(cli)
+        with pool.client() as again:
+            self.assertIs(again, cli)
+            self.assertEmpty(again)
+            configure(again)
+        # a client quit by its user is started again
+        cli.quit()
+        with pool.client() as again:
+            self.assertIs(again, cli)
+            self.assertFalse(again.alreadyQuit)
+            self.assertEmpty(again)
+        pool.close()
+        self.assertTrue(cli.alreadyQuit)
+
+
+if __name__ == "__main__":
+    unittest.main()
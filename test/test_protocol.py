@@ -0,0 +1,108 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The binary and the text protocol give the same replies, and the snapshot
+and the tick events agree with the per-task queries.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from client import (EVENT_JOB_RELEASED, EVENT_PROCESSOR_IDLE, EVENT_SEGMENT_COMPLETED,
+                    EVENT_SEGMENT_READY, SimulatorClient)
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+TASKS = 4
+
+
+def configure(cli) -> None:
+    cli.create_processor(0, 2); cli.create_processor(3, 1); cli.create_processor(7, 1)
+    for task in DAGTaskGenerator(21, TASKS, 1.5).generate_tasksets(): cli.create_dag_task(task)
+    cli.set_simulation_timebound(300)
+    cli.start_simulation()
+
+
+def running(cli):
+    """ schedule greedily and yield the events of each tick """
+    while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+        schedule_greedy(cli, TASKS)
+        _, events = cli.update_processor_and_task(events=True)
+        yield events
+
+
+def trace(cli) -> list:
+    configure(cli)
+    result = []
+    for events in running(cli):
+        time, processors, segments = cli.snapshot()
+        result.append((time, events.tolist(), processors.tolist(), segments.tolist(),
+                       cli.query_task_versions()[1].tolist(), cli.query_tick_events().tolist()))
+    cli.quit()
+    return result
+
+
+class ProtocolTest(unittest.TestCase):
+
+    def test_same_in_every_protocol(self):
+        binary = SimulatorClient(MAIN)
+        self.assertTrue(binary.binary)
+        text = SimulatorClient(MAIN, binary=False)
+        self.assertFalse(text.binary)
+        expected = trace(binary)
+        self.assertGreater(len(expected), 100)
+        self.assertEqual(trace(text), expected)
+        self.assertEqual(trace(InProcessSimulatorClient(LIBRARY)), expected)
+
+    def test_snapshot_matches_queries(self):
+        for binary in (True, False):
+            cli = SimulatorClient(MAIN, binary=binary)
+            configure(cli)
+            for _ in running(cli):
+                time, processors, segments = cli.snapshot()
+                self.assertEqual(time, cli.get_current_time_stamp())
+                self.assertEqual([tuple(p) for p in processors.tolist()], list(cli.query_processor_states()))
+                queried = []
+                for i in range(TASKS):
+                    period, states = cli.query_task_state(i)
+                    queried += [(i, k, *seg, period) for k, seg in enumerate(states)]
+                self.assertEqual([tuple(s) for s in segments.tolist()], queried)
+            cli.quit()
+
+    def test_events_match_state_changes(self):
+        cli = SimulatorClient(MAIN)
+        configure(cli)
+        while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+            schedule_greedy(cli, TASKS)
+            _, processors, segments = cli.snapshot()
+            versions = cli.query_task_versions()[1]
+            _, events = cli.update_processor_and_task(events=True)
+            _, next_processors, next_segments = cli.snapshot()
+            next_versions = cli.query_task_versions()[1]
+            self.assertEqual(events.tolist(), cli.query_tick_events().tolist())
+            by_type = lambda kind: {(e["index"], e["segment"]) for e in events if e["type"] == kind}
+
+            self.assertEqual(by_type(EVENT_PROCESSOR_IDLE),
+                             {(i, 0) for i, (a, b) in enumerate(zip(processors, next_processors))
+                              if a["state"] != 0 and b["state"] == 0})
+            # a completed segment is reset if its job is released in the same tick
+            self.assertEqual(by_type(EVENT_SEGMENT_COMPLETED),
+                             {(a["task"], a["segment"]) for a, b in zip(segments, next_segments)
+                              if a["remaining"] > 0 and (b["remaining"] == 0 or
+                                                         a["processor"] >= 0 and b["remaining"] == b["length"])})
+            self.assertEqual(by_type(EVENT_SEGMENT_READY),
+                             {(b["task"], b["segment"]) for a, b in zip(segments, next_segments)
+                              if a["ready"] == 0 and b["ready"] == 1})
+
+            # the tasks with segment or release events, or a changed state, have a new version
+            changed = {i for i in range(TASKS) if next_versions[i] != versions[i]}
+            self.assertLessEqual({e["index"] for e in events if e["type"] in
+                                  (EVENT_SEGMENT_COMPLETED, EVENT_SEGMENT_READY, EVENT_JOB_RELEASED)}, changed)
+            self.assertLessEqual({b["task"] for a, b in zip(segments, next_segments) if a != b}, changed)
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
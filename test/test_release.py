@@ -0,0 +1,110 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The release calendar releases at the offset, within the jitter after the
+arrival and at sporadic gaps of the period up to the slack more, the same for
+the same seed.
+"""
+
+import unittest
+
+from common import MAIN, schedule_greedy
+
+from client import EVENT_JOB_RELEASED, SimulatorClient
+
+PERIODS = (10, 12, 15)
+# (task, offset, jitter, slack)
+RELEASES = ((0, 3, 0, 0), (1, 0, 4, 0), (2, 2, 0, 6))
+BOUND = 300
+
+
+def configure(cli, seed: int) -> None:
+    cli.create_processor(0, len(PERIODS))
+    for period in PERIODS: cli.create_heter_ss_task(period, 1, (0,), (2,))
+    cli.set_variation_seed(seed)
+    for release in RELEASES: assert cli.set_task_release(*release)
+    cli.set_simulation_timebound(BOUND)
+    cli.start_simulation()
+
+
+def releases(cli, advance: bool = False) -> list:
+    """ (time, arrival) of the releases of each task after time 0 """
+    result = [[] for _ in PERIODS]
+    update = cli.advance_until_event if advance else cli.update_processor_and_task
+    while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+        schedule_greedy(cli, len(PERIODS))
+        _, events = update(events=True)
+        for event in events[events["type"] == EVENT_JOB_RELEASED]:
+            task = int(event["index"])
+            result[task].append((cli.get_current_time_stamp(), cli.query_task_release(task)[3]))
+    return result
+
+
+def run(seed: int, advance: bool = False) -> list:
+    cli = SimulatorClient(MAIN)
+    configure(cli, seed)
+    result = releases(cli, advance)
+    cli.quit()
+    return result
+
+
+class ReleaseTest(unittest.TestCase):
+
+    def test_offset(self):
+        released = run(5)[0]
+        self.assertEqual(released, [(3 + 10 * k, 3 + 10 * k) for k in range(len(released))])
+        self.assertEqual(released[-1][0] + 10, 303)
+
+    def test_jitter(self):
+        released = run(5)[1]
+        self.assertEqual([arrival for _, arrival in released][-3:], [264, 276, 288])
+        for time, arrival in released:
+            self.assertEqual(arrival % 12, 0)
+            self.assertLessEqual(arrival, time)
+            self.assertLessEqual(time, arrival + 4)
+        self.assertGreater(len({time - arrival for time, arrival in released}), 1)
+
+    def test_sporadic(self):
+        arrivals = [arrival for _, arrival in run(5)[2]]
+        self.assertEqual(arrivals[0], 2)
+        gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+        self.assertTrue(all(15 <= gap <= 21 for gap in gaps), gaps)
+        self.assertGreater(len(set(gaps)), 1)
+
+    def test_reproducible(self):
+        expected = run(5)
+        self.assertEqual(run(5), expected)
+        self.assertNotEqual(run(6), expected)
+        self.assertEqual(run(5, advance=True), expected)
+
+        cli = SimulatorClient(MAIN)
+        configure(cli, 5)
+        releases(cli)
+        self.assertTrue(cli.reset_client())
+        self.assertEqual(releases(cli), expected)
+        cli.quit()
+
+    def test_query(self):
+        cli = SimulatorClient(MAIN)
+        configure(cli, 5)
+        self.assertEqual(cli.query_task_release(0), (3, 0, 0, 0, 3))
+        self.assertEqual(cli.query_task_release(2), (2, 0, 6, 0, 2))
+        cli.quit()
+
+    def test_invalid(self):
+        cli = SimulatorClient(MAIN)
+        cli.create_processor(0, 1)
+        cli.create_heter_ss_task(10, 1, (0,), (2,))
+        self.assertFalse(cli.set_task_release(0, 0, 10))
+        self.assertFalse(cli.set_task_release(1, 0))
+        self.assertTrue(cli.set_task_release(0, 0, 9, 5))
+        cli.set_simulation_timebound(50)
+        cli.start_simulation()
+        cli.update_processor_and_task()
+        self.assertFalse(cli.set_task_release(0, 1))
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
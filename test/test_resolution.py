@@ -0,0 +1,76 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The executed lengths of the runtime sub-tick units are replied in time
+units, also for segments of billions of sub-ticks.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+
+RESOLUTION = 2**20
+LENGTH = 4000
+
+
+def clients() -> list:
+    return [SimulatorClient(MAIN), SimulatorClient(MAIN, binary=False), InProcessSimulatorClient(LIBRARY)]
+
+
+def configure(cli) -> None:
+    """ a segment of 2^32 sub-ticks or more """
+    assert cli.set_time_resolution(RESOLUTION)
+    cli.create_processor(0, 2)
+    cli.create_heter_ss_task(2 * LENGTH, 1, (0,), (LENGTH,))
+    cli.create_heter_ss_task(2 * LENGTH, 1, (0,), (LENGTH // 2,))
+    cli.set_simulation_timebound(4 * LENGTH)
+    cli.start_simulation()
+    cli.schedule_segment_on_processor(0, 0, 0)
+    cli.schedule_segment_on_processor(1, 1, 0)
+
+
+class ResolutionTest(unittest.TestCase):
+
+    def test_large_resolution(self):
+        for cli in clients():
+            configure(cli)
+            self.assertEqual(cli.update_processor_and_task(), 2)
+            # to the completion of the shorter segment, then of the longer one
+            self.assertEqual(cli.advance_until_event(), LENGTH - 2)
+            self.assertEqual(cli.get_current_time_stamp(), LENGTH // 2)
+            self.assertEqual(cli.advance_until_event(), LENGTH // 2)
+            self.assertEqual(cli.get_current_time_stamp(), LENGTH)
+            self.assertEqual(cli.query_task_execution_states(), [LENGTH, LENGTH // 2])
+            self.assertFalse(cli.does_task_miss_deadline())
+            cli.quit()
+
+    def test_time_units(self):
+        for cli in clients():
+            cli.set_time_resolution(1000)
+            cli.set_variation_seed(3)
+            cli.create_processor(0, 1)
+            cli.create_heter_ss_task(20, 1, (0,), (6,))
+            cli.set_processor_variation(0, 50)
+            cli.set_simulation_timebound(40)
+            cli.start_simulation()
+            cli.schedule_segment_on_processor(0, 0, 0)
+            executed = cli.update_processor_and_task()
+            self.assertGreater(executed, 0.5)
+            self.assertLessEqual(executed, 1.0)
+            _, ((*_, length, remaining),) = cli.query_task_state(0)
+            self.assertEqual(cli.query_task_execution_states(), [executed])
+            self.assertAlmostEqual(length - remaining, executed)
+            # to the completion of the segment
+            executed += cli.advance_until_event()
+            self.assertAlmostEqual(executed, 6.0)
+            self.assertEqual(cli.query_task_execution_states(), [6.0])
+            self.assertEqual(cli.query_task_state(0)[1][0][-1], 0.0)
+            cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
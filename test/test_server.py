@@ -0,0 +1,104 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The sessions of the server mode are independent simulators, kept between
+connections until "quit".
+"""
+
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from common import MAIN
+
+from client import SimulatorClient
+
+
+class ServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.directory.name, "rtheter.sock")
+        cls.server = subprocess.Popen([MAIN, "--server", cls.socket_path], stderr=subprocess.DEVNULL)
+        for _ in range(500):
+            if os.path.exists(cls.socket_path): break
+            time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.kill()
+        cls.server.wait()
+        cls.directory.cleanup()
+
+    def attach(self, session: str = None) -> SimulatorClient:
+        return SimulatorClient(MAIN, socket_path=self.socket_path, session=session)
+
+    def configure(self, cli, processors: int, period: int) -> None:
+        cli.create_processor(0, processors)
+        cli.create_heter_ss_task(period, 1, (0,), (2, 3))
+        cli.set_simulation_timebound(100)
+        cli.start_simulation()
+
+    def test_sessions_are_isolated(self):
+        first, second = self.attach(), self.attach()
+        self.assertNotEqual(first.session, second.session)
+        self.configure(first, 2, 10)
+        self.configure(second, 1, 20)
+        first.schedule_segment_on_processor(0, 0, 0)
+        for _ in range(5): first.update_processor_and_task()
+        self.assertEqual(first.get_current_time_stamp(), 5)
+        self.assertEqual(second.get_current_time_stamp(), 0)
+        self.assertEqual(len(first.query_processor_states()), 2)
+        self.assertEqual(second.query_task_state(0), (20, ((0, -1, 1, 2, 2), (0, -1, 0, 3, 3))))
+        first.quit()
+        second.quit()
+
+    def test_detach_and_attach_again(self):
+        cli = self.attach()
+        self.configure(cli, 1, 10)
+        cli.schedule_segment_on_processor(0, 0, 0)
+        cli.update_processor_and_task()
+        state = cli.query_task_state(0)
+        session = cli.session
+        cli.detach()
+
+        cli = self.attach(session)
+        self.assertEqual(cli.session, session)
+        self.assertEqual(cli.get_current_time_stamp(), 1)
+        self.assertEqual(cli.query_task_state(0), state)
+        cli.quit()
+        # quit ends the session
+        with self.assertRaisesRegex(RuntimeError, "No such session"):
+            self.attach(session)
+
+    def test_unknown_session(self):
+        for session in ("1000000", "sweep-1"):
+            with self.assertRaisesRegex(RuntimeError, "No such session"):
+                self.attach(session)
+        cli = self.attach()
+        self.assertEqual(cli.get_current_time_stamp(), 0)
+        cli.quit()
+
+    def test_busy_session(self):
+        cli = self.attach()
+        unraisable = []
+        hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+        try:
+            with self.assertRaisesRegex(RuntimeError, "Session busy"):
+                self.attach(cli.session)
+            gc.collect()
+        finally:
+            sys.unraisablehook = hook
+        # the failed client is collected without an error
+        self.assertEqual(unraisable, [])
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The hyperperiod bound, and the steady state detection ending a run once
+the state after a release repeats, with the verdict of the full run.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+
+POLICIES = ("edf", "rm", "dm", "fifo", "dagedf")
+PROCESSORS = ((0, 1), (7, 1))
+# periods 8 and 16: a CPU and a GPU node, and a chain of three nodes
+TASKS = ([8, 2, 0, 2, 0, 1, 7], [16, 3, 2, 3, 0, 2, 7, 1, 0, 0, 1, 1, 2])
+HYPERPERIOD = 16
+# a GPU node of 13 more per 16 overloads the GPU, first released at 40
+MISSING = TASKS + ([16, 1, 0, 13, 7],)
+MISSING_OFFSET = 40
+BOUND = 4000
+
+
+def create(tasks: tuple = TASKS, detection: bool = True, scale: int = 1, offset: int = 0, cli = None):
+    """ with scale > 1, the periods and lengths times scale on a compressed time base;
+    offset is the release offset of the last task
+    """
+    cli = cli or InProcessSimulatorClient(LIBRARY)
+    for affinity, count in PROCESSORS: cli.create_processor(affinity, count)
+    for task in tasks:
+        task = list(task)
+        task[0] *= scale
+        for k in range(task[1]): task[3 + 2 * k] *= scale
+        cli.create_dag_task(task)
+    if offset: assert cli.set_task_release(len(tasks) - 1, offset * scale)
+    if scale > 1: assert cli.compress_time_base() == scale
+    cli.set_simulation_timebound(BOUND * scale)
+    assert cli.set_steady_state_detection(detection)
+    cli.start_simulation()
+    return cli
+
+
+def run(policy: str, **kwargs) -> tuple:
+    """ schedulable, miss time and end time of run_policy, and query_steady_state """
+    cli = create(**kwargs)
+    result = cli.run_policy(policy)[:3] + cli.query_steady_state()
+    cli.quit()
+    return result
+
+
+class SteadyStateTest(unittest.TestCase):
+
+    def test_hyperperiod(self):
+        for cli in (SimulatorClient(MAIN), InProcessSimulatorClient(LIBRARY)):
+            create(detection=False, cli=cli)
+            self.assertEqual(cli.query_hyperperiod(), HYPERPERIOD)
+            self.assertTrue(cli.set_hyperperiod_timebound(3))
+            self.assertEqual(cli.run_policy("edf")[:3], (True, -1, 3 * HYPERPERIOD))
+            cli.quit()
+
+        cli = InProcessSimulatorClient(LIBRARY)
+        for affinity, count in PROCESSORS: cli.create_processor(affinity, count)
+        self.assertFalse(cli.set_hyperperiod_timebound())
+        for task in TASKS: cli.create_dag_task(task)
+        # after the largest release offset
+        self.assertTrue(cli.set_task_release(1, 5))
+        self.assertTrue(cli.set_hyperperiod_timebound(2))
+        cli.start_simulation()
+        self.assertEqual(cli.run_policy("edf")[2], 2 * HYPERPERIOD + 5)
+        cli.quit()
+
+    def test_early_verdict(self):
+        for policy in POLICIES:
+            schedulable, miss_time, end_time, reached, cycle = run(policy)
+            self.assertEqual((schedulable, miss_time, reached), (True, -1, True), policy)
+            self.assertLess(end_time, 4 * HYPERPERIOD, policy)
+            self.assertGreater(cycle, 0, policy)
+            self.assertEqual(cycle % HYPERPERIOD, 0, policy)
+            self.assertEqual(run(policy, detection=False), (True, -1, BOUND, False, 0), policy)
+
+    def test_same_miss_as_without(self):
+        for policy in POLICIES:
+            # the states before the first release of the last task do not repeat
+            expected = run(policy, tasks=MISSING, offset=MISSING_OFFSET, detection=False)
+            self.assertFalse(expected[0], policy)
+            self.assertGreater(expected[1], MISSING_OFFSET, policy)
+            self.assertEqual(run(policy, tasks=MISSING, offset=MISSING_OFFSET), expected, policy)
+
+    def test_compressed(self):
+        for policy in POLICIES:
+            schedulable, _, end_time, reached, cycle = run(policy, scale=3)
+            expected = run(policy)
+            self.assertEqual((schedulable, end_time, reached, cycle),
+                             (True, 3 * expected[2], True, 3 * expected[4]), policy)
+
+    def test_off_under_variation(self):
+        cli = InProcessSimulatorClient(LIBRARY)
+        cli.set_variation_seed(7)
+        self.assertTrue(cli.set_variation_distribution("uniform", 0.5, 1.0))
+        create(cli=cli)
+        self.assertEqual(cli.run_policy("edf")[:3], (True, -1, BOUND))
+        self.assertEqual(cli.query_steady_state(), (False, 0))
+        cli.quit()
+
+    def test_off_under_random_releases(self):
+        for jitter, slack in ((2, 0), (0, 3)):
+            cli = InProcessSimulatorClient(LIBRARY)
+            for affinity, count in PROCESSORS: cli.create_processor(affinity, count)
+            for task in TASKS: cli.create_dag_task(task)
+            self.assertTrue(cli.set_task_release(0, 0, jitter, slack))
+            cli.set_simulation_timebound(BOUND)
+            cli.set_steady_state_detection()
+            cli.start_simulation()
+            result = cli.run_policy("edf")
+            self.assertEqual(cli.query_steady_state(), (False, 0), (jitter, slack))
+            self.assertTrue(not result[0] or result[2] == BOUND, (jitter, slack))
+            cli.quit()
+
+    def test_reset_and_restore(self):
+        expected = run("edf")
+        cli = create()
+        cli.push_state()
+        self.assertEqual(cli.run_policy("edf")[:3] + cli.query_steady_state(), expected)
+        # the states recorded before are dropped, the run repeats from the start
+        self.assertTrue(cli.reset_client())
+        self.assertEqual(cli.query_steady_state(), (False, 0))
+        self.assertEqual(cli.run_policy("edf")[:3] + cli.query_steady_state(), expected)
+        self.assertTrue(cli.pop_state() is not None)
+        self.assertEqual(cli.get_current_time_stamp(), 0)
+        self.assertEqual(cli.query_steady_state(), (False, 0))
+        self.assertEqual(cli.run_policy("edf")[:3] + cli.query_steady_state(), expected)
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
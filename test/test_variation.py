@@ -0,0 +1,142 @@
+#
+# Copy Right. The EHPCL Authors.
+#
+
+""" The execution variation is drawn from a seeded generator at each job
+release: the same seed gives the same runs, a factor is drawn per segment or
+per job, and invalid distributions are refused.
+"""
+
+import unittest
+
+from common import LIBRARY, MAIN, schedule_greedy
+
+from client import SimulatorClient
+from inprocess import InProcessSimulatorClient
+from rand import DAGTaskGenerator
+
+PROCESSORS = ((0, 2), (3, 1), (7, 1))
+TASKS = 4
+# a job runs in half or in the nominal execution time
+HISTOGRAM = (0.5, 1, 1.0, 1)
+# 4 CPU segments of 4 time units run one after the other
+PERIOD = 40
+SEGMENTS = (4, 4, 4, 4)
+
+
+def create(cli, seed: int):
+    for affinity, count in PROCESSORS: cli.create_processor(affinity, count)
+    for task in DAGTaskGenerator(7, TASKS, 1.5).generate_tasksets(): cli.create_dag_task(task)
+    cli.set_simulation_timebound(400)
+    assert cli.set_variation_seed(seed)
+    assert cli.set_variation_distribution("histogram", *HISTOGRAM)
+    cli.start_simulation()
+    return cli
+
+
+def trace(cli) -> list:
+    """ the task states after every tick, scheduled greedily """
+    states = []
+    while not cli.is_simulation_completed() and not cli.does_task_miss_deadline():
+        schedule_greedy(cli, TASKS)
+        cli.update_processor_and_task()
+        states.append([cli.query_task_state(i) for i in range(TASKS)])
+    states.append((cli.get_current_time_stamp(), cli.does_task_miss_deadline()))
+    cli.quit()
+    return states
+
+
+def progress(cli, bound: int = 20 * PERIOD) -> dict:
+    """ (job, segment) -> set of the progress per time unit of the segment """
+    cli.set_simulation_timebound(bound)
+    cli.start_simulation()
+    result = {}
+    while not cli.is_simulation_completed():
+        schedule_greedy(cli, 1)
+        job = cli.get_current_time_stamp() // PERIOD
+        before = [seg[4] for seg in cli.query_task_state(0)[1]]
+        cli.update_processor_and_task()
+        after = [seg[4] for seg in cli.query_task_state(0)[1]]
+        for k, (a, b) in enumerate(zip(before, after)):
+            if b < a: result.setdefault((job, k), set()).add(a - b)
+    cli.quit()
+    return result
+
+
+def chain(per_job: bool = False, distribution: tuple = ("histogram", *HISTOGRAM)):
+    cli = SimulatorClient(MAIN)
+    cli.create_processor(0, 1)
+    cli.create_heter_ss_task(PERIOD, 1, (0,), SEGMENTS)
+    cli.set_variation_seed(5)
+    assert cli.set_variation_distribution(*distribution, per_job=per_job)
+    return cli
+
+
+class VariationTest(unittest.TestCase):
+
+    def test_same_seed_same_run(self):
+        expected = trace(create(SimulatorClient(MAIN), 3))
+        self.assertEqual(trace(create(InProcessSimulatorClient(LIBRARY), 3)), expected)
+        self.assertNotEqual(trace(create(SimulatorClient(MAIN), 4)), expected)
+        # the reset starts the sequence of the seed again
+        cli = create(InProcessSimulatorClient(LIBRARY), 3)
+        for _ in range(50): cli.update_processor_and_task()
+        self.assertTrue(cli.reset_client())
+        self.assertEqual(trace(cli), expected)
+
+    def test_same_seed_same_policy_result(self):
+        results = {}
+        for seed in (3, 3, 4, 9):
+            cli = create(InProcessSimulatorClient(LIBRARY), seed)
+            results.setdefault(seed, set()).add(cli.run_policy("edf"))
+            cli.quit()
+        self.assertEqual([len(result) for result in results.values()], [1, 1, 1])
+        self.assertGreater(len(set.union(*results.values())), 1)
+
+    def test_scope(self):
+        for per_job in (True, False):
+            drawn = progress(chain(per_job))
+            self.assertEqual(set.union(*drawn.values()), {1, 2}, per_job)
+            speeds = [set.union(*(drawn[job, k] for k in range(len(SEGMENTS)))) for job in range(20)]
+            # one factor for all the segments of a job, or one per segment
+            if per_job: self.assertTrue(all(len(speed) == 1 for speed in speeds))
+            else: self.assertTrue(any(len(speed) > 1 for speed in speeds))
+
+    def test_invalid(self):
+        cli = SimulatorClient(MAIN)
+        for distribution in (("uniform", 1.2, 0.8), ("uniform", 0, 1.0), ("uniform", 1.0),
+                             ("histogram", 1.0, 1, 1.5), ("histogram", 1.0, 0, 1.5, 0), ("histogram",),
+                             ("normal", 1.0, -0.1, 0.5, 2.0), ("lognormal", 0, 0.2, 2.0, 0.5),
+                             ("none", 1.0), ("gamma", 1.0, 1.0)):
+            self.assertFalse(cli.set_variation_distribution(*distribution), distribution)
+        self.assertEqual(cli.send_command("setVariationDistribution task uniform 0.8 1.2"), "Invalid args!")
+        self.assertEqual(cli.send_command("setVariationSeed x"), "Invalid args!")
+        cli.quit()
+
+        # a refused distribution keeps the one set before
+        cli = chain(distribution=("histogram", 0.5, 1))
+        self.assertFalse(cli.set_variation_distribution("histogram", 1.0, 0))
+        self.assertEqual(set.union(*progress(cli).values()), {2})
+
+    def test_drawn_at_release(self):
+        cli = SimulatorClient(MAIN)
+        cli.create_processor(0, 1)
+        cli.create_heter_ss_task(PERIOD, 1, (0,), SEGMENTS)
+        cli.set_simulation_timebound(2 * PERIOD)
+        cli.start_simulation()
+        # the running job keeps the nominal execution time
+        self.assertTrue(cli.set_variation_distribution("histogram", 0.5, 1))
+        drawn = {}
+        while not cli.is_simulation_completed():
+            schedule_greedy(cli, 1)
+            job = cli.get_current_time_stamp() // PERIOD
+            before = cli.query_task_execution_states()[0]
+            cli.update_processor_and_task()
+            after = cli.query_task_execution_states()[0]
+            if after > before: drawn.setdefault(job, set()).add(after - before)
+        self.assertEqual(drawn, {0: {1}, 1: {2}})
+        cli.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()